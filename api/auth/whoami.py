@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 
 from company_manager.models import CompanyUser
 from employee_center.models import Employee
+from auth_center.bootstrap_cache import bootstrap_response, get_bootstrap, store_bootstrap
 from auth_center.models import ActiveUserSession, UserProfile
 from billing_center.models import CompanySubscription
 
@@ -155,6 +156,29 @@ def apiWhoAmI(request):
     if not user.is_authenticated:
         return JsonResponse(_anonymous_payload(), status=200)
 
+    # ============================================================
+    # ⚡ Bootstrap Cache (قراءة cache واحدة + ETag / 304)
+    # ============================================================
+    entry, cache_state = get_bootstrap(request)
+
+    if entry is None:
+        payload = _build_authenticated_payload(request, user)
+
+        if payload is None:
+            request.session.flush()
+            return JsonResponse(_anonymous_payload(), status=200)
+
+        entry = store_bootstrap(cache_state, payload)
+
+    return bootstrap_response(request, entry)
+
+
+def _build_authenticated_payload(request, user):
+    """
+    بناء payload المستخدم المسجل.
+    None → الجلسة غير مسجلة في ActiveUserSession (يجب إنهاؤها).
+    """
+
     # ============================================================
     # 👤 Base User Payload
     # ============================================================
@@ -323,8 +347,7 @@ def apiWhoAmI(request):
             if active_session:
                 session_version = active_session.session_version
             else:
-                request.session.flush()
-                return JsonResponse(_anonymous_payload(), status=200)
+                return None
 
     except Exception:
         pass
@@ -332,31 +355,28 @@ def apiWhoAmI(request):
     # ============================================================
     # ✅ FINAL RESPONSE (ENTERPRISE CONTRACT)
     # ============================================================
-    return JsonResponse(
-        {
-            "authenticated": True,
-            "user": user_payload,
-            "is_superuser": user.is_superuser,
-            "role": role,
-
-            "company": active_company,
-            "company_id": company_id,
-            "active_company_id": company_id,
-
-            "companies": companies,
-
-            "subscription": {
-                "apps": subscription_payload["apps"],
-                "apps_snapshot": subscription_payload["apps_snapshot"],
-                "days_remaining": days_remaining,
-            },
-
-            "impersonation": impersonation_payload,
-
-            "session": {
-                "key": session_key,
-                "version": session_version,
-            },
+    return {
+        "authenticated": True,
+        "user": user_payload,
+        "is_superuser": user.is_superuser,
+        "role": role,
+
+        "company": active_company,
+        "company_id": company_id,
+        "active_company_id": company_id,
+
+        "companies": companies,
+
+        "subscription": {
+            "apps": subscription_payload["apps"],
+            "apps_snapshot": subscription_payload["apps_snapshot"],
+            "days_remaining": days_remaining,
+        },
+
+        "impersonation": impersonation_payload,
+
+        "session": {
+            "key": session_key,
+            "version": session_version,
         },
-        status=200,
-    )
\ No newline at end of file
+    }
\ No newline at end of file
@@ -10,7 +10,6 @@ from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from django.db import transaction
-from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 
 import json
@@ -45,6 +44,7 @@ from company_manager.models import CompanyUser
 from employee_center.models import Employee
 
 from employee_center.services.biotime_linker import link_biotime_employees
+from primey_hrm.distributed_lock import DistributedLock
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +86,15 @@ def api_error(message, status=400, **extra):
         {"status": "error", "message": message, **extra},
         status=status
     )
+
+
+def lock_unavailable_error(trace):
+    # تعطل Redis ليس تزاحمًا → 503 بدل 429
+    return api_error(
+        "⚠️ خدمة الأقفال غير متاحة حاليًا، حاول لاحقًا.",
+        status=503,
+        trace_id=trace,
+    )
 # ================================================================
 # 🔄 API — Sync Existing Employee To Biotime (Replace Mode)
 # ================================================================
@@ -245,20 +254,22 @@ def company_biotime_sync_employees(request):
         )
 
     # ============================================================
-    # 🔒 Lock محلي (بدون Global Dependency)
+    # 🔒 Lock مشترك بين كل الـ Workers (Atomic)
     # ============================================================
     lock_key = f"biotime:sync-employees:lock:{company_user.company_id}"
     lock_ttl = 30  # seconds
 
-    if cache.get(lock_key):
+    lock = DistributedLock(lock_key, lock_ttl)
+
+    if not lock.acquire():
+        if lock.unavailable:
+            return lock_unavailable_error(trace)
         return api_error(
             "⏳ عملية مزامنة الموظفين قيد التنفيذ حاليًا.",
             status=429,
             trace_id=trace,
         )
 
-    cache.set(lock_key, True, lock_ttl)
-
     try:
         # --------------------------------------------------------
         # 🔍 Resolve Biotime Settings (Company Scoped – Validation فقط)
@@ -328,7 +339,7 @@ def company_biotime_sync_employees(request):
         )
 
     finally:
-        cache.delete(lock_key)
+        lock.release()
 
 # ================================================================
 # 📦 API — Unlinked Biotime Employees (SELECT SOURCE)
@@ -429,15 +440,17 @@ def company_biotime_test_connection(request):
     # 🔒 Prevent rapid duplicate tests (Company Scoped)
     lock_key = f"{TEST_LOCK_KEY}:{company.id}"
 
-    if cache.get(lock_key):
+    lock = DistributedLock(lock_key, TEST_LOCK_TTL)
+
+    if not lock.acquire():
+        if lock.unavailable:
+            return lock_unavailable_error(trace)
         return api_error(
             "⏳ يتم تنفيذ اختبار الاتصال حاليًا، حاول بعد لحظات.",
             status=429,
             trace_id=trace,
         )
 
-    cache.set(lock_key, True, TEST_LOCK_TTL)
-
     try:
         # --------------------------------------------------------
         # 🔍 Resolve Company-Scoped Biotime Setting
@@ -491,7 +504,7 @@ def company_biotime_test_connection(request):
         )
 
     finally:
-        cache.delete(lock_key)
+        lock.release()
 
 # ================================================================
 # 💾 API — Save Biotime Settings (PRODUCTION SAFE ✅)
@@ -772,15 +785,17 @@ def company_biotime_push_employee(request, employee_id: int):
     # ============================================================
     lock_key = f"{PUSH_LOCK_PREFIX}{company.id}:{employee_id}"
 
-    if cache.get(lock_key):
+    lock = DistributedLock(lock_key, PUSH_LOCK_TTL)
+
+    if not lock.acquire():
+        if lock.unavailable:
+            return lock_unavailable_error(trace)
         return api_error(
             "⏳ عملية الإرسال قيد التنفيذ.",
             status=429,
             trace_id=trace,
         )
 
-    cache.set(lock_key, True, PUSH_LOCK_TTL)
-
     try:
         # --------------------------------------------------------
         # 🔍 Get Employee (Company Strict)
@@ -905,7 +920,7 @@ def company_biotime_push_employee(request, employee_id: int):
         )
 
     finally:
-        cache.delete(lock_key)
+        lock.release()
 # ================================================================
 # 🔗 API — Link Existing Biotime Employee To System Employee
 # ================================================================
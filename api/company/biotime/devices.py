@@ -15,6 +15,10 @@ from django.utils import timezone
 
 from biotime_center.models import BiotimeDevice, BiotimeSetting
 from biotime_center.biotime_api_client import BiotimeAPIClient
+from biotime_center.services.geo_resolver import (
+    get_location_for_ip,
+    get_locations_for_ips,
+)
 from company_manager.models import CompanyUser
 from biotime_center.sync_service import (
     create_or_sync_department,
@@ -27,53 +31,9 @@ from company_manager.models import (
     CompanyBranch,
 )
 
+logger = logging.getLogger(__name__)
 
 
-# ================================================================
-# 🌍 Geo Resolver (LIVE READ ONLY — NO STORAGE)
-# ================================================================
-
-import requests
-
-def build_location_text_from_ip(ip_address: str | None):
-    """
-    🔹 Resolve Public IP to City + District (Live Only)
-    🔹 No DB storage
-    🔹 Safe Fail
-    """
-
-    if not ip_address:
-        return None
-
-    try:
-        response = requests.get(
-            f"http://ip-api.com/json/{ip_address}",
-            timeout=2,
-        )
-
-        if response.status_code != 200:
-            return None
-
-        data = response.json()
-
-        if data.get("status") != "success":
-            return None
-
-        city = data.get("city")
-        region = data.get("regionName")
-
-        if city and region:
-            return f"{city} - {region}"
-
-        if city:
-            return city
-
-        return None
-
-    except Exception:
-        logger.warning(f"Geo lookup failed for IP: {ip_address}")
-        return None
-
 
 # ================================================================
 # 🔐 Helpers
@@ -207,7 +167,13 @@ def company_biotime_devices(request):
     if not company:
         return JsonResponse({"status": "error", "message": "Company context not found"}, status=403)
 
-    devices = BiotimeDevice.objects.filter(company_name=company.name).order_by("alias")
+    devices = list(
+        BiotimeDevice.objects.filter(company_name=company.name).order_by("alias")
+    )
+
+    # 🌍 قراءة واحدة من الكاش لكل الأجهزة (المفقود يُحل في الخلفية)
+    geo = get_locations_for_ips([d.ip_address for d in devices])
+    geo_unavailable = {"text": None, "status": "unavailable"}
 
     payload = []
     total_users = 0
@@ -216,6 +182,7 @@ def company_biotime_devices(request):
         users = int(d.user_count or 0)
         total_users += users
         meta = resolve_device_status(d)
+        geo_entry = geo.get((d.ip_address or "").strip(), geo_unavailable)
 
         payload.append({
             "id": d.device_id,
@@ -223,7 +190,8 @@ def company_biotime_devices(request):
             "sn": d.sn,
             "ip": d.ip_address,
             "location": d.area_name,
-            "geo_location": build_location_text_from_ip(d.ip_address),
+            "geo_location": geo_entry["text"],
+            "geo_status": geo_entry["status"],
             "status": "online" if meta["online"] else "offline",
             "status_reason": meta["reason"],
             "threshold_minutes": meta["threshold_minutes"],
@@ -261,6 +229,7 @@ def company_biotime_device_detail(request, device_id: int):
         return JsonResponse({"status": "error", "message": "Device not found"}, status=404)
 
     meta = resolve_device_status(device)
+    geo_entry = get_location_for_ip(device.ip_address)
 
     return JsonResponse({
         "status": "success",
@@ -270,7 +239,8 @@ def company_biotime_device_detail(request, device_id: int):
             "sn": device.sn,
             "ip": device.ip_address,
             "location": device.area_name,
-            "geo_location": build_location_text_from_ip(device.ip_address),
+            "geo_location": geo_entry["text"],
+            "geo_status": geo_entry["status"],
             "status": "online" if meta["online"] else "offline",
             "status_reason": meta["reason"],
             "threshold_minutes": meta["threshold_minutes"],
@@ -129,51 +129,55 @@ def branch_create(request):
             return api_error("اسم الفرع مطلوب.", status=400)
 
         # ====================================================
-        # 🔐 Subscription Limit Check — Branches
-        # Product-aware + Limit-aware
+        # 🔒 الفحص + الإنشاء في transaction واحدة
+        # (قفل عداد الفروع → لا تجاوز للحد مع الطلبات المتزامنة)
         # ====================================================
-        branch_limit_check = check_branch_creation_limit(company_user.company)
-
-        if not branch_limit_check.allowed:
-            logger.warning(
-                "Branch creation blocked by subscription limit | company=%s | code=%s | usage=%s | max=%s | subscription_id=%s",
-                getattr(company_user.company, "id", None),
-                branch_limit_check.code,
-                branch_limit_check.current_usage,
-                branch_limit_check.max_allowed,
-                branch_limit_check.subscription_id,
-            )
-
-            limit_message_map = {
-                "NO_PRODUCT_SUBSCRIPTION": "لا يوجد اشتراك نشط للمنتج المطلوب.",
-                "LIMIT_EXCEEDED": "تم الوصول إلى الحد الأقصى المسموح لعدد الفروع في الباقة الحالية.",
-                "NO_COMPANY": "تعذر تحديد الشركة الحالية.",
-            }
-
-            return api_error(
-                limit_message_map.get(
+        with transaction.atomic():
+            # ====================================================
+            # 🔐 Subscription Limit Check — Branches
+            # Product-aware + Limit-aware
+            # ====================================================
+            branch_limit_check = check_branch_creation_limit(company_user.company)
+
+            if not branch_limit_check.allowed:
+                logger.warning(
+                    "Branch creation blocked by subscription limit | company=%s | code=%s | usage=%s | max=%s | subscription_id=%s",
+                    getattr(company_user.company, "id", None),
                     branch_limit_check.code,
-                    branch_limit_check.message or "تعذر إنشاء الفرع بسبب قيود الاشتراك.",
-                ),
-                status=402,
-                limit={
-                    "resource": "branches",
-                    "product_code": branch_limit_check.product_code,
-                    "current_usage": branch_limit_check.current_usage,
-                    "max_allowed": branch_limit_check.max_allowed,
-                    "remaining": branch_limit_check.remaining,
-                    "subscription_id": branch_limit_check.subscription_id,
-                    "code": branch_limit_check.code,
-                },
-            )
-
-        if CompanyBranch.objects.filter(
-            company=company_user.company,
-            name=name,
-        ).exists():
-            return api_error("اسم الفرع مستخدم مسبقًا.", status=409)
+                    branch_limit_check.current_usage,
+                    branch_limit_check.max_allowed,
+                    branch_limit_check.subscription_id,
+                )
+
+                limit_message_map = {
+                    "NO_PRODUCT_SUBSCRIPTION": "لا يوجد اشتراك نشط للمنتج المطلوب.",
+                    "LIMIT_EXCEEDED": "تم الوصول إلى الحد الأقصى المسموح لعدد الفروع في الباقة الحالية.",
+                    "NO_COMPANY": "تعذر تحديد الشركة الحالية.",
+                }
+
+                return api_error(
+                    limit_message_map.get(
+                        branch_limit_check.code,
+                        branch_limit_check.message or "تعذر إنشاء الفرع بسبب قيود الاشتراك.",
+                    ),
+                    status=402,
+                    limit={
+                        "resource": "branches",
+                        "product_code": branch_limit_check.product_code,
+                        "current_usage": branch_limit_check.current_usage,
+                        "max_allowed": branch_limit_check.max_allowed,
+                        "remaining": branch_limit_check.remaining,
+                        "subscription_id": branch_limit_check.subscription_id,
+                        "code": branch_limit_check.code,
+                    },
+                )
+
+            if CompanyBranch.objects.filter(
+                company=company_user.company,
+                name=name,
+            ).exists():
+                return api_error("اسم الفرع مستخدم مسبقًا.", status=409)
 
-        with transaction.atomic():
             branch = CompanyBranch.objects.create(
                 company=company_user.company,
                 name=name,
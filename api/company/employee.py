@@ -14,7 +14,7 @@ from datetime import datetime
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.db import transaction
-from django.db.models import F, Q
+from django.db.models import F
 from django.db.models.functions import Coalesce
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -31,10 +31,19 @@ from company_manager.models import (
 )
 from employee_center.models import (
     Employee,
+    EmployeeImportBatch,
     EmploymentHistory,
     EmploymentInfo,
     FinancialInfo,
 )
+from employee_center.services.bulk_import import (
+    ImportLimitExceeded,
+    ImportValidationError,
+    import_employees,
+    parse_import_file,
+    serialize_import_batch,
+)
+from employee_center.services.search_index import search_employees
 from payroll_center.models import PayrollRecord
 
 from attendance_center.models import WorkSchedule
@@ -516,14 +525,7 @@ def employees_report(request):
     )
 
     if search:
-        qs = qs.filter(
-            Q(full_name__icontains=search)
-            | Q(arabic_name__icontains=search)
-            | Q(national_id__icontains=search)
-            | Q(employee_number__icontains=search)
-            | Q(user__username__icontains=search)
-            | Q(user__email__icontains=search)
-        )
+        qs = search_employees(qs, company, search)
 
     if department_id:
         qs = qs.filter(department_id=department_id)
@@ -1043,6 +1045,109 @@ def employee_create(request):
     })
 
 
+# ======================================================
+# 📥 Bulk Import Employees (CSV / XLSX)
+# - تحقق كامل قبل أي إنشاء (كل الأخطاء في رد واحد)
+# - dry_run=1 → تحقق فقط
+# - الترحيب / Biotime في الخلفية (EmployeeImportBatch)
+# ======================================================
+@csrf_exempt
+@require_POST
+@login_required
+def employee_bulk_import(request):
+    company = _resolve_company(request)
+    if not company:
+        return JsonResponse(
+            {"status": "error", "message": "Company context missing"},
+            status=403,
+        )
+
+    uploaded_file = request.FILES.get("file")
+    if not uploaded_file:
+        return JsonResponse(
+            {"status": "error", "message": "Import file is required"},
+            status=400,
+        )
+
+    dry_run = _clean_bool(request.POST.get("dry_run", False))
+
+    try:
+        rows = parse_import_file(uploaded_file, uploaded_file.name)
+        batch = import_employees(
+            company,
+            rows,
+            actor=request.user,
+            file_name=uploaded_file.name,
+            send_welcome=_clean_bool(request.POST.get("send_welcome", True)),
+            push_biotime=_clean_bool(request.POST.get("push_biotime", False)),
+            dry_run=dry_run,
+        )
+
+    except ImportValidationError as exc:
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": "Import file has errors",
+                "errors": exc.errors,
+            },
+            status=400,
+        )
+
+    except ImportLimitExceeded as exc:
+        limit_check = exc.limit_check
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": "عدد الموظفين في الملف يتجاوز الحد المسموح في الباقة الحالية.",
+                "limit": {
+                    "resource": "employees",
+                    "product_code": limit_check.product_code,
+                    "current_usage": limit_check.current_usage,
+                    "max_allowed": limit_check.max_allowed,
+                    "remaining": limit_check.remaining,
+                    "requested": exc.requested,
+                    "subscription_id": limit_check.subscription_id,
+                    "code": limit_check.code,
+                },
+            },
+            status=402,
+        )
+
+    if dry_run:
+        return JsonResponse({
+            "status": "success",
+            "dry_run": True,
+            "valid_rows": len(rows),
+        })
+
+    return JsonResponse({
+        "status": "success",
+        "batch": serialize_import_batch(batch),
+    }, status=201)
+
+
+@require_GET
+@login_required
+def employee_import_batch_status(request, batch_id):
+    company = _resolve_company(request)
+    if not company:
+        return JsonResponse(
+            {"status": "error", "message": "Company context missing"},
+            status=403,
+        )
+
+    batch = EmployeeImportBatch.objects.filter(id=batch_id, company=company).first()
+    if not batch:
+        return JsonResponse(
+            {"status": "error", "message": "Import batch not found"},
+            status=404,
+        )
+
+    return JsonResponse({
+        "status": "success",
+        "batch": serialize_import_batch(batch),
+    })
+
 
 # ======================================================
 # 🔗 Link Employee with Biotime
@@ -2403,14 +2508,10 @@ def employee_search(request):
         return JsonResponse([], safe=False)
 
     employees = (
-        Employee.objects
-        .filter(company=company)
-        .filter(
-            Q(full_name__icontains=query)
-            | Q(arabic_name__icontains=query)
-            | Q(employee_number__icontains=query)
-            | Q(user__username__icontains=query)
-            | Q(user__email__icontains=query)
+        search_employees(
+            Employee.objects.filter(company=company).select_related("user"),
+            company,
+            query,
         )
         .order_by("full_name")[:20]
     )
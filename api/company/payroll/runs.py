@@ -20,6 +20,7 @@ from rest_framework import status
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.db.models import Count
+from django.http import StreamingHttpResponse
 
 from payroll_center.models import PayrollRun, PayrollRecord, PayrollRecordHistory
 from payroll_center.services.payroll_engine import (
@@ -31,6 +32,12 @@ from payroll_center.services.payroll_engine import (
 from payroll_center.services.reporting import (
     get_payroll_run_financial_summary,
 )
+from payroll_center.services.bulk_payslips import (
+    build_run_slips,
+    iter_payroll_run_payslips_zip,
+    missing_payslips,
+    schedule_payroll_run_payslips,
+)
 
 from company_manager.models import CompanyUser
 from notification_center.services_hr import (
@@ -393,6 +400,8 @@ class PayrollRunApproveAPIView(APIView):
 
         try:
             approve_payroll_run(run)
+            # 🧾 تجهيز القسائم مسبقًا لتحميل ZIP فوري
+            schedule_payroll_run_payslips(run.id)
             return Response({
                 "status": "APPROVED",
                 "detail": _t(request, "تم اعتماد تشغيل الرواتب بنجاح.", "Payroll run approved successfully."),
@@ -571,4 +580,59 @@ class PayrollRunPayAPIView(APIView):
                 "run": final_payload,
             },
             status=status.HTTP_200_OK,
-        )
\ No newline at end of file
+        )
+
+# ============================================================
+# 📦 Bulk Payslips ZIP API
+# ✅ كل قسائم الدورة (Snapshots) في ملف ZIP واحد يُبث على دفعات
+# ✅ القسائم غير المتغيرة تُعاد من التخزين بدون توليد
+# ✅ قسائم ناقصة → توليد في الخلفية + 202 (لا توليد داخل الطلب)
+# ============================================================
+
+class PayrollRunPayslipsZipAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, run_id):
+
+        company = _resolve_company(request.user)
+        if not company:
+            return Response(
+                {"detail": _t(request, "تعذر العثور على سياق الشركة.", "Company context not found")},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        run = get_object_or_404(
+            PayrollRun.objects.select_related("company"),
+            id=run_id,
+            company=company,
+        )
+
+        if run.status not in [PayrollRun.Status.APPROVED, PayrollRun.Status.PAID]:
+            return Response(
+                {"detail": _t(request, "القسائم متاحة فقط بعد اعتماد الدورة.", "Payslips are available only after the run is approved.")},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        slips = build_run_slips(run)
+        missing = missing_payslips(run, slips)
+
+        if missing:
+            schedule_payroll_run_payslips(run.id)
+            return Response(
+                {
+                    "status": "rendering",
+                    "total": len(slips),
+                    "ready": len(slips) - len(missing),
+                    "detail": _t(request, "جاري تجهيز القسائم، أعد المحاولة بعد قليل.", "Payslips are being prepared, please retry shortly."),
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        response = StreamingHttpResponse(
+            iter_payroll_run_payslips_zip(run, slips),
+            content_type="application/zip",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="payslips_{run.month.strftime("%Y-%m")}_run_{run.id}.zip"'
+        )
+        return response
@@ -12,6 +12,8 @@ from api.company.employee import (
     employees_report,
     employee_detail,
     employee_create,
+    employee_bulk_import,
+    employee_import_batch_status,
     employee_update,
     employee_profile_update,
     employee_toggle_status,
@@ -81,6 +83,7 @@ from api.company.payroll.runs import (
     PayrollRunApproveAPIView,
     PayrollRunResetAPIView,
     PayrollRunPayAPIView,
+    PayrollRunPayslipsZipAPIView,
 )
 
 from api.company.payroll.records import (
@@ -227,6 +230,16 @@ urlpatterns = [
         employee_create,
         name="employee_create",
     ),
+    path(
+        "employees/import/",
+        employee_bulk_import,
+        name="employee_bulk_import",
+    ),
+    path(
+        "employees/import/<int:batch_id>/",
+        employee_import_batch_status,
+        name="employee_import_batch_status",
+    ),
     path(
         "employees/search/",
         employee_search,
@@ -822,6 +835,11 @@ urlpatterns = [
         PayrollRunPayAPIView.as_view(),
         name="company_payroll_run_pay",
     ),
+    path(
+        "payroll/runs/<int:run_id>/payslips.zip",
+        PayrollRunPayslipsZipAPIView.as_view(),
+        name="company_payroll_run_payslips_zip",
+    ),
 
     path(
         "payroll/runs/<int:run_id>/records/",
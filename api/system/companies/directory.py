@@ -0,0 +1,182 @@
+# ============================================================
+# 🏢 Tenant Directory — Annotated Read Model
+# Mham Cloud — Super Admin Companies Listing
+# ============================================================
+# ✔ آخر اشتراك + عدد المستخدمين كـ Subquery (بدون N+1)
+# ✔ عدد استعلامات ثابت مهما زاد عدد الشركات
+# ✔ Keyset Pagination (sort_value, id) بدل OFFSET
+# ✔ بحث + ترتيب من قائمة مسموحة فقط
+# ============================================================
+
+import base64
+import json
+
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_datetime
+
+from billing_center.models import CompanySubscription
+from company_manager.models import Company, CompanyUser
+
+DEFAULT_SORT = "-created_at"
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# sort key → (annotated field, cursor decoder)
+SORT_FIELDS = {
+    "created_at": ("created_at", parse_datetime),
+    "name": ("name", str),
+    "users_count": ("users_count", int),
+}
+
+
+class InvalidDirectoryQuery(ValueError):
+    pass
+
+
+# ============================================================
+# 📥 Annotated Queryset
+# ============================================================
+def tenant_directory_queryset():
+    latest_subscription = (
+        CompanySubscription.objects
+        .filter(company=OuterRef("pk"))
+        .order_by("-created_at", "-id")
+    )
+
+    users_count = (
+        CompanyUser.objects
+        .filter(company=OuterRef("pk"))
+        .order_by()
+        .values("company")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+
+    return (
+        Company.objects
+        .select_related("owner")
+        .annotate(
+            subscription_plan=Subquery(latest_subscription.values("plan__name")[:1]),
+            subscription_status=Subquery(latest_subscription.values("status")[:1]),
+            subscription_end_date=Subquery(latest_subscription.values("end_date")[:1]),
+            users_count=Coalesce(
+                Subquery(users_count[:1], output_field=IntegerField()),
+                Value(0),
+            ),
+        )
+    )
+
+
+def search_tenants(queryset, term):
+    term = (term or "").strip()
+    if not term:
+        return queryset
+
+    return queryset.filter(
+        Q(name__icontains=term)
+        | Q(email__icontains=term)
+        | Q(phone__icontains=term)
+        | Q(owner__email__icontains=term)
+    )
+
+
+# ============================================================
+# 🔁 Keyset Pagination
+# ============================================================
+def _parse_sort(sort):
+    sort = (sort or DEFAULT_SORT).strip()
+    descending = sort.startswith("-")
+    key = sort.lstrip("-")
+
+    if key not in SORT_FIELDS:
+        raise InvalidDirectoryQuery(f"Unsupported sort: {sort}")
+
+    return key, descending
+
+
+def encode_cursor(value, pk):
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    raw = json.dumps([value, pk]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor, key):
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        value = SORT_FIELDS[key][1](value)
+        if value is None:
+            raise ValueError
+        return value, int(pk)
+    except Exception as exc:
+        raise InvalidDirectoryQuery("Invalid cursor") from exc
+
+
+def paginate_tenants(queryset, *, sort=None, cursor=None, limit=DEFAULT_LIMIT):
+    """
+    يرجع (companies, next_cursor) — استعلام واحد (limit + 1).
+    limit=None → كل النتائج بنفس الترتيب (الشكل القديم للقائمة).
+    """
+    key, descending = _parse_sort(sort)
+    field = SORT_FIELDS[key][0]
+
+    if descending:
+        queryset = queryset.order_by(f"-{field}", "-id")
+    else:
+        queryset = queryset.order_by(field, "id")
+
+    if cursor:
+        value, pk = decode_cursor(cursor, key)
+        op = "lt" if descending else "gt"
+        queryset = queryset.filter(
+            Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"id__{op}": pk})
+        )
+
+    if limit is None:
+        return list(queryset), None
+
+    limit = min(max(int(limit or DEFAULT_LIMIT), 1), MAX_LIMIT)
+    companies = list(queryset[:limit + 1])
+
+    next_cursor = None
+    if len(companies) > limit:
+        companies = companies[:limit]
+        last = companies[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+
+    return companies, next_cursor
+
+
+# ============================================================
+# 🧾 Serializer
+# ============================================================
+def serialize_tenant(company):
+    owner = company.owner
+
+    return {
+        "id": company.id,
+        "name": company.name,
+        "is_active": company.is_active,
+        "created_at": company.created_at.isoformat() if company.created_at else None,
+        "owner": {
+            "id": owner.id if owner else None,
+            "name": f"{owner.first_name} {owner.last_name}".strip() if owner else None,
+            "email": owner.email if owner else None,
+        },
+        "contact": {
+            "phone": company.phone,
+            "email": company.email,
+        },
+        "address": company.short_address or company.city or "-",
+        "subscription": {
+            "plan": company.subscription_plan,
+            "status": company.subscription_status,
+            "end_date": (
+                company.subscription_end_date.isoformat()
+                if company.subscription_end_date else None
+            ),
+        },
+        "users_count": company.users_count,
+        "devices_count": 0,
+    }
@@ -1,54 +1,53 @@
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 
-from billing_center.models import CompanySubscription
-from company_manager.models import Company, CompanyUser
+from .directory import (
+    DEFAULT_LIMIT,
+    InvalidDirectoryQuery,
+    paginate_tenants,
+    search_tenants,
+    serialize_tenant,
+    tenant_directory_queryset,
+)
 
 
 @login_required
 def companies_list(request):
-
-    companies = Company.objects.all().order_by("-created_at")
-
-    result = []
-
-    for company in companies:
-
-        sub = (
-            CompanySubscription.objects
-            .filter(company=company)
-            .select_related("plan")
-            .order_by("-created_at")
-            .first()
+    """
+    - بدون limit/cursor → القائمة كاملة (نفس الشكل القديم: Array)
+    - مع limit أو cursor → {"results", "next_cursor"} (Keyset)
+    - q / is_active / subscription_status / sort متاحة في الحالتين
+    """
+
+    queryset = search_tenants(tenant_directory_queryset(), request.GET.get("q"))
+
+    is_active = request.GET.get("is_active")
+    if is_active in ("true", "false"):
+        queryset = queryset.filter(is_active=is_active == "true")
+
+    subscription_status = request.GET.get("subscription_status")
+    if subscription_status:
+        queryset = queryset.filter(subscription_status=subscription_status)
+
+    paginated = "limit" in request.GET or "cursor" in request.GET
+
+    try:
+        companies, next_cursor = paginate_tenants(
+            queryset,
+            sort=request.GET.get("sort"),
+            cursor=request.GET.get("cursor"),
+            limit=(request.GET.get("limit") or DEFAULT_LIMIT) if paginated else None,
         )
+    except (InvalidDirectoryQuery, ValueError) as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
 
-        result.append({
-            "id": company.id,
-            "name": company.name,
-            "is_active": company.is_active,
-            "created_at": company.created_at.isoformat() if company.created_at else None,
-
-            "owner": {
-                "id": company.owner.id if company.owner else None,
-                "name": f"{company.owner.first_name} {company.owner.last_name}".strip() if company.owner else None,
-                "email": company.owner.email if company.owner else None,
-            },
-
-            "contact": {
-                "phone": company.phone,
-                "email": company.email,
-            },
-
-            "address": company.short_address or company.city or "-",
-
-            "subscription": {
-                "plan": sub.plan.name if sub and sub.plan else None,
-                "status": sub.status if sub else None,
-                "end_date": sub.end_date.isoformat() if sub and sub.end_date else None,
-            },
+    result = [serialize_tenant(company) for company in companies]
 
-            "users_count": CompanyUser.objects.filter(company=company).count(),
-            "devices_count": 0,
-        })
+    if not paginated:
+        return JsonResponse(result, safe=False)
 
-    return JsonResponse(result, safe=False)
\ No newline at end of file
+    return JsonResponse({
+        "results": result,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+    })
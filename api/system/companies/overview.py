@@ -1,6 +1,7 @@
 from datetime import timedelta
 
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Q
 from django.http import JsonResponse
 from django.utils.timezone import now
 
@@ -13,49 +14,33 @@ def companies_overview(request):
 
     today = now().date()
 
-    total = Company.objects.count()
-    active = Company.objects.filter(is_active=True).count()
-    suspended = Company.objects.filter(is_active=False).count()
+    # 🏢 الشركات — استعلام واحد
+    companies = Company.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+        suspended=Count("id", filter=Q(is_active=False)),
+    )
 
     total_users = CompanyUser.objects.count()
 
-    subscriptions_total = CompanySubscription.objects.count()
-
-    subscriptions_active = CompanySubscription.objects.filter(
-        status="ACTIVE"
-    ).count()
-
-    subscriptions_trial = CompanySubscription.objects.filter(
-        status="TRIAL"
-    ).count()
-
-    subs = CompanySubscription.objects.exclude(end_date__isnull=True)
-
-    expiring_7 = subs.filter(
-        end_date__gte=today,
-        end_date__lte=today + timedelta(days=7),
-    ).count()
-
-    expiring_30 = subs.filter(
-        end_date__gte=today,
-        end_date__lte=today + timedelta(days=30),
-    ).count()
-
-    expired = subs.filter(end_date__lt=today).count()
+    # 💳 الاشتراكات — استعلام واحد
+    subscriptions = CompanySubscription.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(status="ACTIVE")),
+        trial=Count("id", filter=Q(status="TRIAL")),
+        expired=Count("id", filter=Q(end_date__lt=today)),
+        expiring_7=Count(
+            "id",
+            filter=Q(end_date__gte=today, end_date__lte=today + timedelta(days=7)),
+        ),
+        expiring_30=Count(
+            "id",
+            filter=Q(end_date__gte=today, end_date__lte=today + timedelta(days=30)),
+        ),
+    )
 
     return JsonResponse({
-        "companies": {
-            "total": total,
-            "active": active,
-            "suspended": suspended,
-        },
+        "companies": companies,
         "users_total": total_users,
-        "subscriptions": {
-            "total": subscriptions_total,
-            "active": subscriptions_active,
-            "trial": subscriptions_trial,
-            "expired": expired,
-            "expiring_7": expiring_7,
-            "expiring_30": expiring_30,
-        }
-    })
\ No newline at end of file
+        "subscriptions": subscriptions,
+    })
@@ -7,6 +7,8 @@ from django.middleware.csrf import get_token
 
 from django.conf import settings
 
+from primey_hrm.workers import get_worker_status
+
 # ================================================================
 # Optional Redis
 # ================================================================
@@ -43,13 +45,12 @@ def _redis_status():
         return f"error: {e}"
 
 
-def _scheduler_status():
+def _scheduler_status(workers):
     """
     APScheduler snapshot
-    مبدئيًا نفترض أنه يعمل طالما السيرفر شغال.
-    يمكن ربطه لاحقًا بـ scheduler instance حقيقي.
+    مرتبط بـ Heartbeat عملية run_workers.
     """
-    return getattr(settings, "SCHEDULER_RUNNING", True)
+    return workers["alive"] and getattr(settings, "SCHEDULER_RUNNING", True)
 
 
 def _system_flags():
@@ -68,11 +69,14 @@ def system_health(request):
     if not _is_super_admin(request.user):
         return JsonResponse({"detail": "Forbidden"}, status=403)
 
+    workers = get_worker_status()
+
     health = {
         "api": "ok",
         "database": _db_status(),
         "redis": _redis_status(),
-        "scheduler": "running" if _scheduler_status() else "stopped",
+        "scheduler": "running" if _scheduler_status(workers) else "stopped",
+        "workers": workers,
         "errors_24h": 0,  # Placeholder (System Log لاحقًا)
     }
 
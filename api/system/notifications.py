@@ -14,6 +14,10 @@ from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 
 from notification_center.models import Notification
+from notification_center.unread_counter import (
+    get_unread_count,
+    mark_notifications_read,
+)
 
 
 # ============================================================
@@ -57,10 +61,7 @@ def notifications_list(request):
         for n in qs
     ]
 
-    unread_count = Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).count()
+    unread_count = get_unread_count(request.user.id)
 
     return JsonResponse(
         {
@@ -81,11 +82,7 @@ def mark_notification_read(request, notification_id):
     Mark a single notification as read
     """
 
-    updated = Notification.objects.filter(
-        id=notification_id,
-        recipient=request.user,
-        is_read=False
-    ).update(is_read=True)
+    updated = mark_notifications_read(request.user, [notification_id])
 
     if not updated:
         return JsonResponse(
@@ -109,10 +106,7 @@ def mark_all_notifications_read(request):
     Mark all user notifications as read
     """
 
-    updated = Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).update(is_read=True)
+    updated = mark_notifications_read(request.user)
 
     return JsonResponse(
         {
@@ -28,7 +28,7 @@ from whatsapp_center.models import (
     WhatsAppBroadcast,
     WhatsAppBroadcastRecipient,
 )
-from whatsapp_center.services import send_event_whatsapp_message
+from whatsapp_center.services import send_event_whatsapp_messages_batch
 from whatsapp_center.utils import normalize_phone_number
 
 User = get_user_model()
@@ -50,6 +50,10 @@ except Exception:
     CompanySubscription = None
 
 
+# عدد المستلمين في كل طلب إلى الـ Session Gateway
+BROADCAST_SEND_CHUNK_SIZE = 50
+
+
 ALLOWED_MESSAGE_TYPES = {
     MessageType.TEXT,
     MessageType.DOCUMENT,
@@ -739,26 +743,33 @@ def system_whatsapp_broadcast_execute(request, broadcast_id: int):
         sent_count = 0
         failed_count = 0
 
-        recipients = (
+        recipients = list(
             broadcast.recipients
             .select_related("company", "user", "employee")
             .order_by("id")
         )
 
-        for recipient in recipients:
-            log = send_event_whatsapp_message(
+        for offset in range(0, len(recipients), BROADCAST_SEND_CHUNK_SIZE):
+            chunk = recipients[offset:offset + BROADCAST_SEND_CHUNK_SIZE]
+
+            logs = send_event_whatsapp_messages_batch(
                 scope_type=ScopeType.SYSTEM,
                 event_code="system_broadcast_manual",
-                recipient_phone=recipient.recipient_phone,
-                recipient_name=recipient.recipient_name,
-                recipient_role=recipient.recipient_type,
+                recipients=[
+                    {
+                        "phone": recipient.recipient_phone,
+                        "name": recipient.recipient_name,
+                        "role": recipient.recipient_type,
+                        "context": _build_broadcast_context(
+                            broadcast=broadcast,
+                            recipient=recipient,
+                        ),
+                    }
+                    for recipient in chunk
+                ],
                 trigger_source=TriggerSource.BROADCAST,
                 company=None,
                 language_code="ar",
-                context=_build_broadcast_context(
-                    broadcast=broadcast,
-                    recipient=recipient,
-                ),
                 related_model="WhatsAppBroadcast",
                 related_object_id=str(broadcast.id),
                 attachment_url=broadcast.attachment_url or "",
@@ -766,29 +777,31 @@ def system_whatsapp_broadcast_execute(request, broadcast_id: int):
                 mime_type=broadcast.mime_type or "",
             )
 
-            delivery_status = str(getattr(log, "delivery_status", "") or "")
-            recipient.delivery_status = delivery_status or DeliveryStatus.FAILED
-            recipient.external_message_id = getattr(log, "external_message_id", "") or ""
-            recipient.failure_reason = getattr(log, "failure_reason", "") or ""
-
-            if recipient.delivery_status == DeliveryStatus.SENT:
-                recipient.sent_at = timezone.now()
-                sent_count += 1
-            elif recipient.delivery_status == DeliveryStatus.FAILED:
-                failed_count += 1
-            else:
-                # أي حالة غير SENT نعتبرها فشلًا في هذا التنفيذ الأولي
-                failed_count += 1
-                if not recipient.failure_reason:
-                    recipient.failure_reason = f"Unexpected delivery status: {recipient.delivery_status}"
-
-            recipient.save(
-                update_fields=[
+            for recipient, log in zip(chunk, logs):
+                delivery_status = str(getattr(log, "delivery_status", "") or "")
+                recipient.delivery_status = delivery_status or DeliveryStatus.FAILED
+                recipient.external_message_id = getattr(log, "external_message_id", "") or ""
+                recipient.failure_reason = getattr(log, "failure_reason", "") or ""
+
+                if recipient.delivery_status == DeliveryStatus.SENT:
+                    recipient.sent_at = timezone.now()
+                    sent_count += 1
+                elif recipient.delivery_status == DeliveryStatus.FAILED:
+                    failed_count += 1
+                else:
+                    # أي حالة غير SENT نعتبرها فشلًا في هذا التنفيذ الأولي
+                    failed_count += 1
+                    if not recipient.failure_reason:
+                        recipient.failure_reason = f"Unexpected delivery status: {recipient.delivery_status}"
+
+            WhatsAppBroadcastRecipient.objects.bulk_update(
+                chunk,
+                [
                     "delivery_status",
                     "external_message_id",
                     "failure_reason",
                     "sent_at",
-                ]
+                ],
             )
 
         broadcast.sent_count = sent_count
@@ -6,11 +6,9 @@
 # ✅ يدعم:
 # - Meta-style verify endpoint
 # - Internal Gateway Token Validation
-# - Raw webhook audit storage
-# - Baileys messages.upsert intake
-# - Baileys messages.update intake
-# - Legacy statuses intake
-# - Delegation to webhook_service Inbox Engine
+# - Raw webhook audit storage = طابور المعالجة (Fast-Ack)
+# - Baileys messages.upsert / messages.update / Legacy statuses
+#   → تُعالج في الخلفية عبر whatsapp_center.inbox_queue
 # ============================================================
 
 from __future__ import annotations
@@ -24,15 +22,9 @@ from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 
+from whatsapp_center.inbox_queue import enqueue_webhook_event
 from whatsapp_center.models import ScopeType
 from whatsapp_center.selectors import get_active_system_whatsapp_config
-from whatsapp_center.webhook_service import (
-    apply_status_update_to_conversation_message,
-    apply_status_update_to_message,
-    create_or_update_inbox_from_webhook,
-    normalize_status_value,
-    store_webhook_event,
-)
 
 
 # ============================================================
@@ -131,115 +123,6 @@ def _normalize_provider(provider_value: str) -> str:
     return _safe_str(provider_value or "META") or "META"
 
 
-def _extract_legacy_statuses(payload: dict[str, Any]) -> list[dict[str, str]]:
-    """
-    دعم الشكل القديم:
-    {
-        "statuses": [{"id": "...", "status": "delivered"}]
-    }
-    """
-    normalized: list[dict[str, str]] = []
-
-    for item in payload.get("statuses", []) or []:
-        external_message_id = _safe_str(item.get("id"))
-        new_status = normalize_status_value(item.get("status"))
-
-        if external_message_id and new_status:
-            normalized.append(
-                {
-                    "external_message_id": external_message_id,
-                    "new_status": new_status,
-                }
-            )
-
-    return normalized
-
-
-def _extract_gateway_message_updates(payload: dict[str, Any]) -> list[dict[str, str]]:
-    """
-    دعم الشكل الجديد القادم من Gateway:
-    {
-        "event": "messages.update",
-        "message_updates": [
-            {
-                "message_id": "...",
-                "update": {
-                    "status": "read"
-                }
-            }
-        ]
-    }
-    """
-    normalized: list[dict[str, str]] = []
-
-    for item in payload.get("message_updates", []) or []:
-        external_message_id = _safe_str(
-            item.get("message_id")
-            or item.get("external_message_id")
-            or item.get("id")
-        )
-
-        update = item.get("update", {}) or {}
-
-        candidate_status = (
-            update.get("status")
-            or update.get("delivery_status")
-            or update.get("ack")
-            or update.get("messageStatus")
-        )
-
-        new_status = normalize_status_value(candidate_status)
-
-        if external_message_id and new_status:
-            normalized.append(
-                {
-                    "external_message_id": external_message_id,
-                    "new_status": new_status,
-                }
-            )
-
-    return normalized
-
-
-def _collect_status_updates(payload: dict[str, Any]) -> list[dict[str, str]]:
-    updates: list[dict[str, str]] = []
-    updates.extend(_extract_legacy_statuses(payload))
-    updates.extend(_extract_gateway_message_updates(payload))
-    return updates
-
-
-def _apply_status_updates(payload: dict[str, Any]) -> int:
-    """
-    تطبيق status updates على:
-    - WhatsAppMessageLog
-    - WhatsAppConversationMessage
-    """
-    applied_count = 0
-
-    for item in _collect_status_updates(payload):
-        external_message_id = item.get("external_message_id") or ""
-        new_status = item.get("new_status") or ""
-
-        if not external_message_id or not new_status:
-            continue
-
-        log = apply_status_update_to_message(
-            external_message_id=external_message_id,
-            new_status=new_status,
-        )
-        if log:
-            applied_count += 1
-
-        conversation_message = apply_status_update_to_conversation_message(
-            external_message_id=external_message_id,
-            new_status=new_status,
-        )
-        if conversation_message:
-            applied_count += 1
-
-    return applied_count
-
-
 # ============================================================
 # 🌐 Verify Endpoint
 # ============================================================
@@ -304,54 +187,24 @@ def system_whatsapp_webhook_receive(request):
     event_type = _safe_str(payload.get("event_type") or payload.get("event") or "provider_webhook")
 
     # --------------------------------------------------------
-    # 1) Audit Store — نحفظ payload الخام كاملًا أولًا
+    # 📥 Fast-Ack: نحفظ payload الخام في الطابور ونرد فورًا
+    # (الرسائل الواردة + تحديثات الحالة تُطبق في الخلفية)
     # --------------------------------------------------------
-    store_webhook_event(
+    event = enqueue_webhook_event(
         payload=payload,
         event_type=event_type or "provider_webhook",
-        external_message_id="",
         scope_type=ScopeType.SYSTEM,
         company=None,
         provider=provider,
     )
 
-    inbound_created = 0
-    inbound_skipped = 0
-    applied_status_updates = 0
-
-    # --------------------------------------------------------
-    # 2) Inbound Messages Intake + Runtime Creation
-    # --------------------------------------------------------
-    try:
-        if payload.get("messages"):
-            result = create_or_update_inbox_from_webhook(
-                payload=payload,
-                scope_type=ScopeType.SYSTEM,
-                company=None,
-            )
-            inbound_created = result.get("created_count", 0)
-            inbound_skipped = result.get("skipped_count", 0)
-    except Exception:
-        inbound_created = 0
-        inbound_skipped = 0
-
-    # --------------------------------------------------------
-    # 3) Status Updates Intake
-    # --------------------------------------------------------
-    try:
-        applied_status_updates = _apply_status_updates(payload)
-    except Exception:
-        applied_status_updates = 0
-
     return JsonResponse(
         {
             "ok": True,
-            "message": "Webhook received",
+            "message": "Webhook queued",
             "event_type": event_type,
             "provider": provider,
-            "inbound_created": inbound_created,
-            "inbound_skipped": inbound_skipped,
-            "applied_status_updates": applied_status_updates,
+            "event_id": event.id,
         },
         status=200,
-    )
\ No newline at end of file
+    )
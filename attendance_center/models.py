@@ -6,6 +6,7 @@
 
 from django.db import models
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.exceptions import ValidationError
 from datetime import date
 
@@ -127,6 +128,23 @@ def normalize_weekend_days(raw_value: str) -> str:
     return ",".join(unique)
 
 
+def weekend_days_to_mask(weekend_days: str) -> int:
+    """
+    "fri,sat" → bitmask بترتيب date.weekday() (mon=bit0 … sun=bit6)
+    الأكواد غير المعروفة يتم تجاهلها (نفس سلوك is_weekend السابق).
+    """
+
+    if not weekend_days:
+        return 0
+
+    mask = 0
+    for code in weekend_days.split(","):
+        code = code.strip()
+        if code in WEEKDAY_SET:
+            mask |= 1 << WEEKDAY_CODES.index(code)
+    return mask
+
+
 # ============================================================
 # 🕒 (NEW) Work Schedule — Phase 1 Data Layer Only
 # ============================================================
@@ -235,6 +253,7 @@ class WorkSchedule(models.Model):
     # ============================================================
     def save(self, *args, **kwargs):
         self.weekend_days = normalize_weekend_days(self.weekend_days)
+        self.__dict__.pop("weekend_mask", None)
         super().save(*args, **kwargs)
 
     # ============================================================
@@ -257,27 +276,16 @@ class WorkSchedule(models.Model):
         """'الجمعة، السبت'"""
         return "، ".join(self.get_weekend_days_ar_list())
 
+    @cached_property
+    def weekend_mask(self) -> int:
+        """Bitmask محسوب مرة واحدة لكل instance (انظر weekend_days_to_mask)"""
+        return weekend_days_to_mask(self.weekend_days)
+
     def is_weekend(self, target_date: date) -> bool:
         if not target_date:
             return False
 
-        mapping = {
-            "mon": 0,
-            "tue": 1,
-            "wed": 2,
-            "thu": 3,
-            "fri": 4,
-            "sat": 5,
-            "sun": 6,
-        }
-
-        weekday_index = target_date.weekday()
-        weekend_indexes = [
-            mapping.get(code)
-            for code in self.get_weekend_days_list()
-            if code in mapping
-        ]
-        return weekday_index in weekend_indexes
+        return bool(self.weekend_mask & (1 << target_date.weekday()))
 
     # ============================================================
     # 🛡️ SAFE __str__
@@ -835,3 +843,62 @@ class CompanyHoliday(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.start_date} → {self.end_date})"
+
+
+# ============================================================
+# 🔁 Holiday Calendar Invalidation
+# ============================================================
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender=CompanyHoliday)
+@receiver(post_delete, sender=CompanyHoliday)
+def invalidate_holiday_calendar(sender, instance, **kwargs):
+    """
+    إسقاط تقويم الشركة المخزن (فورًا + بعد commit)
+    """
+    from attendance_center.services.holiday_calendar import (
+        invalidate_company_holiday_calendar,
+    )
+
+    company_id = instance.company_id
+    invalidate_company_holiday_calendar(company_id)
+    transaction.on_commit(lambda: invalidate_company_holiday_calendar(company_id))
+
+
+# ============================================================
+# 🔁 Schedule / Policy Resolution Invalidation
+# ============================================================
+@receiver(post_save, sender=WorkSchedule)
+@receiver(post_delete, sender=WorkSchedule)
+@receiver(post_save, sender=AttendancePolicy)
+@receiver(post_delete, sender=AttendancePolicy)
+@receiver(post_save, sender=AttendanceSetting)
+@receiver(post_delete, sender=AttendanceSetting)
+@receiver(post_save, sender=EmployeeAttendancePolicy)
+@receiver(post_delete, sender=EmployeeAttendancePolicy)
+def invalidate_attendance_resolution(sender, instance, **kwargs):
+    """
+    رفع Version الشركة (فورًا + بعد commit)
+    """
+    from attendance_center.services.resolution_cache import (
+        invalidate_company_resolution,
+    )
+
+    if sender is EmployeeAttendancePolicy:
+        company_id = (
+            Employee.objects
+            .filter(id=instance.employee_id)
+            .values_list("company_id", flat=True)
+            .first()
+        )
+    else:
+        company_id = instance.company_id
+
+    if not company_id:
+        return
+
+    invalidate_company_resolution(company_id)
+    transaction.on_commit(lambda: invalidate_company_resolution(company_id))
@@ -12,6 +12,8 @@ from django.conf import settings
 from .models import AttendanceSetting, AttendanceRecord
 from company_manager.models import Company, CompanyUser
 from notification_center.services import create_notification, broadcast_notification
+from primey_hrm.db_connections import with_db_connection
+from primey_hrm.distributed_lock import single_instance_job
 
 
 # ================================================================
@@ -102,6 +104,8 @@ def sync_company_attendance(company, settings_obj):
 # ================================================================
 # 🔒 SAFE JOB WRAPPER — Per Company Isolation
 # ================================================================
+@with_db_connection
+@single_instance_job("scheduler:attendance:auto_sync", 60 * 50)
 def auto_sync_job_runner():
     """
     🔒 Wrapper آمن:
@@ -11,16 +11,18 @@
 
 import logging
 from apscheduler.schedulers.background import BackgroundScheduler
-from django_apscheduler.jobstores import DjangoJobStore
 from django.conf import settings
 from django.utils import timezone
-from django.core.cache import cache
+
+from primey_hrm.db_connections import with_db_connection
+from primey_hrm.distributed_lock import DistributedLock, single_instance_job
 
 from biotime_center.sync_service import sync_logs
 from attendance_center.services.sync_biotime_to_attendance import (
     sync_biotime_logs_to_attendance
 )
 from biotime_center.models import BiotimeSyncLog
+from biotime_center.services.org_sync_worker import run_org_sync
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +35,16 @@ scheduler = BackgroundScheduler(timezone=settings.TIME_ZONE)
 # 🔒 Runtime Locks
 # ================================================================
 JOB_LOCK_KEY = "scheduler:biotime_attendance:running"
-JOB_LOCK_TTL = 60 * 30   # 30 minutes safety lock
+JOB_LOCK_TTL = 60 * 30   # 30 minutes safety lock (renewed per company)
+
+ORG_SYNC_LOCK_KEY = "scheduler:biotime_org_sync:running"
+ORG_SYNC_LOCK_TTL = 60 * 10
 
 
 # ================================================================
 # 🧩 Core Job
 # ================================================================
+@with_db_connection
 def run_biotime_attendance_pipeline():
     """
     🔄 Main pipeline (Multi-Tenant Safe):
@@ -50,13 +56,14 @@ def run_biotime_attendance_pipeline():
     """
 
     # ------------------------------------------------------------
-    # 🔒 Prevent double execution
+    # 🔒 Prevent double execution (across all workers)
     # ------------------------------------------------------------
-    if cache.get(JOB_LOCK_KEY):
+    lock = DistributedLock(JOB_LOCK_KEY, JOB_LOCK_TTL)
+
+    if not lock.acquire():
         logger.warning("⏳ Biotime Attendance Job already running — skipped.")
         return
 
-    cache.set(JOB_LOCK_KEY, True, JOB_LOCK_TTL)
     start_time = timezone.now()
 
     try:
@@ -78,6 +85,9 @@ def run_biotime_attendance_pipeline():
         # --------------------------------------------------------
         for company in companies:
 
+            # ⏱️ تمديد القفل لكل شركة (المهمة قد تتجاوز الـ TTL)
+            lock.renew()
+
             logger.info(
                 "🏢 Processing company ID=%s | %s",
                 company.id,
@@ -145,7 +155,19 @@ def run_biotime_attendance_pipeline():
         logger.exception("❌ Biotime Attendance Pipeline failed")
 
     finally:
-        cache.delete(JOB_LOCK_KEY)
+        lock.release()
+
+
+# ================================================================
+# 🏢 Org Structure Sync Job (Deferred Markers → Biotime)
+# ================================================================
+@with_db_connection
+@single_instance_job(ORG_SYNC_LOCK_KEY, ORG_SYNC_LOCK_TTL)
+def run_biotime_org_sync_job():
+    try:
+        run_org_sync()
+    except Exception:
+        logger.exception("❌ Biotime Org Sync Job failed")
 
 
 # ================================================================
@@ -164,14 +186,12 @@ def start_biotime_attendance_scheduler():
         existing_job = scheduler.get_job("biotime_attendance_job")
         if existing_job:
             logger.info("⚠️ Biotime Attendance job already registered.")
-            return
+            return scheduler
 
     logger.info("🔥 Initializing Biotime Attendance Scheduler…")
 
     try:
-        if not scheduler.running:
-            scheduler.add_jobstore(DjangoJobStore(), "default")
-
+        # MemoryJobStore (الافتراضي): جدول DjangoJobStore خاص بالفوترة
         scheduler.add_job(
             run_biotime_attendance_pipeline,
             trigger="interval",
@@ -182,6 +202,16 @@ def start_biotime_attendance_scheduler():
             coalesce=True,
         )
 
+        scheduler.add_job(
+            run_biotime_org_sync_job,
+            trigger="interval",
+            minutes=1,
+            id="biotime_org_sync_job",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+
         if not scheduler.running:
             scheduler.start()
 
@@ -189,3 +219,6 @@ def start_biotime_attendance_scheduler():
 
     except Exception:
         logger.exception("❌ Failed to start Biotime Attendance Scheduler")
+        return None
+
+    return scheduler
@@ -6,7 +6,9 @@
 from django.db import transaction
 
 from attendance_center.models import AttendanceRecord
-from attendance_center.services.holiday_resolver import HolidayResolver
+from attendance_center.services.holiday_calendar import get_company_holiday_calendar
+
+BACKFILL_CHUNK_SIZE = 1000
 
 
 class HolidayBackfillEngine:
@@ -34,41 +36,49 @@ class HolidayBackfillEngine:
         if end_date:
             qs = qs.filter(date__lte=end_date)
 
-        updated = 0
+        calendar = get_company_holiday_calendar(company)
+
+        # 📅 تقويم فارغ → لا شيء للتحديث (بدون قراءة السجلات)
+        if not calendar:
+            total = qs.count()
+            return {
+                "updated": 0,
+                "skipped": total,
+                "total": total,
+                "dry_run": dry_run,
+            }
+
+        # بدون بصمة → holiday (نفس حارس AttendanceRecord.save)
+        # مع بصمة → HOLIDAY (Holiday Overtime)
+        no_punch_ids = []
+        punched_ids = []
         skipped = 0
 
-        for record in qs.select_related("employee"):
-            if not HolidayResolver.is_holiday(record.date, company):
+        rows = qs.values_list("id", "date", "status", "check_in", "check_out")
+
+        for record_id, record_date, status, check_in, check_out in rows.iterator(
+            chunk_size=BACKFILL_CHUNK_SIZE
+        ):
+            if record_date not in calendar:
                 skipped += 1
                 continue
 
             # Idempotent guard
-            if record.status == "HOLIDAY":
+            if status in ("HOLIDAY", "holiday"):
                 skipped += 1
                 continue
 
-            if dry_run:
-                updated += 1
-                continue
+            if not check_in and not check_out:
+                no_punch_ids.append(record_id)
+            else:
+                punched_ids.append(record_id)
 
+        updated = len(no_punch_ids) + len(punched_ids)
+
+        if not dry_run and updated:
             with transaction.atomic():
-                record.status = "HOLIDAY"
-                record.reason_code = "company_holiday"
-                record.late_minutes = 0
-                record.early_minutes = 0
-                record.overtime_minutes = 0
-                record.actual_hours = 0
-                record.official_hours = 0
-                record.save(update_fields=[
-                    "status",
-                    "reason_code",
-                    "late_minutes",
-                    "early_minutes",
-                    "overtime_minutes",
-                    "actual_hours",
-                    "official_hours",
-                ])
-                updated += 1
+                cls._bulk_mark(no_punch_ids, status="holiday", is_leave=False)
+                cls._bulk_mark(punched_ids, status="HOLIDAY")
 
         return {
             "updated": updated,
@@ -76,3 +86,23 @@ class HolidayBackfillEngine:
             "total": updated + skipped,
             "dry_run": dry_run,
         }
+
+    @staticmethod
+    def _bulk_mark(record_ids, status, **fields):
+        """
+        UPDATE واحد لكل دفعة (بدون save / engine لكل سجل)
+        fields: حقول إضافية (مثل is_leave=False لسجلات holiday بدون بصمة)
+        """
+        for start in range(0, len(record_ids), BACKFILL_CHUNK_SIZE):
+            AttendanceRecord.objects.filter(
+                id__in=record_ids[start:start + BACKFILL_CHUNK_SIZE],
+            ).update(
+                status=status,
+                reason_code="company_holiday",
+                late_minutes=0,
+                early_minutes=0,
+                overtime_minutes=0,
+                actual_hours=0,
+                official_hours=0,
+                **fields,
+            )
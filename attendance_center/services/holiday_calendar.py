@@ -0,0 +1,102 @@
+# ============================================================
+# 📅 Company Holiday Calendar — Phase H.10
+# In-Process Date Index for HolidayResolver
+# ============================================================
+# ✔ قراءة واحدة لكل شركة (كل الإجازات النشطة)
+# ✔ dict: date → CompanyHoliday (O(1) lookup)
+# ✔ Cache داخل العملية + TTL (للتغييرات من عمليات أخرى)
+# ✔ Invalidate عند save / delete لـ CompanyHoliday
+# ============================================================
+
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+
+
+_CALENDAR_CACHE: Dict[int, tuple] = {}
+_CALENDAR_LOCK = threading.Lock()
+
+
+def _calendar_ttl_seconds() -> int:
+    return int(getattr(settings, "HOLIDAY_CALENDAR_TTL_SECONDS", 300) or 0)
+
+
+class CompanyHolidayCalendar:
+    """
+    🧠 فهرس تواريخ الإجازات الرسمية لشركة واحدة
+
+    - يبنى مرة واحدة من CompanyHoliday
+    - عند تداخل إجازتين يفوز الأقدم start_date
+      (نفس ترتيب HolidayResolver السابق)
+    """
+
+    def __init__(self, company_id: int, holidays):
+        self.company_id = company_id
+        self._days: Dict[date, object] = {}
+
+        for holiday in holidays:
+            current = holiday.start_date
+            while current <= holiday.end_date:
+                self._days.setdefault(current, holiday)
+                current += timedelta(days=1)
+
+    @classmethod
+    def build(cls, company_id: int) -> "CompanyHolidayCalendar":
+        from attendance_center.models import CompanyHoliday
+
+        holidays = (
+            CompanyHoliday.objects
+            .filter(company_id=company_id, is_active=True)
+            .select_related("holiday_type")
+            .order_by("start_date", "id")
+        )
+        return cls(company_id, holidays)
+
+    def get(self, target_date: date):
+        return self._days.get(target_date)
+
+    def __contains__(self, target_date: date) -> bool:
+        return target_date in self._days
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+
+# ============================================================
+# 🗂️ Cache Access
+# ============================================================
+def get_company_holiday_calendar(company) -> Optional[CompanyHolidayCalendar]:
+    company_id = getattr(company, "id", company)
+    if not company_id:
+        return None
+
+    now = time.monotonic()
+
+    with _CALENDAR_LOCK:
+        entry = _CALENDAR_CACHE.get(company_id)
+        if entry and entry[1] > now:
+            return entry[0]
+
+    calendar = CompanyHolidayCalendar.build(company_id)
+
+    ttl = _calendar_ttl_seconds()
+    if ttl > 0:
+        with _CALENDAR_LOCK:
+            _CALENDAR_CACHE[company_id] = (calendar, now + ttl)
+
+    return calendar
+
+
+def invalidate_company_holiday_calendar(company_id=None):
+    """
+    إزالة تقويم شركة واحدة (أو الكل عند None).
+    """
+
+    with _CALENDAR_LOCK:
+        if company_id is None:
+            _CALENDAR_CACHE.clear()
+        else:
+            _CALENDAR_CACHE.pop(company_id, None)
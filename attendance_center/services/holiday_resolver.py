@@ -7,6 +7,7 @@ from datetime import date
 from typing import Optional
 
 from attendance_center.models import CompanyHoliday
+from attendance_center.services.holiday_calendar import get_company_holiday_calendar
 from company_manager.models import Company
 
 
@@ -40,17 +41,9 @@ class HolidayResolver:
             return None
 
         try:
-            return (
-                CompanyHoliday.objects
-                .filter(
-                    company=company,
-                    is_active=True,
-                    start_date__lte=target_date,
-                    end_date__gte=target_date,
-                )
-                .order_by("start_date")
-                .first()
-            )
+            # 📅 O(1) lookup من تقويم الشركة (يبنى مرة واحدة ويُخزن)
+            calendar = get_company_holiday_calendar(company)
+            return calendar.get(target_date) if calendar else None
         except Exception:
             # 🛡️ Silent fail (no side effects)
             return None
@@ -0,0 +1,181 @@
+# ================================================================
+# 📘 LeaveAttendanceProjector — Set-Based Leave ↔ Attendance
+# ================================================================
+# ✔ قفل نطاق (employee, start→end) باستعلام واحد
+# ✔ bulk_create لأيام الإجازة غير الموجودة
+# ✔ UPDATE واحد للسجلات المؤهلة (إجازة سابقة / unknown)
+# ✔ لا نلمس أي حضور فعلي
+# ✔ الإجازة الرسمية للشركة تبقى holiday (نفس حارس save)
+# ✔ Rollback: DELETE واحد + UPDATE واحد لسجلات Biotime
+# ================================================================
+# ⚠ bulk_create / update لا تمر على AttendanceRecord.save
+#   → حارس الإجازة الرسمية مطبق هنا عبر CompanyHolidayCalendar
+# ================================================================
+
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+
+from attendance_center.models import AttendanceRecord
+from attendance_center.services.holiday_calendar import get_company_holiday_calendar
+
+
+logger = logging.getLogger(__name__)
+
+# سجلات يمكن تحويلها لإجازة (غير ذلك = حضور فعلي)
+OVERRIDABLE_STATUSES = ("leave", "unknown")
+
+ZEROED_FIELDS = {
+    "official_hours": 0,
+    "actual_hours": 0,
+    "late_minutes": 0,
+    "early_minutes": 0,
+    "overtime_minutes": 0,
+}
+
+LEAVE_FIELDS = {
+    "status": "leave",
+    "reason_code": "leave",
+    "is_leave": True,
+    **ZEROED_FIELDS,
+}
+
+HOLIDAY_FIELDS = {
+    "status": "holiday",
+    "reason_code": "company_holiday",
+    "is_leave": False,
+    **ZEROED_FIELDS,
+}
+
+
+class LeaveAttendanceProjector:
+
+    def __init__(self, leave_request):
+        self.leave = leave_request
+        self.employee_id = leave_request.employee_id
+        self.company_id = leave_request.company_id
+        self.start_date = leave_request.start_date
+        self.end_date = leave_request.end_date
+
+    # ------------------------------------------------------------
+    # 🟩 Helpers
+    # ------------------------------------------------------------
+    def _days(self):
+        current = self.start_date
+        while current <= self.end_date:
+            yield current
+            current += timedelta(days=1)
+
+    def _range_qs(self):
+        return AttendanceRecord.objects.filter(
+            employee_id=self.employee_id,
+            date__gte=self.start_date,
+            date__lte=self.end_date,
+        )
+
+    # ------------------------------------------------------------
+    # 🟦 1) Apply Leave → Attendance
+    # ------------------------------------------------------------
+    @transaction.atomic
+    def apply(self):
+        """
+        يرجع عدد السجلات المنشأة.
+        """
+
+        if not self.start_date or not self.end_date or self.start_date > self.end_date:
+            return 0
+
+        existing = {
+            row[0]: row
+            for row in (
+                self._range_qs()
+                .select_for_update()
+                .values_list("date", "id", "is_leave", "status", "check_in", "check_out")
+            )
+        }
+
+        holidays = get_company_holiday_calendar(self.company_id) or ()
+
+        new_records = []
+        leave_ids = []
+        holiday_ids = []
+
+        for day in self._days():
+            row = existing.get(day)
+
+            # 🟢 لا يوجد سجل → أنشئ سجل إجازة
+            if row is None:
+                fields = HOLIDAY_FIELDS if day in holidays else LEAVE_FIELDS
+                new_records.append(
+                    AttendanceRecord(
+                        employee_id=self.employee_id,
+                        date=day,
+                        synced_from_biotime=False,
+                        **fields,
+                    )
+                )
+                continue
+
+            _, record_id, is_leave, status, check_in, check_out = row
+
+            # 🚫 لا نلمس أي حضور فعلي
+            if not is_leave and status not in OVERRIDABLE_STATUSES:
+                continue
+
+            if day in holidays and not check_in and not check_out:
+                holiday_ids.append(record_id)
+            else:
+                leave_ids.append(record_id)
+
+        if new_records:
+            # 🛡️ ignore_conflicts: سباق تزامن نادر مع Biotime
+            AttendanceRecord.objects.bulk_create(new_records, ignore_conflicts=True)
+
+        if leave_ids:
+            AttendanceRecord.objects.filter(id__in=leave_ids).update(**LEAVE_FIELDS)
+
+        if holiday_ids:
+            AttendanceRecord.objects.filter(id__in=holiday_ids).update(**HOLIDAY_FIELDS)
+
+        logger.info(
+            "[Leave→Attendance] Leave #%s projected | created=%s updated=%s holidays=%s",
+            self.leave.id,
+            len(new_records),
+            len(leave_ids),
+            len(holiday_ids),
+        )
+
+        return len(new_records)
+
+    # ------------------------------------------------------------
+    # 🟥 2) Rollback Leave → Attendance
+    # ------------------------------------------------------------
+    @transaction.atomic
+    def rollback(self):
+        """
+        - سجلات الإجازة المنشأة → حذف
+        - سجلات Biotime → لا تحذف أبدًا، تعود unknown لإعادة التصنيف
+        يرجع عدد السجلات المحذوفة.
+        """
+
+        leave_qs = self._range_qs().filter(is_leave=True)
+
+        restored = leave_qs.filter(synced_from_biotime=True).update(
+            status="unknown",
+            reason_code=None,
+            is_leave=False,
+            is_finalized=False,
+            finalized_at=None,
+        )
+
+        removed, _ = leave_qs.filter(synced_from_biotime=False).delete()
+
+        logger.info(
+            "[Leave→Attendance] Leave #%s rollback | deleted=%s restored=%s",
+            self.leave.id,
+            removed,
+            restored,
+        )
+
+        return removed
@@ -0,0 +1,102 @@
+# ================================================================
+# 🖨️ Attendance Report Exports — Bytes Renderers (ReportJob)
+# ================================================================
+# ✔ تُستدعى من reports_center في الخلفية (وليس داخل الطلب)
+# ✔ قراءة values_list + iterator → ذاكرة ثابتة مع التقارير الكبيرة
+# ================================================================
+
+import io
+
+import openpyxl
+from django.db.models import Count
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+
+from attendance_center.models import AttendancePolicy, AttendanceRecord
+from reports_center.pdf_fonts import ensure_pdf_font
+
+
+def _fmt_time(value):
+    return value.strftime("%H:%M") if value else "—"
+
+
+# ================================================================
+# 🧾 Attendance Range PDF (Monthly / Range)
+# ================================================================
+def render_attendance_range_pdf(company, start, end):
+    rows = (
+        AttendanceRecord.objects
+        .filter(employee__company=company, date__range=(start, end))
+        .order_by("date", "employee__full_name")
+        .values_list(
+            "date",
+            "employee__full_name",
+            "status",
+            "check_in",
+            "check_out",
+            "late_minutes",
+        )
+    )
+
+    font = ensure_pdf_font()
+
+    buffer = io.BytesIO()
+    width, height = landscape(A4)
+    pdf = canvas.Canvas(buffer, pagesize=(width, height))
+
+    columns = (40, 130, 420, 520, 600, 680)
+    headers = ("التاريخ", "الموظف", "الحالة", "دخول", "خروج", "تأخير (د)")
+
+    def _header(y):
+        pdf.setFont(font, 14)
+        pdf.drawString(40, y, f"{company.name} — {start} → {end}")
+        y -= 30
+        pdf.setFont(font, 10)
+        for x, title in zip(columns, headers):
+            pdf.drawString(x, y, title)
+        return y - 20
+
+    y = _header(height - 40)
+
+    for day, name, status, check_in, check_out, late in rows.iterator(chunk_size=2000):
+        pdf.drawString(columns[0], y, str(day))
+        pdf.drawString(columns[1], y, (name or "—")[:45])
+        pdf.drawString(columns[2], y, status or "—")
+        pdf.drawString(columns[3], y, _fmt_time(check_in))
+        pdf.drawString(columns[4], y, _fmt_time(check_out))
+        pdf.drawString(columns[5], y, str(late or 0))
+        y -= 16
+
+        if y < 40:
+            pdf.showPage()
+            y = _header(height - 40)
+
+    pdf.save()
+    return buffer.getvalue()
+
+
+# ================================================================
+# 📊 Attendance Policies XLSX
+# ================================================================
+def render_attendance_policies_xlsx(company):
+    policies = (
+        AttendancePolicy.objects
+        .filter(company=company)
+        .annotate(employees_count=Count("employeeattendancepolicy"))
+        .values_list("work_start", "work_end", "weekend_days", "employees_count")
+    )
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Policies")
+    ws.append(["اسم السياسة", "أيام العمل", "عدد الموظفين"])
+
+    for work_start, work_end, weekend_days, employees_count in policies:
+        ws.append([
+            f"سياسة الدوام من {work_start} إلى {work_end}",
+            (weekend_days or "").replace(",", " - "),
+            employees_count,
+        ])
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,177 @@
+# ============================================================
+# 🧠 Attendance Resolution Cache — Phase A.6
+# Versioned Per-Company Schedules & Effective Policies
+# ============================================================
+# ✔ schedule_id → WorkSchedule (قراءة واحدة لكل شركة)
+# ✔ employee_id → EmployeeAttendancePolicy override (قراءة واحدة)
+# ✔ AttendancePolicy / AttendanceSetting للشركة (قراءة واحدة لكل منهما)
+# ✔ Version لكل شركة في Django cache (Invalidate عبر العمليات)
+# ✔ Invalidate فوري محليًا عبر Signals
+# ⚠️ محتوى الـ Bundle مشترك بين كل الخيوط → للقراءة فقط داخليًا؛
+#   ما يخرج للمستدعين (WorkSchedule / EffectivePolicy) نسخة مستقلة
+# ============================================================
+
+import copy
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+VERSION_CACHE_KEY = "attendance:resolution:version:{company_id}"
+
+_BUNDLES = {}
+_BUNDLES_LOCK = threading.Lock()
+
+
+def _version_check_seconds() -> float:
+    return float(getattr(settings, "ATTENDANCE_RESOLUTION_CHECK_SECONDS", 5) or 0)
+
+
+def _read_version(company_id):
+    try:
+        return cache.get(VERSION_CACHE_KEY.format(company_id=company_id))
+    except Exception:
+        return None
+
+
+class CompanyResolutionBundle:
+    """
+    📦 كل ما يحتاجه WorkScheduleResolver / PolicyService لشركة واحدة.
+    الأقسام تُحمّل عند أول طلب فقط (Lazy).
+    """
+
+    _MISSING = object()
+
+    def __init__(self, company_id, version):
+        self.company_id = company_id
+        self.version = version
+        self.checked_at = time.monotonic()
+
+        self._schedules = None
+        self._overrides = None
+        self._company_policy = self._MISSING
+        self._attendance_setting = self._MISSING
+        self._effective = {}
+
+    # --------------------------------------------------------
+    # 🕒 Schedules
+    # --------------------------------------------------------
+    @property
+    def schedules(self):
+        if self._schedules is None:
+            from attendance_center.models import WorkSchedule
+
+            self._schedules = {
+                schedule.id: schedule
+                for schedule in WorkSchedule.objects.filter(
+                    company_id=self.company_id,
+                    is_active=True,
+                )
+            }
+        return self._schedules
+
+    def get_schedule(self, schedule_id):
+        """
+        نسخة من الجدول المخزن (تعديلها لا يفسد الـ cache للعملية كلها).
+        """
+        schedule = self.schedules.get(schedule_id)
+        return copy.copy(schedule) if schedule is not None else None
+
+    # --------------------------------------------------------
+    # 📘 Policies
+    # --------------------------------------------------------
+    @property
+    def overrides(self):
+        if self._overrides is None:
+            from attendance_center.models import EmployeeAttendancePolicy
+
+            self._overrides = {
+                override.employee_id: override
+                for override in (
+                    EmployeeAttendancePolicy.objects
+                    .filter(employee__company_id=self.company_id)
+                    .select_related("company_policy")
+                )
+            }
+        return self._overrides
+
+    @property
+    def company_policy(self):
+        if self._company_policy is self._MISSING:
+            from attendance_center.models import AttendancePolicy
+
+            self._company_policy = (
+                AttendancePolicy.objects.filter(company_id=self.company_id).first()
+            )
+        return self._company_policy
+
+    @property
+    def attendance_setting(self):
+        if self._attendance_setting is self._MISSING:
+            from attendance_center.models import AttendanceSetting
+
+            self._attendance_setting = (
+                AttendanceSetting.objects.filter(company_id=self.company_id).first()
+            )
+        return self._attendance_setting
+
+    def get_effective_policy(self, employee_id, builder):
+        """
+        builder(bundle, employee_id) → EffectivePolicy
+        (يُحسب مرة واحدة لكل موظف — ويرجع نسخة للمستدعي)
+        """
+        policy = self._effective.get(employee_id)
+        if policy is None:
+            policy = builder(self, employee_id)
+            self._effective[employee_id] = policy
+        return copy.deepcopy(policy)
+
+
+# ============================================================
+# 🗂️ Access
+# ============================================================
+def get_company_bundle(company_id) -> CompanyResolutionBundle:
+    now = time.monotonic()
+
+    with _BUNDLES_LOCK:
+        bundle = _BUNDLES.get(company_id)
+
+    if bundle is not None and now - bundle.checked_at < _version_check_seconds():
+        return bundle
+
+    version = _read_version(company_id)
+
+    if bundle is not None and bundle.version == version:
+        bundle.checked_at = now
+        return bundle
+
+    bundle = CompanyResolutionBundle(company_id, version)
+
+    with _BUNDLES_LOCK:
+        _BUNDLES[company_id] = bundle
+
+    return bundle
+
+
+def invalidate_company_resolution(company_id=None):
+    """
+    إسقاط الـ Bundle محليًا + رفع الـ Version لباقي العمليات.
+    """
+
+    with _BUNDLES_LOCK:
+        if company_id is None:
+            _BUNDLES.clear()
+            return
+        _BUNDLES.pop(company_id, None)
+
+    try:
+        cache.set(
+            VERSION_CACHE_KEY.format(company_id=company_id),
+            uuid.uuid4().hex,
+            None,
+        )
+    except Exception:
+        pass
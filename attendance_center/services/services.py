@@ -6,12 +6,7 @@ from django.utils import timezone
 from django.db import models
 from datetime import time
 
-from attendance_center.models import (
-    AttendancePolicy,
-    EmployeeAttendancePolicy,
-    AttendanceSetting,
-)
-
+from attendance_center.services.resolution_cache import get_company_bundle
 from employee_center.models import Employee
 
 import logging
@@ -54,18 +49,23 @@ class PolicyService:
 
     @staticmethod
     def get_effective_policy(employee: Employee) -> EffectivePolicy:
+        """
+        ⚡ Cached: قراءة واحدة لكل مصدر لكل شركة (resolution_cache)
+        """
+
+        bundle = get_company_bundle(employee.company_id)
+        return bundle.get_effective_policy(
+            employee.id,
+            PolicyService._build_effective_policy,
+        )
 
-        company = employee.company
+    @staticmethod
+    def _build_effective_policy(bundle, employee_id) -> EffectivePolicy:
 
         # ------------------------------------------------------
         # 1) Employee Override Policy
         # ------------------------------------------------------
-        override = (
-            EmployeeAttendancePolicy.objects
-            .filter(employee=employee)
-            .select_related("company_policy")
-            .first()
-        )
+        override = bundle.overrides.get(employee_id)
 
         if override and override.company_policy:
             policy = override.company_policy
@@ -93,7 +93,7 @@ class PolicyService:
         # ------------------------------------------------------
         # 2) Company Policy
         # ------------------------------------------------------
-        policy = AttendancePolicy.objects.filter(company=company).first()
+        policy = bundle.company_policy
         if policy:
             return EffectivePolicy(
                 work_start=policy.work_start,
@@ -110,7 +110,7 @@ class PolicyService:
         # ------------------------------------------------------
         # 3) Attendance Settings Fallback
         # ------------------------------------------------------
-        settings = AttendanceSetting.objects.filter(company=company).first()
+        settings = bundle.attendance_setting
         if settings:
             return EffectivePolicy(
                 work_start=settings.work_start,
@@ -156,22 +156,17 @@ class WorkScheduleResolver:
         لا يوجد AttendanceSetting.
         """
 
-        from attendance_center.models import WorkSchedule
-
         if not employee.default_work_schedule_id:
             raise ValueError(
                 f"[WorkScheduleResolver] Employee {employee.id} "
                 f"does not have a default_work_schedule assigned."
             )
 
+        # ⚡ Cached schedule_id → WorkSchedule (نشطة + نفس الشركة فقط)
+        # نسخة مستقلة لكل مستدعي (المخزن لا يتأثر بأي تعديل)
         schedule = (
-            WorkSchedule.objects
-            .filter(
-                id=employee.default_work_schedule_id,
-                company=employee.company,
-                is_active=True
-            )
-            .first()
+            get_company_bundle(employee.company_id)
+            .get_schedule(employee.default_work_schedule_id)
         )
 
         if not schedule:
@@ -243,9 +238,8 @@ class KPIService:
 
         if late_records.exists():
             late_minutes = []
-            from attendance_center.services.policy_engine import PolicyService  # ✅ FIXED
-
-            for r in late_records:
+            # PolicyService المحلي (Cached لكل شركة)
+            for r in late_records.select_related("employee"):
                 policy = PolicyService.get_effective_policy(r.employee)
                 allowed = (
                     timezone.datetime.combine(r.date, policy.work_start)
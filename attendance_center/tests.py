@@ -1,3 +1,244 @@
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from attendance_center.models import AttendanceRecord, CompanyHoliday, WorkSchedule
+from attendance_center.services.biotime_attendance_scheduler import (
+    JOB_LOCK_KEY,
+    run_biotime_attendance_pipeline,
+)
+from attendance_center.services.holiday_backfill_engine import HolidayBackfillEngine
+from attendance_center.services.holiday_calendar import (
+    invalidate_company_holiday_calendar,
+)
+from attendance_center.services.holiday_resolver import HolidayResolver
+from attendance_center.services.leave_projection import LeaveAttendanceProjector
+from attendance_center.services.resolution_cache import invalidate_company_resolution
+from attendance_center.services.services import PolicyService, WorkScheduleResolver
+from company_manager.models import Company
+from employee_center.models import Employee
+from primey_hrm.distributed_lock import DistributedLock, single_instance_job
+
+
+class HolidayCalendarTests(TestCase):
+    def setUp(self):
+        invalidate_company_holiday_calendar()
+        self.company = Company.objects.create(name="Holiday Co", is_active=False)
+
+    def test_resolve_uses_single_calendar_read(self):
+        CompanyHoliday.objects.create(
+            company=self.company,
+            name="Eid",
+            start_date=date(2026, 3, 20),
+            end_date=date(2026, 3, 23),
+        )
+
+        with self.assertNumQueries(1):
+            self.assertTrue(HolidayResolver.is_holiday(date(2026, 3, 21), self.company))
+            self.assertTrue(HolidayResolver.is_holiday(date(2026, 3, 23), self.company))
+            self.assertFalse(HolidayResolver.is_holiday(date(2026, 3, 24), self.company))
+
+    def test_calendar_is_invalidated_on_save_and_delete(self):
+        self.assertFalse(HolidayResolver.is_holiday(date(2026, 9, 23), self.company))
+
+        holiday = CompanyHoliday.objects.create(
+            company=self.company,
+            name="National Day",
+            start_date=date(2026, 9, 23),
+            end_date=date(2026, 9, 23),
+        )
+        self.assertEqual(
+            HolidayResolver.get_holiday_name(date(2026, 9, 23), self.company),
+            "National Day",
+        )
+
+        holiday.delete()
+        self.assertFalse(HolidayResolver.is_holiday(date(2026, 9, 23), self.company))
+
+    def test_backfill_marks_unpunched_days_as_holiday_not_leave(self):
+        employee = Employee.objects.create(
+            company=self.company,
+            user=get_user_model().objects.create_user(username="holiday-emp"),
+            full_name="Holiday Employee",
+            national_id="1000000002",
+        )
+        record = AttendanceRecord.objects.bulk_create([
+            AttendanceRecord(employee=employee, date=date(2026, 9, 23), status="absent"),
+        ])[0]
+        CompanyHoliday.objects.create(
+            company=self.company,
+            name="National Day",
+            start_date=date(2026, 9, 23),
+            end_date=date(2026, 9, 23),
+        )
+
+        result = HolidayBackfillEngine.run(self.company)
+
+        record.refresh_from_db()
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(record.status, "holiday")
+        self.assertEqual(record.reason_code, "company_holiday")
+        self.assertFalse(record.is_leave)
+
+
+class ResolutionCacheTests(TestCase):
+    def setUp(self):
+        invalidate_company_resolution()
+        self.company = Company.objects.create(name="Schedule Co", is_active=False)
+        self.schedule = WorkSchedule.objects.create(
+            company=self.company,
+            name="Admin",
+            weekend_days="fri,sat",
+        )
+        self.employee = Employee.objects.create(
+            company=self.company,
+            user=get_user_model().objects.create_user(username="schedule-emp"),
+            full_name="Test Employee",
+            national_id="1000000001",
+            default_work_schedule=self.schedule,
+        )
+
+    def test_schedule_and_policy_are_resolved_once_per_company(self):
+        WorkScheduleResolver.resolve(self.employee)
+        PolicyService.get_effective_policy(self.employee)
+
+        with self.assertNumQueries(0):
+            schedule = WorkScheduleResolver.resolve(self.employee)
+            PolicyService.get_effective_policy(self.employee)
+            self.assertTrue(schedule.is_weekend(date(2026, 10, 16)))   # Friday
+            self.assertFalse(schedule.is_weekend(date(2026, 10, 18)))  # Sunday
+
+    def test_resolved_schedule_is_a_private_copy(self):
+        schedule = WorkScheduleResolver.resolve(self.employee)
+        schedule.weekend_days = "sun"
+
+        fresh = WorkScheduleResolver.resolve(self.employee)
+        self.assertIsNot(fresh, schedule)
+        self.assertEqual(fresh.weekend_days, "fri,sat")
+
+    def test_schedule_change_invalidates_cache(self):
+        WorkScheduleResolver.resolve(self.employee)
+
+        self.schedule.weekend_days = "sun"
+        self.schedule.save()
+
+        schedule = WorkScheduleResolver.resolve(self.employee)
+        self.assertTrue(schedule.is_weekend(date(2026, 10, 18)))
+        self.assertFalse(schedule.is_weekend(date(2026, 10, 16)))
+
+        self.schedule.is_active = False
+        self.schedule.save()
+
+        with self.assertRaises(ValueError):
+            WorkScheduleResolver.resolve(self.employee)
+
+
+class SchedulerLockTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_lock_is_exclusive_and_owner_scoped(self):
+        first = DistributedLock("scheduler:test", 60)
+        second = DistributedLock("scheduler:test", 60)
+
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        self.assertFalse(second.renew())
+        self.assertTrue(first.renew())
+
+        first.release()
+        self.assertTrue(second.acquire())
+        second.release()
+
+    def test_backend_outage_is_not_reported_as_contention(self):
+        job = single_instance_job("scheduler:outage", 60)(lambda: "ran")
+        lock = DistributedLock("scheduler:outage", 60)
+
+        with patch.object(lock.cache, "add", side_effect=ConnectionError("redis down")):
+            with self.assertLogs("primey_hrm.distributed_lock", level="ERROR") as logs:
+                self.assertFalse(lock.acquire())
+                self.assertIsNone(job())
+
+        self.assertTrue(lock.unavailable)
+        self.assertTrue(any("unavailable" in line for line in logs.output))
+        self.assertFalse(any("already running" in line for line in logs.output))
+
+    def test_pipeline_skips_while_another_worker_holds_lock(self):
+        holder = DistributedLock(JOB_LOCK_KEY, 60)
+        self.assertTrue(holder.acquire())
+
+        with patch(
+            "attendance_center.services.biotime_attendance_scheduler.sync_logs"
+        ) as sync_logs:
+            run_biotime_attendance_pipeline()
+
+        sync_logs.assert_not_called()
+        holder.release()
+
+
+class LeaveProjectionTests(TestCase):
+    def setUp(self):
+        invalidate_company_holiday_calendar()
+        self.company = Company.objects.create(name="Leave Co", is_active=False)
+        self.employee = Employee.objects.create(
+            company=self.company,
+            user=get_user_model().objects.create_user(username="leave-emp"),
+            full_name="Leave Employee",
+            national_id="1000000003",
+        )
+        self.leave = SimpleNamespace(
+            id=1,
+            employee_id=self.employee.id,
+            company_id=self.company.id,
+            start_date=date(2026, 5, 3),
+            end_date=date(2026, 5, 9),
+        )
+
+    def test_apply_projects_range_without_touching_real_attendance(self):
+        AttendanceRecord.objects.create(
+            employee=self.employee,
+            date=date(2026, 5, 4),
+            status="present",
+        )
+        AttendanceRecord.objects.create(
+            employee=self.employee,
+            date=date(2026, 5, 5),
+            status="unknown",
+        )
+        CompanyHoliday.objects.create(
+            company=self.company,
+            name="Holiday",
+            start_date=date(2026, 5, 9),
+            end_date=date(2026, 5, 9),
+        )
+
+        with self.assertNumQueries(6):
+            created = LeaveAttendanceProjector(self.leave).apply()
+
+        records = dict(
+            AttendanceRecord.objects
+            .filter(employee=self.employee)
+            .values_list("date", "status")
+        )
+        self.assertEqual(created, 5)
+        self.assertEqual(records[date(2026, 5, 4)], "present")
+        self.assertEqual(records[date(2026, 5, 5)], "leave")
+        self.assertEqual(records[date(2026, 5, 9)], "holiday")
+
+    def test_rollback_deletes_leave_rows_and_keeps_biotime_rows(self):
+        LeaveAttendanceProjector(self.leave).apply()
+        AttendanceRecord.objects.filter(date=date(2026, 5, 6)).update(
+            synced_from_biotime=True,
+        )
+
+        removed = LeaveAttendanceProjector(self.leave).rollback()
+
+        self.assertEqual(removed, 6)
+        self.assertEqual(
+            list(AttendanceRecord.objects.values_list("date", "status", "is_leave")),
+            [(date(2026, 5, 6), "unknown", False)],
+        )
@@ -43,8 +43,8 @@ from attendance_center.services.sync_biotime_to_attendance import AttendanceSync
 # ================================
 # 📌 Exports
 # ================================
+from reports_center.services import report_job_response, request_report
 import csv
-import openpyxl
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 
@@ -307,28 +307,13 @@ def attendance_policies_export_csv(request):
 
 @login_required
 def attendance_policies_export_excel(request):
-    company = request.user.company
-    qs = AttendancePolicy.objects.filter(company=company)
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Policies"
-
-    ws.append(["اسم السياسة", "أيام العمل", "عدد الموظفين"])
-
-    for p in qs:
-        count = EmployeeAttendancePolicy.objects.filter(company_policy=p).count()
-        days = p.weekend_days.replace(",", " - ")
-        name = f"سياسة الدوام من {p.work_start} إلى {p.work_end}"
-        ws.append([name, days, count])
-
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    # 📊 يُولّد في الخلفية (ReportJob) → الاستجابة فورية
+    job = request_report(
+        report_type="attendance_policies_xlsx",
+        requested_by=request.user,
+        company=request.user.company,
     )
-    response['Content-Disposition'] = 'attachment; filename="attendance_policies.xlsx"'
-
-    wb.save(response)
-    return response
+    return report_job_response(job)
 
 
 @login_required
@@ -391,27 +376,15 @@ from company_manager.models import Company
 def attendance_print_monthly(request, company_id):
     company = get_object_or_404(Company, id=company_id)
 
-    today = timezone.now()
-    month_start = today.replace(day=1)
-    month_end = today
-
-    records = AttendanceRecord.objects.filter(
-        employee__company=company,
-        timestamp__range=[month_start, month_end]
-    ).order_by("-timestamp")
+    today = timezone.localdate()
 
-    engine = AttendanceReportPrintEngine(
+    job = request_report(
+        report_type="attendance_range_pdf",
+        requested_by=request.user,
         company=company,
-        records=records,
-        mode="monthly"
+        params={"start": str(today.replace(day=1)), "end": str(today)},
     )
-
-    pdf_binary = engine.render_pdf()
-    filename = f"attendance_monthly_{company.name}_{today.strftime('%Y_%m')}.pdf"
-
-    response = HttpResponse(pdf_binary, content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+    return report_job_response(job)
 
 
 # ============================================================
@@ -427,26 +400,13 @@ def attendance_print_range(request, company_id):
     if not start or not end:
         return HttpResponse("❌ يجب تحديد تاريخ البداية والنهاية ?start=YYYY-MM-DD&end=YYYY-MM-DD")
 
-    records = AttendanceRecord.objects.filter(
-        employee__company=company,
-        timestamp__date__range=[start, end]
-    ).order_by("-timestamp")
-
-    period = {"start": start, "end": end}
-
-    engine = AttendanceReportPrintEngine(
+    job = request_report(
+        report_type="attendance_range_pdf",
+        requested_by=request.user,
         company=company,
-        records=records,
-        mode="range",
-        period=period
+        params={"start": start, "end": end},
     )
-
-    pdf_binary = engine.render_pdf()
-    filename = f"attendance_{company.name}_{start}_to_{end}.pdf"
-
-    response = HttpResponse(pdf_binary, content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+    return report_job_response(job)
 
 
 # ============================================================
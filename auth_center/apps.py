@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AuthCenterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth_center'
+
+    def ready(self):
+        import auth_center.signals  # noqa: F401
@@ -0,0 +1,196 @@
+# ============================================================
+# 👤 WhoAmI Bootstrap Cache — Versioned + ETag
+# Mham Cloud | Auth Center
+# ============================================================
+# ✔ payload جاهز (JSON bytes + ETag) لكل مستخدم + سياق الجلسة
+#   (session_key / الشركة النشطة / حالة الانتحال / اليوم)
+# ✔ الطلب المتكرر = get_many واحد:
+#   [payload, نسخة المستخدم, النسخة العامة]
+# ✔ الإبطال برفع النسخة (بعد commit):
+#   - نسخة المستخدم: الملف الشخصي / العضويات / الموظف / الجلسات / المجموعات
+#   - النسخة العامة: الشركات / الاشتراكات / الباقات (تغييرات نادرة)
+# ✔ If-None-Match مطابق → 304 بدون جسم
+# ============================================================
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BOOTSTRAP_KEY = "auth:bootstrap:{user_id}:{context}"
+USER_VERSION_KEY = "auth:bootstrap:version:user:{user_id}"
+GLOBAL_VERSION_KEY = "auth:bootstrap:version:global"
+
+# قيم الجلسة التي تغيّر الـ payload
+SESSION_CONTEXT_KEYS = (
+    "active_company_id",
+    "session_version",
+    "impersonation_active",
+    "impersonation_source_user_id",
+    "impersonation_source_username",
+    "impersonation_source_email",
+    "impersonation_company_id",
+    "impersonation_company_name",
+    "impersonation_company_user_id",
+    "impersonation_target_user_id",
+    "impersonation_target_username",
+    "impersonation_target_role",
+)
+
+
+def _ttl():
+    return int(getattr(settings, "WHOAMI_CACHE_TTL", 300) or 0)
+
+
+def _context_hash(request) -> str | None:
+    session_key = request.session.session_key
+    if not session_key:
+        return None
+
+    raw = json.dumps(
+        {
+            "session_key": session_key,
+            "session": {key: request.session.get(key) for key in SESSION_CONTEXT_KEYS},
+            # days_remaining يتغير يوميًا
+            "day": timezone.localdate().isoformat(),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+# ============================================================
+# 📖 Read
+# ============================================================
+def get_bootstrap(request):
+    """
+    يرجع (entry, state):
+    - entry: {"etag", "body"} إذا كان المخزن صالحًا، وإلا None
+    - state: يمرر لـ store_bootstrap (النسخ المقروءة قبل البناء)
+    """
+    context = _context_hash(request)
+    if context is None or not _ttl():
+        return None, None
+
+    user_id = request.user.id
+    payload_key = BOOTSTRAP_KEY.format(user_id=user_id, context=context)
+    user_version_key = USER_VERSION_KEY.format(user_id=user_id)
+
+    try:
+        values = cache.get_many([payload_key, user_version_key, GLOBAL_VERSION_KEY])
+    except Exception:
+        logger.debug("⚠️ Bootstrap cache read failed | user=%s", user_id)
+        return None, None
+
+    versions = (values.get(user_version_key), values.get(GLOBAL_VERSION_KEY))
+    state = {"key": payload_key, "user_id": user_id, "versions": versions}
+
+    entry = values.get(payload_key)
+    if None in versions or not entry or entry.get("versions") != list(versions):
+        return None, state
+
+    return entry, state
+
+
+# ============================================================
+# ✏️ Write
+# ============================================================
+def _ensure_version(key):
+    cache.add(key, time.time_ns(), None)
+    return cache.get(key)
+
+
+def build_entry(payload) -> dict:
+    body = json.dumps(payload, cls=DjangoJSONEncoder).encode("utf-8")
+    return {
+        "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        "body": body,
+    }
+
+
+def store_bootstrap(state, payload) -> dict:
+    """
+    يخزن الـ payload تحت النسخ المقروءة قبل البناء
+    (إبطال أثناء البناء → نسخة مختلفة → لن يُستخدم المخزن).
+    """
+    entry = build_entry(payload)
+    if not state:
+        return entry
+
+    user_version, global_version = state["versions"]
+
+    try:
+        if user_version is None:
+            user_version = _ensure_version(USER_VERSION_KEY.format(user_id=state["user_id"]))
+        if global_version is None:
+            global_version = _ensure_version(GLOBAL_VERSION_KEY)
+
+        cache.set(
+            state["key"],
+            {**entry, "versions": [user_version, global_version]},
+            _ttl(),
+        )
+    except Exception:
+        logger.debug("⚠️ Bootstrap cache write failed | user=%s", state["user_id"])
+
+    return entry
+
+
+# ============================================================
+# 🌐 Response (ETag / 304)
+# ============================================================
+def _etag_matches(request, etag) -> bool:
+    header = request.META.get("HTTP_IF_NONE_MATCH") or ""
+    candidates = {
+        value.strip().removeprefix("W/")
+        for value in header.split(",")
+        if value.strip()
+    }
+    return "*" in candidates or etag in candidates
+
+
+def bootstrap_response(request, entry):
+    if _etag_matches(request, entry["etag"]):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry["body"], content_type="application/json")
+
+    response["ETag"] = entry["etag"]
+    response["Cache-Control"] = "private, no-cache"
+    response["Vary"] = "Cookie"
+    return response
+
+
+# ============================================================
+# ♻️ Invalidation
+# ============================================================
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    except Exception:
+        logger.debug("⚠️ تعذر إبطال bootstrap cache | key=%s", key)
+
+
+def invalidate_user_bootstrap(user_id) -> None:
+    if not user_id:
+        return
+    transaction.on_commit(partial(_bump, USER_VERSION_KEY.format(user_id=user_id)))
+
+
+def invalidate_all_bootstrap() -> None:
+    transaction.on_commit(partial(_bump, GLOBAL_VERSION_KEY))
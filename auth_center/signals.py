@@ -0,0 +1,103 @@
+# ===============================================================
+# 📂 auth_center/signals.py
+# ♻️ WhoAmI Bootstrap Cache — Invalidation Signals
+# ===============================================================
+# ✔ كل ما يظهر في payload الـ whoami يرفع نسخة المستخدم
+# ✔ الشركات / الاشتراكات / الباقات → النسخة العامة
+# ✔ حفظ بـ update_fields لا يمس حقول الـ payload → لا شيء
+# ===============================================================
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from billing_center.models import CompanySubscription, SubscriptionPlan
+from company_manager.models import Company, CompanyUser
+from employee_center.models import Employee
+
+from .bootstrap_cache import invalidate_all_bootstrap, invalidate_user_bootstrap
+from .models import ActiveUserSession, UserProfile
+
+User = get_user_model()
+
+USER_PAYLOAD_FIELDS = {
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "is_superuser",
+    "last_login",
+}
+
+
+def _touches(update_fields, fields) -> bool:
+    return update_fields is None or bool(set(update_fields) & set(fields))
+
+
+# ===============================================================
+# 👤 Per-User
+# ===============================================================
+@receiver(post_save, sender=User)
+def bootstrap_user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or not _touches(update_fields, USER_PAYLOAD_FIELDS):
+        return
+    invalidate_user_bootstrap(instance.id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def bootstrap_user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        invalidate_user_bootstrap(instance.pk)
+        return
+
+    # group.user_set.add(...) → المستخدمون في pk_set
+    if action == "post_clear":
+        invalidate_all_bootstrap()
+        return
+
+    for user_id in pk_set or ():
+        invalidate_user_bootstrap(user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def bootstrap_profile_changed(sender, instance, **kwargs):
+    invalidate_user_bootstrap(instance.user_id)
+
+
+@receiver(post_save, sender=CompanyUser)
+@receiver(post_delete, sender=CompanyUser)
+def bootstrap_membership_changed(sender, instance, **kwargs):
+    invalidate_user_bootstrap(instance.user_id)
+
+
+@receiver(post_save, sender=Employee)
+def bootstrap_employee_saved(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, {"full_name", "user", "company"}):
+        invalidate_user_bootstrap(instance.user_id)
+
+
+@receiver(post_delete, sender=Employee)
+def bootstrap_employee_deleted(sender, instance, **kwargs):
+    invalidate_user_bootstrap(instance.user_id)
+
+
+@receiver(post_save, sender=ActiveUserSession)
+@receiver(post_delete, sender=ActiveUserSession)
+def bootstrap_session_changed(sender, instance, **kwargs):
+    invalidate_user_bootstrap(instance.user_id)
+
+
+# ===============================================================
+# 🌐 Global (Company / Subscription / Plan)
+# ===============================================================
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=CompanySubscription)
+@receiver(post_delete, sender=CompanySubscription)
+@receiver(post_save, sender=SubscriptionPlan)
+def bootstrap_tenant_changed(sender, instance, **kwargs):
+    invalidate_all_bootstrap()
@@ -1,3 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from auth_center.models import ActiveUserSession, UserProfile
+from company_manager.models import Company, CompanyUser
+
+
+# ============================================================
+# 👤 WhoAmI — Bootstrap Cache + ETag
+# ============================================================
+class WhoAmIBootstrapCacheTests(TestCase):
+    url = "/api/auth/whoami/"
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.user = get_user_model().objects.create_user(username="bootstrap-user", password="x")
+        self.company = Company.objects.create(name="Bootstrap Co", is_active=False)
+        CompanyUser.objects.create(company=self.company, user=self.user, role="HR")
+
+        self.client.force_login(self.user)
+        ActiveUserSession.objects.create(
+            user=self.user,
+            session_key=self.client.session.session_key,
+            session_version=1,
+            is_active=True,
+        )
+
+    def _get(self, **headers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(self.url, **headers)
+
+    def test_repeat_calls_skip_payload_queries_and_honor_etag(self):
+        first = self._get()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["role"], "hr")
+        self.assertEqual(first.json()["company_id"], self.company.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self._get()
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if "companyuser" in query["sql"] or "activeusersession" in query["sql"]
+        ])
+
+        not_modified = self._get(HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+
+    def test_profile_and_session_changes_invalidate(self):
+        first = self._get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfile.objects.create(user=self.user, phone_number="0500000000")
+
+        changed = self._get(HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["user"]["phone"], "0500000000")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ActiveUserSession.objects.filter(user=self.user).delete()
+
+        self.assertFalse(self._get().json()["authenticated"])
@@ -7,7 +7,7 @@ class BillingCenterConfig(AppConfig):
     💳 Billing Center — AppConfig
     Mham Cloud
     ============================================================
-    ✔ Initializes Auto Billing Scheduler (S3-D)
+    ✔ Auto Billing Scheduler يعمل فقط داخل run_workers (S3-D)
     ✔ Registers Billing Signals (Payment → Transaction)
     ✔ No DB Queries on import
     ✔ Safe for:
@@ -27,7 +27,6 @@ class BillingCenterConfig(AppConfig):
         🔌 App Initialization Hook
         ------------------------------------------------------------
         1) Register billing signals (SAFE, no side effects)
-        2) Start auto billing scheduler (guarded)
         ------------------------------------------------------------
         """
 
@@ -39,17 +38,3 @@ class BillingCenterConfig(AppConfig):
         except Exception:
             # لا نكسر تشغيل Django في أي ظرف
             pass
-
-        # ---------------------------------------------------------
-        # 2️⃣ Start Auto Billing Scheduler (GUARDED)
-        # ---------------------------------------------------------
-        try:
-            from billing_center.schedulers.auto_billing_scheduler import start
-            start()
-        except Exception:
-            # ❗ لا نكسر تشغيل Django في أي حالة:
-            # - أثناء migrations
-            # - أثناء shell
-            # - أثناء collectstatic
-            # - أثناء startup في بيئات معينة
-            pass
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("billing_center", "0009_replace_unique_active_subscription_constraint"),
+        ("company_manager", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompanyUsageCounter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("employees", models.PositiveIntegerField(default=0)),
+                ("branches", models.PositiveIntegerField(default=0)),
+                ("reconciled_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "company",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="usage_counter",
+                        to="company_manager.company",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Company Usage Counter",
+                "verbose_name_plural": "Company Usage Counters",
+            },
+        ),
+    ]
@@ -640,4 +640,33 @@ class AccountSubscription(models.Model):
         return self.status == "ACTIVE"
 
     def __str__(self):
-        return f"{self.owner} — {self.plan.name}"
\ No newline at end of file
+        return f"{self.owner} — {self.plan.name}"
+
+# =====================================================================
+# 📊 Company Usage Counter (Subscription Limits)
+# =====================================================================
+class CompanyUsageCounter(models.Model):
+    """
+    عدادات الاستخدام لكل شركة (موظفين / فروع) لفحص حدود الباقة بـ O(1).
+    - تُحدّث عبر Signals (Employee / CompanyBranch) داخل نفس الـ transaction
+    - تُصحح دوريًا من COUNT فعلي (reconcile)
+    """
+
+    company = models.OneToOneField(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="usage_counter",
+    )
+
+    employees = models.PositiveIntegerField(default=0)
+    branches = models.PositiveIntegerField(default=0)
+
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Company Usage Counter"
+        verbose_name_plural = "Company Usage Counters"
+
+    def __str__(self):
+        return f"{self.company} — employees={self.employees} branches={self.branches}"
@@ -18,12 +18,13 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from django.utils import timezone
 from django_apscheduler.jobstores import DjangoJobStore
-from django_apscheduler.models import DjangoJobExecution
+from django_apscheduler.models import DjangoJob, DjangoJobExecution
 from django_apscheduler.util import close_old_connections
 
 from billing_center.services.auto_invoice_generator import AutoInvoiceGenerator
 from billing_center.services.billing_cycle_engine import BillingCycleEngine
 from billing_center.services.subscription_state_updater import SubscriptionStateUpdater
+from primey_hrm.distributed_lock import single_instance_job
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,10 @@ logger = logging.getLogger(__name__)
 # ============================================================
 scheduler = BackgroundScheduler(timezone=timezone.get_current_timezone())
 
+# الـ Jobs الوحيدة في جدول DjangoJobStore
+# (أي صف آخر بقايا Schedulers قديمة وسيُنفَّذ هنا لو تُرك)
+JOB_IDS = ("daily_auto_billing",)
+
 
 # ============================================================
 # Helpers
@@ -53,6 +58,7 @@ def _cleanup_old_job_executions(max_age_seconds: int = 7 * 24 * 60 * 60) -> int:
 # Main Job
 # ============================================================
 @close_old_connections
+@single_instance_job("scheduler:billing:daily_auto_billing", 60 * 60)
 def run_daily_auto_billing():
     """
     ============================================================
@@ -116,13 +122,14 @@ def start():
     # Prevent duplicates
     if scheduler.running:
         logger.info("ℹ️ Auto Billing Scheduler يعمل بالفعل، تم تجاهل إعادة التشغيل.")
-        return
+        return scheduler
 
     try:
+        DjangoJob.objects.exclude(id__in=JOB_IDS).delete()
         scheduler.add_jobstore(DjangoJobStore(), "default")
     except Exception:
         logger.exception("❌ فشل إضافة DjangoJobStore إلى Auto Billing Scheduler.")
-        return
+        return None
 
     scheduler.add_job(
         run_daily_auto_billing,
@@ -133,4 +140,5 @@ def start():
     )
 
     scheduler.start()
-    logger.info("✅ تم تشغيل Auto Billing Scheduler بنجاح.")
\ No newline at end of file
+    logger.info("✅ تم تشغيل Auto Billing Scheduler بنجاح.")
+    return scheduler
\ No newline at end of file
@@ -0,0 +1,35 @@
+# ============================================================
+# ⏰ Usage Counters Reconcile (run_workers)
+# ============================================================
+
+import logging
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from django.conf import settings
+
+from billing_center.services.usage_counters import reconcile_usage_counters
+from primey_hrm.db_connections import with_db_connection
+from primey_hrm.distributed_lock import single_instance_job
+
+logger = logging.getLogger(__name__)
+
+
+@with_db_connection
+@single_instance_job("scheduler:billing:reconcile_usage_counters", 30 * 60)
+def reconcile_usage_counters_job():
+    result = reconcile_usage_counters()
+    logger.info("📊 Usage counters reconciled | %s", result)
+
+
+def start_scheduler():
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(
+        reconcile_usage_counters_job,
+        trigger="interval",
+        seconds=max(int(getattr(settings, "BILLING_USAGE_RECONCILE_SECONDS", 3600) or 3600), 60),
+        id="reconcile_usage_counters",
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.start()
+    return scheduler
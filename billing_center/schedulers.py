@@ -5,13 +5,26 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from django.core.management import call_command
 
+from primey_hrm.db_connections import with_db_connection
+from primey_hrm.distributed_lock import single_instance_job
+
+
+@with_db_connection
+@single_instance_job("scheduler:billing:renew_subscriptions", 60 * 60)
+def renew_subscriptions_job():
+    call_command("renew_subscriptions")
+
 
 def start():
     scheduler = BackgroundScheduler()
     scheduler.add_job(
-        lambda: call_command("renew_subscriptions"),
+        renew_subscriptions_job,
         trigger="cron",
         hour=1,
         minute=0,
+        id="renew_subscriptions_job",
+        max_instances=1,
+        coalesce=True,
     )
     scheduler.start()
+    return scheduler
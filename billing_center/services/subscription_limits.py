@@ -7,17 +7,30 @@
 # ✔ Unified limit access
 # ✔ Employee / Branch enforcement helpers
 # ✔ Safe fallbacks
-# ✔ Read-only helpers (no DB writes)
+# ✔ Active subscription cached (invalidated on subscription / plan save)
+# ✔ Usage from CompanyUsageCounter → O(1) + row lock inside transactions
 # ============================================================
 
 from __future__ import annotations
 
+import logging
+import time
 from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
 from billing_center.models import CompanySubscription
-from company_manager.models import CompanyBranch
-from employee_center.models import Employee
+from billing_center.services.usage_counters import (
+    USAGE_BRANCHES,
+    USAGE_EMPLOYEES,
+    get_usage,
+)
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================
@@ -29,6 +42,12 @@ PRODUCT_HR = "HR"
 LIMIT_EMPLOYEES = "max_employees"
 LIMIT_BRANCHES = "max_branches"
 
+ACTIVE_SUBSCRIPTION_KEY = "billing:active_sub:{company_id}:{version}:{product_code}"
+ACTIVE_SUBSCRIPTION_VERSION_KEY = "billing:active_sub:version:{company_id}"
+
+# قيمة مخزنة تعني: لا يوجد اشتراك نشط (تمييزًا عن غياب المفتاح)
+_NO_SUBSCRIPTION = "none"
+
 
 # ============================================================
 # 🧱 Data Objects
@@ -82,17 +101,41 @@ def get_product_code_for_branches() -> str:
 # 🔎 Subscription Resolution
 # ============================================================
 
-def get_active_product_subscription(company, product_code: str) -> CompanySubscription | None:
+def _active_subscription_ttl() -> int:
+    return int(getattr(settings, "BILLING_ACTIVE_SUBSCRIPTION_CACHE_TTL", 300) or 300)
+
+
+def _active_subscription_version(company_id: int) -> int:
+    key = ACTIVE_SUBSCRIPTION_VERSION_KEY.format(company_id=company_id)
+    version = cache.get(key)
+    if version is None:
+        # time_ns: لا تعود نسخة قديمة بعد ضياع المفتاح
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_active_subscription_version(company_id: int) -> None:
+    key = ACTIVE_SUBSCRIPTION_VERSION_KEY.format(company_id=company_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    except Exception:
+        logger.debug("⚠️ تعذر إبطال cache الاشتراك النشط | company=%s", company_id)
+
+
+def invalidate_active_subscription_cache(company_id: int | None) -> None:
     """
-    جلب الاشتراك النشط الخاص بمنتج معين للشركة.
+    إبطال الاشتراك النشط المخزن للشركة (كل المنتجات) بعد commit.
     """
+    if not company_id:
+        return
 
-    if not company or not getattr(company, "id", None):
-        return None
+    transaction.on_commit(partial(_bump_active_subscription_version, company_id))
 
-    if not product_code:
-        return None
 
+def _query_active_product_subscription(company, product_code: str) -> CompanySubscription | None:
     return (
         CompanySubscription.objects
         .select_related("product", "plan")
@@ -106,6 +149,40 @@ def get_active_product_subscription(company, product_code: str) -> CompanySubscr
     )
 
 
+def get_active_product_subscription(company, product_code: str) -> CompanySubscription | None:
+    """
+    جلب الاشتراك النشط الخاص بمنتج معين للشركة (من الـ cache أولًا).
+    """
+
+    if not company or not getattr(company, "id", None):
+        return None
+
+    if not product_code:
+        return None
+
+    try:
+        key = ACTIVE_SUBSCRIPTION_KEY.format(
+            company_id=company.id,
+            version=_active_subscription_version(company.id),
+            product_code=product_code,
+        )
+        cached = cache.get(key)
+    except Exception:
+        return _query_active_product_subscription(company, product_code)
+
+    if cached is not None:
+        return None if cached == _NO_SUBSCRIPTION else cached
+
+    subscription = _query_active_product_subscription(company, product_code)
+
+    try:
+        cache.set(key, subscription or _NO_SUBSCRIPTION, _active_subscription_ttl())
+    except Exception:
+        logger.debug("⚠️ تعذر تخزين الاشتراك النشط | company=%s", company.id)
+
+    return subscription
+
+
 # ============================================================
 # 📏 Limit Readers
 # ============================================================
@@ -143,25 +220,11 @@ def get_subscription_limit(subscription: CompanySubscription | None, limit_key:
 # ============================================================
 
 def get_employees_usage(company) -> int:
-    if not company or not getattr(company, "id", None):
-        return 0
-
-    return (
-        Employee.objects
-        .filter(company=company)
-        .count()
-    )
+    return get_usage(company, USAGE_EMPLOYEES)
 
 
 def get_branches_usage(company) -> int:
-    if not company or not getattr(company, "id", None):
-        return 0
-
-    return (
-        CompanyBranch.objects
-        .filter(company=company)
-        .count()
-    )
+    return get_usage(company, USAGE_BRANCHES)
 
 
 def get_usage_value(company, limit_key: str) -> int:
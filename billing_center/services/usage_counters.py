@@ -0,0 +1,180 @@
+# ============================================================
+# 📊 Company Usage Counters — O(1) Subscription Limits
+# Mham Cloud | Billing Center
+# ============================================================
+# ✔ صف واحد لكل شركة (employees / branches)
+# ✔ Signals: إنشاء/حذف Employee أو CompanyBranch → UPDATE ذري بـ F()
+#   داخل نفس الـ transaction (rollback يلغي التغيير تلقائيًا)
+# ✔ فحص الحد داخل transaction → select_for_update على صف العداد
+#   (الطلبات المتزامنة لنفس الشركة تُنفذ بالتسلسل → لا تجاوز للحد)
+# ✔ reconcile دوري: COUNT مجمّع واحد لكل جدول + تصحيح الانحراف فقط
+# ✔ bulk_create لا يطلق Signals → استدعِ adjust_usage يدويًا
+# ============================================================
+
+from __future__ import annotations
+
+import logging
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from billing_center.models import CompanyUsageCounter
+from company_manager.models import Company, CompanyBranch
+from employee_center.models import Employee
+
+logger = logging.getLogger(__name__)
+
+USAGE_EMPLOYEES = "employees"
+USAGE_BRANCHES = "branches"
+
+USAGE_SOURCES = {
+    USAGE_EMPLOYEES: Employee,
+    USAGE_BRANCHES: CompanyBranch,
+}
+
+
+def _live_counts(company_id: int) -> dict[str, int]:
+    return {
+        field: model.objects.filter(company_id=company_id).count()
+        for field, model in USAGE_SOURCES.items()
+    }
+
+
+# ============================================================
+# 📖 Read
+# ============================================================
+
+def get_usage_counter(company_id: int, *, for_update: bool = False) -> CompanyUsageCounter:
+    """
+    صف العداد (يُنشأ من COUNT فعلي عند أول استخدام).
+    for_update=True داخل transaction → قفل الصف حتى commit.
+    """
+    queryset = CompanyUsageCounter.objects
+    if for_update:
+        queryset = queryset.select_for_update()
+
+    counter = queryset.filter(company_id=company_id).first()
+    if counter is not None:
+        return counter
+
+    try:
+        with transaction.atomic():
+            counter = CompanyUsageCounter.objects.create(
+                company_id=company_id,
+                reconciled_at=timezone.now(),
+                **_live_counts(company_id),
+            )
+    except IntegrityError:
+        # طلب آخر أنشأ الصف في نفس اللحظة
+        counter = None
+
+    if counter is None or for_update:
+        counter = queryset.get(company_id=company_id)
+
+    return counter
+
+
+def get_usage(company, field: str) -> int:
+    """
+    الاستخدام الحالي بـ O(1).
+    داخل transaction.atomic يقفل صف العداد (فحص + إنشاء آمن مع التزامن).
+    """
+    company_id = getattr(company, "id", None) if company else None
+    if not company_id or field not in USAGE_SOURCES:
+        return 0
+
+    counter = get_usage_counter(company_id, for_update=connection.in_atomic_block)
+    return int(getattr(counter, field) or 0)
+
+
+# ============================================================
+# ✏️ Write (Signals / Bulk Paths)
+# ============================================================
+
+def adjust_usage(company_id: int | None, field: str, delta: int) -> None:
+    """
+    تعديل ذري للعداد. لا يُنشئ الصف (أول قراءة تحسبه من COUNT).
+    """
+    if not company_id or not delta or field not in USAGE_SOURCES:
+        return
+
+    queryset = CompanyUsageCounter.objects.filter(company_id=company_id)
+
+    # لا نسمح بالنزول تحت الصفر (PositiveIntegerField) — الانحراف يصححه reconcile
+    if delta < 0:
+        queryset = queryset.filter(**{f"{field}__gte": -delta})
+
+    queryset.update(**{field: F(field) + delta, "updated_at": timezone.now()})
+
+
+# ============================================================
+# 🔁 Reconcile (run_workers)
+# ============================================================
+
+def reconcile_usage_counters(company_ids=None) -> dict[str, int]:
+    """
+    مقارنة العدادات مع COUNT فعلي مجمّع وتصحيح المختلف فقط.
+    التصحيح مشروط بالقيمة المقروءة (لا يطغى على تحديث Signal متزامن).
+    """
+    companies = Company.objects.all()
+    if company_ids is not None:
+        companies = companies.filter(id__in=list(company_ids))
+    ids = list(companies.values_list("id", flat=True))
+
+    live = {
+        field: dict(
+            model.objects
+            .filter(company_id__in=ids)
+            .order_by()
+            .values("company_id")
+            .annotate(total=Count("id"))
+            .values_list("company_id", "total")
+        )
+        for field, model in USAGE_SOURCES.items()
+    }
+
+    now = timezone.now()
+    existing = {
+        counter.company_id: counter
+        for counter in CompanyUsageCounter.objects.filter(company_id__in=ids)
+    }
+
+    missing = [
+        CompanyUsageCounter(
+            company_id=company_id,
+            reconciled_at=now,
+            updated_at=now,
+            **{field: live[field].get(company_id, 0) for field in USAGE_SOURCES},
+        )
+        for company_id in ids
+        if company_id not in existing
+    ]
+    CompanyUsageCounter.objects.bulk_create(missing, ignore_conflicts=True)
+
+    corrected = 0
+    for company_id, counter in existing.items():
+        expected = {field: live[field].get(company_id, 0) for field in USAGE_SOURCES}
+        seen = {field: getattr(counter, field) for field in USAGE_SOURCES}
+        if expected == seen:
+            continue
+
+        corrected += CompanyUsageCounter.objects.filter(pk=counter.pk, **seen).update(
+            **expected,
+            reconciled_at=now,
+            updated_at=now,
+        )
+        logger.warning(
+            "⚠️ Usage counter drift corrected | company=%s | counter=%s | actual=%s",
+            company_id,
+            seen,
+            expected,
+        )
+
+    CompanyUsageCounter.objects.filter(company_id__in=ids).update(reconciled_at=now)
+
+    return {
+        "companies": len(ids),
+        "created": len(missing),
+        "corrected": corrected,
+    }
@@ -3,14 +3,23 @@
 # Mham Cloud
 # ======================================================
 
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from billing_center.models import (
     CompanySubscription,
     Payment,
     PaymentTransaction,
+    SubscriptionPlan,
 )
+from billing_center.services.subscription_limits import invalidate_active_subscription_cache
+from billing_center.services.usage_counters import (
+    USAGE_BRANCHES,
+    USAGE_EMPLOYEES,
+    adjust_usage,
+)
+from company_manager.models import CompanyBranch
+from employee_center.models import Employee
 
 # ======================================================
 # 📦 Subscription → Apps Snapshot
@@ -127,3 +136,57 @@ def create_payment_transaction_on_paid(
         created_by=None,
         description="Auto-created from Payment",
     )
+
+
+# ============================================================
+# 🧠 Active Subscription Cache — Invalidation
+# ============================================================
+
+@receiver(post_save, sender=CompanySubscription)
+@receiver(post_delete, sender=CompanySubscription)
+def invalidate_active_subscription_on_change(sender, instance: CompanySubscription, **kwargs):
+    invalidate_active_subscription_cache(instance.company_id)
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+def invalidate_active_subscriptions_on_plan_change(sender, instance: SubscriptionPlan, created, **kwargs):
+    """
+    تعديل حدود الباقة → إبطال الشركات المشتركة فيها فقط.
+    """
+    if created:
+        return
+
+    company_ids = (
+        CompanySubscription.objects
+        .filter(plan=instance)
+        .values_list("company_id", flat=True)
+        .distinct()
+    )
+    for company_id in company_ids:
+        invalidate_active_subscription_cache(company_id)
+
+
+# ============================================================
+# 📊 Usage Counters — Employees / Branches
+# ============================================================
+
+@receiver(post_save, sender=Employee)
+def increment_employees_usage(sender, instance: Employee, created, **kwargs):
+    if created:
+        adjust_usage(instance.company_id, USAGE_EMPLOYEES, 1)
+
+
+@receiver(post_delete, sender=Employee)
+def decrement_employees_usage(sender, instance: Employee, **kwargs):
+    adjust_usage(instance.company_id, USAGE_EMPLOYEES, -1)
+
+
+@receiver(post_save, sender=CompanyBranch)
+def increment_branches_usage(sender, instance: CompanyBranch, created, **kwargs):
+    if created:
+        adjust_usage(instance.company_id, USAGE_BRANCHES, 1)
+
+
+@receiver(post_delete, sender=CompanyBranch)
+def decrement_branches_usage(sender, instance: CompanyBranch, **kwargs):
+    adjust_usage(instance.company_id, USAGE_BRANCHES, -1)
@@ -1,3 +1,75 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from billing_center.models import CompanySubscription, CompanyUsageCounter, Product, SubscriptionPlan
+from billing_center.services.subscription_limits import check_employee_creation_limit
+from billing_center.services.usage_counters import reconcile_usage_counters
+from company_manager.models import Company
+from employee_center.models import Employee
+
+
+# ============================================================
+# 📏 Subscription Limits — Cached Subscription + Usage Counters
+# ============================================================
+class SubscriptionLimitCountersTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.company = Company.objects.create(name="Limits Co", is_active=False)
+        product, _ = Product.objects.get_or_create(code="HR", defaults={"name": "HR"})
+        self.plan = SubscriptionPlan.objects.create(
+            product=product,
+            name="Starter",
+            price_monthly=Decimal("10.00"),
+            price_yearly=Decimal("100.00"),
+            max_employees=2,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            CompanySubscription.objects.create(company=self.company, plan=self.plan, status="ACTIVE")
+
+    def _add_employee(self, index):
+        return Employee.objects.create(
+            user=get_user_model().objects.create_user(username=f"limit-emp-{index}", password="x"),
+            company=self.company,
+            full_name=f"Employee {index}",
+            national_id=f"20000000{index}",
+        )
+
+    def test_limit_check_reads_counter_and_cached_subscription(self):
+        self.assertTrue(check_employee_creation_limit(self.company).allowed)
+
+        self._add_employee(1)
+        self._add_employee(2)
+
+        with self.assertNumQueries(1):
+            result = check_employee_creation_limit(self.company)
+
+        self.assertEqual(result.code, "LIMIT_EXCEEDED")
+        self.assertEqual(result.current_usage, 2)
+
+        self.plan.max_employees = 5
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plan.save()
+
+        result = check_employee_creation_limit(self.company)
+        self.assertTrue(result.allowed)
+        self.assertEqual(result.remaining, 3)
+
+        Employee.objects.filter(company=self.company).first().delete()
+        self.assertEqual(check_employee_creation_limit(self.company).current_usage, 1)
+
+    def test_reconcile_corrects_drift(self):
+        self._add_employee(1)
+        check_employee_creation_limit(self.company)
+
+        CompanyUsageCounter.objects.filter(company=self.company).update(employees=40, branches=3)
+
+        result = reconcile_usage_counters(company_ids=[self.company.id])
+
+        self.assertEqual(result["corrected"], 1)
+        counter = CompanyUsageCounter.objects.get(company=self.company)
+        self.assertEqual((counter.employees, counter.branches), (1, 0))
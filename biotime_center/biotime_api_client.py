@@ -3,9 +3,16 @@
 # 🌩️ Biotime API Client — الإصدار الرسمي V9.4 (Tenant Subdomain Stable ✅)
 # 🚀 يدعم: Session Login + JWT Fallback + Terminals + Transactions + Employees
 # 🌀 متوافق 100% مع Biotime Cloud الحقيقي
+# ♻️ Pooled HTTP Session لكل Tenant + إعادة استخدام JWT/Session
 # ================================================================
 
+import hashlib
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 import logging
@@ -14,6 +21,96 @@ import re
 logger = logging.getLogger(__name__)
 
 
+# ================================================================
+# ♻️ Process-wide Session Pool (Per Tenant)
+# ================================================================
+# مفتاح لكل Tenant → {
+#     "session": requests.Session,
+#     "login_at": datetime | None,
+#     "lock": RLock (تسجيل دخول واحد في نفس الوقت لكل Tenant),
+#     "generation": int (يزيد مع كل Login ناجح),
+# }
+# الهدف: عدم تكرار Login + TCP/TLS Handshake في كل دورة مزامنة.
+
+_SESSION_POOL = {}
+_SESSION_POOL_LOCK = threading.Lock()
+
+AUTH_FAILURE_STATUSES = (401, 403)
+
+
+def _session_ttl():
+    return timedelta(
+        minutes=getattr(settings, "BIOTIME_SESSION_TTL_MINUTES", 30)
+    )
+
+
+def _build_pooled_session():
+    session = requests.Session()
+
+    total = max(int(getattr(settings, "BIOTIME_HTTP_RETRIES", 3) or 0), 0)
+
+    retries = Retry(
+        total=total,
+        connect=total,
+        # أخطاء القراءة قد تعني أن الخادم نفّذ الطلب → محاولة أقل
+        read=max(total - 1, 0),
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        # POST/PATCH غير idempotent في Biotime → لا نعيدها تلقائيًا
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        raise_on_status=False,
+    )
+
+    pool_size = getattr(settings, "BIOTIME_HTTP_POOL_MAXSIZE", 10)
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retries,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _pool_key(setting, base_url):
+    password_digest = hashlib.sha256(
+        (setting.password or "").encode("utf-8")
+    ).hexdigest()[:16]
+    return (
+        setting.pk,
+        base_url,
+        (setting.email or "").strip().lower(),
+        password_digest,
+    )
+
+
+def _get_pool_entry(key):
+    with _SESSION_POOL_LOCK:
+        entry = _SESSION_POOL.get(key)
+        if entry is None:
+            entry = {
+                "session": _build_pooled_session(),
+                "login_at": None,
+                "lock": threading.RLock(),
+                "generation": 0,
+            }
+            _SESSION_POOL[key] = entry
+        return entry
+
+
+def reset_session_pool():
+    """
+    إغلاق كل الـ Sessions المخزنة (للاختبارات أو عند تغيير الإعدادات).
+    """
+    with _SESSION_POOL_LOCK:
+        for entry in _SESSION_POOL.values():
+            try:
+                entry["session"].close()
+            except Exception:
+                pass
+        _SESSION_POOL.clear()
+
+
 class BiotimeAPIClient:
 
     # ============================================================
@@ -49,8 +146,9 @@ class BiotimeAPIClient:
         self.password = setting.password
         self.biotime_company = company
 
-        # 🧠 HTTP Session (كوكيز المتصفح)
-        self.session = requests.Session()
+        # 🧠 HTTP Session مشتركة (كوكيز المتصفح + Keep-Alive) لكل Tenant
+        self._pool_entry = _get_pool_entry(_pool_key(setting, self.base_url))
+        self.session = self._pool_entry["session"]
 
         logger.info(
             "🌐 Biotime Base URL Resolved: %s (company=%s)",
@@ -108,6 +206,9 @@ class BiotimeAPIClient:
                 logger.error("❌ Session Login Failed: No cookies received")
                 return False
 
+            self._pool_entry["login_at"] = timezone.now()
+            self._pool_entry["generation"] += 1
+
             # تحديث حالة الاتصال
             self.setting.last_login_status = "success"
             self.setting.last_login_at = timezone.now()
@@ -122,12 +223,34 @@ class BiotimeAPIClient:
             logger.exception("🔥 Session Login Exception: %s", e)
             return False
 
+    def _has_fresh_session(self) -> bool:
+        login_at = self._pool_entry.get("login_at")
+        if not login_at or not self.session.cookies:
+            return False
+        return timezone.now() - login_at < _session_ttl()
+
+    def _invalidate_auth(self):
+        """
+        إسقاط بيانات المصادقة المخزنة بعد 401/403
+        حتى يتم تسجيل الدخول من جديد عند الطلب التالي.
+        ⚠️ يُستدعى فقط داخل قفل الـ Tenant (_reauthenticate).
+        """
+        self.session.cookies.clear()
+        self._pool_entry["login_at"] = None
+
+        if self.setting.token_expiry:
+            self.setting.token_expiry = None
+            try:
+                self.setting.save(update_fields=["token_expiry"])
+            except Exception:
+                logger.exception("⚠️ Failed to persist JWT invalidation")
+
     # ============================================================
     # 🔐 3) تسجيل الدخول — JWT TOKEN (Fallback فقط)
     # ============================================================
-    def authenticate(self):
+    def authenticate(self, force=False):
         # 🔁 Reuse Token
-        if self.setting.jwt_token and self.setting.token_expiry:
+        if not force and self.setting.jwt_token and self.setting.token_expiry:
             if timezone.now() < self.setting.token_expiry:
                 logger.info("🔁 Reusing existing JWT token (not expired)")
                 return {
@@ -136,6 +259,40 @@ class BiotimeAPIClient:
                     "token": self.setting.jwt_token,
                 }  
 
+        # 🔁 Reuse Pooled Session (بدون Login جديد)
+        if not force and self._has_fresh_session():
+            logger.info("🔁 Reusing pooled Biotime session (not expired)")
+            return {"status": "success", "mode": "session"}
+
+        # 🔒 Login واحد لكل Tenant — من ينتظر القفل يعيد استخدام نتيجة الأول
+        with self._pool_entry["lock"]:
+            if not force and self._has_fresh_session():
+                logger.info("🔁 Reusing pooled Biotime session (logged in by another thread)")
+                return {"status": "success", "mode": "session"}
+
+            return self._login()
+
+    def _reauthenticate(self, seen_generation):
+        """
+        إعادة تسجيل الدخول بعد 401/403 (مرة واحدة لكل جيل Login):
+        - أول Thread يسقط المصادقة ويسجل الدخول
+        - البقية (نفس الجيل القديم) يعيدون استخدام الكوكيز / JWT الجديدة
+        """
+        entry = self._pool_entry
+
+        with entry["lock"]:
+            if entry["generation"] != seen_generation:
+                logger.info("🔁 Biotime re-auth already done by another thread")
+                try:
+                    self.setting.refresh_from_db(fields=["jwt_token", "token_expiry"])
+                except Exception:
+                    logger.exception("⚠️ Failed to reload Biotime JWT after shared re-auth")
+                return {"status": "success"}
+
+            self._invalidate_auth()
+            return self._login()
+
+    def _login(self):
         # نحاول Session أولاً
         if self._session_login():
             return {"status": "success", "mode": "session"}
@@ -159,7 +316,7 @@ class BiotimeAPIClient:
 
             logger.debug("📦 JWT Login Payload: %s", payload)
 
-            res = requests.post(
+            res = self.session.post(
                 login_url,
                 json=payload,
                 timeout=15,
@@ -188,6 +345,7 @@ class BiotimeAPIClient:
 
             self.setting.jwt_token = token
             self.setting.token_expiry = expiry
+            self._pool_entry["generation"] += 1
             self.setting.last_login_status = "success"
             self.setting.last_login_at = timezone.now()
             self.setting.save()
@@ -203,7 +361,7 @@ class BiotimeAPIClient:
     # 🔁 4) الحصول على وضع المصادقة الحالي
     # ============================================================
     def get_token(self):
-        if self.session and self.session.cookies:
+        if self._has_fresh_session():
             return "SESSION"
 
         if (
@@ -214,30 +372,65 @@ class BiotimeAPIClient:
             logger.warning("⚠️ Token/session expired. Re-authenticating...")
             res = self.authenticate()
             if res.get("status") == "success":
-                return res.get("mode")
+                return "SESSION" if res.get("mode") == "session" else "JWT"
             return None
 
         return "JWT"
 
+    # ============================================================
+    # 🧩 Helper — تنفيذ طلب موحد (Session أو JWT) + Re-Auth عند 401
+    # ============================================================
+    def _send(self, method, url, headers=None, **kwargs):
+        """
+        تنفيذ الطلب عبر الـ Session المشتركة دائمًا (Keep-Alive):
+        - Session Cookies عند توفرها
+        - JWT Authorization عند الحاجة
+        - 🔁 عند 401/403: إسقاط المصادقة + تسجيل دخول واحد + إعادة المحاولة
+        """
+
+        for attempt in range(2):
+            mode = self.get_token()
+            if not mode:
+                logger.error("❌ Cannot perform %s: No authentication", method)
+                return None
+
+            generation = self._pool_entry["generation"]
+
+            request_headers = dict(headers or {})
+            if mode != "SESSION":
+                request_headers["Authorization"] = f"JWT {self.setting.jwt_token}"
+
+            res = self.session.request(
+                method,
+                url,
+                headers=request_headers,
+                **kwargs,
+            )
+
+            if res.status_code not in AUTH_FAILURE_STATUSES or attempt:
+                return res
+
+            logger.warning(
+                "⚠️ %s unauthorized (%s) — re-authenticating once",
+                method,
+                res.status_code,
+            )
+            auth = self._reauthenticate(generation)
+            if auth.get("status") != "success":
+                logger.error("❌ Re-Auth Failed during %s retry", method)
+                return res
+
+        return res
+
     # ============================================================
     # 🧩 Helper — تنفيذ GET موحد (Session أو JWT)
     # ============================================================
     def _get(self, url, params=None, timeout=20):
-        mode = self.get_token()
-        if not mode:
-            logger.error("❌ Cannot perform GET: No authentication")
-            return None
-
         try:
-            if mode == "SESSION":
-                return self.session.get(url, params=params, timeout=timeout)
-
-            return requests.get(
+            return self._send(
+                "GET",
                 url,
-                headers={
-                    "Authorization": f"JWT {self.setting.jwt_token}",
-                    "Content-Type": "application/json",
-                },
+                headers={"Content-Type": "application/json"},
                 params=params,
                 timeout=timeout,
             )
@@ -258,37 +451,17 @@ class BiotimeAPIClient:
         - منع تعارض json / data
         """
 
-        mode = self.get_token()
-        if not mode:
-            logger.error("❌ Cannot perform POST: No authentication")
-            return None
-
         if json is not None and data is not None:
             logger.error("❌ POST payload conflict: both json and data provided")
             return None
 
-        headers = {
-            "Content-Type": "application/json",
-        }
-
         try:
-            if mode == "SESSION":
-                return self.session.post(
-                    url,
-                    json=json,
-                    data=data,
-                    headers=headers,
-                    timeout=timeout,
-                    allow_redirects=True,
-                )
-
-            headers["Authorization"] = f"JWT {self.setting.jwt_token}"
-
-            return self.session.post(
+            return self._send(
+                "POST",
                 url,
+                headers={"Content-Type": "application/json"},
                 json=json,
                 data=data,
-                headers=headers,
                 timeout=timeout,
                 allow_redirects=True,
             )
@@ -309,89 +482,16 @@ class BiotimeAPIClient:
         - 🔁 Retry ذكي عند فشل Session أو JWT
         """
 
-        mode = self.get_token()
-        if not mode:
-            logger.error("❌ Cannot perform PATCH: No authentication")
-            return None
-
-        headers = {
-            "Content-Type": "application/json",
-        }
-
         try:
-            # -------------------------------
-            # ✅ Session Mode
-            # -------------------------------
-            if mode == "SESSION":
-                res = self.session.patch(
-                    url,
-                    json=json,
-                    headers=headers,
-                    timeout=timeout,
-                    allow_redirects=True,
-                )
-
-                # 🔁 إذا فشل Session → نجرب JWT مباشرة
-                if res is not None and res.status_code in (401, 403):
-                    logger.warning(
-                        "⚠️ PATCH Session failed (%s) — retrying with JWT",
-                        res.status_code,
-                    )
-
-                    auth = self.authenticate()
-                    if auth.get("status") != "success":
-                        logger.error("❌ JWT Retry Auth Failed during PATCH")
-                        return res
-
-                    headers["Authorization"] = f"JWT {self.setting.jwt_token}"
-
-                    return requests.patch(
-                        url,
-                        json=json,
-                        headers=headers,
-                        timeout=timeout,
-                        allow_redirects=True,
-                    )
-
-                return res
-
-            # -------------------------------
-            # ✅ JWT Mode
-            # -------------------------------
-            headers["Authorization"] = f"JWT {self.setting.jwt_token}"
-
-            res = requests.patch(
+            return self._send(
+                "PATCH",
                 url,
+                headers={"Content-Type": "application/json"},
                 json=json,
-                headers=headers,
                 timeout=timeout,
                 allow_redirects=True,
             )
 
-            # 🔁 Retry أخير إذا رجع None أو Unauthorized
-            if res is None or res.status_code in (401, 403):
-                logger.warning(
-                    "⚠️ PATCH JWT failed (%s) — retrying once",
-                    getattr(res, "status_code", "NO_RESPONSE"),
-                )
-
-                auth = self.authenticate()
-                if auth.get("status") != "success":
-                    logger.error("❌ JWT Re-Auth Failed during PATCH retry")
-                    return res
-
-                headers["Authorization"] = f"JWT {self.setting.jwt_token}"
-
-                return requests.patch(
-                    url,
-                    json=json,
-                    headers=headers,
-                    timeout=timeout,
-                    allow_redirects=True,
-                )
-
-            return res
-
         except Exception as e:
             logger.exception("🔥 HTTP PATCH Transport Error: %s", e)
             return None
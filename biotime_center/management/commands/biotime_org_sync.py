@@ -0,0 +1,26 @@
+# biotime_center/management/commands/biotime_org_sync.py
+
+from django.core.management.base import BaseCommand
+from biotime_center.services.org_sync_worker import run_org_sync
+
+
+class Command(BaseCommand):
+    help = "Push pending Branch / Department / JobTitle markers to Biotime"
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING("🚀 Running Biotime Org Sync Worker..."))
+
+        results = run_org_sync()
+
+        if results:
+            for item in results:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"✔ Company {item['company_id']}: "
+                        f"synced={item['synced']} | failed={item['failed']}"
+                    )
+                )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS("✔ No dirty org markers found.")
+            )
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biotime_center', '0007_biotimesynclog_company'),
+        ('company_manager', '0002_companybranch_biotime_code_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BiotimeOrgSyncMarker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('branch', 'Branch → Area'), ('department', 'Department → Department'), ('job_title', 'JobTitle → Position')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('is_dirty', models.BooleanField(default=True)),
+                ('retry_count', models.PositiveIntegerField(default=0)),
+                ('last_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='biotime_org_sync_markers', to='company_manager.company')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['is_dirty', 'company'], name='biotime_cen_is_dirt_03af26_idx')],
+                'unique_together': {('company', 'object_type', 'object_id')},
+            },
+        ),
+    ]
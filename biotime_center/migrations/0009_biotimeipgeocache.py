@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biotime_center', '0008_biotimeorgsyncmarker'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BiotimeIPGeoCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ip_address', models.CharField(max_length=64, unique=True)),
+                ('location_text', models.CharField(blank=True, max_length=255, null=True)),
+                ('status', models.CharField(choices=[('resolved', 'Resolved'), ('not_found', 'Not Found'), ('failed', 'Failed')], default='resolved', max_length=20)),
+                ('resolved_at', models.DateTimeField(auto_now=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'BioTime IP Geo Cache',
+                'verbose_name_plural': 'BioTime IP Geo Cache',
+            },
+        ),
+    ]
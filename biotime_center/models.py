@@ -308,3 +308,98 @@ class BiotimeSyncState(models.Model):
             self.is_dirty = False
 
         self.save()
+
+
+# ============================================================
+# 🏢 Biotime Org Sync Marker — Deferred Master Data Push
+# ============================================================
+
+class BiotimeOrgObjectType(models.TextChoices):
+    BRANCH = "branch", "Branch → Area"
+    DEPARTMENT = "department", "Department → Department"
+    JOB_TITLE = "job_title", "JobTitle → Position"
+
+
+class BiotimeOrgSyncMarker(models.Model):
+    """
+    🎯 علامة "Dirty" خفيفة لكائن هيكل تنظيمي يحتاج دفعًا إلى BioTime
+    - تُنشأ بعد commit من signals بدل استدعاء HTTP داخل الحفظ
+    - سجل واحد لكل كائن (Coalesced)
+    - يعالجها Worker على دفعات لكل شركة
+    """
+
+    company = models.ForeignKey(
+        "company_manager.Company",
+        on_delete=models.CASCADE,
+        related_name="biotime_org_sync_markers",
+    )
+
+    object_type = models.CharField(
+        max_length=20,
+        choices=BiotimeOrgObjectType.choices,
+    )
+
+    object_id = models.PositiveBigIntegerField()
+
+    is_dirty = models.BooleanField(default=True)
+
+    retry_count = models.PositiveIntegerField(default=0)
+
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+
+    last_error = models.TextField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("company", "object_type", "object_id")
+        indexes = [
+            models.Index(fields=["is_dirty", "company"]),
+        ]
+
+    def __str__(self):
+        return f"{self.object_type}#{self.object_id} (company={self.company_id})"
+
+
+# ============================================================
+# 🌍 IP Geolocation Cache (Devices API)
+# ============================================================
+
+class BiotimeIPGeoCache(models.Model):
+    """
+    🌍 نتيجة تحويل IP عام إلى مدينة/منطقة
+    - مخزنة لتبقى دافئة بعد إعادة التشغيل
+    - Negative caching: IP خاص / فشل / غير معروف (location_text = NULL)
+    """
+
+    STATUS_RESOLVED = "resolved"
+    STATUS_NOT_FOUND = "not_found"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_RESOLVED, "Resolved"),
+        (STATUS_NOT_FOUND, "Not Found"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    ip_address = models.CharField(max_length=64, unique=True)
+
+    location_text = models.CharField(max_length=255, null=True, blank=True)
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_RESOLVED,
+    )
+
+    resolved_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "BioTime IP Geo Cache"
+        verbose_name_plural = "BioTime IP Geo Cache"
+
+    def __str__(self):
+        return f"{self.ip_address} → {self.location_text or self.status}"
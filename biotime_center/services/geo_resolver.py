@@ -0,0 +1,237 @@
+# ============================================================
+# 🌍 Geo Resolver — Cached & Non-Blocking IP → Location
+# ============================================================
+# ✔ قراءة واحدة من BiotimeIPGeoCache لكل صفحة أجهزة
+# ✔ TTL للنتائج + Negative caching (IP خاص / فشل)
+# ✔ المفقود يُحل في الخلفية بطلب batch واحد (ip-api)
+# ✔ الـ API يرجع فورًا: resolved / pending / unavailable
+# ============================================================
+
+import ipaddress
+import logging
+import threading
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from biotime_center.models import BiotimeIPGeoCache
+from primey_hrm.db_connections import DBThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+GEO_BATCH_URL = "http://ip-api.com/batch"
+GEO_BATCH_MAX_IPS = 100
+GEO_BATCH_FIELDS = "status,message,query,city,regionName"
+GEO_REQUEST_TIMEOUT = 5
+
+GEO_STATUS_RESOLVED = "resolved"
+GEO_STATUS_PENDING = "pending"
+GEO_STATUS_UNAVAILABLE = "unavailable"
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+_IN_FLIGHT = set()
+_IN_FLIGHT_LOCK = threading.Lock()
+
+
+def _positive_ttl(setting_name, default):
+    return max(int(getattr(settings, setting_name, default) or default), 1)
+
+
+def _geo_ttl():
+    return timedelta(hours=_positive_ttl("BIOTIME_GEO_CACHE_TTL_HOURS", 168))
+
+
+def _geo_negative_ttl():
+    return timedelta(minutes=_positive_ttl("BIOTIME_GEO_NEGATIVE_TTL_MINUTES", 60))
+
+
+def _get_executor():
+    global _EXECUTOR
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = DBThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="biotime-geo",
+            )
+        return _EXECUTOR
+
+
+def _is_public_ip(ip_address):
+    try:
+        return ipaddress.ip_address(str(ip_address).strip()).is_global
+    except ValueError:
+        return False
+
+
+def _format_location(data):
+    city = data.get("city")
+    region = data.get("regionName")
+
+    if city and region:
+        return f"{city} - {region}"
+
+    return city or None
+
+
+# ============================================================
+# 💾 Persistence
+# ============================================================
+
+def _store_results(results):
+    """
+    results: dict ip → (status, location_text)
+    """
+
+    now = timezone.now()
+
+    for ip_address, (status, location_text) in results.items():
+        ttl = _geo_ttl() if status == BiotimeIPGeoCache.STATUS_RESOLVED else _geo_negative_ttl()
+        BiotimeIPGeoCache.objects.update_or_create(
+            ip_address=ip_address,
+            defaults={
+                "status": status,
+                "location_text": location_text,
+                "expires_at": now + ttl,
+            },
+        )
+
+
+# ============================================================
+# 🌐 Batch Lookup (One HTTP Call Per ≤100 IPs)
+# ============================================================
+
+def resolve_ips_now(ip_addresses):
+    """
+    حل قائمة IPs عامة فورًا وتخزين النتيجة (يستخدمه الـ Worker).
+    """
+
+    ip_addresses = list(dict.fromkeys(ip_addresses))
+    results = {}
+
+    for start in range(0, len(ip_addresses), GEO_BATCH_MAX_IPS):
+        chunk = ip_addresses[start:start + GEO_BATCH_MAX_IPS]
+
+        try:
+            response = requests.post(
+                GEO_BATCH_URL,
+                params={"fields": GEO_BATCH_FIELDS},
+                json=chunk,
+                timeout=GEO_REQUEST_TIMEOUT,
+            )
+            rows = response.json() if response.status_code == 200 else None
+        except Exception:
+            logger.warning("Geo batch lookup failed for %s IPs", len(chunk))
+            rows = None
+
+        if not isinstance(rows, list):
+            for ip_address in chunk:
+                results[ip_address] = (BiotimeIPGeoCache.STATUS_FAILED, None)
+            continue
+
+        for ip_address, row in zip(chunk, rows):
+            row = row if isinstance(row, dict) else {}
+            location_text = _format_location(row) if row.get("status") == "success" else None
+
+            results[ip_address] = (
+                (BiotimeIPGeoCache.STATUS_RESOLVED, location_text)
+                if location_text
+                else (BiotimeIPGeoCache.STATUS_NOT_FOUND, None)
+            )
+
+    _store_results(results)
+    return results
+
+
+def _resolve_in_background(ip_addresses):
+    try:
+        resolve_ips_now(ip_addresses)
+    except Exception:
+        logger.exception("Geo background resolution failed")
+    finally:
+        with _IN_FLIGHT_LOCK:
+            _IN_FLIGHT.difference_update(ip_addresses)
+
+
+def _schedule_resolution(ip_addresses):
+    with _IN_FLIGHT_LOCK:
+        pending = [ip for ip in ip_addresses if ip not in _IN_FLIGHT]
+        _IN_FLIGHT.update(pending)
+
+    if pending:
+        _get_executor().submit(_resolve_in_background, pending)
+
+
+# ============================================================
+# 🚀 Public API (Non-Blocking)
+# ============================================================
+
+def get_locations_for_ips(ip_addresses):
+    """
+    يرجع dict ip → {"text": str | None, "status": resolved|pending|unavailable}
+    بدون أي طلب HTTP داخل الـ request.
+    """
+
+    ips = [str(ip).strip() for ip in ip_addresses if ip and str(ip).strip()]
+    ips = list(dict.fromkeys(ips))
+
+    locations = {}
+    public_ips = []
+
+    for ip_address in ips:
+        if _is_public_ip(ip_address):
+            public_ips.append(ip_address)
+        else:
+            # IP داخلي/غير صالح → لا يمكن تحديد موقعه
+            locations[ip_address] = {"text": None, "status": GEO_STATUS_UNAVAILABLE}
+
+    if not public_ips:
+        return locations
+
+    now = timezone.now()
+    cached = {
+        row.ip_address: row
+        for row in BiotimeIPGeoCache.objects.filter(ip_address__in=public_ips)
+    }
+
+    misses = []
+
+    for ip_address in public_ips:
+        row = cached.get(ip_address)
+
+        if row is None:
+            misses.append(ip_address)
+            locations[ip_address] = {"text": None, "status": GEO_STATUS_PENDING}
+            continue
+
+        # منتهي الصلاحية → نرجع القديم ونجدد في الخلفية
+        if row.expires_at <= now:
+            misses.append(ip_address)
+
+        locations[ip_address] = {
+            "text": row.location_text,
+            "status": (
+                GEO_STATUS_RESOLVED
+                if row.status == BiotimeIPGeoCache.STATUS_RESOLVED
+                else GEO_STATUS_UNAVAILABLE
+            ),
+        }
+
+    if misses:
+        _schedule_resolution(misses)
+
+    return locations
+
+
+def get_location_for_ip(ip_address):
+    if not ip_address:
+        return {"text": None, "status": GEO_STATUS_UNAVAILABLE}
+
+    key = str(ip_address).strip()
+    return get_locations_for_ips([key]).get(
+        key,
+        {"text": None, "status": GEO_STATUS_UNAVAILABLE},
+    )
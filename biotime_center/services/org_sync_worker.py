@@ -0,0 +1,389 @@
+# ============================================================
+# 🏢 Org Sync Worker — Deferred & Coalesced Master Data Push
+# ============================================================
+# ✔ Signals تسجل علامة Dirty فقط (بعد commit)
+# ✔ Worker يجمع العلامات لكل شركة
+# ✔ تسجيل دخول واحد لكل شركة
+# ✔ قراءة الأكواد الموجودة في BioTime مرة واحدة لكل نوع
+# ✔ إنشاء المفقود فقط (Area → Department → Position)
+# ============================================================
+
+import logging
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from biotime_center.models import (
+    BiotimeOrgObjectType,
+    BiotimeOrgSyncMarker,
+    BiotimeSetting,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_ORG_SYNC_RETRIES = 5
+
+# الترتيب مهم: Master قبل التابع
+ORG_SYNC_ORDER = (
+    BiotimeOrgObjectType.BRANCH,
+    BiotimeOrgObjectType.DEPARTMENT,
+    BiotimeOrgObjectType.JOB_TITLE,
+)
+
+# object_type → (endpoint, code_field, code_prefix)
+ORG_SYNC_ENDPOINTS = {
+    BiotimeOrgObjectType.BRANCH: ("/personnel/api/areas/", "area_code", "BR"),
+    BiotimeOrgObjectType.DEPARTMENT: ("/personnel/api/departments/", "dept_code", "DEPT"),
+    BiotimeOrgObjectType.JOB_TITLE: ("/personnel/api/positions/", "position_code", "POS"),
+}
+
+
+def _get_org_model(object_type):
+    from company_manager.models import CompanyBranch, CompanyDepartment, JobTitle
+
+    return {
+        BiotimeOrgObjectType.BRANCH: CompanyBranch,
+        BiotimeOrgObjectType.DEPARTMENT: CompanyDepartment,
+        BiotimeOrgObjectType.JOB_TITLE: JobTitle,
+    }[object_type]
+
+
+# ============================================================
+# 📝 Enqueue (Called From Signals)
+# ============================================================
+
+def mark_org_object_dirty(*, company_id, object_type, object_id):
+    """
+    تسجيل/تحديث علامة Dirty لكائن واحد (Idempotent).
+    الشركات بدون BiotimeSetting يتم تجاهلها.
+    """
+
+    if not company_id or not object_id:
+        return None
+
+    if not BiotimeSetting.objects.filter(company_id=company_id).exists():
+        return None
+
+    marker, _ = BiotimeOrgSyncMarker.objects.update_or_create(
+        company_id=company_id,
+        object_type=object_type,
+        object_id=object_id,
+        defaults={
+            "is_dirty": True,
+            "retry_count": 0,
+            "last_error": None,
+        },
+    )
+    return marker
+
+
+def enqueue_org_object_sync(instance, object_type):
+    """
+    جدولة العلامة بعد نجاح الـ transaction الحالية
+    حتى لا يرى الـ Worker كائنًا لم يُحفظ بعد.
+    """
+
+    transaction.on_commit(
+        partial(
+            mark_org_object_dirty,
+            company_id=getattr(instance, "company_id", None),
+            object_type=object_type,
+            object_id=instance.pk,
+        )
+    )
+
+
+def mark_org_objects_dirty(*, company_id, object_type, object_ids):
+    """
+    نسخة مجمّعة لـ mark_org_object_dirty (Seed / Import).
+    bulk_create واحد + update واحد للعلامات الموجودة.
+    """
+
+    object_ids = [object_id for object_id in (object_ids or []) if object_id]
+
+    if not company_id or not object_ids:
+        return 0
+
+    if not BiotimeSetting.objects.filter(company_id=company_id).exists():
+        return 0
+
+    BiotimeOrgSyncMarker.objects.bulk_create(
+        [
+            BiotimeOrgSyncMarker(
+                company_id=company_id,
+                object_type=object_type,
+                object_id=object_id,
+            )
+            for object_id in object_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+    return BiotimeOrgSyncMarker.objects.filter(
+        company_id=company_id,
+        object_type=object_type,
+        object_id__in=object_ids,
+    ).update(
+        is_dirty=True,
+        retry_count=0,
+        last_error=None,
+        updated_at=timezone.now(),
+    )
+
+
+def enqueue_org_objects_sync(*, company_id, object_type, object_ids):
+    transaction.on_commit(
+        partial(
+            mark_org_objects_dirty,
+            company_id=company_id,
+            object_type=object_type,
+            object_ids=list(object_ids or []),
+        )
+    )
+
+
+# ============================================================
+# 🔎 Existing Codes (One Paged Read Per Type)
+# ============================================================
+
+def _fetch_existing_codes(client, endpoint, code_field):
+    """
+    قراءة كل الأكواد الموجودة في BioTime لنوع واحد.
+    يرجع set أو None عند الفشل (ليتم الرجوع للتحقق الفردي).
+    """
+
+    codes = set()
+    next_url = f"{client.base_url}{endpoint}"
+    params = {"page_size": 500}
+
+    while next_url:
+        res = client._get(next_url, params=params, timeout=20)
+        if not res or res.status_code != 200:
+            return None
+
+        try:
+            raw = res.json() or {}
+        except Exception:
+            return None
+
+        if isinstance(raw, dict):
+            rows = raw.get("data") or []
+            next_url = raw.get("next")
+        elif isinstance(raw, list):
+            rows = raw
+            next_url = None
+        else:
+            return None
+
+        for row in rows:
+            code = str(row.get(code_field) or "").strip()
+            if code:
+                codes.add(code)
+
+        params = None
+
+    return codes
+
+
+def _create_org_entity(client, object_type, obj):
+    from biotime_center.sync_service import (
+        get_or_create_area,
+        get_or_create_department,
+        get_or_create_position,
+    )
+
+    if object_type == BiotimeOrgObjectType.BRANCH:
+        return get_or_create_area(client, obj.name, obj.biotime_code)
+
+    if object_type == BiotimeOrgObjectType.DEPARTMENT:
+        return get_or_create_department(client, obj.name, obj.biotime_code)
+
+    return get_or_create_position(client, obj.name, obj.biotime_code)
+
+
+def _ensure_org_codes(model, objects, prefix):
+    from biotime_center.sync_service import _generate_biotime_code
+
+    missing = []
+    for obj in objects:
+        if not obj.biotime_code:
+            obj.biotime_code = _generate_biotime_code(prefix, obj.id)
+            missing.append(obj)
+
+    if missing:
+        # bulk_update لا يطلق post_save → لا علامات جديدة
+        model.objects.bulk_update(missing, ["biotime_code"])
+
+
+# ============================================================
+# ✅ Marker State Updates (Optimistic — Keep Re-dirtied Rows)
+# ============================================================
+
+def _mark_markers_done(markers):
+    now = timezone.now()
+    for marker in markers:
+        # إذا تغيّر updated_at أثناء المعالجة فهناك تعديل جديد → يبقى Dirty
+        BiotimeOrgSyncMarker.objects.filter(
+            pk=marker.pk,
+            updated_at=marker.updated_at,
+        ).update(
+            is_dirty=False,
+            retry_count=0,
+            last_error=None,
+            last_attempt_at=now,
+            last_success_at=now,
+        )
+
+
+def _mark_markers_failed(markers, error):
+    now = timezone.now()
+    BiotimeOrgSyncMarker.objects.filter(
+        pk__in=[marker.pk for marker in markers],
+    ).update(
+        retry_count=F("retry_count") + 1,
+        last_error=str(error)[:2000],
+        last_attempt_at=now,
+    )
+
+    # 🛑 Stop retrying after MAX attempts
+    BiotimeOrgSyncMarker.objects.filter(
+        pk__in=[marker.pk for marker in markers],
+        retry_count__gte=MAX_ORG_SYNC_RETRIES,
+    ).update(is_dirty=False)
+
+
+# ============================================================
+# 🔄 Company Batch
+# ============================================================
+
+def sync_company_org_markers(company):
+    """
+    دفع كل العلامات Dirty لشركة واحدة في جلسة واحدة.
+    """
+
+    from biotime_center.sync_service import get_authenticated_client
+
+    markers = list(
+        BiotimeOrgSyncMarker.objects.filter(
+            company=company,
+            is_dirty=True,
+            retry_count__lt=MAX_ORG_SYNC_RETRIES,
+        )
+    )
+
+    result = {"company_id": company.id, "synced": 0, "failed": 0}
+
+    if not markers:
+        return result
+
+    client, error = get_authenticated_client(company=company)
+    if error or not client:
+        _mark_markers_failed(markers, error or "Biotime authentication failed")
+        result["failed"] = len(markers)
+        return result
+
+    by_type = {}
+    for marker in markers:
+        by_type.setdefault(marker.object_type, []).append(marker)
+
+    for object_type in ORG_SYNC_ORDER:
+        type_markers = by_type.get(object_type) or []
+        if not type_markers:
+            continue
+
+        model = _get_org_model(object_type)
+        endpoint, code_field, prefix = ORG_SYNC_ENDPOINTS[object_type]
+
+        objects = {
+            obj.id: obj
+            for obj in model.objects.filter(
+                company=company,
+                id__in=[marker.object_id for marker in type_markers],
+            )
+        }
+
+        active_objects = [obj for obj in objects.values() if obj.is_active]
+        _ensure_org_codes(model, active_objects, prefix)
+
+        existing_codes = _fetch_existing_codes(client, endpoint, code_field)
+
+        done, failed = [], []
+
+        for marker in type_markers:
+            obj = objects.get(marker.object_id)
+
+            # محذوف أو غير نشط → لا شيء للدفع
+            if obj is None or not obj.is_active:
+                done.append(marker)
+                continue
+
+            code = str(obj.biotime_code).strip()
+
+            if existing_codes is not None and code in existing_codes:
+                done.append(marker)
+                continue
+
+            try:
+                created = _create_org_entity(client, object_type, obj)
+            except Exception:
+                logger.exception(
+                    "❌ Org Sync Failed | company=%s | type=%s | id=%s",
+                    company.id,
+                    object_type,
+                    obj.id,
+                )
+                created = None
+
+            if created:
+                done.append(marker)
+                if existing_codes is not None:
+                    existing_codes.add(code)
+            else:
+                failed.append(marker)
+
+        _mark_markers_done(done)
+        if failed:
+            _mark_markers_failed(failed, "Biotime create/resolve failed")
+
+        result["synced"] += len(done)
+        result["failed"] += len(failed)
+
+    logger.info(
+        "✅ Org Sync Completed | company=%s | synced=%s | failed=%s",
+        company.id,
+        result["synced"],
+        result["failed"],
+    )
+
+    return result
+
+
+# ============================================================
+# 🚀 Worker Entry
+# ============================================================
+
+def run_org_sync():
+    """
+    معالجة كل الشركات التي لديها علامات Dirty.
+    """
+
+    from company_manager.models import Company
+
+    company_ids = (
+        BiotimeOrgSyncMarker.objects
+        .filter(is_dirty=True, retry_count__lt=MAX_ORG_SYNC_RETRIES)
+        .values_list("company_id", flat=True)
+        .distinct()
+    )
+
+    results = []
+
+    for company in Company.objects.filter(id__in=list(company_ids)):
+        try:
+            results.append(sync_company_org_markers(company))
+        except Exception:
+            logger.exception("❌ Org Sync Company Failed | company=%s", company.id)
+
+    return results
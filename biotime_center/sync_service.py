@@ -381,7 +381,6 @@ def sync_logs(company=None, start_date=None, end_date=None):
     setting = (
         BiotimeSetting.objects
         .filter(company=company)
-        .only("id")
         .first()
     )
 
@@ -703,7 +702,7 @@ def get_or_create_position(client, name: str, code: str):
 
 # ---------------- Public Sync APIs ----------------
 
-def create_or_sync_branch(branch: CompanyBranch):
+def create_or_sync_branch(branch: CompanyBranch, client=None):
     """
     ======================================================
     🏢 Sync CompanyBranch → Biotime Area
@@ -716,8 +715,10 @@ def create_or_sync_branch(branch: CompanyBranch):
     if not branch.is_active:
         return None
 
-    # 🔐 Company Scoped Auth
-    client, error = get_authenticated_client(company=branch.company)
+    # 🔐 Company Scoped Auth (Reuse Client إن وُجد)
+    error = None
+    if client is None:
+        client, error = get_authenticated_client(company=branch.company)
     if error or not client:
         logger.warning("⚠️ Branch Sync Skipped | auth_error=%s | branch_id=%s", error, branch.id)
         return None
@@ -757,7 +758,7 @@ def create_or_sync_branch(branch: CompanyBranch):
 #🏢 Sync CompanyDepartment → Biotime Department ONLY
 #❌ ممنوع إنشاء Area من القسم
 #======================================================
-def create_or_sync_department(department: CompanyDepartment):
+def create_or_sync_department(department: CompanyDepartment, client=None):
     """
     ======================================================
     🏢 Sync CompanyDepartment → Biotime Department ONLY
@@ -770,8 +771,10 @@ def create_or_sync_department(department: CompanyDepartment):
     if not department.is_active:
         return None
 
-    # 🔐 Company Scoped Auth
-    client, error = get_authenticated_client(company=department.company)
+    # 🔐 Company Scoped Auth (Reuse Client إن وُجد)
+    error = None
+    if client is None:
+        client, error = get_authenticated_client(company=department.company)
     if error or not client:
         logger.warning("⚠️ Dept Sync Skipped | auth_error=%s | dept_id=%s", error, department.id)
         return None
@@ -811,7 +814,7 @@ def create_or_sync_department(department: CompanyDepartment):
         logger.exception("❌ Create Department Failed | dept_id=%s", department.id)
         return None
 
-def create_or_sync_jobtitle(jobtitle: JobTitle):
+def create_or_sync_jobtitle(jobtitle: JobTitle, client=None):
     """
     ======================================================
     💼 Sync JobTitle → Biotime Position
@@ -824,8 +827,10 @@ def create_or_sync_jobtitle(jobtitle: JobTitle):
     if not jobtitle.is_active:
         return None
 
-    # 🔐 Company Scoped Auth
-    client, error = get_authenticated_client(company=jobtitle.company)
+    # 🔐 Company Scoped Auth (Reuse Client إن وُجد)
+    error = None
+    if client is None:
+        client, error = get_authenticated_client(company=jobtitle.company)
     if error or not client:
         logger.warning("⚠️ JobTitle Sync Skipped | auth_error=%s | job_id=%s", error, jobtitle.id)
         return None
@@ -0,0 +1,96 @@
+# ============================================================
+# 📂 الملف: biotime_center/tests/test_api_client.py
+# 🧪 Biotime API Client — Session Pool + Re-Auth
+# ============================================================
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from biotime_center.biotime_api_client import (
+    BiotimeAPIClient,
+    _build_pooled_session,
+    reset_session_pool,
+)
+from biotime_center.models import BiotimeSetting
+from company_manager.models import Company
+
+
+def _fake_login(client):
+    entry = client._pool_entry
+    entry["login_at"] = timezone.now()
+    entry["generation"] += 1
+    client.session.cookies.set("sessionid", f"s{entry['generation']}")
+    return True
+
+
+class BiotimeAPIClientPoolTests(TestCase):
+    def setUp(self):
+        reset_session_pool()
+        self.addCleanup(reset_session_pool)
+
+        self.company = Company.objects.create(name="Biotime Co", is_active=False)
+        self.setting = BiotimeSetting.objects.create(
+            company=self.company,
+            server_url="https://biotime.test",
+            biotime_company="acme",
+            email="admin@example.com",
+            password="secret",
+        )
+
+        login = patch.object(BiotimeAPIClient, "_session_login", autospec=True, side_effect=_fake_login)
+        self.login = login.start()
+        self.addCleanup(login.stop)
+
+    def _client(self):
+        return BiotimeAPIClient(BiotimeSetting.objects.get(pk=self.setting.pk))
+
+    def test_clients_share_pooled_session_and_login(self):
+        first = self._client()
+        second = self._client()
+
+        self.assertIs(first.session, second.session)
+        self.assertEqual(first.get_token(), "SESSION")
+        self.assertEqual(second.get_token(), "SESSION")
+        self.assertEqual(self.login.call_count, 1)
+
+        self.setting.password = "rotated"
+        self.setting.save(update_fields=["password"])
+        self.assertIsNot(self._client().session, first.session)
+
+    def test_unauthorized_relogs_in_once_and_retries(self):
+        client = self._client()
+        client.get_token()
+
+        with patch.object(
+            client.session,
+            "request",
+            side_effect=[MagicMock(status_code=401), MagicMock(status_code=200)],
+        ) as request:
+            res = client._get(f"{client.base_url}/iclock/api/terminals/")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(self.login.call_count, 2)
+        self.assertEqual(client.session.cookies.get("sessionid"), "s2")
+
+    def test_stale_generation_reuses_concurrent_relogin(self):
+        first = self._client()
+        second = self._client()
+        first.get_token()
+
+        seen = first._pool_entry["generation"]
+        first._reauthenticate(seen)
+        self.assertEqual(self.login.call_count, 2)
+
+        # Thread ثاني رأى نفس الجيل القديم → لا Login جديد ولا مسح للكوكيز
+        self.assertEqual(second._reauthenticate(seen)["status"], "success")
+        self.assertEqual(self.login.call_count, 2)
+        self.assertEqual(second.session.cookies.get("sessionid"), "s2")
+
+    @override_settings(BIOTIME_HTTP_RETRIES=5)
+    def test_retry_limits_follow_setting(self):
+        retries = _build_pooled_session().get_adapter("https://biotime.test").max_retries
+
+        self.assertEqual((retries.total, retries.connect, retries.read), (5, 5, 4))
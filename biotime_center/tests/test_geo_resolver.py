@@ -0,0 +1,56 @@
+# ============================================================
+# 📂 الملف: biotime_center/tests/test_geo_resolver.py
+# 🧪 Cached Geo Resolver — Non-Blocking Devices API
+# ============================================================
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+from django.utils import timezone
+
+from biotime_center.models import BiotimeIPGeoCache
+from biotime_center.services import geo_resolver
+
+
+class GeoResolverTests(TestCase):
+    def test_private_ips_never_schedule_lookup(self):
+        with patch.object(geo_resolver, "_schedule_resolution") as schedule:
+            result = geo_resolver.get_locations_for_ips(["192.168.1.10", "10.0.0.5"])
+
+        schedule.assert_not_called()
+        self.assertEqual(result["192.168.1.10"]["status"], "unavailable")
+
+    def test_misses_are_pending_and_cached_rows_are_served(self):
+        BiotimeIPGeoCache.objects.create(
+            ip_address="8.8.8.8",
+            location_text="Riyadh - Riyadh Region",
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        with patch.object(geo_resolver, "_schedule_resolution") as schedule:
+            result = geo_resolver.get_locations_for_ips(["8.8.8.8", "1.1.1.1"])
+
+        schedule.assert_called_once_with(["1.1.1.1"])
+        self.assertEqual(result["8.8.8.8"]["text"], "Riyadh - Riyadh Region")
+        self.assertEqual(result["1.1.1.1"]["status"], "pending")
+
+    def test_batch_lookup_stores_positive_and_negative_results(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = [
+            {"status": "success", "city": "Jeddah", "regionName": "Makkah"},
+            {"status": "fail", "message": "reserved range"},
+        ]
+
+        with patch.object(geo_resolver.requests, "post", return_value=response) as post:
+            geo_resolver.resolve_ips_now(["8.8.4.4", "9.9.9.9"])
+
+        post.assert_called_once()
+        self.assertEqual(
+            BiotimeIPGeoCache.objects.get(ip_address="8.8.4.4").location_text,
+            "Jeddah - Makkah",
+        )
+        self.assertEqual(
+            BiotimeIPGeoCache.objects.get(ip_address="9.9.9.9").status,
+            BiotimeIPGeoCache.STATUS_NOT_FOUND,
+        )
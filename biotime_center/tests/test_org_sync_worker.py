@@ -0,0 +1,75 @@
+# ============================================================
+# 📂 الملف: biotime_center/tests/test_org_sync_worker.py
+# 🧪 Deferred Org Sync — Markers + Coalesced Worker
+# ============================================================
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from biotime_center.models import (
+    BiotimeOrgObjectType,
+    BiotimeOrgSyncMarker,
+    BiotimeSetting,
+)
+from biotime_center.services.org_sync_worker import sync_company_org_markers
+from biotime_center.sync_service import _generate_biotime_code
+from company_manager.models import Company, CompanyDepartment
+
+
+class OrgSyncWorkerTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name="Biotime Co", is_active=False)
+        BiotimeSetting.objects.create(
+            company=self.company,
+            server_url="https://biotime.test",
+            biotime_company="acme",
+            email="admin@example.com",
+            password="secret",
+        )
+
+    def test_department_save_queues_marker_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            department = CompanyDepartment.objects.create(
+                company=self.company,
+                name="HR",
+            )
+
+        marker = BiotimeOrgSyncMarker.objects.get()
+        self.assertEqual(marker.object_type, BiotimeOrgObjectType.DEPARTMENT)
+        self.assertEqual(marker.object_id, department.id)
+        self.assertTrue(marker.is_dirty)
+
+    def test_worker_authenticates_once_and_creates_only_missing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            existing = CompanyDepartment.objects.create(company=self.company, name="A")
+            missing = CompanyDepartment.objects.create(company=self.company, name="B")
+
+        client = MagicMock(base_url="https://acme.biotime.test")
+        client._get.return_value = MagicMock(
+            status_code=200,
+            json=MagicMock(
+                return_value={
+                    "data": [{"dept_code": _generate_biotime_code("DEPT", existing.id)}],
+                    "next": None,
+                }
+            ),
+        )
+
+        with patch(
+            "biotime_center.sync_service.get_authenticated_client",
+            return_value=(client, None),
+        ) as mock_auth, patch(
+            "biotime_center.sync_service.get_or_create_department",
+            return_value={"id": 99},
+        ) as mock_create:
+            result = sync_company_org_markers(self.company)
+
+        mock_auth.assert_called_once()
+        mock_create.assert_called_once_with(
+            client,
+            missing.name,
+            _generate_biotime_code("DEPT", missing.id),
+        )
+        self.assertEqual(result["synced"], 2)
+        self.assertFalse(BiotimeOrgSyncMarker.objects.filter(is_dirty=True).exists())
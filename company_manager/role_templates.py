@@ -96,9 +96,22 @@ def apply_role_templates(company):
 
     with transaction.atomic():
 
+        # الأدوار الموجودة مسبقًا (استعلام واحد → Idempotent)
+        existing_names = set(
+            CompanyRole.objects.filter(
+                company=company,
+                name__in=[role_label for _, role_label in DEFAULT_ROLE_TEMPLATES],
+            ).values_list("name", flat=True)
+        )
+
+        new_roles = []
+
         # loop على القوالب الافتراضية
         for role_code, role_label in DEFAULT_ROLE_TEMPLATES:
 
+            if role_label in existing_names:
+                continue
+
             template = ROLE_TEMPLATES.get(role_code, {})
 
             # استخراج معلومات الصلاحيات
@@ -118,10 +131,17 @@ def apply_role_templates(company):
                     actions = ROLE_TEMPLATES["MODULES"].get(module_name, {})
                     permissions[module_name] = actions
 
-            # إنشاء الدور الفعلي داخل الشركة
-            CompanyRole.objects.create(
-                company=company,
-                name=role_label,
-                permissions=permissions,
-                is_system_role=True
+            new_roles.append(
+                CompanyRole(
+                    company=company,
+                    name=role_label,
+                    permissions=permissions,
+                    is_system_role=True
+                )
             )
+
+        # إنشاء الأدوار الفعلية داخل الشركة (INSERT واحد)
+        if new_roles:
+            CompanyRole.objects.bulk_create(new_roles)
+
+        return len(new_roles)
@@ -0,0 +1,453 @@
+# ===============================================================
+# 🌱 Company Manager — Bulk Master Data Seeding Engine
+# ===============================================================
+# ✔ Catalog افتراضي واحد (أقسام / مسميات / أدوار / إجازات)
+# ✔ Diff: استعلام واحد لكل Model لمعرفة الموجود
+# ✔ bulk_create للمفقود فقط (Idempotent)
+# ✔ بدون post_save لكل سجل
+# ✔ Hook واحد مجمّع بعد الانتهاء: company_master_data_seeded
+# ===============================================================
+
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.dispatch import Signal
+
+from .models import (
+    CompanyBranch,
+    CompanyDepartment,
+    CompanyOffice,
+    JobTitle,
+)
+from .role_templates import apply_role_templates
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================================================
+# 📣 Aggregated Post-Seed Hook
+# ===============================================================
+# kwargs: company, created (dict[str, list[int]] → أسماء النماذج إلى IDs الجديدة)
+company_master_data_seeded = Signal()
+
+
+# ===============================================================
+# 📚 Default Catalog
+# ===============================================================
+DEFAULT_HQ_BRANCH_NAME = "المقر الرئيسي"
+DEFAULT_HQ_OFFICE_NAME = "مكتب رئيسي"
+
+DEFAULT_DEPARTMENTS = [
+    "الإدارة العامة",
+    "الموارد البشرية",
+    "المالية",
+    "تقنية المعلومات",
+    "المبيعات",
+]
+
+DEFAULT_JOB_TITLES = [
+    "مدير عام",
+    "مدير موارد بشرية",
+    "محاسب",
+    "موظف",
+    "مشرف",
+]
+
+DEFAULT_ANNUAL_LEAVE_POLICY = {
+    "annual_days": 21,
+    "carry_forward_enabled": True,
+    "carry_forward_limit": 15,
+    "reset_month": 1,
+    "is_active": True,
+}
+
+DEFAULT_LEAVE_TYPES = [
+    {
+        "name": "إجازة سنوية",
+        "category": "annual",
+        "annual_balance": 21,
+        "requires_manager_only": False,
+        "requires_hr_only": False,
+        "requires_attachment": False,
+        "max_days": 30,
+        "color": "#0A4D3C",
+    },
+    {
+        "name": "إجازة مرضية",
+        "category": "sick",
+        "annual_balance": 30,
+        "requires_manager_only": False,
+        "requires_hr_only": False,
+        "requires_attachment": True,
+        "max_days": 30,
+        "color": "#3B82F6",
+    },
+    {
+        "name": "إجازة أمومة",
+        "category": "maternity",
+        "annual_balance": 10,
+        "requires_manager_only": False,
+        "requires_hr_only": True,
+        "requires_attachment": True,
+        "max_days": 70,
+        "color": "#EC4899",
+    },
+    {
+        "name": "إجازة زواج",
+        "category": "marriage",
+        "annual_balance": 5,
+        "requires_manager_only": False,
+        "requires_hr_only": False,
+        "requires_attachment": False,
+        "max_days": 5,
+        "color": "#8B5CF6",
+    },
+    {
+        "name": "إجازة وفاة",
+        "category": "death",
+        "annual_balance": 3,
+        "requires_manager_only": False,
+        "requires_hr_only": False,
+        "requires_attachment": False,
+        "max_days": 5,
+        "color": "#F97316",
+    },
+    {
+        "name": "إجازة حج",
+        "category": "hajj",
+        "annual_balance": 10,
+        "requires_manager_only": False,
+        "requires_hr_only": True,
+        "requires_attachment": False,
+        "max_days": 10,
+        "color": "#059669",
+    },
+    {
+        "name": "إجازة دراسية",
+        "category": "study",
+        "annual_balance": 15,
+        "requires_manager_only": False,
+        "requires_hr_only": True,
+        "requires_attachment": True,
+        "max_days": 30,
+        "color": "#14B8A6",
+    },
+    {
+        "name": "إجازة بدون راتب",
+        "category": "unpaid",
+        "annual_balance": 999,
+        "requires_manager_only": False,
+        "requires_hr_only": True,
+        "requires_attachment": False,
+        "max_days": 60,
+        "color": "#6B7280",
+    },
+]
+
+DEFAULT_LEAVE_POLICIES = {
+    "annual": {
+        "default_days": 21,
+        "carry_forward_enabled": True,
+        "carry_forward_limit": 15,
+        "reset_month": 1,
+        "paid_leave": True,
+        "requires_manager_approval": True,
+        "requires_hr_approval": False,
+        "max_consecutive_days": 30,
+        "gender_restriction": None,
+        "is_active": True,
+    },
+    "sick": {
+        "default_days": 30,
+        "carry_forward_enabled": False,
+        "carry_forward_limit": None,
+        "reset_month": 1,
+        "paid_leave": True,
+        "requires_manager_approval": True,
+        "requires_hr_approval": False,
+        "max_consecutive_days": 30,
+        "gender_restriction": None,
+        "is_active": True,
+    },
+    "maternity": {
+        "default_days": 10,
+        "carry_forward_enabled": False,
+        "carry_forward_limit": None,
+        "reset_month": 1,
+        "paid_leave": True,
+        "requires_manager_approval": False,
+        "requires_hr_approval": True,
+        "max_consecutive_days": 70,
+        "gender_restriction": "female",
+        "is_active": True,
+    },
+    "marriage": {
+        "default_days": 5,
+        "carry_forward_enabled": False,
+        "carry_forward_limit": None,
+        "reset_month": 1,
+        "paid_leave": True,
+        "requires_manager_approval": True,
+        "requires_hr_approval": False,
+        "max_consecutive_days": 5,
+        "gender_restriction": None,
+        "is_active": True,
+    },
+    "death": {
+        "default_days": 3,
+        "carry_forward_enabled": False,
+        "carry_forward_limit": None,
+        "reset_month": 1,
+        "paid_leave": True,
+        "requires_manager_approval": True,
+        "requires_hr_approval": False,
+        "max_consecutive_days": 5,
+        "gender_restriction": None,
+        "is_active": True,
+    },
+    "hajj": {
+        "default_days": 10,
+        "carry_forward_enabled": False,
+        "carry_forward_limit": None,
+        "reset_month": 1,
+        "paid_leave": True,
+        "requires_manager_approval": True,
+        "requires_hr_approval": True,
+        "max_consecutive_days": 10,
+        "gender_restriction": None,
+        "is_active": True,
+    },
+    "study": {
+        "default_days": 15,
+        "carry_forward_enabled": False,
+        "carry_forward_limit": None,
+        "reset_month": 1,
+        "paid_leave": True,
+        "requires_manager_approval": True,
+        "requires_hr_approval": True,
+        "max_consecutive_days": 30,
+        "gender_restriction": None,
+        "is_active": True,
+    },
+    "unpaid": {
+        "default_days": 999,
+        "carry_forward_enabled": False,
+        "carry_forward_limit": None,
+        "reset_month": 1,
+        "paid_leave": False,
+        "requires_manager_approval": True,
+        "requires_hr_approval": True,
+        "max_consecutive_days": 60,
+        "gender_restriction": None,
+        "is_active": True,
+    },
+}
+
+
+# ===============================================================
+# 🧩 Helpers
+# ===============================================================
+def _bulk_create_missing_by_name(model, company, names):
+    """
+    إنشاء الأسماء المفقودة فقط (استعلام قراءة واحد + bulk_create واحد).
+    يرجع IDs للسجلات الجديدة.
+    """
+    existing = set(
+        model.objects.filter(company=company, name__in=names).values_list("name", flat=True)
+    )
+    missing = [name for name in names if name not in existing]
+
+    if not missing:
+        return []
+
+    model.objects.bulk_create([model(company=company, name=name) for name in missing])
+
+    # MySQL لا يرجع PKs من bulk_create → قراءة واحدة
+    return list(
+        model.objects.filter(company=company, name__in=missing).values_list("id", flat=True)
+    )
+
+
+# ===============================================================
+# 🏢 Structure (HQ Branch / Office / Roles / Departments / Titles)
+# ===============================================================
+def seed_company_structure(company, created=None):
+    created = created if created is not None else {}
+
+    # الفرع الرئيسي عبر save عادي → Biotime marker من post_save الخاص به
+    branch, _ = CompanyBranch.objects.get_or_create(
+        company=company,
+        name=DEFAULT_HQ_BRANCH_NAME,
+        defaults={
+            "city": "غير محدد",
+            "address": company.short_address or "—",
+        },
+    )
+
+    CompanyOffice.objects.get_or_create(
+        branch=branch,
+        name=DEFAULT_HQ_OFFICE_NAME,
+        defaults={
+            "floor": "1",
+            "description": "تم الإنشاء تلقائيًا",
+        },
+    )
+
+    apply_role_templates(company)
+
+    created["CompanyDepartment"] = _bulk_create_missing_by_name(
+        CompanyDepartment, company, DEFAULT_DEPARTMENTS
+    )
+    created["JobTitle"] = _bulk_create_missing_by_name(
+        JobTitle, company, DEFAULT_JOB_TITLES
+    )
+
+    return created
+
+
+# ===============================================================
+# 🌴 Leave Master Data (Annual Policy / Types / Policies)
+# ===============================================================
+def seed_company_leave_catalog(company, created=None):
+    created = created if created is not None else {}
+
+    try:
+        LeaveType = apps.get_model("leave_center", "LeaveType")
+        LeavePolicy = apps.get_model("leave_center", "LeavePolicy")
+        CompanyAnnualLeavePolicy = apps.get_model("leave_center", "CompanyAnnualLeavePolicy")
+    except Exception:
+        logger.exception("❌ Failed loading leave_center models for seed")
+        return created
+
+    # -----------------------------------------------------------
+    # 1️⃣ Company Annual Leave Policy
+    # -----------------------------------------------------------
+    CompanyAnnualLeavePolicy.objects.get_or_create(
+        company=company,
+        defaults=DEFAULT_ANNUAL_LEAVE_POLICY,
+    )
+
+    # -----------------------------------------------------------
+    # 2️⃣ Leave Types — Diff + Soft Backfill
+    # -----------------------------------------------------------
+    catalog = {item["category"]: item for item in DEFAULT_LEAVE_TYPES}
+
+    existing_types = {
+        leave_type.category: leave_type
+        for leave_type in LeaveType.objects.filter(company=company, category__in=catalog)
+    }
+
+    new_types = [
+        LeaveType(company=company, **item)
+        for category, item in catalog.items()
+        if category not in existing_types
+    ]
+
+    backfill = []
+    backfill_fields = set()
+
+    for category, leave_type in existing_types.items():
+        item = catalog[category]
+        changed = False
+
+        if not leave_type.name:
+            leave_type.name = item["name"]
+            backfill_fields.add("name")
+            changed = True
+
+        if leave_type.annual_balance in [None, 0]:
+            leave_type.annual_balance = item["annual_balance"]
+            backfill_fields.add("annual_balance")
+            changed = True
+
+        if leave_type.color in [None, "", "#0ea5e9"]:
+            leave_type.color = item["color"]
+            backfill_fields.add("color")
+            changed = True
+
+        if leave_type.max_days in [None, 0]:
+            leave_type.max_days = item["max_days"]
+            backfill_fields.add("max_days")
+            changed = True
+
+        if changed:
+            backfill.append(leave_type)
+
+    if backfill:
+        LeaveType.objects.bulk_update(backfill, sorted(backfill_fields))
+
+    if new_types:
+        LeaveType.objects.bulk_create(new_types)
+        existing_types = {
+            leave_type.category: leave_type
+            for leave_type in LeaveType.objects.filter(company=company, category__in=catalog)
+        }
+        created["LeaveType"] = [
+            existing_types[row.category].id
+            for row in new_types
+            if row.category in existing_types
+        ]
+
+    # -----------------------------------------------------------
+    # 3️⃣ Leave Policies — Diff by leave_type
+    # -----------------------------------------------------------
+    covered_type_ids = set(
+        LeavePolicy.objects.filter(company=company).values_list("leave_type_id", flat=True)
+    )
+
+    new_policies = [
+        LeavePolicy(
+            company=company,
+            leave_type=existing_types[category],
+            **policy_defaults,
+        )
+        for category, policy_defaults in DEFAULT_LEAVE_POLICIES.items()
+        if category in existing_types and existing_types[category].id not in covered_type_ids
+    ]
+
+    if new_policies:
+        LeavePolicy.objects.bulk_create(new_policies)
+        created["LeavePolicy"] = len(new_policies)
+
+    return created
+
+
+# ===============================================================
+# 🚀 Public Entry
+# ===============================================================
+def seed_company_defaults(company, *, structure=True, leave=True):
+    """
+    تجهيز كل البيانات الافتراضية لشركة في transaction واحدة
+    ثم إطلاق company_master_data_seeded مرة واحدة.
+    """
+
+    created = {}
+
+    with transaction.atomic():
+        if structure:
+            seed_company_structure(company, created)
+
+        if leave:
+            try:
+                with transaction.atomic():
+                    seed_company_leave_catalog(company, created)
+            except Exception:
+                logger.exception(
+                    "❌ Failed seeding leave master data | company_id=%s",
+                    getattr(company, "id", None),
+                )
+
+    company_master_data_seeded.send(
+        sender=company.__class__,
+        company=company,
+        created=created,
+    )
+
+    logger.info(
+        "✅ Company master data seeded | company_id=%s | created=%s",
+        getattr(company, "id", None),
+        {key: (len(value) if isinstance(value, list) else value) for key, value in created.items()},
+    )
+
+    return created
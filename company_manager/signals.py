@@ -1,30 +1,27 @@
 # ===============================================================
 # 🔔 Company Manager — SAFE Signals (NO BILLING)
-# Ultra Stable V29.4 — Biotime Auto Sync + Leave Types / Leave Policies Seed ✅
+# Ultra Stable V29.6 — Deferred Biotime Sync + Bulk Master Data Seed ✅
 # ===============================================================
 print("🔥 company_manager.signals LOADED")
 
 import logging
 
-from django.apps import apps
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from .models import (
     Company,
     CompanyBranch,
-    CompanyOffice,
     CompanyDepartment,
     JobTitle,
 )
-from .role_templates import apply_role_templates
+from .seeding import company_master_data_seeded, seed_company_defaults
 
-from biotime_center.models import BiotimeSetting
+from biotime_center.models import BiotimeOrgObjectType, BiotimeSetting
 from biotime_center.biotime_api_client import BiotimeAPIClient
-from biotime_center.sync_service import (
-    create_or_sync_branch,
-    create_or_sync_department,
-    create_or_sync_jobtitle,
+from biotime_center.services.org_sync_worker import (
+    enqueue_org_object_sync,
+    enqueue_org_objects_sync,
 )
 
 logger = logging.getLogger(__name__)
@@ -41,307 +38,9 @@ ENABLE_COMPANY_SIGNALS = True
 # ===============================================================
 def seed_company_leave_master_data(company):
     """
-    إنشاء بيانات الإجازات الأساسية للشركة بشكل آمن وبدون تكرار.
-
-    ما يتم إنشاؤه:
-    1) LeaveType الأساسية
-    2) CompanyAnnualLeavePolicy
-    3) LeavePolicy الافتراضية لكل نوع
-
-    ملاحظات:
-    - الاستيراد داخلي لتجنب أي circular import
-    - لا يكسر النظام إذا لم تكن جداول leave_center جاهزة
-    - يعمل بشكل idempotent
+    إنشاء بيانات الإجازات الأساسية للشركة (Bulk — انظر seeding.py).
     """
-    try:
-        LeaveType = apps.get_model("leave_center", "LeaveType")
-        LeavePolicy = apps.get_model("leave_center", "LeavePolicy")
-        CompanyAnnualLeavePolicy = apps.get_model("leave_center", "CompanyAnnualLeavePolicy")
-    except Exception:
-        logger.exception("❌ Failed loading leave_center models for seed")
-        return
-
-    # -----------------------------------------------------------
-    # 1️⃣ Company Annual Leave Policy
-    # -----------------------------------------------------------
-    try:
-        CompanyAnnualLeavePolicy.objects.get_or_create(
-            company=company,
-            defaults={
-                "annual_days": 21,
-                "carry_forward_enabled": True,
-                "carry_forward_limit": 15,
-                "reset_month": 1,
-                "is_active": True,
-            },
-        )
-    except Exception:
-        logger.exception(
-            "❌ Failed seeding CompanyAnnualLeavePolicy | company_id=%s",
-            getattr(company, "id", None),
-        )
-
-    # -----------------------------------------------------------
-    # 2️⃣ Leave Types الأساسية
-    # -----------------------------------------------------------
-    default_leave_types = [
-        {
-            "name": "إجازة سنوية",
-            "category": "annual",
-            "annual_balance": 21,
-            "requires_manager_only": False,
-            "requires_hr_only": False,
-            "requires_attachment": False,
-            "max_days": 30,
-            "color": "#0A4D3C",
-        },
-        {
-            "name": "إجازة مرضية",
-            "category": "sick",
-            "annual_balance": 30,
-            "requires_manager_only": False,
-            "requires_hr_only": False,
-            "requires_attachment": True,
-            "max_days": 30,
-            "color": "#3B82F6",
-        },
-        {
-            "name": "إجازة أمومة",
-            "category": "maternity",
-            "annual_balance": 10,
-            "requires_manager_only": False,
-            "requires_hr_only": True,
-            "requires_attachment": True,
-            "max_days": 70,
-            "color": "#EC4899",
-        },
-        {
-            "name": "إجازة زواج",
-            "category": "marriage",
-            "annual_balance": 5,
-            "requires_manager_only": False,
-            "requires_hr_only": False,
-            "requires_attachment": False,
-            "max_days": 5,
-            "color": "#8B5CF6",
-        },
-        {
-            "name": "إجازة وفاة",
-            "category": "death",
-            "annual_balance": 3,
-            "requires_manager_only": False,
-            "requires_hr_only": False,
-            "requires_attachment": False,
-            "max_days": 5,
-            "color": "#F97316",
-        },
-        {
-            "name": "إجازة حج",
-            "category": "hajj",
-            "annual_balance": 10,
-            "requires_manager_only": False,
-            "requires_hr_only": True,
-            "requires_attachment": False,
-            "max_days": 10,
-            "color": "#059669",
-        },
-        {
-            "name": "إجازة دراسية",
-            "category": "study",
-            "annual_balance": 15,
-            "requires_manager_only": False,
-            "requires_hr_only": True,
-            "requires_attachment": True,
-            "max_days": 30,
-            "color": "#14B8A6",
-        },
-        {
-            "name": "إجازة بدون راتب",
-            "category": "unpaid",
-            "annual_balance": 999,
-            "requires_manager_only": False,
-            "requires_hr_only": True,
-            "requires_attachment": False,
-            "max_days": 60,
-            "color": "#6B7280",
-        },
-    ]
-
-    created_types_by_category = {}
-
-    for item in default_leave_types:
-        try:
-            leave_type, _ = LeaveType.objects.get_or_create(
-                company=company,
-                category=item["category"],
-                defaults={
-                    "name": item["name"],
-                    "annual_balance": item["annual_balance"],
-                    "requires_manager_only": item["requires_manager_only"],
-                    "requires_hr_only": item["requires_hr_only"],
-                    "requires_attachment": item["requires_attachment"],
-                    "max_days": item["max_days"],
-                    "color": item["color"],
-                },
-            )
-
-            # ---------------------------------------------------
-            # ✅ Soft backfill لو النوع موجود لكنه ناقص بعض الحقول
-            # ---------------------------------------------------
-            update_fields = []
-
-            if not getattr(leave_type, "name", None):
-                leave_type.name = item["name"]
-                update_fields.append("name")
-
-            if getattr(leave_type, "annual_balance", None) in [None, 0]:
-                leave_type.annual_balance = item["annual_balance"]
-                update_fields.append("annual_balance")
-
-            if getattr(leave_type, "color", None) in [None, "", "#0ea5e9"]:
-                leave_type.color = item["color"]
-                update_fields.append("color")
-
-            if getattr(leave_type, "max_days", None) in [None, 0]:
-                leave_type.max_days = item["max_days"]
-                update_fields.append("max_days")
-
-            if update_fields:
-                leave_type.save(update_fields=update_fields)
-
-            created_types_by_category[item["category"]] = leave_type
-
-        except Exception:
-            logger.exception(
-                "❌ Failed seeding LeaveType | company_id=%s | category=%s",
-                getattr(company, "id", None),
-                item["category"],
-            )
-
-    # -----------------------------------------------------------
-    # 3️⃣ LeavePolicy الافتراضية
-    # -----------------------------------------------------------
-    default_policies = {
-        "annual": {
-            "default_days": 21,
-            "carry_forward_enabled": True,
-            "carry_forward_limit": 15,
-            "reset_month": 1,
-            "paid_leave": True,
-            "requires_manager_approval": True,
-            "requires_hr_approval": False,
-            "max_consecutive_days": 30,
-            "gender_restriction": None,
-            "is_active": True,
-        },
-        "sick": {
-            "default_days": 30,
-            "carry_forward_enabled": False,
-            "carry_forward_limit": None,
-            "reset_month": 1,
-            "paid_leave": True,
-            "requires_manager_approval": True,
-            "requires_hr_approval": False,
-            "max_consecutive_days": 30,
-            "gender_restriction": None,
-            "is_active": True,
-        },
-        "maternity": {
-            "default_days": 10,
-            "carry_forward_enabled": False,
-            "carry_forward_limit": None,
-            "reset_month": 1,
-            "paid_leave": True,
-            "requires_manager_approval": False,
-            "requires_hr_approval": True,
-            "max_consecutive_days": 70,
-            "gender_restriction": "female",
-            "is_active": True,
-        },
-        "marriage": {
-            "default_days": 5,
-            "carry_forward_enabled": False,
-            "carry_forward_limit": None,
-            "reset_month": 1,
-            "paid_leave": True,
-            "requires_manager_approval": True,
-            "requires_hr_approval": False,
-            "max_consecutive_days": 5,
-            "gender_restriction": None,
-            "is_active": True,
-        },
-        "death": {
-            "default_days": 3,
-            "carry_forward_enabled": False,
-            "carry_forward_limit": None,
-            "reset_month": 1,
-            "paid_leave": True,
-            "requires_manager_approval": True,
-            "requires_hr_approval": False,
-            "max_consecutive_days": 5,
-            "gender_restriction": None,
-            "is_active": True,
-        },
-        "hajj": {
-            "default_days": 10,
-            "carry_forward_enabled": False,
-            "carry_forward_limit": None,
-            "reset_month": 1,
-            "paid_leave": True,
-            "requires_manager_approval": True,
-            "requires_hr_approval": True,
-            "max_consecutive_days": 10,
-            "gender_restriction": None,
-            "is_active": True,
-        },
-        "study": {
-            "default_days": 15,
-            "carry_forward_enabled": False,
-            "carry_forward_limit": None,
-            "reset_month": 1,
-            "paid_leave": True,
-            "requires_manager_approval": True,
-            "requires_hr_approval": True,
-            "max_consecutive_days": 30,
-            "gender_restriction": None,
-            "is_active": True,
-        },
-        "unpaid": {
-            "default_days": 999,
-            "carry_forward_enabled": False,
-            "carry_forward_limit": None,
-            "reset_month": 1,
-            "paid_leave": False,
-            "requires_manager_approval": True,
-            "requires_hr_approval": True,
-            "max_consecutive_days": 60,
-            "gender_restriction": None,
-            "is_active": True,
-        },
-    }
-
-    for category, policy_defaults in default_policies.items():
-        leave_type = created_types_by_category.get(category)
-        if not leave_type:
-            continue
-
-        try:
-            LeavePolicy.objects.get_or_create(
-                company=company,
-                leave_type=leave_type,
-                defaults=policy_defaults,
-            )
-        except Exception:
-            logger.exception(
-                "❌ Failed seeding LeavePolicy | company_id=%s | category=%s",
-                getattr(company, "id", None),
-                category,
-            )
-
-    logger.info(
-        "✅ Leave master data seeded successfully | company_id=%s",
-        getattr(company, "id", None),
-    )
+    return seed_company_defaults(company, structure=False, leave=True)
 
 
 # ===============================================================
@@ -349,50 +48,11 @@ def seed_company_leave_master_data(company):
 # ===============================================================
 def seed_company_master_data(company):
     """
-    إنشاء البيانات الأساسية للشركة
-    - آمن
-    - لا يكرر
+    إنشاء البيانات الأساسية للشركة (أقسام / مسميات / إجازات)
+    - Bulk بدل get_or_create لكل سجل
     - بدون أي Billing Logic
     """
-
-    # -------------------------------
-    # Departments
-    # -------------------------------
-    default_departments = [
-        "الإدارة العامة",
-        "الموارد البشرية",
-        "المالية",
-        "تقنية المعلومات",
-        "المبيعات",
-    ]
-
-    for name in default_departments:
-        CompanyDepartment.objects.get_or_create(
-            company=company,
-            name=name,
-        )
-
-    # -------------------------------
-    # Job Titles
-    # -------------------------------
-    default_titles = [
-        "مدير عام",
-        "مدير موارد بشرية",
-        "محاسب",
-        "موظف",
-        "مشرف",
-    ]
-
-    for name in default_titles:
-        JobTitle.objects.get_or_create(
-            company=company,
-            name=name,
-        )
-
-    # -------------------------------
-    # Leave Types + Policies
-    # -------------------------------
-    seed_company_leave_master_data(company)
+    return seed_company_defaults(company)
 
 
 # ===============================================================
@@ -402,6 +62,7 @@ def seed_company_master_data(company):
 def company_post_create_init(sender, instance, created, **kwargs):
     """
     Signal آمن لتجهيز الشركة بعد إنشائها
+    (فرع رئيسي / مكتب / أدوار / أقسام / مسميات / إجازات)
     """
 
     if not ENABLE_COMPANY_SIGNALS:
@@ -413,39 +74,32 @@ def company_post_create_init(sender, instance, created, **kwargs):
     if not instance.is_active:
         return
 
-    # -------------------------------
-    # 1️⃣ Branch (HQ)
-    # -------------------------------
-    branch, _ = CompanyBranch.objects.get_or_create(
-        company=instance,
-        name="المقر الرئيسي",
-        defaults={
-            "city": "غير محدد",
-            "address": instance.short_address or "—",
-        },
-    )
-
-    # -------------------------------
-    # 2️⃣ Office
-    # -------------------------------
-    CompanyOffice.objects.get_or_create(
-        branch=branch,
-        name="مكتب رئيسي",
-        defaults={
-            "floor": "1",
-            "description": "تم الإنشاء تلقائيًا",
-        },
-    )
-
-    # -------------------------------
-    # 3️⃣ Roles
-    # -------------------------------
-    apply_role_templates(instance)
-
-    # -------------------------------
-    # 4️⃣ Master Data
-    # -------------------------------
-    seed_company_master_data(instance)
+    seed_company_defaults(instance)
+
+
+# ===============================================================
+# 🌱 Post-Seed Hook → Biotime (One Enqueue Per Type)
+# ===============================================================
+@receiver(company_master_data_seeded)
+def enqueue_seeded_org_objects(sender, company, created, **kwargs):
+
+    if not ENABLE_COMPANY_SIGNALS:
+        return
+
+    # bulk_create لا يطلق post_save → تسجيل العلامات هنا دفعة واحدة
+    try:
+        enqueue_org_objects_sync(
+            company_id=company.id,
+            object_type=BiotimeOrgObjectType.DEPARTMENT,
+            object_ids=created.get("CompanyDepartment") or [],
+        )
+        enqueue_org_objects_sync(
+            company_id=company.id,
+            object_type=BiotimeOrgObjectType.JOB_TITLE,
+            object_ids=created.get("JobTitle") or [],
+        )
+    except Exception:
+        logger.exception("🔥 Failed queueing seeded org Biotime sync")
 
 
 # ===============================================================
@@ -483,18 +137,11 @@ def sync_branch_to_biotime(sender, instance, created, **kwargs):
     if not created:
         return
 
+    # ⏳ Deferred: علامة Dirty بعد commit — الـ Worker يدفعها لاحقًا
     try:
-        create_or_sync_branch(instance)
-
-        logger.info(
-            "✅ Branch synced via Service | id=%s | name=%s | code=%s",
-            instance.id,
-            instance.name,
-            instance.biotime_code,
-        )
-
+        enqueue_org_object_sync(instance, BiotimeOrgObjectType.BRANCH)
     except Exception:
-        logger.exception("🔥 Failed syncing branch to Biotime")
+        logger.exception("🔥 Failed queueing branch Biotime sync")
 
 
 # ===============================================================
@@ -509,18 +156,11 @@ def sync_department_to_biotime(sender, instance, created, **kwargs):
     if not created:
         return
 
+    # ⏳ Deferred: علامة Dirty بعد commit — الـ Worker يدفعها لاحقًا
     try:
-        create_or_sync_department(instance)
-
-        logger.info(
-            "✅ Department synced via Service | id=%s | name=%s | code=%s",
-            instance.id,
-            instance.name,
-            instance.biotime_code,
-        )
-
+        enqueue_org_object_sync(instance, BiotimeOrgObjectType.DEPARTMENT)
     except Exception:
-        logger.exception("🔥 Failed syncing department to Biotime")
+        logger.exception("🔥 Failed queueing department Biotime sync")
 
 
 # ===============================================================
@@ -535,15 +175,8 @@ def sync_jobtitle_to_biotime(sender, instance, created, **kwargs):
     if not created:
         return
 
+    # ⏳ Deferred: علامة Dirty بعد commit — الـ Worker يدفعها لاحقًا
     try:
-        create_or_sync_jobtitle(instance)
-
-        logger.info(
-            "✅ JobTitle synced via Service | id=%s | name=%s | code=%s",
-            instance.id,
-            instance.name,
-            instance.biotime_code,
-        )
-
+        enqueue_org_object_sync(instance, BiotimeOrgObjectType.JOB_TITLE)
     except Exception:
-        logger.exception("🔥 Failed syncing job title to Biotime")
\ No newline at end of file
+        logger.exception("🔥 Failed queueing job title Biotime sync")
\ No newline at end of file
@@ -1,3 +1,99 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from api.system.companies.directory import (
+    paginate_tenants,
+    serialize_tenant,
+    tenant_directory_queryset,
+)
+
+from company_manager.models import Company, CompanyDepartment, CompanyRole, CompanyUser, JobTitle
+from company_manager.seeding import (
+    DEFAULT_DEPARTMENTS,
+    DEFAULT_JOB_TITLES,
+    company_master_data_seeded,
+    seed_company_defaults,
+)
+
+
+class CompanySeedingTests(TestCase):
+    def test_new_company_is_seeded_in_bulk(self):
+        company = Company.objects.create(name="Seed Co", is_active=True)
+
+        self.assertEqual(
+            CompanyDepartment.objects.filter(company=company).count(),
+            len(DEFAULT_DEPARTMENTS),
+        )
+        self.assertEqual(
+            JobTitle.objects.filter(company=company).count(),
+            len(DEFAULT_JOB_TITLES),
+        )
+        self.assertTrue(CompanyRole.objects.filter(company=company).exists())
+
+    def test_reseed_is_idempotent_and_hook_fires_once(self):
+        company = Company.objects.create(name="Seed Co", is_active=True)
+        roles_before = CompanyRole.objects.filter(company=company).count()
+
+        calls = []
+
+        def _capture(sender, company, created, **kwargs):
+            calls.append(created)
+
+        company_master_data_seeded.connect(_capture)
+        try:
+            seed_company_defaults(company)
+        finally:
+            company_master_data_seeded.disconnect(_capture)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0]["CompanyDepartment"], [])
+        self.assertEqual(calls[0]["JobTitle"], [])
+        self.assertEqual(
+            CompanyRole.objects.filter(company=company).count(),
+            roles_before,
+        )
+        self.assertEqual(
+            CompanyDepartment.objects.filter(company=company).count(),
+            len(DEFAULT_DEPARTMENTS),
+        )
+
+
+class TenantDirectoryTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_user(username="directory-admin", password="x")
+
+        for index in range(5):
+            company = Company.objects.create(name=f"Tenant {index}", is_active=False)
+            for user_index in range(index):
+                CompanyUser.objects.create(
+                    company=company,
+                    user=User.objects.create_user(username=f"t{index}-u{user_index}", password="x"),
+                )
+
+    def test_listing_takes_constant_queries(self):
+        with self.assertNumQueries(1):
+            companies, next_cursor = paginate_tenants(tenant_directory_queryset(), sort="-users_count", limit=3)
+            rows = [serialize_tenant(company) for company in companies]
+
+        self.assertEqual([row["users_count"] for row in rows], [4, 3, 2])
+        self.assertIsNotNone(next_cursor)
+
+    def test_keyset_pages_cover_all_tenants_once(self):
+        self.client.force_login(self.admin)
+
+        names, cursor = [], None
+        while True:
+            params = {"limit": 2, "sort": "name"}
+            if cursor:
+                params["cursor"] = cursor
+            payload = self.client.get("/api/system/companies/list/", params).json()
+            names.extend(row["name"] for row in payload["results"])
+            cursor = payload["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(names, [f"Tenant {index}" for index in range(5)])
+
+        legacy = self.client.get("/api/system/companies/list/", {"q": "tenant 3"}).json()
+        self.assertEqual([row["name"] for row in legacy], ["Tenant 3"])
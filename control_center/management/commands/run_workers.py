@@ -0,0 +1,104 @@
+# control_center/management/commands/run_workers.py
+# ============================================================
+# 🧵 Background Workers Process — Schedulers + Job Store
+# ============================================================
+# الاستخدام:
+#   python manage.py run_workers
+#   python manage.py run_workers --only biotime_attendance --only auto_billing
+#   python manage.py run_workers --exclude whatsapp_gateway
+# 💳 auto_billing / subscription_renewal: Opt-in
+#   (WORKERS_ENABLE_AUTO_BILLING / WORKERS_ENABLE_SUBSCRIPTION_RENEWAL أو --only)
+# ============================================================
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from primey_hrm.workers import WORKERS, JobMetricsRecorder, beat, is_worker_enabled
+
+
+class Command(BaseCommand):
+    help = "Run all background schedulers / workers in a dedicated process"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            action="append",
+            default=[],
+            help=f"Run only these workers ({', '.join(WORKERS)})",
+        )
+        parser.add_argument(
+            "--exclude",
+            action="append",
+            default=[],
+            help="Skip these workers",
+        )
+        parser.add_argument(
+            "--heartbeat",
+            type=int,
+            default=30,
+            help="Heartbeat interval in seconds",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["only"] + options["exclude"]) - set(WORKERS)
+        if unknown:
+            raise CommandError(f"Unknown workers: {', '.join(sorted(unknown))}")
+
+        selected = [
+            name for name in WORKERS
+            if (not options["only"] or name in options["only"])
+            and name not in options["exclude"]
+        ]
+
+        disabled = [name for name in selected if not is_worker_enabled(name, options["only"])]
+        if disabled:
+            self.stdout.write(
+                self.style.WARNING(f"⏸️ Opt-in workers not enabled: {', '.join(disabled)}")
+            )
+            selected = [name for name in selected if name not in disabled]
+
+        recorder = JobMetricsRecorder()
+        schedulers = []
+        started = []
+
+        for name in selected:
+            try:
+                scheduler = WORKERS[name]()
+            except Exception as exc:
+                self.stderr.write(self.style.ERROR(f"❌ {name}: {exc}"))
+                continue
+
+            if scheduler is not None:
+                recorder.attach(name, scheduler)
+                schedulers.append(scheduler)
+
+            started.append(name)
+            self.stdout.write(self.style.SUCCESS(f"✔ {name} started"))
+
+        if not started:
+            raise CommandError("No workers started.")
+
+        stop = threading.Event()
+
+        def _shutdown(*_):
+            stop.set()
+
+        signal.signal(signal.SIGTERM, _shutdown)
+        signal.signal(signal.SIGINT, _shutdown)
+
+        interval = max(options["heartbeat"], 1)
+        self.stdout.write(self.style.WARNING(f"🧵 Workers running: {', '.join(started)}"))
+
+        while not stop.is_set():
+            beat(started, interval)
+            stop.wait(interval)
+
+        for scheduler in schedulers:
+            try:
+                scheduler.shutdown(wait=False)
+            except Exception:
+                pass
+
+        self.stdout.write(self.style.SUCCESS("✔ Workers stopped."))
@@ -1,3 +1,42 @@
-from django.test import TestCase
+from types import SimpleNamespace
 
-# Create your tests here.
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_SUBMITTED
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+
+from primey_hrm.workers import METRICS_CACHE_KEY, JobMetricsRecorder, get_worker_status, is_worker_enabled
+
+
+# ============================================================
+# 🧵 run_workers — Job Metrics
+# ============================================================
+class WorkerMetricsTests(SimpleTestCase):
+    def setUp(self):
+        cache.delete(METRICS_CACHE_KEY)
+
+    def test_recorder_publishes_runs_failures_and_durations(self):
+        recorder = JobMetricsRecorder()
+
+        for code in (EVENT_JOB_SUBMITTED, EVENT_JOB_EXECUTED, EVENT_JOB_SUBMITTED, EVENT_JOB_ERROR):
+            recorder.handle("auto_billing", SimpleNamespace(code=code, job_id="daily_auto_billing"))
+
+        status = get_worker_status()
+        job = status["jobs"][0]
+
+        self.assertFalse(status["alive"])
+        self.assertEqual((job["runs"], job["failures"], job["running"]), (2, 1, 0))
+        self.assertEqual(job["last_status"], "failed")
+        self.assertIsNotNone(job["last_duration_seconds"])
+
+    def test_unknown_worker_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("run_workers", only=["nope"])
+
+    @override_settings(WORKERS_ENABLE_AUTO_BILLING=False, WORKERS_ENABLE_SUBSCRIPTION_RENEWAL=True)
+    def test_billing_workers_are_opt_in(self):
+        self.assertFalse(is_worker_enabled("auto_billing"))
+        self.assertTrue(is_worker_enabled("auto_billing", only=["auto_billing"]))
+        self.assertTrue(is_worker_enabled("subscription_renewal"))
+        self.assertTrue(is_worker_enabled("leave_balances"))
@@ -25,4 +25,9 @@ python manage.py collectstatic --noinput
 echo "♻️ Restarting backend service..."
 sudo systemctl restart primeyhr-backend
 
+if systemctl list-unit-files | grep -q "^primeyhr-workers"; then
+  echo "🧵 Restarting background workers (manage.py run_workers)..."
+  sudo systemctl restart primeyhr-workers
+fi
+
 echo "✅ Backend deployment completed successfully."
@@ -0,0 +1,27 @@
+# employee_center/management/commands/rebuild_employee_search_index.py
+
+from django.core.management.base import BaseCommand
+
+from employee_center.services.search_index import reindex_employees
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employee search index (EmployeeSearchToken)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--company", type=int, help="Rebuild one company only")
+
+    def handle(self, *args, **options):
+        from employee_center.models import Employee
+
+        employee_ids = None
+        if options.get("company"):
+            employee_ids = Employee.objects.filter(
+                company_id=options["company"],
+            ).values_list("id", flat=True)
+
+        self.stdout.write(self.style.WARNING("🔎 Rebuilding employee search index..."))
+
+        indexed = reindex_employees(employee_ids)
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Indexed Employees: {indexed}"))
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_manager', '0002_companybranch_biotime_code_and_more'),
+        ('employee_center', '0009_remove_employee_drive_file_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeImportBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(choices=[('processing', 'قيد المعالجة'), ('completed', 'مكتمل'), ('failed', 'فشل')], default='processing', max_length=20)),
+                ('send_welcome', models.BooleanField(default=True)),
+                ('push_biotime', models.BooleanField(default=False)),
+                ('employee_ids', models.JSONField(blank=True, default=list)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('processed_count', models.PositiveIntegerField(default=0)),
+                ('biotime_pushed_count', models.PositiveIntegerField(default=0)),
+                ('biotime_failed_count', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='employee_import_batches', to='company_manager.company', verbose_name='الشركة')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employee_import_batches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'دفعة استيراد موظفين',
+                'verbose_name_plural': 'دفعات استيراد الموظفين',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:37
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# نسخة ثابتة من تطبيع search_index (الـ migration لا تعتمد على الكود الحالي)
+EMPLOYEE_SEARCH_FIELDS = ("full_name", "arabic_name", "national_id", "employee_number")
+USER_SEARCH_FIELDS = ("username", "email")
+
+ARABIC_MARKS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+TOKEN_SPLIT = re.compile(r"[\W_]+")
+
+ARABIC_CHAR_MAP = str.maketrans({
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ة": "ه",
+    "ى": "ي",
+    "ئ": "ي",
+    "ؤ": "و",
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+})
+
+
+def search_tokens_for(*values):
+    tokens = set()
+
+    for value in values:
+        text = unicodedata.normalize("NFKC", str(value or ""))
+        text = ARABIC_MARKS.sub("", text).translate(ARABIC_CHAR_MAP).casefold()
+
+        for token in TOKEN_SPLIT.split(text):
+            if not token:
+                continue
+            token = token[:64]
+            tokens.add(token)
+            if token.startswith("ال") and len(token) > 3:
+                tokens.add(token[2:])
+
+    return tokens
+
+
+def build_search_index(apps, schema_editor):
+    # بناء الفهرس للموظفين الحاليين على دفعات
+    Employee = apps.get_model("employee_center", "Employee")
+    EmployeeSearchToken = apps.get_model("employee_center", "EmployeeSearchToken")
+
+    last_id = 0
+    while True:
+        employees = list(
+            Employee.objects.select_related("user").filter(id__gt=last_id).order_by("id")[:500]
+        )
+        if not employees:
+            return
+
+        EmployeeSearchToken.objects.bulk_create(
+            [
+                EmployeeSearchToken(company_id=employee.company_id, employee_id=employee.id, token=token)
+                for employee in employees
+                for token in search_tokens_for(
+                    *(getattr(employee, field) for field in EMPLOYEE_SEARCH_FIELDS),
+                    *(getattr(employee.user, field) for field in USER_SEARCH_FIELDS),
+                )
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        last_id = employees[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_manager', '0002_companybranch_biotime_code_and_more'),
+        ('employee_center', '0010_employeeimportbatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='employee_search_tokens', to='company_manager.company')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='employee_center.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', 'token'], name='emp_search_company_token')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='employeesearchtoken',
+            constraint=models.UniqueConstraint(fields=('employee', 'token'), name='uniq_employee_search_token'),
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -597,4 +597,102 @@ class SyncLog(models.Model):
         verbose_name_plural = "سجلات المزامنة"
 
     def __str__(self):
-        return f"{self.company} — {self.sync_type} — {self.status}"
\ No newline at end of file
+        return f"{self.company} — {self.sync_type} — {self.status}"
+
+# ===============================================================
+# 📥 (11) EmployeeImportBatch — الاستيراد الجماعي للموظفين
+# ===============================================================
+class EmployeeImportBatch(models.Model):
+    """
+    دفعة استيراد موظفين (CSV / XLSX).
+    الإنشاء يتم داخل الطلب (bulk_create) — الآثار الجانبية
+    (ترحيب / Biotime) تُنفذ في الخلفية على دفعات مع مؤشر استئناف.
+    """
+
+    STATUS_PROCESSING = "processing"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PROCESSING, "قيد المعالجة"),
+        (STATUS_COMPLETED, "مكتمل"),
+        (STATUS_FAILED, "فشل"),
+    ]
+
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="employee_import_batches",
+        verbose_name="الشركة",
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="employee_import_batches",
+    )
+
+    file_name = models.CharField(max_length=255, blank=True, default="")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PROCESSING)
+
+    send_welcome = models.BooleanField(default=True)
+    push_biotime = models.BooleanField(default=False)
+
+    employee_ids = models.JSONField(default=list, blank=True)
+    created_count = models.PositiveIntegerField(default=0)
+
+    # 🔁 مؤشر الاستئناف (عدد الموظفين الذين عولجت آثارهم الجانبية)
+    processed_count = models.PositiveIntegerField(default=0)
+    biotime_pushed_count = models.PositiveIntegerField(default=0)
+    biotime_failed_count = models.PositiveIntegerField(default=0)
+
+    error_message = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "دفعة استيراد موظفين"
+        verbose_name_plural = "دفعات استيراد الموظفين"
+
+    def __str__(self):
+        return f"{self.company} — {self.created_count} — {self.status}"
+
+
+# ===============================================================
+# 🔎 (12) EmployeeSearchToken — فهرس البحث
+# ===============================================================
+class EmployeeSearchToken(models.Model):
+    """
+    كلمة مطبّعة واحدة لكل صف (عربي: بدون تشكيل + توحيد الألف/التاء المربوطة).
+    البحث = LIKE 'term%' على (company, token) → يستخدم الفهرس بدل مسح الجدول.
+    يُحدَّث تلقائيًا عند حفظ Employee / User (signals).
+    """
+
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="employee_search_tokens",
+    )
+
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="search_tokens",
+    )
+
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["company", "token"], name="emp_search_company_token"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "token"], name="uniq_employee_search_token"),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} — {self.token}"
@@ -0,0 +1,30 @@
+# ============================================================
+# ⏰ Employee Import Sweep (run_workers)
+# ============================================================
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from primey_hrm.db_connections import with_db_connection
+from primey_hrm.distributed_lock import single_instance_job
+
+from .services.bulk_import import process_pending_import_batches
+
+
+@with_db_connection
+@single_instance_job("scheduler:employee_center:import_batches", 30 * 60)
+def process_pending_import_batches_job():
+    process_pending_import_batches()
+
+
+def start_scheduler():
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(
+        process_pending_import_batches_job,
+        trigger="interval",
+        seconds=60,
+        id="process_pending_import_batches",
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.start()
+    return scheduler
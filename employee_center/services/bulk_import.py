@@ -0,0 +1,818 @@
+# ============================================================
+# 📥 Employee Bulk Import — CSV / XLSX
+# Mham Cloud | Employee Center
+# ============================================================
+# ✔ parse_import_file: CSV (UTF-8 / BOM) أو XLSX (read_only)
+# ✔ validate_import_rows: كل الأخطاء دفعة واحدة قبل أي كتابة
+#   (استعلام واحد لكل نوع: أقسام / مسميات / فروع / تكرار)
+# ✔ import_employees: كل شيء أو لا شيء داخل transaction واحدة
+#   - فحص حد الاشتراك يقفل صف العداد → الإنشاء بالتسلسل لنفس الشركة
+#   - أرقام الموظفين + أسماء المستخدمين تُحجز ككتلة
+#   - bulk_create: User / CompanyUser / Employee / Branches
+#     / EmploymentInfo / LeaveBalance / UserProfile
+#   - bulk_create لا يطلق Signals → الرصيد والعداد وفهرس البحث هنا
+# ✔ process_import_batch: ترحيب + Biotime في الخلفية على دفعات
+#   (مؤشر استئناف processed_count + Sweep في run_workers)
+# ============================================================
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import re
+from datetime import date, datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from auth_center.models import UserProfile
+from billing_center.services.subscription_limits import check_employee_creation_limit
+from billing_center.services.usage_counters import USAGE_EMPLOYEES, adjust_usage
+from company_manager.models import CompanyBranch, CompanyDepartment, CompanyUser, JobTitle
+from employee_center.models import Employee, EmployeeImportBatch, EmploymentInfo
+from employee_center.services.search_index import reindex_employees
+from leave_center.models import LeaveBalance
+from primey_hrm.db_connections import DBThreadPoolExecutor
+from primey_hrm.distributed_lock import DistributedLock
+from whatsapp_center.utils import normalize_phone_number
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+IMPORT_LOCK_PREFIX = "employee-import:batch:"
+IMPORT_LOCK_TTL = 10 * 60
+BIOTIME_BASE_CODE = 1001
+BULK_BATCH_SIZE = 500
+
+# عمود الملف → الحقل (إنجليزي أو عربي)
+HEADER_ALIASES = {
+    "full_name": ("full_name", "الاسم الكامل"),
+    "arabic_name": ("arabic_name", "الاسم بالعربي"),
+    "national_id": ("national_id", "رقم الهوية"),
+    "employee_number": ("employee_number", "رقم الموظف"),
+    "username": ("username", "اسم المستخدم"),
+    "email": ("email", "البريد الإلكتروني"),
+    "mobile_number": ("mobile_number", "رقم الجوال"),
+    "department": ("department", "القسم"),
+    "job_title": ("job_title", "المسمى الوظيفي"),
+    "branches": ("branches", "الفروع"),
+    "join_date": ("join_date", "تاريخ الالتحاق"),
+    "gender": ("gender", "الجنس"),
+}
+
+REQUIRED_COLUMNS = ("full_name", "national_id", "department")
+
+GENDER_VALUES = {
+    "male": "male",
+    "ذكر": "male",
+    "female": "female",
+    "أنثى": "female",
+    "انثى": "female",
+}
+
+BRANCH_SEPARATORS = re.compile(r"[,،|]")
+
+_executor = DBThreadPoolExecutor(max_workers=1, thread_name_prefix="employee-import")
+
+
+class ImportValidationError(Exception):
+    """
+    أخطاء الملف كاملة: [{"row", "field", "message"}, ...]
+    """
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} import error(s)")
+        self.errors = errors
+
+
+class ImportLimitExceeded(Exception):
+    def __init__(self, limit_check, requested):
+        super().__init__(limit_check.code)
+        self.limit_check = limit_check
+        self.requested = requested
+
+
+def _max_rows():
+    return int(getattr(settings, "EMPLOYEE_IMPORT_MAX_ROWS", 2000) or 2000)
+
+
+def _side_effect_batch_size():
+    return max(int(getattr(settings, "EMPLOYEE_IMPORT_SIDE_EFFECT_BATCH", 50) or 1), 1)
+
+
+def _error(row, field, message):
+    return {"row": row, "field": field, "message": message}
+
+
+# ============================================================
+# 📄 Parse
+# ============================================================
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value
+    # أرقام Excel (هوية / جوال) تصل float → بدون ".0"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _header_map(headers):
+    lookup = {
+        alias.strip().lower(): field
+        for field, aliases in HEADER_ALIASES.items()
+        for alias in aliases
+    }
+    return {
+        index: lookup[str(header or "").strip().lower()]
+        for index, header in enumerate(headers)
+        if str(header or "").strip().lower() in lookup
+    }
+
+
+def _iter_csv(uploaded_file):
+    text = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text)
+    finally:
+        text.detach()
+
+
+def _iter_xlsx(uploaded_file):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def parse_import_file(uploaded_file, file_name=""):
+    """
+    يرجع [(row_number, {field: value}), ...] — row_number كما يظهر في الملف.
+    """
+    name = (file_name or getattr(uploaded_file, "name", "") or "").lower()
+
+    if name.endswith(".xlsx"):
+        rows = _iter_xlsx(uploaded_file)
+    elif name.endswith(".csv"):
+        rows = _iter_csv(uploaded_file)
+    else:
+        raise ImportValidationError([_error(None, "file", "صيغة الملف غير مدعومة (CSV / XLSX فقط).")])
+
+    try:
+        headers = next(rows, None)
+        if not headers:
+            raise ImportValidationError([_error(None, "file", "الملف فارغ.")])
+
+        columns = _header_map(headers)
+        missing = [field for field in REQUIRED_COLUMNS if field not in columns.values()]
+        if missing:
+            raise ImportValidationError([
+                _error(1, field, "العمود مطلوب في الملف.") for field in missing
+            ])
+
+        max_rows = _max_rows()
+        parsed = []
+
+        for row_number, values in enumerate(rows, start=2):
+            record = {
+                field: _cell(values[index]) if index < len(values) else ""
+                for index, field in columns.items()
+            }
+            if not any(record.values()):
+                continue
+
+            if len(parsed) >= max_rows:
+                raise ImportValidationError([
+                    _error(None, "file", f"الحد الأقصى {max_rows} صف لكل ملف."),
+                ])
+
+            parsed.append((row_number, record))
+
+    except UnicodeDecodeError:
+        raise ImportValidationError([_error(None, "file", "ترميز الملف يجب أن يكون UTF-8.")])
+
+    if not parsed:
+        raise ImportValidationError([_error(None, "file", "لا توجد صفوف للاستيراد.")])
+
+    return parsed
+
+
+# ============================================================
+# ✅ Validate (All Up Front)
+# ============================================================
+def _parse_date(value):
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+
+    raise ValueError(value)
+
+
+def _by_name(queryset):
+    return {obj.name.strip().lower(): obj for obj in queryset if obj.name}
+
+
+def validate_import_rows(company, rows):
+    """
+    يتحقق من كل الصفوف ويرجع الصفوف الجاهزة للإنشاء.
+    أي خطأ → ImportValidationError بكل الأخطاء (لا كتابة جزئية).
+    """
+    errors = []
+
+    departments = _by_name(CompanyDepartment.objects.filter(company=company))
+    job_titles = _by_name(JobTitle.objects.filter(company=company))
+    branches = _by_name(CompanyBranch.objects.filter(company=company))
+
+    seen = {"national_id": {}, "employee_number": {}, "username": {}, "email": {}}
+    prepared = []
+
+    for row_number, raw in rows:
+        item = {
+            "row": row_number,
+            "full_name": str(raw.get("full_name") or "").strip(),
+            "arabic_name": str(raw.get("arabic_name") or "").strip() or None,
+            "national_id": str(raw.get("national_id") or "").strip(),
+            "employee_number": str(raw.get("employee_number") or "").strip() or None,
+            "username": str(raw.get("username") or "").strip() or None,
+            "email": str(raw.get("email") or "").strip() or None,
+            "mobile_number": str(raw.get("mobile_number") or "").strip() or None,
+            "department": None,
+            "job_title": None,
+            "branch_ids": [],
+            "join_date": None,
+            "gender": None,
+        }
+
+        if not item["full_name"]:
+            errors.append(_error(row_number, "full_name", "الاسم الكامل مطلوب."))
+
+        if not item["national_id"]:
+            errors.append(_error(row_number, "national_id", "رقم الهوية مطلوب."))
+        elif len(item["national_id"]) > 20:
+            errors.append(_error(row_number, "national_id", "رقم الهوية أطول من 20 خانة."))
+
+        department_name = str(raw.get("department") or "").strip()
+        if not department_name:
+            errors.append(_error(row_number, "department", "القسم مطلوب."))
+        else:
+            item["department"] = departments.get(department_name.lower())
+            if item["department"] is None:
+                errors.append(_error(row_number, "department", f"القسم غير موجود: {department_name}"))
+
+        job_title_name = str(raw.get("job_title") or "").strip()
+        if job_title_name:
+            item["job_title"] = job_titles.get(job_title_name.lower())
+            if item["job_title"] is None:
+                errors.append(_error(row_number, "job_title", f"المسمى الوظيفي غير موجود: {job_title_name}"))
+
+        for branch_name in BRANCH_SEPARATORS.split(str(raw.get("branches") or "")):
+            branch_name = branch_name.strip()
+            if not branch_name:
+                continue
+            branch = branches.get(branch_name.lower())
+            if branch is None:
+                errors.append(_error(row_number, "branches", f"الفرع غير موجود: {branch_name}"))
+            elif branch.id not in item["branch_ids"]:
+                item["branch_ids"].append(branch.id)
+
+        try:
+            item["join_date"] = _parse_date(raw.get("join_date"))
+        except ValueError:
+            errors.append(_error(row_number, "join_date", "صيغة التاريخ YYYY-MM-DD."))
+
+        gender = str(raw.get("gender") or "").strip().lower()
+        if gender:
+            item["gender"] = GENDER_VALUES.get(gender)
+            if item["gender"] is None:
+                errors.append(_error(row_number, "gender", "الجنس: male / female."))
+
+        if item["email"]:
+            try:
+                validate_email(item["email"])
+            except ValidationError:
+                errors.append(_error(row_number, "email", "البريد الإلكتروني غير صالح."))
+
+        # 🔁 التكرار داخل الملف
+        for field, values in seen.items():
+            value = item[field]
+            if not value:
+                continue
+            key = value.lower()
+            if key in values:
+                errors.append(_error(row_number, field, f"مكرر في الملف (الصف {values[key]})."))
+            else:
+                values[key] = row_number
+
+        prepared.append(item)
+
+    # 🔁 التكرار مع قاعدة البيانات (استعلام واحد لكل حقل)
+    def _conflicts(field, queryset, lookup):
+        values = [item[field] for item in prepared if item[field]]
+        if not values:
+            return
+        taken = set(queryset.filter(**{f"{lookup}__in": values}).values_list(lookup, flat=True))
+        for item in prepared:
+            if item[field] in taken:
+                errors.append(_error(item["row"], field, "مستخدم مسبقًا."))
+
+    _conflicts("national_id", Employee.objects.filter(company=company), "national_id")
+    _conflicts("employee_number", Employee.objects.filter(company=company), "employee_number")
+
+    # username / email: مقارنة بدون حالة الأحرف (ترتيب MySQL الافتراضي case-insensitive
+    # → Ali@x.com يتعارض مع ali@x.com عند الإدراج)
+    for field in ("username", "email"):
+        taken = _taken_lowercase(field, [item[field] for item in prepared if item[field]])
+        for item in prepared:
+            if item[field] and item[field].lower() in taken:
+                errors.append(_error(item["row"], field, "مستخدم مسبقًا."))
+
+    if errors:
+        errors.sort(key=lambda error: (error["row"] or 0, error["field"]))
+        raise ImportValidationError(errors)
+
+    return prepared
+
+
+# ============================================================
+# 🔢 Block Allocation
+# ============================================================
+def _allocate_employee_numbers(company, count, reserved):
+    """
+    قراءة واحدة لأعلى تسلسل ثم حجز كتلة متتالية
+    (تتخطى أرقامًا مذكورة صراحة في نفس الملف).
+    """
+    prefix, _, seq = Employee(company_id=company.id)._generate_employee_number().rpartition("-")
+    seq = int(seq)
+
+    numbers = []
+    while len(numbers) < count:
+        candidate = f"{prefix}-{seq:05d}"
+        seq += 1
+        if candidate not in reserved:
+            numbers.append(candidate)
+
+    return numbers
+
+
+def _taken_lowercase(field, values):
+    """
+    القيم المستخدمة مسبقًا في User (بأحرف صغيرة) — استعلام واحد.
+    """
+    values = {value.lower() for value in values if value}
+    if not values:
+        return set()
+
+    return set(
+        User.objects
+        .annotate(_lowered=Lower(field))
+        .filter(_lowered__in=values)
+        .values_list("_lowered", flat=True)
+    )
+
+
+def _allocate_usernames(items):
+    """
+    username صريح (تم التحقق منه) أو رقم الهوية،
+    وعند التعارض لاحقة عشوائية — استعلام واحد لكل محاولة.
+    """
+    usernames = {}
+    used = set()
+    pending = {}
+
+    for index, item in enumerate(items):
+        if item["username"]:
+            usernames[index] = item["username"]
+            used.add(item["username"].lower())
+        else:
+            pending[index] = item["national_id"]
+
+    attempt = 0
+    while pending:
+        candidates = {
+            index: base if attempt == 0 else f"{base}_{get_random_string(4).lower()}"
+            for index, base in pending.items()
+        }
+        taken = _taken_lowercase("username", candidates.values())
+
+        retry = {}
+        for index, candidate in candidates.items():
+            if candidate.lower() in taken or candidate.lower() in used:
+                retry[index] = pending[index]
+                continue
+            usernames[index] = candidate
+            used.add(candidate.lower())
+
+        pending = retry
+        attempt += 1
+
+    return [usernames[index] for index in range(len(items))]
+
+
+# ============================================================
+# 📥 Import
+# ============================================================
+def _check_limit(company, requested):
+    limit_check = check_employee_creation_limit(company)
+
+    if not limit_check.allowed or (
+        limit_check.remaining is not None and requested > limit_check.remaining
+    ):
+        raise ImportLimitExceeded(limit_check, requested)
+
+    return limit_check
+
+
+@transaction.atomic
+def import_employees(
+    company,
+    rows,
+    *,
+    actor=None,
+    file_name="",
+    send_welcome=True,
+    push_biotime=False,
+    dry_run=False,
+):
+    """
+    rows من parse_import_file.
+    dry_run=True → تحقق + فحص الحد فقط (يرجع None).
+    """
+    items = validate_import_rows(company, rows)
+    _check_limit(company, len(items))
+
+    if dry_run:
+        return None
+
+    # ----------------------------------------------------
+    # 🔢 حجز الأرقام + أسماء المستخدمين
+    # ----------------------------------------------------
+    explicit_numbers = {item["employee_number"] for item in items if item["employee_number"]}
+    generated = iter(_allocate_employee_numbers(
+        company,
+        sum(1 for item in items if not item["employee_number"]),
+        explicit_numbers,
+    ))
+    for item in items:
+        if not item["employee_number"]:
+            item["employee_number"] = next(generated)
+
+    usernames = _allocate_usernames(items)
+
+    # ----------------------------------------------------
+    # 👤 Users (كلمة مرور غير قابلة للاستخدام → استعادة كلمة المرور)
+    # ----------------------------------------------------
+    User.objects.bulk_create(
+        [
+            User(
+                username=username,
+                email=item["email"] or "",
+                password=make_password(None),
+                is_active=True,
+            )
+            for item, username in zip(items, usernames)
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    # MySQL لا يرجع المعرفات من bulk_create → قراءة واحدة
+    user_ids = dict(
+        User.objects.filter(username__in=usernames).values_list("username", "id")
+    )
+
+    CompanyUser.objects.bulk_create(
+        [
+            CompanyUser(company=company, user_id=user_ids[username], role="EMPLOYEE", is_active=True)
+            for username in usernames
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    # ----------------------------------------------------
+    # 👥 Employees
+    # ----------------------------------------------------
+    employees = []
+    for item, username in zip(items, usernames):
+        optional = {
+            field: item[field]
+            for field in ("join_date", "gender")
+            if item[field] is not None
+        }
+        employees.append(Employee(
+            company=company,
+            user_id=user_ids[username],
+            full_name=item["full_name"],
+            arabic_name=item["arabic_name"],
+            national_id=item["national_id"],
+            employee_number=item["employee_number"],
+            mobile_number=item["mobile_number"],
+            department=item["department"],
+            job_title=item["job_title"],
+            **optional,
+        ))
+
+    Employee.objects.bulk_create(employees, batch_size=BULK_BATCH_SIZE)
+    employee_ids = dict(
+        Employee.objects
+        .filter(company=company, employee_number__in=[item["employee_number"] for item in items])
+        .values_list("employee_number", "id")
+    )
+    ordered_ids = [employee_ids[item["employee_number"]] for item in items]
+
+    BranchLink = Employee.branches.through
+    BranchLink.objects.bulk_create(
+        [
+            BranchLink(employee_id=employee_id, companybranch_id=branch_id)
+            for item, employee_id in zip(items, ordered_ids)
+            for branch_id in item["branch_ids"]
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    EmploymentInfo.objects.bulk_create(
+        [EmploymentInfo(employee_id=employee_id) for employee_id in ordered_ids],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    # 🌴 نفس أرصدة auto_create_leave_balance (قيم النموذج الافتراضية)
+    LeaveBalance.objects.bulk_create(
+        [LeaveBalance(employee_id=employee_id, company=company) for employee_id in ordered_ids],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    # 📱 نفس _sync_user_profile_contact (لإشعارات واتساب)
+    UserProfile.objects.bulk_create(
+        [
+            UserProfile(
+                user_id=user_ids[username],
+                phone_number=item["mobile_number"],
+                whatsapp_number=normalize_phone_number(item["mobile_number"]) or item["mobile_number"],
+            )
+            for item, username in zip(items, usernames)
+            if item["mobile_number"]
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    adjust_usage(company.id, USAGE_EMPLOYEES, len(ordered_ids))
+    reindex_employees(ordered_ids)
+
+    batch = EmployeeImportBatch.objects.create(
+        company=company,
+        created_by=actor if getattr(actor, "pk", None) else None,
+        file_name=(file_name or "")[:255],
+        send_welcome=send_welcome,
+        push_biotime=push_biotime,
+        employee_ids=ordered_ids,
+        created_count=len(ordered_ids),
+    )
+    transaction.on_commit(lambda: submit_import_batch(batch.id))
+
+    logger.info(
+        "📥 Employees imported | company=%s | batch=%s | count=%s",
+        company.id,
+        batch.id,
+        len(ordered_ids),
+    )
+
+    return batch
+
+
+def submit_import_batch(batch_id):
+    try:
+        _executor.submit(process_import_batch, batch_id)
+    except Exception:
+        # تبقى processing → يلتقطها الـ Sweep في run_workers
+        logger.exception("❌ Failed to submit employee import batch | batch=%s", batch_id)
+
+
+# ============================================================
+# ⚙️ Side Effects (Background, Batched, Resumable)
+# ============================================================
+def _send_welcome(employees, actor):
+    from notification_center.services_hr import notify_employee_imported
+
+    for employee in employees:
+        try:
+            notify_employee_imported(employee, send_email=True, send_whatsapp=True, actor=actor)
+        except Exception:
+            logger.exception("⚠️ Import welcome failed (non-blocking) | employee=%s", employee.id)
+
+
+def _push_to_biotime(company, employees):
+    """
+    مزامنة الأقسام / المسميات / الفروع مرة واحدة لكل قيمة مميزة،
+    ثم حجز كتلة emp_code وإرسال الموظفين.
+    يرجع (pushed, failed).
+    """
+    from biotime_center.sync_service import (
+        create_or_sync_branch,
+        create_or_sync_department,
+        create_or_sync_jobtitle,
+        get_authenticated_client,
+        push_employee_to_biotime,
+    )
+
+    ready = [
+        employee for employee in employees
+        if not employee.biotime_code
+        and employee.department_id
+        and employee.job_title_id
+        and employee.branches.all()
+    ]
+    skipped = sum(1 for employee in employees if not employee.biotime_code) - len(ready)
+    if not ready:
+        return 0, skipped
+
+    client, error = get_authenticated_client(company=company)
+    if error or not client:
+        logger.warning("⚠️ Import Biotime push skipped | company=%s | error=%s", company.id, error)
+        return 0, skipped + len(ready)
+
+    synced = set()
+    for employee in ready:
+        for kind, obj, sync in (
+            ("department", employee.department, create_or_sync_department),
+            ("job_title", employee.job_title, create_or_sync_jobtitle),
+            *(("branch", branch, create_or_sync_branch) for branch in employee.branches.all()),
+        ):
+            if (kind, obj.id) in synced:
+                continue
+            synced.add((kind, obj.id))
+            try:
+                sync(obj, client=client)
+            except Exception:
+                logger.exception("❌ Import Biotime master sync failed | %s=%s", kind, obj.id)
+
+    local_numbers = [
+        int(code)
+        for code in (
+            Employee.objects
+            .filter(company=company)
+            .exclude(biotime_code__isnull=True)
+            .values_list("biotime_code", flat=True)
+        )
+        if str(code).isdigit()
+    ]
+    next_code = max(local_numbers) + 1 if local_numbers else BIOTIME_BASE_CODE
+
+    pushed = []
+    for employee in ready:
+        name_parts = employee.full_name.strip().split(" ")
+        emp_code = str(next_code)
+
+        try:
+            result = push_employee_to_biotime(
+                company=company,
+                emp_code=emp_code,
+                first_name=name_parts[0],
+                last_name=" ".join(name_parts[1:]) or "-",
+                area_codes=[branch.biotime_code for branch in employee.branches.all()],
+                dept_code=employee.department.biotime_code,
+                position_code=employee.job_title.biotime_code,
+                is_active=True,
+            )
+        except Exception:
+            logger.exception("❌ Import Biotime push failed | employee=%s", employee.id)
+            result = {}
+
+        if result.get("status") == "success":
+            employee.biotime_code = emp_code
+            pushed.append(employee)
+            next_code += 1
+
+    Employee.objects.bulk_update(pushed, ["biotime_code"])
+
+    return len(pushed), skipped + len(ready) - len(pushed)
+
+
+def process_import_batch(batch_id):
+    """
+    معالجة الآثار الجانبية على دفعات مع حفظ المؤشر بعد كل دفعة
+    (عملية ماتت → الـ Sweep يكمل من نفس الموضع).
+    """
+    with DistributedLock(f"{IMPORT_LOCK_PREFIX}{batch_id}", IMPORT_LOCK_TTL) as lock:
+        if not lock.acquired:
+            return None
+
+        batch = (
+            EmployeeImportBatch.objects
+            .select_related("company", "created_by")
+            .filter(id=batch_id, status=EmployeeImportBatch.STATUS_PROCESSING)
+            .first()
+        )
+        if batch is None:
+            return None
+
+        chunk_size = _side_effect_batch_size()
+        ids = list(batch.employee_ids or [])
+
+        try:
+            while batch.processed_count < len(ids):
+                chunk_ids = ids[batch.processed_count:batch.processed_count + chunk_size]
+                employees = list(
+                    Employee.objects
+                    .filter(id__in=chunk_ids, company=batch.company)
+                    .select_related("company", "user", "department", "job_title")
+                    .prefetch_related("branches")
+                    .order_by("id")
+                )
+
+                if batch.send_welcome:
+                    _send_welcome(employees, batch.created_by)
+
+                if batch.push_biotime:
+                    pushed, failed = _push_to_biotime(batch.company, employees)
+                    batch.biotime_pushed_count += pushed
+                    batch.biotime_failed_count += failed
+
+                batch.processed_count += len(chunk_ids)
+                batch.save(update_fields=[
+                    "processed_count",
+                    "biotime_pushed_count",
+                    "biotime_failed_count",
+                ])
+                lock.renew()
+
+        except Exception as exc:
+            logger.exception("❌ Employee import batch failed | batch=%s", batch.id)
+            batch.status = EmployeeImportBatch.STATUS_FAILED
+            batch.error_message = str(exc)[:2000]
+            batch.finished_at = timezone.now()
+            batch.save(update_fields=["status", "error_message", "finished_at"])
+            return batch
+
+        batch.status = EmployeeImportBatch.STATUS_COMPLETED
+        batch.finished_at = timezone.now()
+        batch.save(update_fields=["status", "finished_at"])
+
+        try:
+            from notification_center.services_hr import notify_employees_import_completed
+
+            notify_employees_import_completed(
+                batch.company,
+                batch.created_count,
+                send_email=batch.send_welcome,
+                actor=batch.created_by,
+                extra_context={"batch_id": batch.id},
+            )
+        except Exception:
+            logger.exception("⚠️ Import summary notification failed | batch=%s", batch.id)
+
+        return batch
+
+
+# ============================================================
+# 🧹 Sweep (run_workers)
+# ============================================================
+def process_pending_import_batches(limit=10):
+    """
+    دفعات لم تُرسل للـ executor أو توقفت في المنتصف → تكمل هنا.
+    """
+    pending_ids = list(
+        EmployeeImportBatch.objects
+        .filter(status=EmployeeImportBatch.STATUS_PROCESSING)
+        .order_by("created_at")
+        .values_list("id", flat=True)[:limit]
+    )
+
+    for batch_id in pending_ids:
+        process_import_batch(batch_id)
+
+    return len(pending_ids)
+
+
+def serialize_import_batch(batch):
+    return {
+        "batch_id": batch.id,
+        "status": batch.status,
+        "file_name": batch.file_name,
+        "created_count": batch.created_count,
+        "processed_count": batch.processed_count,
+        "biotime_pushed_count": batch.biotime_pushed_count,
+        "biotime_failed_count": batch.biotime_failed_count,
+        "send_welcome": batch.send_welcome,
+        "push_biotime": batch.push_biotime,
+        "error_message": batch.error_message,
+        "created_at": batch.created_at.isoformat() if batch.created_at else None,
+        "finished_at": batch.finished_at.isoformat() if batch.finished_at else None,
+    }
@@ -0,0 +1,195 @@
+# ============================================================
+# 🔎 Employee Search Index — Arabic-Aware Prefix Search
+# Mham Cloud | Employee Center
+# ============================================================
+# ✔ تطبيع عربي: حذف التشكيل والتطويل
+#   أ / إ / آ / ٱ → ا   |   ة → ه   |   ى / ئ → ي   |   ؤ → و
+#   الأرقام العربية/الفارسية → 0-9   |   casefold للإنجليزي
+# ✔ كل حقل يُقسّم إلى كلمات → صف لكل كلمة في EmployeeSearchToken
+#   (كلمة تبدأ بـ "ال" تُفهرس أيضًا بدونها: العتيبي → عتيبي)
+# ✔ البحث: كل كلمة في الاستعلام يجب أن تطابق بداية كلمة مفهرسة
+#   token LIKE 'term%' على فهرس (company, token) → بدون مسح كامل
+#   (istartswith: الكلمات casefold عند الكتابة، و startswith = LIKE BINARY
+#    على MySQL ولا يستخدم الفهرس)
+# ✔ الأرقام (هوية / رقم وظيفي): تطابق جزئي داخل الحقل كما كان سابقًا
+# ✔ التحديث: signals عند حفظ Employee / User
+#   bulk_create / update() لا تطلق signals → reindex_employees يدويًا
+# ============================================================
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from django.db.models import Q
+
+from employee_center.models import Employee, EmployeeSearchToken
+
+MAX_TOKEN_LENGTH = 64
+MAX_QUERY_TERMS = 6
+# أقل طول لرقم يُبحث عنه داخل national_id / employee_number
+MIN_IDENTIFIER_SUBSTRING = 3
+ARABIC_ARTICLE = "ال"
+
+# الحقول التي يُبنى منها الفهرس (تغيّرها → إعادة فهرسة)
+EMPLOYEE_SEARCH_FIELDS = ("full_name", "arabic_name", "national_id", "employee_number")
+USER_SEARCH_FIELDS = ("username", "email")
+
+_ARABIC_MARKS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_TOKEN_SPLIT = re.compile(r"[\W_]+")
+
+_ARABIC_CHAR_MAP = str.maketrans({
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ة": "ه",
+    "ى": "ي",
+    "ئ": "ي",
+    "ؤ": "و",
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+})
+
+
+# ============================================================
+# 🔤 Normalization
+# ============================================================
+def normalize_search_text(value) -> str:
+    text = unicodedata.normalize("NFKC", str(value or ""))
+    text = _ARABIC_MARKS.sub("", text)
+    return text.translate(_ARABIC_CHAR_MAP).casefold()
+
+
+def tokenize(value) -> list[str]:
+    return [
+        token[:MAX_TOKEN_LENGTH]
+        for token in _TOKEN_SPLIT.split(normalize_search_text(value))
+        if token
+    ]
+
+
+def search_tokens_for(*values) -> set[str]:
+    tokens = set()
+
+    for value in values:
+        for token in tokenize(value):
+            tokens.add(token)
+            if token.startswith(ARABIC_ARTICLE) and len(token) > len(ARABIC_ARTICLE) + 1:
+                tokens.add(token[len(ARABIC_ARTICLE):])
+
+    return tokens
+
+
+def employee_search_tokens(employee) -> set[str]:
+    user = getattr(employee, "user", None)
+
+    return search_tokens_for(
+        *(getattr(employee, field, None) for field in EMPLOYEE_SEARCH_FIELDS),
+        *(getattr(user, field, None) for field in USER_SEARCH_FIELDS),
+    )
+
+
+def search_terms(query) -> list[str]:
+    terms = []
+    for term in tokenize(query):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+# ============================================================
+# 🔎 Search
+# ============================================================
+def search_employees(queryset, company, query):
+    """
+    فلترة queryset (موظفو الشركة) بالاستعلام.
+    كل كلمة → Subquery على (company, token LIKE 'term%')،
+    والكلمات الرقمية تطابق أيضًا داخل national_id / employee_number.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    for term in terms:
+        condition = Q(
+            id__in=EmployeeSearchToken.objects
+            .filter(company=company, token__istartswith=term)
+            .values("employee_id")
+        )
+
+        # أرقام الهوية / الرقم الوظيفي: جزء من المنتصف يبقى قابلًا للبحث
+        if term.isdigit() and len(term) >= MIN_IDENTIFIER_SUBSTRING:
+            condition |= Q(national_id__contains=term) | Q(employee_number__contains=term)
+
+        queryset = queryset.filter(condition)
+
+    return queryset
+
+
+# ============================================================
+# ✏️ Maintenance
+# ============================================================
+def sync_employee_search_tokens(employee) -> None:
+    """
+    تحديث كلمات موظف واحد (الفرق فقط: حذف القديم + إضافة الجديد).
+    """
+    wanted = employee_search_tokens(employee)
+
+    existing = set(
+        EmployeeSearchToken.objects
+        .filter(employee_id=employee.id)
+        .values_list("token", "company_id")
+    )
+
+    stale = [
+        token for token, company_id in existing
+        if token not in wanted or company_id != employee.company_id
+    ]
+    if stale:
+        EmployeeSearchToken.objects.filter(employee_id=employee.id, token__in=stale).delete()
+
+    current = {
+        token for token, company_id in existing
+        if company_id == employee.company_id
+    }
+    EmployeeSearchToken.objects.bulk_create(
+        [
+            EmployeeSearchToken(company_id=employee.company_id, employee_id=employee.id, token=token)
+            for token in wanted - current
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def reindex_employees(employee_ids=None, chunk_size=500) -> int:
+    """
+    إعادة بناء الفهرس على دفعات (bulk paths + البناء الأولي).
+    employee_ids=None → كل الموظفين.
+    """
+    queryset = Employee.objects.select_related("user").order_by("id")
+    if employee_ids is not None:
+        queryset = queryset.filter(id__in=list(employee_ids))
+
+    indexed = 0
+    last_id = 0
+
+    while True:
+        employees = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        if not employees:
+            return indexed
+
+        ids = [employee.id for employee in employees]
+        EmployeeSearchToken.objects.filter(employee_id__in=ids).delete()
+        EmployeeSearchToken.objects.bulk_create(
+            [
+                EmployeeSearchToken(company_id=employee.company_id, employee_id=employee.id, token=token)
+                for employee in employees
+                for token in employee_search_tokens(employee)
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+        indexed += len(employees)
+        last_id = ids[-1]
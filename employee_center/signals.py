@@ -3,12 +3,22 @@
 # 🧭 Employee Signals — AUTO USER CREATION (FINAL)
 # ===============================================================
 
+import logging
+
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.utils.crypto import get_random_string
 
 from .models import Employee, EmploymentHistory
+from .services.search_index import (
+    EMPLOYEE_SEARCH_FIELDS,
+    USER_SEARCH_FIELDS,
+    sync_employee_search_tokens,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def generate_unique_username(base):
@@ -51,3 +61,39 @@ def ensure_employee_has_user(sender, instance, created, **kwargs):
         action_type="hire",
         description=f"إنشاء مستخدم تلقائيًا ({username})"
     )
+
+
+# ===============================================================
+# 🔎 Search Index — تحديث كلمات البحث عند الحفظ
+# (حفظ بـ update_fields لا يمس حقول البحث → لا شيء)
+# (savepoint: فشل الفهرسة لا يكسر transaction المستدعي)
+# ===============================================================
+@receiver(post_save, sender=Employee)
+def sync_employee_search_index(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & {*EMPLOYEE_SEARCH_FIELDS, "user", "company"}:
+        return
+
+    try:
+        with transaction.atomic():
+            sync_employee_search_tokens(instance)
+    except Exception:
+        logger.exception("❌ Employee search index sync failed | employee=%s", instance.id)
+
+
+@receiver(post_save, sender=get_user_model())
+def sync_user_employee_search_index(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+
+    if update_fields is not None and not set(update_fields) & set(USER_SEARCH_FIELDS):
+        return
+
+    employee = Employee.objects.select_related("user").filter(user_id=instance.id).first()
+    if employee is None:
+        return
+
+    try:
+        with transaction.atomic():
+            sync_employee_search_tokens(employee)
+    except Exception:
+        logger.exception("❌ Employee search index sync failed | employee=%s", employee.id)
@@ -1,3 +1,195 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection, transaction
 from django.test import TestCase
 
-# Create your tests here.
+from billing_center.models import CompanySubscription, CompanyUsageCounter, Product, SubscriptionPlan
+from company_manager.models import CompanyBranch, CompanyDepartment, Company, CompanyUser
+from employee_center.models import Employee, EmployeeImportBatch
+from employee_center.services.bulk_import import (
+    ImportLimitExceeded,
+    ImportValidationError,
+    import_employees,
+    parse_import_file,
+    process_import_batch,
+)
+from employee_center.services.search_index import search_employees
+from leave_center.models import LeaveBalance
+
+
+# ============================================================
+# 📥 Employee Bulk Import
+# ============================================================
+class EmployeeBulkImportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.company = Company.objects.create(name="Import Co", is_active=False)
+        self.admin = get_user_model().objects.create_user(username="import-admin", password="x")
+        CompanyUser.objects.create(company=self.company, user=self.admin)
+
+        CompanyDepartment.objects.create(company=self.company, name="Sales")
+        self.branch = CompanyBranch.objects.create(company=self.company, name="Riyadh")
+
+        product, _ = Product.objects.get_or_create(code="HR", defaults={"name": "HR"})
+        self.plan = SubscriptionPlan.objects.create(
+            product=product,
+            name="Import Plan",
+            price_monthly=Decimal("10.00"),
+            price_yearly=Decimal("100.00"),
+            max_employees=10,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            CompanySubscription.objects.create(company=self.company, plan=self.plan, status="ACTIVE")
+
+    def _rows(self, content, name="employees.csv"):
+        return parse_import_file(SimpleUploadedFile(name, content.encode("utf-8")), name)
+
+    def test_import_creates_employees_in_bulk(self):
+        rows = self._rows(
+            "\ufefffull_name,national_id,department,branches,mobile_number\n"
+            "Ali Saleh,1000000001,Sales,Riyadh,0500000001\n"
+            "Sara Omar,1000000002,sales,,\n"
+        )
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            batch = import_employees(self.company, rows, actor=self.admin, send_welcome=False)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(batch.created_count, 2)
+
+        employees = list(Employee.objects.filter(company=self.company).order_by("employee_number"))
+        prefix = f"EMP-{self.company.id:03d}-"
+        self.assertEqual(
+            [employee.employee_number for employee in employees],
+            [f"{prefix}00001", f"{prefix}00002"],
+        )
+        self.assertEqual(employees[0].user.username, "1000000001")
+        self.assertFalse(employees[0].user.has_usable_password())
+        self.assertEqual(list(employees[0].branches.all()), [self.branch])
+        self.assertEqual(employees[0].user.profile.whatsapp_number, "+966500000001")
+        self.assertEqual(LeaveBalance.objects.filter(company=self.company).count(), 2)
+        self.assertEqual(CompanyUsageCounter.objects.get(company=self.company).employees, 2)
+
+        process_import_batch(batch.id)
+        batch.refresh_from_db()
+        self.assertEqual(batch.status, EmployeeImportBatch.STATUS_COMPLETED)
+        self.assertEqual(batch.processed_count, 2)
+
+    def test_validation_reports_all_errors_and_writes_nothing(self):
+        rows = self._rows(
+            "full_name,national_id,department,branches\n"
+            "Ali Saleh,1000000001,Sales,Jeddah\n"
+            ",1000000001,Marketing,\n"
+        )
+
+        with self.assertRaises(ImportValidationError) as ctx:
+            import_employees(self.company, rows)
+
+        self.assertEqual(
+            [(error["row"], error["field"]) for error in ctx.exception.errors],
+            [(2, "branches"), (3, "department"), (3, "full_name"), (3, "national_id")],
+        )
+        self.assertFalse(Employee.objects.filter(company=self.company).exists())
+
+    def test_username_and_email_conflicts_ignore_case(self):
+        get_user_model().objects.create_user(username="ali.saleh", email="ali@example.com", password="x")
+        rows = self._rows(
+            "full_name,national_id,department,username,email\n"
+            "Ali Saleh,1000000001,Sales,Ali.Saleh,Ali@Example.com\n"
+        )
+
+        with self.assertRaises(ImportValidationError) as ctx:
+            import_employees(self.company, rows)
+
+        self.assertEqual(
+            [(error["row"], error["field"]) for error in ctx.exception.errors],
+            [(2, "email"), (2, "username")],
+        )
+
+    def test_import_respects_subscription_limit(self):
+        self.plan.max_employees = 1
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plan.save()
+
+        rows = self._rows(
+            "full_name,national_id,department\n"
+            "Ali Saleh,1000000001,Sales\n"
+            "Sara Omar,1000000002,Sales\n"
+        )
+
+        with self.assertRaises(ImportLimitExceeded):
+            import_employees(self.company, rows)
+
+        self.assertFalse(get_user_model().objects.filter(username="1000000001").exists())
+
+
+# ============================================================
+# 🔎 Employee Search Index (Arabic-Aware)
+# ============================================================
+class EmployeeSearchIndexTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name="Search Co", is_active=False)
+        self.other_company = Company.objects.create(name="Other Co", is_active=False)
+
+        self.ahmed = self._add(self.company, "search-1", "Ahmed Saleh", "أحمد العُتيبي", "1000000001")
+        self.fatima = self._add(self.company, "search-2", "Fatima Omar", "فاطمة الزهراء", "1000000002")
+        self._add(self.other_company, "search-3", "Ahmad Other", "أحمد", "1000000003")
+
+    def _add(self, company, username, full_name, arabic_name, national_id):
+        return Employee.objects.create(
+            user=get_user_model().objects.create_user(username=username, password="x"),
+            company=company,
+            full_name=full_name,
+            arabic_name=arabic_name,
+            national_id=national_id,
+        )
+
+    def _search(self, query):
+        return set(search_employees(Employee.objects.filter(company=self.company), self.company, query))
+
+    def test_arabic_variants_and_prefixes(self):
+        self.assertEqual(self._search("احمد"), {self.ahmed})
+        self.assertEqual(self._search("عتيبي"), {self.ahmed})
+        self.assertEqual(self._search("فاطمه"), {self.fatima})
+        self.assertEqual(self._search("fat zah"), set())
+        self.assertEqual(self._search("فاط زهر"), {self.fatima})
+        self.assertEqual(self._search("EMP-%03d" % self.company.id), {self.ahmed, self.fatima})
+        self.assertEqual(self._search("١٠٠٠٠٠٠٠٠٢"), {self.fatima})
+        self.assertEqual(self._search("0000002"), {self.fatima})
+        self.assertEqual(self._search("   "), set())
+
+    def test_index_follows_saves(self):
+        self.ahmed.full_name = "Khalid Saleh"
+        self.ahmed.save()
+        self.assertEqual(self._search("ahmed"), set())
+        self.assertEqual(self._search("khal"), {self.ahmed})
+
+        user = self.fatima.user
+        user.email = "f.omar@example.com"
+        user.save(update_fields=["email"])
+        self.assertEqual(self._search("example"), {self.fatima})
+
+    def test_index_failure_is_isolated_in_a_savepoint(self):
+        savepoints = []
+
+        def _fail(employee):
+            savepoints.append(len(connection.savepoint_ids))
+            raise DatabaseError("index down")
+
+        with transaction.atomic():
+            outer = len(connection.savepoint_ids)
+
+            with patch("employee_center.signals.sync_employee_search_tokens", side_effect=_fail):
+                self.ahmed.full_name = "Khalid Saleh"
+                self.ahmed.save()
+
+            # الفشل داخل savepoint خاص → transaction المستدعي سليم
+            self.assertEqual(savepoints, [outer + 1])
+            self.assertFalse(transaction.get_rollback())
+            self.assertEqual(Employee.objects.get(pk=self.ahmed.pk).full_name, "Khalid Saleh")
@@ -1,16 +1,14 @@
 # ============================================================
-# 📂 leave_center/apps.py — LeaveCenterConfig V3.2 Ultra Safe + Signals
+# 📂 leave_center/apps.py — LeaveCenterConfig V3.3 Ultra Safe + Signals
 # Mham Cloud
 # ============================================================
 # ✔ Signals loaded ALWAYS (shell / migrate safe)
-# ✔ APScheduler guarded from admin commands
+# ✔ APScheduler يعمل فقط داخل: python manage.py run_workers
 # ✔ No double bootstrap
 # ✔ Clean logging
 # ============================================================
 
 from django.apps import AppConfig
-from django.conf import settings
-import sys
 import logging
 
 
@@ -32,8 +30,7 @@ class LeaveCenterConfig(AppConfig):
 
         المهام:
         1️⃣ تحميل signals دائمًا (حتى في shell والمهاجرشن)
-        2️⃣ تشغيل APScheduler بأمان شديد دون كسر Django
-        3️⃣ منع التهيئة المكررة داخل نفس العملية
+        2️⃣ منع التهيئة المكررة داخل نفس العملية
         """
 
         # ============================================================
@@ -52,34 +49,3 @@ class LeaveCenterConfig(AppConfig):
             logger.info("✔ Leave Center Signals Loaded Successfully")
         except Exception as e:
             logger.exception(f"[LeaveCenter Signals Error]: {e}")
-
-        # ============================================================
-        # ⛔ Block Scheduler During Admin Commands
-        # ============================================================
-        if any(cmd in sys.argv for cmd in (
-            "check",
-            "migrate",
-            "makemigrations",
-            "collectstatic",
-            "shell",
-            "createsuperuser",
-        )):
-            logger.info("⛔ Leave Center Scheduler skipped (admin command detected)")
-            return
-
-        # ============================================================
-        # ⛔ Scheduler Disabled by Settings
-        # ============================================================
-        if not getattr(settings, "SCHEDULER_AUTOSTART", False):
-            logger.info("⛔ Leave Center Scheduler disabled by settings")
-            return
-
-        # ============================================================
-        # 🕒 Start Scheduler Safely
-        # ============================================================
-        try:
-            from .jobs import start_scheduler
-            start_scheduler()
-            logger.info("✔ APScheduler Started Successfully (Leave Center)")
-        except Exception as e:
-            logger.exception(f"[LeaveCenter Scheduler Error]: {e}")
\ No newline at end of file
@@ -1,18 +1,21 @@
 # ============================================================
-# 🕒 Auto Reset Leave Balance — Cron Job V6.1 Ultra Pro (Fixed)
+# 🕒 Auto Reset Leave Balance — Cron Job V7.0 Ultra Pro (Chunked)
 # 📦 Mham Cloud — Leave Center Auto Scheduler Engine
-# + Notification Center Integration (create_notification)
+# + Notification Center Integration (bulk_notify_in_app)
 # ============================================================
 
-from django_apscheduler.jobstores import DjangoJobStore
+import logging
+
 from django_apscheduler.models import DjangoJobExecution
 from django_apscheduler import util
 from apscheduler.schedulers.background import BackgroundScheduler
 from django.utils import timezone
-from datetime import date
 
-from .models import LeaveBalance
-from notification_center.services import create_notification  # ← الإشعارات
+from primey_hrm.distributed_lock import single_instance_job
+
+from .services.balance_reset import run_annual_leave_reset
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================
@@ -26,67 +29,15 @@ def delete_old_job_executions(max_age=86400):
 # ============================================================
 # 🔄 الوظيفة الأساسية — إعادة ضبط رصيد الإجازات + إرسال تنبيهات
 # ============================================================
+# ⚡ V7: التنفيذ الفعلي في services.balance_reset
+#    شركة بشركة + دفعات + تقدم قابل للاستئناف
+#    تعمل يوميًا وتعالج فقط الشركات التي حل شهر إعادة التعيين لها
+# ============================================================
 @util.close_old_connections
+@single_instance_job("scheduler:leave_center:auto_reset_leave_balances", 60 * 60)
 def auto_reset_leave_balances():
-    today = date.today()
-
-    # يعمل فقط يوم 1 يناير
-    if today.month == 1 and today.day == 1:
-
-        balances = LeaveBalance.objects.select_related("employee", "company")
-
-        notified_companies = set()  # منع تكرار إشعارات HR
-
-        for bal in balances:
-
-            # ====================================================
-            # 🟦 إعادة ضبط كامل للأرصدة — نظام العمل 2025
-            # ====================================================
-            bal.annual_balance = 21
-            bal.sick_balance = 30
-            bal.maternity_balance = 10
-            bal.marriage_balance = 5
-            bal.death_balance = 3
-            bal.hajj_balance = 10
-            bal.study_balance = 15
-
-            bal.last_reset = today
-            bal.save()
-
-            employee = bal.employee
-            company = employee.company
-
-            # ----------------------------------------------------
-            # 🔔 1) إشعار الموظف
-            # ----------------------------------------------------
-            create_notification(
-                recipient=employee.user,
-                title="🔄 تم تحديث رصيد الإجازات",
-                message=f"تم إعادة ضبط رصيد إجازاتك السنوي إلى {bal.annual_balance} يومًا.",
-                severity="info",
-                link="/leave-center/"
-            )
-
-            notified_companies.add(company)
-
-        # ----------------------------------------------------
-        # 🔔 2) إشعار HR — مرة واحدة لكل شركة
-        # ----------------------------------------------------
-        for company in notified_companies:
-
-            # جلب جميع مستخدمين HR للشركة
-            hr_users = company.companyuser_set.filter(role__name="HR")
-
-            for hr in hr_users:
-                create_notification(
-                    recipient=hr.user,
-                    title="✔ تمت إعادة ضبط أرصدة الإجازات",
-                    message="تم إعادة ضبط أرصدة الإجازات السنوية لجميع الموظفين لهذا العام.",
-                    severity="success",
-                    link="/leave-center/"
-                )
-
-        print("✔ Auto Reset + Notifications Done Successfully!")
+    summary = run_annual_leave_reset()
+    logger.info("✔ Auto Reset + Notifications Done: %s", summary)
 
 
 # ============================================================
@@ -103,12 +54,11 @@ def start_scheduler():
     scheduler_started = True
 
     try:
+        # MemoryJobStore (الافتراضي): جدول DjangoJobStore خاص بالفوترة
         scheduler = BackgroundScheduler(
             timezone=str(timezone.get_current_timezone())
         )
 
-        scheduler.add_jobstore(DjangoJobStore(), "default")
-
         # ===== Reset Job =====
         scheduler.add_job(
             auto_reset_leave_balances,
@@ -134,6 +84,8 @@ def start_scheduler():
 
         scheduler.start()
         print("✔ APScheduler Started Successfully (Leave Center)")
+        return scheduler
 
     except Exception as e:
         print(f"❌ Scheduler Error: {e}")
+        return None
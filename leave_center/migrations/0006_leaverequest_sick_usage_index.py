@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_manager', '0002_companybranch_biotime_code_and_more'),
+        ('employee_center', '0009_remove_employee_drive_file_id_and_more'),
+        ('leave_center', '0005_alter_leaverequest_pay_percentage_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['employee', 'status', 'start_date', 'end_date', 'leave_type'], name='leave_req_emp_status_start_idx'),
+        ),
+    ]
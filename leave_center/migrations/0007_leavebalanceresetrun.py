@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_manager', '0002_companybranch_biotime_code_and_more'),
+        ('leave_center', '0006_leaverequest_sick_usage_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveBalanceResetRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('status', models.CharField(choices=[('running', 'قيد التنفيذ'), ('completed', 'مكتمل'), ('failed', 'فشل')], default='running', max_length=20)),
+                ('last_balance_id', models.BigIntegerField(default=0)),
+                ('processed_count', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_reset_runs', to='company_manager.company')),
+            ],
+            options={
+                'ordering': ['-year', 'company_id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leavebalanceresetrun',
+            constraint=models.UniqueConstraint(fields=('company', 'year'), name='unique_leave_reset_run_per_company_year'),
+        ),
+    ]
@@ -231,6 +231,48 @@ class ResetHistory(models.Model):
         return f"{self.employee.full_name} — Reset {self.year}"
 
 
+# ================================================================
+# 🟧 2.1) Reset Run — تقدم إعادة التعيين لكل شركة (قابل للاستئناف)
+# ================================================================
+class LeaveBalanceResetRun(models.Model):
+
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, "قيد التنفيذ"),
+        (STATUS_COMPLETED, "مكتمل"),
+        (STATUS_FAILED, "فشل"),
+    ]
+
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="leave_reset_runs")
+    year = models.IntegerField()
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+
+    # آخر LeaveBalance.id تمت معالجته → نقطة الاستئناف
+    last_balance_id = models.BigIntegerField(default=0)
+    processed_count = models.PositiveIntegerField(default=0)
+
+    error_message = models.TextField(blank=True, default="")
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-year", "company_id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "year"],
+                name="unique_leave_reset_run_per_company_year",
+            )
+        ]
+
+    def __str__(self):
+        return f"Leave Reset {self.year} — {self.company_id} ({self.status})"
+
+
 
 # ================================================================
 # 🟦 3) Leave Balance — V4 Ultra Pro (Unified Reset Engine)
@@ -445,6 +487,15 @@ class LeaveRequest(models.Model):
     cancelled_at = models.DateTimeField(null=True, blank=True)
     cancellation_reason = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # 🏥 Sick Usage Ledger (SickTierEngine) — Covering Index
+            models.Index(
+                fields=["employee", "status", "start_date", "end_date", "leave_type"],
+                name="leave_req_emp_status_start_idx",
+            ),
+        ]
+
     # ============================================================
     # 🔒 Enterprise Validation Layer
     # ============================================================
@@ -0,0 +1,263 @@
+# ================================================================
+# 🔄 Annual Leave Balance Reset Engine — Chunked & Resumable
+# Mham Cloud — Leave Center
+# ================================================================
+# ✔ شركة بشركة (فشل شركة لا يوقف الباقي)
+# ✔ سياسة كل شركة من CompanyAnnualLeavePolicy (أيام + ترحيل + شهر)
+# ✔ دفعات: SELECT ... FOR UPDATE + bulk_create(ResetHistory) + UPDATE واحد
+# ✔ تقدم محفوظ في LeaveBalanceResetRun (last_balance_id) → استئناف آمن
+# ✔ إشعارات الموظفين عبر bulk_notify_in_app (بدون حلقة create_notification)
+# ================================================================
+
+import logging
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from company_manager.models import Company, CompanyUser
+from leave_center.models import (
+    CompanyAnnualLeavePolicy,
+    LeaveBalance,
+    LeaveBalanceResetRun,
+    ResetHistory,
+)
+from notification_center.services import bulk_notify_in_app
+
+
+logger = logging.getLogger(__name__)
+
+# 🟦 الأرصدة النظامية — نظام العمل 2025
+STATUTORY_BALANCES = {
+    "sick_balance": 30,
+    "maternity_balance": 10,
+    "marriage_balance": 5,
+    "death_balance": 3,
+    "hajj_balance": 10,
+    "study_balance": 15,
+}
+
+# بدون سياسة للشركة → نفس سلوك المهمة السابقة (21 يوم، بدون ترحيل، يناير)
+DEFAULT_RESET_POLICY = {
+    "annual_days": 21,
+    "carry_forward_enabled": False,
+    "carry_forward_limit": 0,
+    "reset_month": 1,
+}
+
+
+def _chunk_size():
+    return max(int(getattr(settings, "LEAVE_RESET_CHUNK_SIZE", 500) or 500), 1)
+
+
+# ================================================================
+# 📘 Policies (قراءة واحدة لكل الشركات)
+# ================================================================
+def load_reset_policies():
+    return {
+        policy["company_id"]: policy
+        for policy in CompanyAnnualLeavePolicy.objects.filter(is_active=True).values(
+            "company_id",
+            "annual_days",
+            "carry_forward_enabled",
+            "carry_forward_limit",
+            "reset_month",
+        )
+    }
+
+
+def _new_annual_balance(old_balance, policy):
+    carry = 0
+    if policy["carry_forward_enabled"]:
+        carry = min(old_balance, policy["carry_forward_limit"] or 0)
+    return policy["annual_days"] + carry
+
+
+def _annual_balance_expression(policy):
+    if not policy["carry_forward_enabled"]:
+        return Value(policy["annual_days"])
+
+    return Value(policy["annual_days"]) + Least(
+        F("annual_balance"),
+        Value(policy["carry_forward_limit"] or 0),
+    )
+
+
+def _hr_user_ids(company_id):
+    return list(
+        CompanyUser.objects.filter(company_id=company_id, is_active=True)
+        .filter(Q(role__iexact="hr") | Q(roles__name__iexact="hr"))
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+# ================================================================
+# 🏢 Reset One Company
+# ================================================================
+def reset_company_balances(company_id, policy, today=None):
+    """
+    إعادة تعيين أرصدة شركة واحدة على دفعات.
+    يرجع LeaveBalanceResetRun.
+    """
+
+    today = today or timezone.now().date()
+    year_start = date(today.year, 1, 1)
+
+    run, _ = LeaveBalanceResetRun.objects.get_or_create(company_id=company_id, year=today.year)
+
+    if run.status == LeaveBalanceResetRun.STATUS_COMPLETED:
+        return run
+
+    company = Company.objects.get(pk=company_id)
+
+    if run.status != LeaveBalanceResetRun.STATUS_RUNNING:
+        run.status = LeaveBalanceResetRun.STATUS_RUNNING
+        run.error_message = ""
+        run.save(update_fields=["status", "error_message"])
+
+    pending = (
+        LeaveBalance.objects
+        .filter(company_id=company_id, auto_reset_enabled=True)
+        .filter(Q(last_reset__isnull=True) | Q(last_reset__lt=year_start))
+    )
+
+    chunk_size = _chunk_size()
+    new_annual_balance = _annual_balance_expression(policy)
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                pending
+                .filter(id__gt=run.last_balance_id)
+                .order_by("id")
+                .select_for_update()
+                .values_list("id", "employee_id", "employee__user_id", "annual_balance")[:chunk_size]
+            )
+
+            if not rows:
+                break
+
+            ResetHistory.objects.bulk_create([
+                ResetHistory(
+                    company_id=company_id,
+                    employee_id=employee_id,
+                    old_balance=annual_balance,
+                    new_balance=_new_annual_balance(annual_balance, policy),
+                    year=today.year,
+                )
+                for _, employee_id, _, annual_balance in rows
+            ])
+
+            LeaveBalance.objects.filter(id__in=[row[0] for row in rows]).update(
+                annual_balance=new_annual_balance,
+                last_reset=today,
+                **STATUTORY_BALANCES,
+            )
+
+            run.last_balance_id = rows[-1][0]
+            run.processed_count += len(rows)
+            run.save(update_fields=["last_balance_id", "processed_count"])
+
+        # ----------------------------------------------------
+        # 🔔 إشعار الموظفين (Bulk Fan-Out — غير حرج)
+        # ----------------------------------------------------
+        try:
+            bulk_notify_in_app(
+                recipient_ids=[row[2] for row in rows],
+                title="🔄 تم تحديث رصيد الإجازات",
+                message=(
+                    f"تم إعادة ضبط رصيد إجازاتك السنوي لعام {today.year} "
+                    f"({policy['annual_days']} يومًا + الرصيد المرحّل إن وجد)."
+                ),
+                notification_type="leave",
+                severity="info",
+                link="/leave-center/",
+                company=company,
+                event_code="leave_balance_reset",
+                source="leave_center.balance_reset",
+            )
+        except Exception:
+            logger.exception("⚠️ Leave reset notifications failed | company=%s", company_id)
+
+    # ----------------------------------------------------
+    # 🔔 إشعار HR — مرة واحدة لكل شركة
+    # ----------------------------------------------------
+    try:
+        bulk_notify_in_app(
+            recipient_ids=_hr_user_ids(company_id),
+            title="✔ تمت إعادة ضبط أرصدة الإجازات",
+            message="تم إعادة ضبط أرصدة الإجازات السنوية لجميع الموظفين لهذا العام.",
+            notification_type="leave",
+            severity="success",
+            link="/leave-center/",
+            company=company,
+            event_code="leave_balance_reset_completed",
+            source="leave_center.balance_reset",
+        )
+    except Exception:
+        logger.exception("⚠️ Leave reset HR notification failed | company=%s", company_id)
+
+    run.status = LeaveBalanceResetRun.STATUS_COMPLETED
+    run.finished_at = timezone.now()
+    run.save(update_fields=["status", "finished_at"])
+
+    return run
+
+
+# ================================================================
+# 🚀 Reset All Companies (Tenant By Tenant)
+# ================================================================
+def run_annual_leave_reset(today=None):
+    """
+    يعالج كل شركة حل شهر إعادة التعيين لها ولم تكتمل هذا العام.
+    آمن للتشغيل اليومي: الشركات المكتملة تُتخطى، والمتوقفة تُستأنف.
+    """
+
+    today = today or timezone.now().date()
+    policies = load_reset_policies()
+
+    completed = set(
+        LeaveBalanceResetRun.objects.filter(
+            year=today.year,
+            status=LeaveBalanceResetRun.STATUS_COMPLETED,
+        ).values_list("company_id", flat=True)
+    )
+
+    company_ids = (
+        LeaveBalance.objects
+        .filter(auto_reset_enabled=True)
+        .values_list("company_id", flat=True)
+        .distinct()
+        .order_by("company_id")
+    )
+
+    summary = {"completed": 0, "failed": 0, "skipped": 0}
+
+    for company_id in company_ids:
+        policy = policies.get(company_id, DEFAULT_RESET_POLICY)
+
+        if company_id in completed or policy["reset_month"] != today.month:
+            summary["skipped"] += 1
+            continue
+
+        try:
+            reset_company_balances(company_id, policy, today=today)
+            summary["completed"] += 1
+
+        except Exception as exc:
+            logger.exception("❌ Leave reset failed | company=%s", company_id)
+            LeaveBalanceResetRun.objects.filter(
+                company_id=company_id,
+                year=today.year,
+            ).update(
+                status=LeaveBalanceResetRun.STATUS_FAILED,
+                error_message=str(exc)[:2000],
+            )
+            summary["failed"] += 1
+
+    logger.info("🔄 Annual leave reset finished | %s", summary)
+    return summary
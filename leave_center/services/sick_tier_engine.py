@@ -2,12 +2,42 @@
 # 🏥 Sick Tier Engine — Saudi Labour Law 2025
 # Phase P5
 # ================================================================
+# ⚡ Sick Usage Ledger:
+# ✔ استعلام واحد عبر index (employee, status, start_date, end_date, leave_type)
+# ✔ قراءة (start_date, end_date) فقط — بدون تحميل الطلبات كاملة
+# ✔ النتيجة في الـ cache لكل موظف + يوم (تُسقط عند أي تغيير للطلبات)
+# ✔ حساب واحد لكل Engine (get_current_tier + can_apply + snapshot)
+# ================================================================
 
 from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
+
 from leave_center.models import LeaveRequest
 
 
+SICK_USAGE_CACHE_KEY = "leave:sick_usage:{employee_id}"
+
+
+def _sick_usage_ttl():
+    return int(getattr(settings, "SICK_USAGE_CACHE_TTL", 3600) or 0)
+
+
+def invalidate_sick_usage(employee_id):
+    """
+    إسقاط رصيد الاستخدام المرضي للموظف بعد نجاح الـ transaction.
+    """
+    if not employee_id:
+        return
+
+    transaction.on_commit(
+        lambda: cache.delete(SICK_USAGE_CACHE_KEY.format(employee_id=employee_id))
+    )
+
+
 class SickTierEngine:
     """
     يحسب:
@@ -23,22 +53,49 @@ class SickTierEngine:
     def __init__(self, employee):
         self.employee = employee
         self.today = timezone.now().date()
+        self._used_days = None
 
     # ------------------------------------------------------------
     # 🔎 حساب الأيام المرضية خلال 365 يوم
     # ------------------------------------------------------------
-    def get_used_days_last_year(self):
+    def _count_used_days(self):
         one_year_ago = self.today - timedelta(days=365)
 
-        sick_leaves = LeaveRequest.objects.filter(
-            employee=self.employee,
-            leave_type__category="sick",
+        periods = LeaveRequest.objects.filter(
+            employee_id=self.employee.id,
             status="approved",
             start_date__gte=one_year_ago,
-        )
+            leave_type__category="sick",
+        ).values_list("start_date", "end_date")
+
+        return sum((end - start).days + 1 for start, end in periods)
+
+    def get_used_days_last_year(self):
+        if self._used_days is not None:
+            return self._used_days
+
+        key = SICK_USAGE_CACHE_KEY.format(employee_id=self.employee.id)
+
+        try:
+            cached = cache.get(key)
+        except Exception:
+            cached = None
+
+        # القيمة مرتبطة باليوم (النافذة تتحرك يوميًا)
+        if cached and cached[0] == self.today:
+            self._used_days = cached[1]
+            return self._used_days
+
+        self._used_days = self._count_used_days()
+
+        ttl = _sick_usage_ttl()
+        if ttl > 0:
+            try:
+                cache.set(key, (self.today, self._used_days), ttl)
+            except Exception:
+                pass
 
-        total_days = sum(l.total_days for l in sick_leaves)
-        return total_days
+        return self._used_days
 
     # ------------------------------------------------------------
     # ⚖ تحديد الشريحة الحالية
@@ -72,4 +129,4 @@ class SickTierEngine:
         if used + requested_days > total_allowed:
             return False, "تجاوز الحد الأعلى للإجازات المرضية خلال سنة."
 
-        return True, None
\ No newline at end of file
+        return True, None
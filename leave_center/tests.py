@@ -1,3 +1,112 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from company_manager.models import Company
+from employee_center.models import Employee
+from notification_center.models import Notification
+from leave_center.models import (
+    CompanyAnnualLeavePolicy,
+    LeaveBalance,
+    LeaveBalanceResetRun,
+    LeaveRequest,
+    LeaveType,
+    ResetHistory,
+)
+from leave_center.services.balance_reset import run_annual_leave_reset
+from leave_center.services.sick_tier_engine import SICK_USAGE_CACHE_KEY, SickTierEngine
+
+
+class SickTierLedgerTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name="Sick Co", is_active=False)
+        self.employee = Employee.objects.create(
+            company=self.company,
+            user=get_user_model().objects.create_user(username="sick-emp"),
+            full_name="Sick Employee",
+            national_id="1000000004",
+        )
+        self.sick = LeaveType.objects.create(
+            company=self.company, name="Sick", category="sick",
+        )
+        cache.delete(SICK_USAGE_CACHE_KEY.format(employee_id=self.employee.id))
+
+    def _approved_sick_leave(self, days_ago, days):
+        start = timezone.now().date() - timedelta(days=days_ago)
+        return LeaveRequest.objects.create(
+            company=self.company,
+            employee=self.employee,
+            leave_type=self.sick,
+            start_date=start,
+            end_date=start + timedelta(days=days - 1),
+            status="approved",
+        )
+
+    def test_usage_is_one_query_then_cached_per_employee(self):
+        self._approved_sick_leave(days_ago=200, days=20)
+        self._approved_sick_leave(days_ago=100, days=15)
+        self._approved_sick_leave(days_ago=400, days=10)  # خارج النافذة
+
+        engine = SickTierEngine(self.employee)
+        with self.assertNumQueries(1):
+            self.assertEqual(engine.get_current_tier(), ("partial", 75))
+            self.assertFalse(engine.can_apply(90)[0])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(SickTierEngine(self.employee).get_used_days_last_year(), 35)
+
+    def test_new_approved_leave_invalidates_cached_usage(self):
+        self.assertEqual(SickTierEngine(self.employee).get_used_days_last_year(), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._approved_sick_leave(days_ago=10, days=5)
+
+        self.assertEqual(SickTierEngine(self.employee).get_used_days_last_year(), 5)
+
+
+@override_settings(LEAVE_RESET_CHUNK_SIZE=2)
+class AnnualBalanceResetTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name="Reset Co", is_active=False)
+        CompanyAnnualLeavePolicy.objects.create(
+            company=self.company,
+            annual_days=25,
+            carry_forward_enabled=True,
+            carry_forward_limit=5,
+        )
+        for index, remaining in enumerate((2, 10, 0)):
+            employee = Employee.objects.create(
+                company=self.company,
+                user=get_user_model().objects.create_user(username=f"reset-{index}"),
+                full_name=f"Reset Employee {index}",
+                national_id=f"200000000{index}",
+            )
+            LeaveBalance.objects.filter(employee=employee).update(annual_balance=remaining)
+
+    def test_reset_applies_company_policy_in_chunks_once_per_year(self):
+        summary = run_annual_leave_reset(today=date(2027, 1, 1))
+
+        self.assertEqual(summary["completed"], 1)
+        self.assertEqual(
+            sorted(LeaveBalance.objects.values_list("annual_balance", flat=True)),
+            [25, 27, 30],
+        )
+        self.assertEqual(ResetHistory.objects.filter(year=2027).count(), 3)
+        self.assertEqual(Notification.objects.filter(notification_type="leave").count(), 3)
+
+        run = LeaveBalanceResetRun.objects.get(company=self.company, year=2027)
+        self.assertEqual(run.status, LeaveBalanceResetRun.STATUS_COMPLETED)
+        self.assertEqual(run.processed_count, 3)
+
+        # تشغيل ثانٍ في نفس الشهر → لا شيء يتغير
+        self.assertEqual(run_annual_leave_reset(today=date(2027, 1, 2))["skipped"], 1)
+        self.assertEqual(ResetHistory.objects.filter(year=2027).count(), 3)
+
+    def test_other_months_are_skipped(self):
+        summary = run_annual_leave_reset(today=date(2027, 3, 1))
+
+        self.assertEqual(summary["skipped"], 1)
+        self.assertFalse(ResetHistory.objects.exists())
@@ -8,6 +8,7 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from .models import Notification
+from .unread_counter import get_unread_count, mark_notifications_read
 
 logger = logging.getLogger(__name__)
 
@@ -76,7 +77,10 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         if not note:
             return
 
-        unread_count = await self.get_unread_count()
+        # 🔢 العداد يصل مع الحدث (لا استعلام على مسار البث)
+        unread_count = event.get("data", {}).get("unread_count")
+        if unread_count is None:
+            unread_count = await self.get_unread_count()
 
         await self.send_json({
             "type": "new",
@@ -110,18 +114,12 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_unread_count(self):
-        return Notification.objects.filter(
-            recipient=self.user,
-            is_read=False
-        ).count()
+        return get_unread_count(self.user.id)
 
 
     @database_sync_to_async
     def mark_as_read(self, pk):
-        Notification.objects.filter(
-            id=pk,
-            recipient=self.user
-        ).update(is_read=True)
+        mark_notifications_read(self.user, [pk])
 
 
     # Helper
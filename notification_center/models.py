@@ -139,9 +139,12 @@ class Notification(models.Model):
     # ✔️ علامة مقروء
     def mark_as_read(self):
         if not self.is_read:
+            from .unread_counter import adjust_unread_count
+
             self.is_read = True
             self.read_at = timezone.now()
             self.save(update_fields=["is_read", "read_at"])
+            adjust_unread_count(self.recipient_id, -1)
 
     def __str__(self):
         return f"{self.title} — {self.recipient}"
@@ -12,11 +12,13 @@
 # ✅ متوافق مع WebSocket + Channels
 # ✅ جاهز للتوسعة لاحقًا نحو SMS / Push
 # ✅ توحيد استخراج رقم واتساب من recipient / target_object / context
+# ✅ Bulk Fan-Out: حدث واحد + bulk_create للإشعارات الداخلية
 # ------------------------------------------------------------
 
 from __future__ import annotations
 
 import logging
+from functools import partial
 from typing import Any, Iterable, Optional
 
 from asgiref.sync import async_to_sync
@@ -36,6 +38,7 @@ from .models import (
     NotificationEvent,
     NotificationEventStatus,
 )
+from .unread_counter import adjust_unread_counts, get_unread_count
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -1149,12 +1152,14 @@ def _broadcast_live_notification(note: Notification) -> None:
             logger.warning("⚠️ لم يتم العثور على Channel Layer.")
             return
 
-        group_name = f"user_{note.recipient.id}"
+        group_name = f"user_{note.recipient_id}"
         payload = {
             "type": "send_notification",
             "data": {
                 "type": "new",
                 "notification": _serialize_notification_for_ws(note),
+                # 🔢 العداد مع الحدث → لا استعلامات داخل الـ Consumer
+                "unread_count": get_unread_count(note.recipient_id),
             },
         }
 
@@ -1302,7 +1307,8 @@ def create_notification(
                 except Exception as delivery_error:
                     logger.warning(f"⚠️ فشل تحديث Delivery الخاص بـ in_app: {delivery_error}")
 
-            _broadcast_live_notification(note)
+            # 📡 البث بعد commit (بعد تحديث العداد من post_save)
+            transaction.on_commit(partial(_broadcast_live_notification, note))
 
         if send_email:
             email_destination = ",".join(resolved_email_recipients) if resolved_email_recipients else _clean_text(
@@ -1596,6 +1602,7 @@ def notify_report_generated(
     report_title: str,
     send_email: bool = False,
     send_whatsapp: bool = False,
+    link: str | None = None,
 ) -> Notification | None:
     return create_notification(
         recipient=recipient,
@@ -1605,6 +1612,7 @@ def notify_report_generated(
         severity="success",
         send_email=send_email,
         send_whatsapp=send_whatsapp,
+        link=link,
         event_code="report_generated",
         event_group="report",
         source="services.notify_report_generated",
@@ -1683,6 +1691,86 @@ def notify_many(
     )
 
 
+# ============================================================
+# 🔟 Bulk Fan-Out (In-App فقط) — للمهام الجماعية
+# ============================================================
+BULK_FANOUT_CHUNK_SIZE = 1000
+
+
+def bulk_notify_in_app(
+    *,
+    recipient_ids: Iterable[int],
+    title: str,
+    message: str,
+    notification_type: str = "system",
+    severity: str = "info",
+    link: str | None = None,
+    company=None,
+    event_code: str | None = None,
+    event_group: str | None = None,
+    source: str | None = None,
+    context: dict | None = None,
+    chunk_size: int = BULK_FANOUT_CHUNK_SIZE,
+) -> int:
+    """
+    📬 نفس الإشعار لعدد كبير من المستخدمين:
+    - NotificationEvent واحد
+    - bulk_create للإشعارات على دفعات
+    - تحديث عداد غير المقروء بعد commit
+    بدون بريد / واتساب / بث WebSocket فردي.
+    """
+    title = _clean_text(title)
+    message = _clean_text(message)
+    link = _clean_text(link)
+
+    user_ids = list(dict.fromkeys(uid for uid in recipient_ids if uid))
+    if not user_ids or (not title and not message):
+        return 0
+
+    resolved_company = _safe_company(company)
+
+    event = create_notification_event(
+        event_code=_resolve_event_code(event_code=event_code, notification_type=notification_type),
+        event_group=_resolve_event_group(event_group=event_group, notification_type=notification_type),
+        company=resolved_company,
+        severity=severity,
+        title=title,
+        message=message,
+        link=link,
+        source=source or "services.bulk_notify_in_app",
+        context=context,
+    )
+
+    created = 0
+
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+
+        with transaction.atomic():
+            Notification.objects.bulk_create(
+                [
+                    Notification(
+                        company=resolved_company,
+                        recipient_id=user_id,
+                        title=title,
+                        message=message,
+                        notification_type=notification_type,
+                        severity=severity,
+                        link=link or None,
+                        event=event,
+                    )
+                    for user_id in chunk
+                ],
+                batch_size=chunk_size,
+            )
+            # bulk_create لا يطلق post_save → تحديث العداد يدويًا
+            adjust_unread_counts(chunk, 1)
+
+        created += len(chunk)
+
+    return created
+
+
 # ============================================================
 # 9️⃣ Backward Compatibility Helpers
 # ============================================================
@@ -344,6 +344,81 @@ def notify_employee_created(
     )
 
 
+# =============================================================
+# 📥 1.1) إشعارات الاستيراد الجماعي للموظفين
+# - ترحيب لكل موظف (بدون إشعار مدراء لكل صف)
+# - ملخص واحد للمدراء لكل دفعة استيراد
+# =============================================================
+def notify_employee_imported(
+    employee: Employee,
+    send_email: bool = False,
+    send_whatsapp: bool = False,
+    actor=None,
+    extra_context: dict | None = None,
+):
+    employee_user = _employee_user(employee)
+    if not employee_user:
+        return
+
+    company = _employee_company(employee)
+
+    _notify_user(
+        recipient=employee_user,
+        title="👤 تم إنشاء ملفك الوظيفي",
+        message=f"تم إنشاء ملفك الوظيفي بنجاح باسم {_employee_name(employee)}.",
+        notification_type="hr_employee",
+        severity="success",
+        link=_employee_link(employee),
+        send_email=send_email,
+        send_whatsapp=send_whatsapp,
+        company=company,
+        event_code="employee_created",
+        event_group="hr",
+        source="services_hr.notify_employee_imported",
+        context=_merge_context(
+            {
+                "employee_id": _safe_getattr(employee, "id", None),
+                "employee_name": _employee_name(employee),
+                "company_id": _safe_getattr(company, "id", None),
+            },
+            extra_context,
+        ),
+        target_object=employee,
+        actor=actor,
+    )
+
+
+def notify_employees_import_completed(
+    company,
+    created_count: int,
+    send_email: bool = False,
+    actor=None,
+    extra_context: dict | None = None,
+):
+    _notify_users(
+        recipients=_get_staff_users_for_company(company),
+        title="📥 اكتمل استيراد الموظفين",
+        message=f"تم استيراد {created_count} موظف إلى الشركة.",
+        notification_type="hr_employee",
+        severity="success",
+        link=None,
+        send_email=send_email,
+        send_whatsapp=False,
+        company=company,
+        event_code="employees_imported",
+        event_group="hr",
+        source="services_hr.notify_employees_import_completed",
+        context=_merge_context(
+            {
+                "company_id": _safe_getattr(company, "id", None),
+                "created_count": created_count,
+            },
+            extra_context,
+        ),
+        actor=actor,
+    )
+
+
 # =============================================================
 # 📝 2) إشعار تحديث بيانات الموظف
 # =============================================================
@@ -15,11 +15,13 @@ import logging
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from company_manager.models import Company
+from .models import Notification
 from .services import create_notification
+from .unread_counter import adjust_unread_count
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -141,4 +143,18 @@ def notify_user_created(sender, instance, created, **kwargs):
         logger.info(f"✅ تم إرسال إشعارات إنشاء المستخدم: {instance.username}")
 
     except Exception as e:
-        logger.warning(f"⚠️ فشل Signal إشعار إنشاء المستخدم (غير حرج): {e}")
\ No newline at end of file
+        logger.warning(f"⚠️ فشل Signal إشعار إنشاء المستخدم (غير حرج): {e}")
+
+# ============================================================
+# 🔢 3️⃣ عداد غير المقروء (Denormalized)
+# ============================================================
+@receiver(post_save, sender=Notification)
+def increment_unread_on_create(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        adjust_unread_count(instance.recipient_id, 1)
+
+
+@receiver(post_delete, sender=Notification)
+def decrement_unread_on_delete(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread_count(instance.recipient_id, -1)
@@ -1,6 +1,7 @@
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 
 from notification_center.models import (
@@ -11,6 +12,7 @@ from notification_center.models import (
     NotificationEvent,
 )
 from notification_center.services import create_notification
+from notification_center.unread_counter import get_unread_count, mark_notifications_read
 
 User = get_user_model()
 
@@ -211,4 +213,30 @@ class NotificationTests(TestCase):
         n.refresh_from_db()
 
         self.assertTrue(n.is_read)
-        self.assertIsNotNone(n.read_at)
\ No newline at end of file
+        self.assertIsNotNone(n.read_at)
+
+    def test_unread_counter_tracks_create_read_and_push_payload(self):
+        cache.clear()
+        self.assertEqual(get_unread_count(self.user.id), 0)
+
+        with patch("notification_center.services.get_channel_layer") as layer_factory, \
+                patch("notification_center.services.async_to_sync") as to_sync:
+            with self.captureOnCommitCallbacks(execute=True):
+                first = create_notification(recipient=self.user, title="A", message="1")
+            with self.captureOnCommitCallbacks(execute=True):
+                create_notification(recipient=self.user, title="B", message="2")
+
+        payload = to_sync.return_value.call_args_list[-1].args[1]
+        self.assertEqual(payload["data"]["unread_count"], 2)
+        layer_factory.assert_called()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user.id), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_notifications_read(self.user, [first.id])
+        self.assertEqual(get_unread_count(self.user.id), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_notifications_read(self.user)
+        self.assertEqual(get_unread_count(self.user.id), 0)
@@ -0,0 +1,143 @@
+# ============================================================
+# 📂 الملف: notification_center/unread_counter.py
+# 🔢 Unread Counter — Denormalized Per-User Count
+# ------------------------------------------------------------
+# ✅ العداد في الـ cache المشترك (incr / decr ذرية)
+# ✅ عند غياب المفتاح: COUNT واحد من قاعدة البيانات ثم تخزينه
+# ✅ يتحدث بعد commit فقط (إنشاء / قراءة / حذف)
+# ✅ TTL كشبكة أمان ضد أي انحراف
+# ------------------------------------------------------------
+
+from __future__ import annotations
+
+import logging
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+UNREAD_COUNT_KEY = "notifications:unread:{user_id}"
+
+
+def _cache_key(user_id: int) -> str:
+    return UNREAD_COUNT_KEY.format(user_id=user_id)
+
+
+def _cache_ttl() -> int:
+    return int(getattr(settings, "NOTIFICATION_UNREAD_CACHE_TTL", 300) or 300)
+
+
+# ============================================================
+# 📖 Read
+# ============================================================
+def get_unread_count(user_id: int | None) -> int:
+    """
+    🔢 عدد غير المقروء من الـ cache، مع fallback إلى COUNT واحد.
+    """
+    if not user_id:
+        return 0
+
+    key = _cache_key(user_id)
+
+    try:
+        value = cache.get(key)
+    except Exception:
+        value = None
+
+    if value is not None:
+        return max(int(value), 0)
+
+    count = Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+
+    try:
+        cache.add(key, count, _cache_ttl())
+    except Exception:
+        logger.debug("⚠️ تعذر تخزين عداد الإشعارات في الـ cache.")
+
+    return count
+
+
+# ============================================================
+# ✏️ Write (Atomic)
+# ============================================================
+def _apply_delta(user_id: int, delta: int) -> None:
+    if not user_id or not delta:
+        return
+
+    key = _cache_key(user_id)
+
+    try:
+        value = cache.incr(key, delta) if delta > 0 else cache.decr(key, -delta)
+    except ValueError:
+        # المفتاح غير موجود → سيُحسب من قاعدة البيانات عند أول قراءة
+        return
+    except Exception:
+        value = -1
+
+    if value < 0:
+        try:
+            cache.delete(key)
+        except Exception:
+            pass
+
+
+def adjust_unread_count(user_id: int | None, delta: int) -> None:
+    """
+    تطبيق التغيير بعد نجاح الـ transaction الحالية.
+    """
+    if not user_id or not delta:
+        return
+
+    transaction.on_commit(partial(_apply_delta, user_id, delta))
+
+
+def _apply_bulk_delta(user_ids, delta: int) -> None:
+    for user_id in user_ids:
+        _apply_delta(user_id, delta)
+
+
+def adjust_unread_counts(user_ids, delta: int) -> None:
+    """
+    نفس adjust_unread_count لعدة مستخدمين بـ on_commit واحد (Bulk Fan-Out).
+    """
+    user_ids = [user_id for user_id in user_ids if user_id]
+    if not user_ids or not delta:
+        return
+
+    transaction.on_commit(partial(_apply_bulk_delta, user_ids, delta))
+
+
+def reset_unread_count(user_id: int | None) -> None:
+    if not user_id:
+        return
+
+    transaction.on_commit(partial(cache.set, _cache_key(user_id), 0, _cache_ttl()))
+
+
+# ============================================================
+# ✅ Mark Read (UPDATE واحد + تحديث العداد)
+# ============================================================
+def mark_notifications_read(user, notification_ids=None) -> int:
+    """
+    تعليم إشعارات المستخدم كمقروءة.
+    notification_ids=None → الكل.
+    """
+    qs = Notification.objects.filter(recipient=user, is_read=False)
+
+    if notification_ids is not None:
+        qs = qs.filter(id__in=list(notification_ids))
+
+    updated = qs.update(is_read=True, read_at=timezone.now())
+
+    if notification_ids is None:
+        reset_unread_count(user.id)
+    elif updated:
+        adjust_unread_count(user.id, -updated)
+
+    return updated
@@ -3,6 +3,7 @@ from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 
 from .models import Notification
+from .unread_counter import mark_notifications_read
 
 
 # ============================================================
@@ -42,9 +43,7 @@ def mark_as_read(request, notification_id):
 @login_required
 def mark_all_as_read(request):
 
-    qs = Notification.objects.filter(recipient=request.user, is_read=False)
-    for n in qs:
-        n.mark_as_read()
+    mark_notifications_read(request.user)
 
     return redirect("notification_center:notification_list")
 
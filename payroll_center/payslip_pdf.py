@@ -0,0 +1,98 @@
+# ============================================================
+# 🖨️ Payslip PDF Renderer — Pure (No Django)
+# Mham Cloud
+# ============================================================
+# ✔ يستقبل payload جاهز (dict) ويرجع bytes
+# ✔ لا يستورد Django → آمن داخل Process Pool (spawn)
+# ✔ خط Tajawal يُسجّل مرة واحدة لكل عملية (initializer)
+# ============================================================
+
+import io
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from reports_center.pdf_fonts import ensure_pdf_font
+
+# يتغير عند تغيير شكل القسيمة → يبطل كل القسائم المخزنة
+RENDERER_VERSION = "1"
+
+
+def _money(value):
+    try:
+        return f"{float(value or 0):,.2f}"
+    except (TypeError, ValueError):
+        return "0.00"
+
+
+# ============================================================
+# 🧾 Single Slip
+# ============================================================
+def render_payslip_pdf(slip):
+    font = ensure_pdf_font()
+
+    buffer = io.BytesIO()
+    width, height = A4
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+
+    print_payload = slip.get("print_payload") or {}
+    summary = print_payload.get("summary") or {}
+
+    y = height - 50
+    pdf.setFont(font, 16)
+    pdf.drawString(40, y, slip.get("company_name") or "—")
+    pdf.setFont(font, 11)
+    pdf.drawRightString(width - 40, y, f"Payslip — {slip.get('month') or ''}")
+
+    y -= 30
+    for label, value in (
+        ("Employee", slip.get("employee_name")),
+        ("Employee No.", slip.get("employee_number")),
+        ("Department", slip.get("department")),
+        ("Job Title", slip.get("job_title")),
+    ):
+        pdf.drawString(40, y, f"{label}: {value or '—'}")
+        y -= 16
+
+    def _section(title, items, y):
+        y -= 12
+        pdf.setFont(font, 12)
+        pdf.drawString(40, y, title)
+        y -= 18
+        pdf.setFont(font, 10)
+        for item in items:
+            pdf.drawString(50, y, (item.get("label") or "—")[:60])
+            pdf.drawRightString(width - 40, y, _money(item.get("amount")))
+            y -= 14
+            if y < 80:
+                pdf.showPage()
+                pdf.setFont(font, 10)
+                y = height - 50
+        return y
+
+    y = _section("Earnings", print_payload.get("earnings_items") or [], y)
+    y = _section("Deductions", print_payload.get("deduction_items") or [], y)
+
+    y -= 16
+    pdf.setFont(font, 11)
+    for label, key in (
+        ("Total Earnings", "total_earnings"),
+        ("Total Deductions", "total_deductions"),
+        ("Net Salary", "net_salary"),
+    ):
+        pdf.drawString(40, y, label)
+        pdf.drawRightString(width - 40, y, _money(summary.get(key)))
+        y -= 16
+
+    pdf.save()
+    return buffer.getvalue()
+
+
+# ============================================================
+# 📦 Batch (Process Pool Worker)
+# ============================================================
+def render_payslip_batch(slips):
+    """
+    يرجع [(slip_hash, pdf_bytes)] — وحدة العمل لكل Process.
+    """
+    return [(slip["slip_hash"], render_payslip_pdf(slip)) for slip in slips]
@@ -0,0 +1,304 @@
+# ============================================================
+# 🧾 Bulk Payslips — دورة رواتب كاملة → ZIP
+# Mham Cloud
+# ============================================================
+# ✔ Payloads من PayrollSlipSnapshot باستعلام واحد (select_related)
+# ✔ slip_hash = sha256(payload + RENDERER_VERSION)
+#   - القسيمة المخزنة بنفس الـ hash تُعاد كما هي (توليد تزايدي)
+# ✔ التوليد: Process Pool (spawn) + Tajawal مرة واحدة لكل عملية
+# ✔ الملفات: payslips/<company>/<run>/<slip_hash>.pdf
+# ✔ التوليد في الخلفية (schedule_payroll_run_payslips) — بعد الاعتماد
+#   أو عند طلب ZIP ناقص؛ قفل موزع لكل دورة
+# ✔ ZIP يُبث من الملفات المخزنة فقط (لا توليد داخل الطلب)
+# ============================================================
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.text import slugify
+
+from api.company.payroll.salary_slip import _build_structured_print_payload
+from payroll_center.models import PayrollRun, PayrollSlipSnapshot
+from payroll_center.payslip_pdf import (
+    RENDERER_VERSION,
+    render_payslip_batch,
+)
+from primey_hrm.db_connections import DBThreadPoolExecutor
+from primey_hrm.distributed_lock import DistributedLock
+from reports_center.pdf_fonts import ensure_pdf_font, tajawal_font_path
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# خيط واحد للتوليد في الخلفية (التوازي داخل Process Pool)
+_executor = DBThreadPoolExecutor(max_workers=1, thread_name_prefix="payslip-render")
+
+RENDER_LOCK_KEY = "payslips:render:{run_id}"
+RENDER_LOCK_TTL = 60 * 30
+
+
+def _setting_int(name, default):
+    return max(int(getattr(settings, name, default) or default), 1)
+
+
+# ============================================================
+# 📥 Payloads (One Query)
+# ============================================================
+def _slip_hash(slip):
+    raw = json.dumps(slip, sort_keys=True, default=str) + RENDERER_VERSION
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _slip_file_name(slip):
+    name = slugify(slip["employee_name"] or "", allow_unicode=True) or "employee"
+    number = slip["employee_number"] or slip["record_id"]
+    return f"{slip['month']}/{number}_{name}.pdf"
+
+
+def build_run_slips(run):
+    """
+    كل قسائم الدورة كـ dicts قابلة للـ pickle (مع slip_hash و file_name).
+    """
+    snapshots = (
+        PayrollSlipSnapshot.objects
+        .filter(run=run)
+        .select_related(
+            "payroll_record",
+            "payroll_record__employee",
+            "payroll_record__employee__department",
+            "payroll_record__employee__job_title",
+        )
+        .order_by("payroll_record__employee__full_name", "id")
+    )
+
+    month = run.month.strftime("%Y-%m")
+    company_name = run.company.name
+
+    slips = []
+    for snapshot in snapshots:
+        record = snapshot.payroll_record
+        employee = record.employee
+
+        slip = {
+            "record_id": record.id,
+            "month": month,
+            "company_name": company_name,
+            "employee_name": employee.full_name,
+            "employee_number": employee.employee_number,
+            "department": employee.department.name if employee.department else None,
+            "job_title": employee.job_title.name if employee.job_title else None,
+            "print_payload": _build_structured_print_payload(record, snapshot),
+        }
+        slip["slip_hash"] = _slip_hash(slip)
+        slip["file_name"] = _slip_file_name(slip)
+        slips.append(slip)
+
+    return slips
+
+
+def _storage_dir(run):
+    return f"payslips/{run.company_id}/{run.id}"
+
+
+def _storage_path(run, slip):
+    return f"{_storage_dir(run)}/{slip['slip_hash']}.pdf"
+
+
+def _stored_names(run):
+    try:
+        return set(default_storage.listdir(_storage_dir(run))[1])
+    except (FileNotFoundError, NotImplementedError):
+        return set()
+
+
+def missing_payslips(run, slips):
+    """
+    القسائم التي لم تُولّد بعد (listdir واحد بدل exists لكل قسيمة).
+    """
+    stored = _stored_names(run)
+    return [slip for slip in slips if f"{slip['slip_hash']}.pdf" not in stored]
+
+
+# ============================================================
+# ⚙️ Rendering (Process Pool)
+# ============================================================
+def _get_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_setting_int("PAYSLIP_RENDER_WORKERS", 4),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=ensure_pdf_font,
+                initargs=(tajawal_font_path(),),
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _render(slips):
+    """
+    يرجع {slip_hash: pdf_bytes}.
+    """
+    workers = _setting_int("PAYSLIP_RENDER_WORKERS", 4)
+
+    if workers > 1 and len(slips) >= _setting_int("PAYSLIP_PARALLEL_MIN_SLIPS", 20):
+        parts = [slips[i::workers] for i in range(workers)]
+        try:
+            rendered = {}
+            for batch in _get_pool().map(render_payslip_batch, [p for p in parts if p]):
+                rendered.update(batch)
+            return rendered
+        except BrokenProcessPool:
+            logger.exception("⚠️ Payslip render pool broken → rendering inline")
+            _reset_pool()
+
+    ensure_pdf_font(tajawal_font_path())
+    return dict(render_payslip_batch(slips))
+
+
+def iter_rendered_payslips(run, slips=None):
+    """
+    يولّد [(slip, pdf_bytes)] على دفعات.
+    القسائم غير المتغيرة تُقرأ من التخزين، والباقي يُولّد ويُحفظ.
+    """
+    if slips is None:
+        slips = build_run_slips(run)
+
+    chunk_size = _setting_int("PAYSLIP_RENDER_CHUNK_SIZE", 100)
+
+    for start in range(0, len(slips), chunk_size):
+        chunk = slips[start:start + chunk_size]
+
+        missing = [slip for slip in chunk if not default_storage.exists(_storage_path(run, slip))]
+        rendered = _render(missing) if missing else {}
+
+        for slip in missing:
+            default_storage.save(_storage_path(run, slip), ContentFile(rendered[slip["slip_hash"]]))
+
+        items = []
+        for slip in chunk:
+            content = rendered.get(slip["slip_hash"])
+            if content is None:
+                with default_storage.open(_storage_path(run, slip), "rb") as stored:
+                    content = stored.read()
+            items.append((slip, content))
+
+        yield items
+
+
+def render_payroll_run_payslips(run):
+    """
+    توليد تزايدي لكل قسائم الدورة (بدون ZIP) + حذف القسائم القديمة.
+    """
+    slips = build_run_slips(run)
+    existing = _stored_names(run)
+
+    current = {f"{slip['slip_hash']}.pdf" for slip in slips}
+    reused = len(current & existing)
+
+    for _items in iter_rendered_payslips(run, slips):
+        pass
+
+    for stale in existing - current:
+        default_storage.delete(f"{_storage_dir(run)}/{stale}")
+
+    return {
+        "total": len(slips),
+        "reused": reused,
+        "rendered": len(current) - reused,
+        "deleted": len(existing - current),
+    }
+
+
+# ============================================================
+# 🧵 Background Render
+# ============================================================
+def render_payroll_run_payslips_job(run_id):
+    with DistributedLock(RENDER_LOCK_KEY.format(run_id=run_id), ttl=RENDER_LOCK_TTL) as lock:
+        # نفس الدورة قيد التوليد في عملية أخرى
+        if not lock.acquired:
+            return None
+
+        run = PayrollRun.objects.select_related("company").filter(id=run_id).first()
+        if run is None:
+            return None
+
+        summary = render_payroll_run_payslips(run)
+        logger.info("🧾 Payslips rendered | run=%s | %s", run_id, summary)
+        return summary
+
+
+def _submit_render(run_id):
+    try:
+        _executor.submit(render_payroll_run_payslips_job, run_id)
+    except Exception:
+        # طلب الـ ZIP التالي يعيد الجدولة
+        logger.exception("❌ Failed to submit payslip render | run=%s", run_id)
+
+
+def schedule_payroll_run_payslips(run_id):
+    """
+    توليد قسائم الدورة في الخلفية بعد commit.
+    """
+    transaction.on_commit(lambda: _submit_render(run_id))
+
+
+# ============================================================
+# 📦 Streamed ZIP
+# ============================================================
+class _ZipStream:
+    """
+    ملف write-only غير قابل للـ seek → zipfile يكتب بالتسلسل.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_payroll_run_payslips_zip(run, slips):
+    """
+    ZIP من القسائم المخزنة فقط (missing_payslips يجب أن يكون فارغًا).
+    """
+    stream = _ZipStream()
+
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for slip in slips:
+            with default_storage.open(_storage_path(run, slip), "rb") as stored:
+                archive.writestr(slip["file_name"], stored.read())
+            yield stream.drain()
+
+    yield stream.drain()
@@ -1,3 +1,112 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from company_manager.models import Company, CompanyUser
+from employee_center.models import Employee
+from payroll_center.models import PayrollRecord, PayrollRun, PayrollSlipSnapshot
+from payroll_center.services.bulk_payslips import (
+    render_payroll_run_payslips,
+    render_payroll_run_payslips_job,
+)
+
+
+# ============================================================
+# 🧾 Bulk Payslips — Incremental Render + Streamed ZIP
+# ============================================================
+@override_settings(PAYSLIP_RENDER_WORKERS=1)
+class BulkPayslipsTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        User = get_user_model()
+        self.company = Company.objects.create(name="Payslip Co", is_active=False)
+        self.admin = User.objects.create_user(username="payroll-admin", password="x")
+        CompanyUser.objects.create(company=self.company, user=self.admin)
+
+        self.run = PayrollRun.objects.create(
+            company=self.company,
+            month=date(2026, 9, 1),
+            status=PayrollRun.Status.APPROVED,
+        )
+
+        self.records = []
+        for index in range(2):
+            employee = Employee.objects.create(
+                user=User.objects.create_user(username=f"slip-emp-{index}", password="x"),
+                company=self.company,
+                full_name=f"Employee {index}",
+                national_id=f"10000000{index}",
+            )
+            record = PayrollRecord.objects.create(
+                employee=employee,
+                run=self.run,
+                month=self.run.month,
+                base_salary=Decimal("5000.00"),
+                allowance=Decimal("500.00"),
+            )
+            PayrollSlipSnapshot.objects.create(
+                payroll_record=record,
+                run=self.run,
+                company=self.company,
+                base_salary=record.base_salary,
+                allowance=record.allowance,
+                bonus=record.bonus,
+                overtime=record.overtime,
+                deductions=record.deductions,
+                net_salary=record.net_salary,
+                breakdown={},
+            )
+            self.records.append(record)
+
+    def test_unchanged_slips_are_reused(self):
+        first = render_payroll_run_payslips(self.run)
+        self.assertEqual((first["total"], first["rendered"], first["reused"]), (2, 2, 0))
+
+        second = render_payroll_run_payslips(self.run)
+        self.assertEqual((second["rendered"], second["reused"]), (0, 2))
+
+        record = self.records[0]
+        record.paid_amount = record.net_salary
+        record.status = "PAID"
+        record.save(update_fields=["paid_amount", "status"])
+
+        third = render_payroll_run_payslips(self.run)
+        self.assertEqual((third["rendered"], third["reused"], third["deleted"]), (1, 1, 1))
+
+    def test_zip_endpoint_renders_in_background_then_streams(self):
+        self.client.force_login(self.admin)
+        url = reverse("api:company_api:company_payroll_run_payslips_zip", args=[self.run.id])
+
+        with patch("payroll_center.services.bulk_payslips._executor") as executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                pending = self.client.get(url)
+
+        self.assertEqual(pending.status_code, 202)
+        self.assertEqual((pending.json()["total"], pending.json()["ready"]), (2, 0))
+        executor.submit.assert_called_once_with(render_payroll_run_payslips_job, self.run.id)
+
+        render_payroll_run_payslips_job(self.run.id)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        names = archive.namelist()
+        self.assertEqual(len(names), 2)
+        self.assertTrue(all(name.startswith("2026-09/") for name in names))
+        self.assertTrue(archive.read(names[0]).startswith(b"%PDF"))
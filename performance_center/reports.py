@@ -4,30 +4,27 @@
 # 🚀 يدعم: PDF + Excel | Arabic RTL | Tajawal Font | Glass Design
 # ===================================================================
 
+import io
+
 from django.http import HttpResponse
 from django.utils import timezone
 
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font
 
-from .models import PerformanceReview, ReviewAnswer
+from reports_center.pdf_fonts import ensure_pdf_font
+
+from .models import PerformanceAnswer, PerformanceReview
 
 
 # ================================================================
 # 🅰️ 1) إعداد خطوط PDF (Tajawal)
 # ================================================================
-# ملاحظة: تأكد من وضع الخط داخل static/fonts
-try:
-    pdfmetrics.registerFont(TTFont("Tajawal", "static/fonts/Tajawal-Regular.ttf"))
-except:
-    # fallback لو لم يتم تحميل الخط
-    pass
+# ملاحظة: الخط داخل BASE_DIR/static/fonts (reports_center.pdf_fonts)
 
 
 # ================================================================
@@ -37,26 +34,29 @@ def draw_rtl_text(c, text, x, y, size=12, bold=False):
     """
     ✨ دالة ذكية لعرض النصوص العربية RTL داخل PDF
     """
-    c.setFont("Tajawal", size)
+    c.setFont(ensure_pdf_font(), size)
     c.drawRightString(x, y, text)
 
 
+def _file_response(content, content_type, filename):
+    response = HttpResponse(content, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 # ===================================================================
 # 📘 3) generate_review_pdf — تقرير تقييم واحد كامل PDF
 # ===================================================================
-def generate_review_pdf(review_id):
+def render_review_pdf(review_id):
     """
-    📝 إنشاء تقرير PDF لتقييم أداء واحد (Self + Manager + HR)
+    📝 إنشاء تقرير PDF لتقييم أداء واحد (Self + Manager + HR) → bytes
     """
-    review = PerformanceReview.objects.get(id=review_id)
-    answers = ReviewAnswer.objects.filter(review=review).select_related("item")
+    review = PerformanceReview.objects.select_related("employee", "template").get(id=review_id)
+    answers = PerformanceAnswer.objects.filter(review=review).select_related("item")
 
     # إنشاء ملف PDF
-    response = HttpResponse(content_type="application/pdf")
-    filename = f"performance_review_{review.employee_id}.pdf"
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-    c = canvas.Canvas(response, pagesize=A4)
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
 
     # هوامش
     margin_x = 190 * mm
@@ -117,30 +117,36 @@ def generate_review_pdf(review_id):
 
         draw_rtl_text(
             c,
-            f"ملاحظات: {ans.hr_comment or ans.manager_comment or ans.self_comment or '—'}",
+            f"ملاحظات: {ans.hr_answer or ans.manager_answer or ans.self_answer or '—'}",
             margin_x,
             current_y,
         )
         current_y -= 15
 
     c.save()
-    return response
+    return buffer.getvalue()
+
+
+def generate_review_pdf(review_id):
+    review = PerformanceReview.objects.only("employee_id").get(id=review_id)
+    return _file_response(
+        render_review_pdf(review_id),
+        "application/pdf",
+        f"performance_review_{review.employee_id}.pdf",
+    )
 
 
 # ===================================================================
 # 📘 4) generate_employee_summary_pdf — تقرير موظف شامل
 # ===================================================================
-def generate_employee_summary_pdf(employee_id):
+def render_employee_summary_pdf(employee_id):
     """
-    🧾 تقرير شامل لتقييمات موظف واحد (Multiple Reviews)
+    🧾 تقرير شامل لتقييمات موظف واحد (Multiple Reviews) → bytes
     """
-    reviews = PerformanceReview.objects.filter(employee_id=employee_id)
-
-    response = HttpResponse(content_type="application/pdf")
-    filename = f"employee_summary_{employee_id}.pdf"
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    reviews = PerformanceReview.objects.filter(employee_id=employee_id).select_related("template")
 
-    c = canvas.Canvas(response, pagesize=A4)
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
 
     margin_x = 190 * mm
     current_y = 270 * mm
@@ -163,15 +169,23 @@ def generate_employee_summary_pdf(employee_id):
             current_y = 270 * mm
 
     c.save()
-    return response
+    return buffer.getvalue()
+
+
+def generate_employee_summary_pdf(employee_id):
+    return _file_response(
+        render_employee_summary_pdf(employee_id),
+        "application/pdf",
+        f"employee_summary_{employee_id}.pdf",
+    )
 
 
 # ===================================================================
 # 📘 5) export_reviews_excel — تصدير Excel لجميع التقييمات
 # ===================================================================
-def export_reviews_excel():
+def render_reviews_xlsx():
     """
-    📊 إنشاء ملف Excel يحتوي جميع التقييمات في النظام
+    📊 إنشاء ملف Excel يحتوي جميع التقييمات في النظام → bytes
     """
     wb = Workbook()
     ws = wb.active
@@ -194,7 +208,7 @@ def export_reviews_excel():
         ws.cell(row=1, column=col).alignment = Alignment(horizontal="center")
 
     # بيانات التقييم
-    for review in PerformanceReview.objects.all():
+    for review in PerformanceReview.objects.select_related("employee", "template").iterator(chunk_size=2000):
         ws.append([
             str(review.employee),
             review.template.name,
@@ -204,11 +218,14 @@ def export_reviews_excel():
             review.updated_at.strftime("%Y-%m-%d"),
         ])
 
-    # تجهيز الاستجابة
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-    response["Content-Disposition"] = 'attachment; filename="performance_reviews.xlsx"'
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
 
-    wb.save(response)
-    return response
+
+def export_reviews_excel():
+    return _file_response(
+        render_reviews_xlsx(),
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "performance_reviews.xlsx",
+    )
@@ -404,12 +404,7 @@ def hr_review(request, review_id):
 # ================================================================
 # 📊 Views — Performance Center Reports (PDF + Excel)
 # ================================================================
-from django.http import HttpResponse
-from .reports import (
-    generate_review_pdf,
-    generate_employee_summary_pdf,
-    export_reviews_excel,
-)
+from reports_center.services import report_job_response, request_report
 
 
 # ------------------------------------------------------------
@@ -418,9 +413,16 @@ from .reports import (
 @login_required
 def review_pdf_view(request, review_id):
     """
-    🔥 إنشاء PDF لتقرير تقييم واحد
+    🔥 إنشاء PDF لتقرير تقييم واحد (ReportJob في الخلفية)
     """
-    return generate_review_pdf(review_id)
+    review = get_object_or_404(PerformanceReview.objects.select_related("employee"), id=review_id)
+    job = request_report(
+        report_type="performance_review_pdf",
+        requested_by=request.user,
+        company=review.employee.company,
+        params={"review_id": review.id},
+    )
+    return report_job_response(job)
 
 
 # ------------------------------------------------------------
@@ -429,9 +431,16 @@ def review_pdf_view(request, review_id):
 @login_required
 def employee_summary_pdf_view(request, employee_id):
     """
-    🔥 إنشاء تقرير PDF لجميع تقييمات الموظف
+    🔥 إنشاء تقرير PDF لجميع تقييمات الموظف (ReportJob في الخلفية)
     """
-    return generate_employee_summary_pdf(employee_id)
+    employee = get_object_or_404(Employee, id=employee_id)
+    job = request_report(
+        report_type="performance_employee_summary_pdf",
+        requested_by=request.user,
+        company=employee.company,
+        params={"employee_id": employee.id},
+    )
+    return report_job_response(job)
 
 
 # ------------------------------------------------------------
@@ -440,6 +449,7 @@ def employee_summary_pdf_view(request, employee_id):
 @login_required
 def reviews_excel_export(request):
     """
-    🔥 إنشاء ملف Excel يحتوي جميع التقييمات داخل النظام
+    🔥 إنشاء ملف Excel يحتوي جميع التقييمات داخل النظام (ReportJob في الخلفية)
     """
-    return export_reviews_excel()
+    job = request_report(report_type="performance_reviews_xlsx", requested_by=request.user)
+    return report_job_response(job)
@@ -0,0 +1,54 @@
+# ============================================================
+# 🗄️ DB Connections — Persistent & Recycled (Jobs / Threads)
+# Mham Cloud
+# ============================================================
+# ✔ الطلبات: CONN_MAX_AGE + CONN_HEALTH_CHECKS (settings.py)
+# ✔ APScheduler / Thread Pools لا تمر بدورة الطلب
+#   → نفس منطق Django يدويًا قبل وبعد كل مهمة
+# ✔ الاتصال يبقى للمهمة التالية في نفس الخيط حتى انتهاء عمره
+# ✔ الاتصالات المعطوبة / المنتهية تُغلق (لا "MySQL server has gone away")
+# ============================================================
+
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.db import close_old_connections
+
+
+def recycle_db_connections():
+    """
+    إغلاق الاتصالات المنتهية أو غير الصالحة فقط (حسب CONN_MAX_AGE).
+    """
+    close_old_connections()
+
+
+@contextmanager
+def db_connection_scope():
+    recycle_db_connections()
+    try:
+        yield
+    finally:
+        recycle_db_connections()
+
+
+def with_db_connection(func):
+    """
+    🧭 Decorator لمهام الجدولة والخيوط الخلفية.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with db_connection_scope():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class DBThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor يعيد تدوير اتصالات قاعدة البيانات حول كل مهمة.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(with_db_connection(fn), *args, **kwargs)
@@ -0,0 +1,164 @@
+# ============================================================
+# 🔒 Distributed Lock — Shared Cache (Redis) / LocMem Fallback
+# Mham Cloud
+# ============================================================
+# ✔ Acquire ذري: cache.add (SET NX على Redis)
+# ✔ Token لكل مالك → لا يحرر أو يجدد قفل عملية أخرى
+# ✔ Release / Renew ذري عبر Lua عند استخدام RedisCache
+# ✔ يعمل مع LocMemCache في الاختبارات
+# ✔ تعطل الـ backend (Redis) يُسجل كخطأ عبر lock.unavailable وليس كتزاحم
+# ============================================================
+
+import functools
+import logging
+import uuid
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY_PREFIX = "lock:"
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class DistributedLock:
+    """
+    🔒 قفل مشترك بين كل العمليات (gunicorn workers / schedulers).
+
+    الاستخدام:
+        with DistributedLock("scheduler:biotime", ttl=1800) as lock:
+            if not lock.acquired:
+                return
+            ...
+            lock.renew()
+
+    lock.acquired == False و lock.unavailable == True → تعطل Redis (وليس عملية أخرى)
+    """
+
+    def __init__(self, key, ttl, *, cache_alias="default"):
+        self.key = f"{LOCK_KEY_PREFIX}{key}"
+        self.ttl = int(ttl)
+        self.cache = caches[cache_alias]
+        self.token = uuid.uuid4().hex
+        self.acquired = False
+        self.error = None
+
+    @property
+    def unavailable(self):
+        return self.error is not None
+
+    # --------------------------------------------------------
+    # 🧩 Redis Helpers
+    # --------------------------------------------------------
+    def _run_script(self, script, *args):
+        """
+        تنفيذ Lua على Redis مباشرة. يرجع None إذا لم يكن الـ backend Redis.
+        """
+        if not isinstance(self.cache, RedisCache):
+            return None
+
+        backend = self.cache._cache
+        raw_key = self.cache.make_and_validate_key(self.key)
+        client = backend.get_client(raw_key, write=True)
+        raw_token = backend._serializer.dumps(self.token)
+
+        return client.eval(script, 1, raw_key, raw_token, *args)
+
+    # --------------------------------------------------------
+    # 🔐 Public API
+    # --------------------------------------------------------
+    def acquire(self):
+        self.error = None
+
+        try:
+            self.acquired = bool(self.cache.add(self.key, self.token, self.ttl))
+        except Exception as exc:
+            # Fail-closed: لا تنفيذ بدون قفل، لكن لا نخلطه مع "مشغول"
+            logger.exception("🚨 Lock backend unavailable | key=%s", self.key)
+            self.error = exc
+            self.acquired = False
+
+        return self.acquired
+
+    def renew(self, ttl=None):
+        """
+        تمديد الـ TTL للمهام الطويلة (فقط إذا ما زلنا المالك).
+        """
+        if not self.acquired:
+            return False
+
+        ttl = int(ttl or self.ttl)
+
+        try:
+            result = self._run_script(_RENEW_SCRIPT, ttl)
+            if result is None:
+                if self.cache.get(self.key) != self.token:
+                    return False
+                return bool(self.cache.touch(self.key, ttl))
+            return bool(result)
+        except Exception:
+            logger.exception("❌ Lock renew failed | key=%s", self.key)
+            return False
+
+    def release(self):
+        if not self.acquired:
+            return False
+
+        self.acquired = False
+
+        try:
+            result = self._run_script(_RELEASE_SCRIPT)
+            if result is None:
+                if self.cache.get(self.key) != self.token:
+                    return False
+                self.cache.delete(self.key)
+                return True
+            return bool(result)
+        except Exception:
+            logger.exception("❌ Lock release failed | key=%s", self.key)
+            return False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+def single_instance_job(key, ttl):
+    """
+    🧭 Decorator لمهام الجدولة: تنفيذ واحد فقط عبر كل العمليات.
+    التنفيذات المتزامنة الأخرى يتم تخطيها.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with DistributedLock(key, ttl) as lock:
+                if lock.unavailable:
+                    logger.error("🚨 Job skipped — lock backend unavailable | %s", key)
+                    return None
+                if not lock.acquired:
+                    logger.info("⏳ Job already running elsewhere — skipped | %s", key)
+                    return None
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -213,6 +213,53 @@ WHATSAPP_GATEWAY_LOG_FILE = env(
     str(BASE_DIR / "logs" / "whatsapp_gateway.log"),
 )
 
+# ------------------------------------------------------------
+# 🔁 Retry Queue (بعد رجوع الجلسة — في الخلفية)
+# ------------------------------------------------------------
+# عدد الرسائل في كل دفعة
+WHATSAPP_RETRY_BATCH_SIZE = env_int("WHATSAPP_RETRY_BATCH_SIZE", 20)
+# أقصى عدد رسائل في كل تفريغ للطابور
+WHATSAPP_RETRY_MAX_PER_DRAIN = env_int("WHATSAPP_RETRY_MAX_PER_DRAIN", 500)
+# حد المعدل (رسالة / ثانية) حتى لا يُحظر الرقم
+WHATSAPP_RETRY_RATE_PER_SECOND = env_int("WHATSAPP_RETRY_RATE_PER_SECOND", 5)
+# خيوط التفريغ في الخلفية
+WHATSAPP_RETRY_WORKERS = env_int("WHATSAPP_RETRY_WORKERS", 2)
+# عمر قفل التفريغ لكل نطاق (ثواني)
+WHATSAPP_RETRY_LOCK_SECONDS = env_int("WHATSAPP_RETRY_LOCK_SECONDS", 600)
+
+# ------------------------------------------------------------
+# 📥 Webhook Queue (Fast-Ack + معالجة في الخلفية)
+# ------------------------------------------------------------
+# عدد الأحداث الخام في كل دفعة معالجة
+WHATSAPP_WEBHOOK_BATCH_SIZE = env_int("WHATSAPP_WEBHOOK_BATCH_SIZE", 200)
+# فترة الـ Sweep الدوري في run_workers (ثواني)
+WHATSAPP_WEBHOOK_SWEEP_SECONDS = env_int("WHATSAPP_WEBHOOK_SWEEP_SECONDS", 5)
+# عدد محاولات حدث الحالة قبل عزله (processing_error) حتى لا يوقف الطابور
+WHATSAPP_WEBHOOK_MAX_ATTEMPTS = env_int("WHATSAPP_WEBHOOK_MAX_ATTEMPTS", 5)
+
+# ============================================================
+# 🕒 BIOTIME CLIENT
+# ============================================================
+# Session مشتركة لكل Tenant طوال عمر العملية (Keep-Alive + Retries)
+
+BIOTIME_SESSION_TTL_MINUTES = env_int("BIOTIME_SESSION_TTL_MINUTES", 30)
+BIOTIME_HTTP_POOL_MAXSIZE = env_int("BIOTIME_HTTP_POOL_MAXSIZE", 10)
+BIOTIME_HTTP_RETRIES = env_int("BIOTIME_HTTP_RETRIES", 3)
+
+# 🌍 IP → Location cache لصفحة الأجهزة (Negative TTL أقصر)
+BIOTIME_GEO_CACHE_TTL_HOURS = env_int("BIOTIME_GEO_CACHE_TTL_HOURS", 168)
+BIOTIME_GEO_NEGATIVE_TTL_MINUTES = env_int("BIOTIME_GEO_NEGATIVE_TTL_MINUTES", 60)
+
+# ============================================================
+# 📅 ATTENDANCE CACHES
+# ============================================================
+# تقويم الإجازات الرسمية داخل العملية (يُسقط عند save/delete)
+
+HOLIDAY_CALENDAR_TTL_SECONDS = env_int("HOLIDAY_CALENDAR_TTL_SECONDS", 300)
+
+# جداول الدوام + السياسة الفعالة (Version لكل شركة في الـ cache)
+ATTENDANCE_RESOLUTION_CHECK_SECONDS = env_int("ATTENDANCE_RESOLUTION_CHECK_SECONDS", 5)
+
 # ============================================================
 # 🌐 ROOT URLS
 # ============================================================
@@ -262,6 +309,7 @@ INSTALLED_APPS = [
     "performance_center",
     "whatsapp_center",
     "system_log",
+    "reports_center",
     "api",
 ]
 
@@ -357,6 +405,12 @@ CORS_ALLOW_HEADERS = [
     "user-agent",
     "x-csrftoken",
     "x-requested-with",
+    "if-none-match",
+]
+
+# ETag (whoami / bootstrap) مقروء من الفرونت
+CORS_EXPOSE_HEADERS = [
+    "etag",
 ]
 
 CORS_ALLOW_METHODS = [
@@ -403,18 +457,59 @@ CSRF_HEADER_NAME = "HTTP_X_CSRFTOKEN"
 ASGI_APPLICATION = "primey_hrm.asgi.application"
 WSGI_APPLICATION = "primey_hrm.wsgi.application"
 
+REDIS_HOST = env("REDIS_HOST", "127.0.0.1")
+REDIS_PORT = env_int("REDIS_PORT", 6379)
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
         "CONFIG": {
             "hosts": [(
-                env("REDIS_HOST", "127.0.0.1"),
-                env_int("REDIS_PORT", 6379),
+                REDIS_HOST,
+                REDIS_PORT,
             )],
         },
     }
 }
 
+# ============================================================
+# 🗃️ CACHE — Shared Redis (Locks / Counters / Snapshots)
+# ============================================================
+# نفس Redis الخاص بالـ Channels لكن على DB منفصلة
+# CACHE_BACKEND=locmem → ذاكرة محلية (الاختبارات / بيئة بدون Redis)
+
+CACHE_BACKEND = env("CACHE_BACKEND", "redis").strip().lower()
+REDIS_CACHE_DB = env_int("REDIS_CACHE_DB", 1)
+
+if CACHE_BACKEND == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "mham-cloud",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_CACHE_DB}",
+            "KEY_PREFIX": "mham",
+            "TIMEOUT": 300,
+        }
+    }
+
+# 🔢 عداد الإشعارات غير المقروءة في الـ cache (ثواني — شبكة أمان ضد الانحراف)
+NOTIFICATION_UNREAD_CACHE_TTL = env_int("NOTIFICATION_UNREAD_CACHE_TTL", 300)
+
+# 🔒 System Flags: فحص الـ Version المشترك كل N ثانية (0 = كل طلب)
+SYSTEM_FLAGS_CHECK_SECONDS = env_int("SYSTEM_FLAGS_CHECK_SECONDS", 1)
+
+# 🏥 استخدام الإجازات المرضية (365 يوم) لكل موظف في الـ cache (ثواني)
+SICK_USAGE_CACHE_TTL = env_int("SICK_USAGE_CACHE_TTL", 3600)
+
+# 🔄 إعادة ضبط أرصدة الإجازات السنوية: حجم الدفعة لكل UPDATE
+LEAVE_RESET_CHUNK_SIZE = env_int("LEAVE_RESET_CHUNK_SIZE", 500)
+
 # ============================================================
 # 🗄️ DATABASE — MariaDB / MySQL
 # ============================================================
@@ -427,6 +522,10 @@ DATABASES = {
         "PASSWORD": env("DB_PASSWORD", "StrongPass123"),
         "HOST": env("DB_HOST", "127.0.0.1"),
         "PORT": env("DB_PORT", "3306"),
+        # ♻️ اتصالات دائمة (ثواني) + فحص صلاحية قبل إعادة الاستخدام
+        # 0 = اتصال جديد لكل طلب (عدد صحيح فقط؛ لا توجد قيمة "بدون حد")
+        "CONN_MAX_AGE": env_int("DB_CONN_MAX_AGE", 60),
+        "CONN_HEALTH_CHECKS": env_bool("DB_CONN_HEALTH_CHECKS", True),
         "OPTIONS": {
             "charset": "utf8mb4",
             "init_command": "SET NAMES utf8mb4 COLLATE utf8mb4_unicode_ci",
@@ -529,11 +628,58 @@ STATICFILES_DIRS = [
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
 # ============================================================
-# ⏱️ ATTENDANCE SCHEDULER
+# 📊 REPORT JOBS (PDF / XLSX في الخلفية)
+# ============================================================
+# إعادة استخدام ملف مطابق تم توليده خلال هذه المدة (ثواني)
+REPORT_ARTIFACT_REUSE_SECONDS = env_int("REPORT_ARTIFACT_REUSE_SECONDS", 900)
+# خيوط توليد التقارير داخل كل عملية
+REPORT_WORKERS = env_int("REPORT_WORKERS", 2)
+# Job عالق في running أكثر من هذه المدة يُعلّم failed
+REPORT_JOB_TIMEOUT_SECONDS = env_int("REPORT_JOB_TIMEOUT_SECONDS", 1800)
+
+# ============================================================
+# 📏 SUBSCRIPTION LIMITS
+# ============================================================
+# مدة تخزين الاشتراك النشط لكل شركة (يُبطل عند حفظ الاشتراك / الباقة)
+BILLING_ACTIVE_SUBSCRIPTION_CACHE_TTL = env_int("BILLING_ACTIVE_SUBSCRIPTION_CACHE_TTL", 300)
+# تصحيح عدادات الاستخدام (موظفين / فروع) من COUNT فعلي كل (ثواني)
+BILLING_USAGE_RECONCILE_SECONDS = env_int("BILLING_USAGE_RECONCILE_SECONDS", 3600)
+
+# ============================================================
+# 🧾 BULK PAYSLIPS (PDF لكل دورة رواتب)
+# ============================================================
+# عدد العمليات (Processes) لتوليد القسائم بالتوازي
+PAYSLIP_RENDER_WORKERS = env_int("PAYSLIP_RENDER_WORKERS", 4)
+# أقل عدد قسائم ناقصة لاستخدام الـ Process Pool (أقل منه → توليد مباشر)
+PAYSLIP_PARALLEL_MIN_SLIPS = env_int("PAYSLIP_PARALLEL_MIN_SLIPS", 20)
+# عدد القسائم في كل دفعة توليد/بث داخل ملف ZIP
+PAYSLIP_RENDER_CHUNK_SIZE = env_int("PAYSLIP_RENDER_CHUNK_SIZE", 100)
+
+# ============================================================
+# 📥 EMPLOYEE BULK IMPORT (CSV / XLSX)
+# ============================================================
+# الحد الأقصى لعدد الصفوف في ملف واحد
+EMPLOYEE_IMPORT_MAX_ROWS = env_int("EMPLOYEE_IMPORT_MAX_ROWS", 2000)
+# عدد الموظفين في كل دفعة ترحيب / Biotime في الخلفية
+EMPLOYEE_IMPORT_SIDE_EFFECT_BATCH = env_int("EMPLOYEE_IMPORT_SIDE_EFFECT_BATCH", 50)
+
+# ============================================================
+# 👤 WHOAMI / BOOTSTRAP CACHE
+# ============================================================
+# مدة تخزين payload الـ whoami لكل مستخدم/جلسة (يُبطل عند أي تغيير) — 0 = تعطيل
+WHOAMI_CACHE_TTL = env_int("WHOAMI_CACHE_TTL", 300)
+
+# ============================================================
+# ⏱️ BACKGROUND WORKERS
 # ============================================================
+# كل الـ Schedulers (الحضور / الإجازات / الفوترة / واتساب) تعمل فقط في:
+#   python manage.py run_workers
+# عمليات الويب لا تشغل أي منها.
 
-# تشغيل مزامنة الحضور التلقائية
-SCHEDULER_AUTOSTART = True
+# 💳 إصدار الفواتير اليومي + تجديد الاشتراكات: تفعيل صريح فقط
+#    (أو تسميتها في run_workers --only)
+WORKERS_ENABLE_AUTO_BILLING = env_bool("WORKERS_ENABLE_AUTO_BILLING", False)
+WORKERS_ENABLE_SUBSCRIPTION_RENEWAL = env_bool("WORKERS_ENABLE_SUBSCRIPTION_RENEWAL", False)
 
 # ============================================================
 # 🔑 Default PK
@@ -0,0 +1,232 @@
+# ============================================================
+# 🧵 Background Workers — Registry + Job Metrics
+# Mham Cloud
+# ============================================================
+# ✔ كل الـ Schedulers / Workers تعمل داخل عملية واحدة:
+#     python manage.py run_workers
+# ✔ عمليات الويب (gunicorn / daphne / runserver) لا تشغل أي منها
+# ✔ مقاييس التنفيذ لكل Job في الـ cache المشترك
+#   (runs / failures / missed / آخر مدة) → تقرأها عمليات الويب
+# ✔ Heartbeat لمعرفة هل عملية الـ Workers حية
+# ✔ Workers الفوترة (auto_billing / subscription_renewal) Opt-in:
+#   WORKERS_ENABLE_* أو تسميتها صراحة في --only
+# ✔ DjangoJobStore خاص بالفوترة فقط — البقية MemoryJobStore
+#   (جدول واحد مشترك = كل Scheduler ينفذ Jobs الآخرين)
+# ============================================================
+
+import logging
+import threading
+import time
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+METRICS_CACHE_KEY = "workers:metrics"
+HEARTBEAT_CACHE_KEY = "workers:heartbeat"
+
+
+# ============================================================
+# 🚀 Starters (Lazy Imports)
+# ============================================================
+def _start_biotime_attendance():
+    from attendance_center.services.biotime_attendance_scheduler import (
+        start_biotime_attendance_scheduler,
+    )
+    return start_biotime_attendance_scheduler()
+
+
+def _start_leave_balances():
+    from leave_center.jobs import start_scheduler
+    return start_scheduler()
+
+
+def _start_auto_billing():
+    from billing_center.scheduler.auto_billing_scheduler import start
+    return start()
+
+
+def _start_subscription_renewal():
+    from billing_center.schedulers import start
+    return start()
+
+
+def _start_usage_counters():
+    from billing_center.scheduler.usage_counters_scheduler import start_scheduler
+    return start_scheduler()
+
+
+def _start_whatsapp_inbox():
+    from whatsapp_center.inbox_queue import start_scheduler
+    return start_scheduler()
+
+
+def _start_report_jobs():
+    from reports_center.scheduler import start_scheduler
+    return start_scheduler()
+
+
+def _start_employee_imports():
+    from employee_center.scheduler import start_scheduler
+    return start_scheduler()
+
+
+def _start_whatsapp_gateway():
+    from django.apps import apps
+    apps.get_app_config("whatsapp_center").start_gateway()
+
+
+# name → starter (يرجع BackgroundScheduler أو None)
+WORKERS = {
+    "biotime_attendance": _start_biotime_attendance,
+    "leave_balances": _start_leave_balances,
+    "auto_billing": _start_auto_billing,
+    "subscription_renewal": _start_subscription_renewal,
+    "usage_counters": _start_usage_counters,
+    "whatsapp_inbox": _start_whatsapp_inbox,
+    "report_jobs": _start_report_jobs,
+    "employee_imports": _start_employee_imports,
+    "whatsapp_gateway": _start_whatsapp_gateway,
+}
+
+# name → setting (لا تعمل إلا بتفعيل صريح)
+OPT_IN_WORKERS = {
+    "auto_billing": "WORKERS_ENABLE_AUTO_BILLING",
+    "subscription_renewal": "WORKERS_ENABLE_SUBSCRIPTION_RENEWAL",
+}
+
+
+def is_worker_enabled(name, only=()):
+    """
+    الـ Worker الاختياري يعمل فقط إذا فُعّل من الإعدادات أو سُمّي في --only.
+    """
+    setting = OPT_IN_WORKERS.get(name)
+    if setting is None or name in only:
+        return True
+    return bool(getattr(settings, setting, False))
+
+
+# ============================================================
+# 📊 Job Metrics (APScheduler Listener)
+# ============================================================
+class JobMetricsRecorder:
+    """
+    يجمع مقاييس التنفيذ داخل عملية الـ Workers وينشرها في الـ cache.
+    """
+
+    EVENT_MASK = EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._started = {}
+
+    def attach(self, worker_name, scheduler):
+        scheduler.add_listener(
+            lambda event: self.handle(worker_name, event),
+            self.EVENT_MASK,
+        )
+
+    def _entry(self, worker_name, job_id):
+        return self._metrics.setdefault(
+            f"{worker_name}:{job_id}",
+            {
+                "worker": worker_name,
+                "job_id": job_id,
+                "runs": 0,
+                "failures": 0,
+                "missed": 0,
+                "running": 0,
+                "last_status": None,
+                "last_run_at": None,
+                "last_duration_seconds": None,
+                "total_duration_seconds": 0.0,
+            },
+        )
+
+    def handle(self, worker_name, event):
+        job_id = getattr(event, "job_id", None) or "unknown"
+        key = (worker_name, job_id)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entry(worker_name, job_id)
+
+            if event.code == EVENT_JOB_SUBMITTED:
+                self._started[key] = now
+                entry["running"] += 1
+                return
+
+            if event.code == EVENT_JOB_MISSED:
+                entry["missed"] += 1
+                entry["last_status"] = "missed"
+            else:
+                started = self._started.pop(key, None)
+                entry["running"] = max(entry["running"] - 1, 0)
+                entry["runs"] += 1
+
+                if event.code == EVENT_JOB_ERROR:
+                    entry["failures"] += 1
+                    entry["last_status"] = "failed"
+                else:
+                    entry["last_status"] = "ok"
+
+                if started is not None:
+                    duration = round(now - started, 3)
+                    entry["last_duration_seconds"] = duration
+                    entry["total_duration_seconds"] = round(
+                        entry["total_duration_seconds"] + duration, 3
+                    )
+
+            entry["last_run_at"] = timezone.now().isoformat()
+            snapshot = dict(self._metrics)
+
+        self._publish(snapshot)
+
+    def _publish(self, snapshot):
+        try:
+            cache.set(METRICS_CACHE_KEY, snapshot, None)
+        except Exception:
+            logger.debug("⚠️ تعذر نشر مقاييس الـ Workers في الـ cache.")
+
+
+def beat(workers, interval):
+    """
+    💓 تحديث Heartbeat (ينتهي تلقائيًا إذا توقفت العملية).
+    """
+    try:
+        cache.set(
+            HEARTBEAT_CACHE_KEY,
+            {
+                "at": timezone.now().isoformat(),
+                "workers": list(workers),
+            },
+            max(int(interval * 3), 1),
+        )
+    except Exception:
+        logger.debug("⚠️ تعذر تحديث Heartbeat الخاص بالـ Workers.")
+
+
+# ============================================================
+# 📖 Read Side (عمليات الويب)
+# ============================================================
+def get_worker_status():
+    try:
+        heartbeat = cache.get(HEARTBEAT_CACHE_KEY)
+        metrics = cache.get(METRICS_CACHE_KEY) or {}
+    except Exception:
+        heartbeat, metrics = None, {}
+
+    return {
+        "alive": heartbeat is not None,
+        "heartbeat": heartbeat,
+        "jobs": sorted(metrics.values(), key=lambda item: (item["worker"], item["job_id"])),
+    }
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import ReportJob
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "report_type", "company", "requested_by", "status", "reused", "size_bytes", "created_at")
+    list_filter = ("status", "report_type", "reused")
+    search_fields = ("report_type", "content_hash", "file_name")
+    readonly_fields = ("params_hash", "content_hash", "created_at", "started_at", "finished_at")
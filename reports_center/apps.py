@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class ReportsCenterConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "reports_center"
+    verbose_name = "Reports Center"
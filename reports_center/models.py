@@ -0,0 +1,76 @@
+# ============================================================
+# 📊 Reports Center — ReportJob
+# Mham Cloud
+# ============================================================
+# ✔ كل تقرير ثقيل (PDF / XLSX) يُولّد في الخلفية كـ ReportJob
+# ✔ الملف يُخزن تحت MEDIA_ROOT باسم = hash المحتوى
+# ✔ params_hash يسمح بإعادة استخدام نفس الملف لنفس الطلب
+# ============================================================
+
+from django.conf import settings
+from django.db import models
+
+from company_manager.models import Company
+
+
+class ReportJob(models.Model):
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "قيد الانتظار"),
+        (STATUS_RUNNING, "قيد التوليد"),
+        (STATUS_COMPLETED, "مكتمل"),
+        (STATUS_FAILED, "فشل"),
+    ]
+
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="report_jobs",
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="report_jobs",
+    )
+
+    report_type = models.CharField(max_length=100)
+    params = models.JSONField(default=dict, blank=True)
+    params_hash = models.CharField(max_length=64)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+
+    # 📁 الملف الناتج (قد يكون مشتركًا بين أكثر من Job عند إعادة الاستخدام)
+    file = models.FileField(upload_to="reports/", max_length=255, blank=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)
+    size_bytes = models.PositiveBigIntegerField(default=0)
+    reused = models.BooleanField(default=False)
+
+    error_message = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(
+                fields=["report_type", "company", "params_hash", "status", "finished_at"],
+                name="report_job_reuse_idx",
+            ),
+            models.Index(fields=["status", "created_at"], name="report_job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.report_type} #{self.id} ({self.status})"
@@ -0,0 +1,41 @@
+# ============================================================
+# 🅰️ PDF Fonts — Tajawal (Shared)
+# Mham Cloud | Reports Center
+# ============================================================
+# ✔ المسار من settings.BASE_DIR (وليس مجلد التشغيل الحالي)
+# ✔ تسجيل مرة واحدة لكل عملية (fallback: Helvetica)
+# ✔ بدون استيراد Django على مستوى الملف → آمن داخل Process Pool (spawn)
+# ============================================================
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+FALLBACK_FONT = "Helvetica"
+
+_PDF_FONT = None
+
+
+def tajawal_font_path():
+    from django.conf import settings
+
+    return str(settings.BASE_DIR / "static" / "fonts" / "Tajawal-Regular.ttf")
+
+
+def ensure_pdf_font(font_path=None):
+    """
+    تسجيل Tajawal مرة واحدة في العملية الحالية ويرجع اسم الخط المستخدم.
+    font_path: يمرر صراحة داخل عمليات spawn (بدون إعدادات Django).
+    """
+    global _PDF_FONT
+
+    if _PDF_FONT is not None:
+        return _PDF_FONT
+
+    _PDF_FONT = FALLBACK_FONT
+    try:
+        pdfmetrics.registerFont(TTFont("Tajawal", str(font_path or tajawal_font_path())))
+        _PDF_FONT = "Tajawal"
+    except Exception:
+        pass
+
+    return _PDF_FONT
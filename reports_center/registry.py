@@ -0,0 +1,118 @@
+# ============================================================
+# 🗂️ Reports Registry — report_type → Builder
+# ============================================================
+# كل Builder يستقبل ReportJob ويرجع bytes فقط (لا HttpResponse)
+# الاستيراد Lazy حتى لا يرتبط تحميل التطبيقات ببعضها
+# ============================================================
+
+from dataclasses import dataclass
+from typing import Callable
+
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PDF = "application/pdf"
+
+
+@dataclass(frozen=True)
+class ReportSpec:
+    title: str
+    content_type: str
+    extension: str
+    filename: Callable
+    build: Callable
+
+
+# ------------------------------------------------------------
+# 🕒 Attendance
+# ------------------------------------------------------------
+def _attendance_range_pdf(job):
+    from attendance_center.services.report_exports import render_attendance_range_pdf
+    return render_attendance_range_pdf(job.company, job.params["start"], job.params["end"])
+
+
+def _attendance_policies_xlsx(job):
+    from attendance_center.services.report_exports import render_attendance_policies_xlsx
+    return render_attendance_policies_xlsx(job.company)
+
+
+# ------------------------------------------------------------
+# 📘 System Log
+# ------------------------------------------------------------
+def _system_logs_xlsx(job):
+    from system_log.exports import render_logs_xlsx
+    return render_logs_xlsx(job.company)
+
+
+def _system_logs_pdf(job):
+    from system_log.exports import render_logs_pdf
+    return render_logs_pdf(job.company)
+
+
+# ------------------------------------------------------------
+# 📊 Performance
+# ------------------------------------------------------------
+def _performance_review_pdf(job):
+    from performance_center.reports import render_review_pdf
+    return render_review_pdf(job.params["review_id"])
+
+
+def _performance_employee_summary_pdf(job):
+    from performance_center.reports import render_employee_summary_pdf
+    return render_employee_summary_pdf(job.params["employee_id"])
+
+
+def _performance_reviews_xlsx(job):
+    from performance_center.reports import render_reviews_xlsx
+    return render_reviews_xlsx()
+
+
+REPORTS = {
+    "attendance_range_pdf": ReportSpec(
+        title="تقرير الحضور",
+        content_type=PDF,
+        extension="pdf",
+        filename=lambda job: f"attendance_{job.company_id}_{job.params['start']}_to_{job.params['end']}.pdf",
+        build=_attendance_range_pdf,
+    ),
+    "attendance_policies_xlsx": ReportSpec(
+        title="سياسات الحضور",
+        content_type=XLSX,
+        extension="xlsx",
+        filename=lambda job: "attendance_policies.xlsx",
+        build=_attendance_policies_xlsx,
+    ),
+    "system_logs_xlsx": ReportSpec(
+        title="سجلات النظام (Excel)",
+        content_type=XLSX,
+        extension="xlsx",
+        filename=lambda job: f"system_logs_{job.company_id}.xlsx",
+        build=_system_logs_xlsx,
+    ),
+    "system_logs_pdf": ReportSpec(
+        title="سجلات النظام (PDF)",
+        content_type=PDF,
+        extension="pdf",
+        filename=lambda job: f"system_logs_{job.company_id}.pdf",
+        build=_system_logs_pdf,
+    ),
+    "performance_review_pdf": ReportSpec(
+        title="تقرير تقييم الأداء",
+        content_type=PDF,
+        extension="pdf",
+        filename=lambda job: f"performance_review_{job.params['review_id']}.pdf",
+        build=_performance_review_pdf,
+    ),
+    "performance_employee_summary_pdf": ReportSpec(
+        title="ملخص تقييمات الموظف",
+        content_type=PDF,
+        extension="pdf",
+        filename=lambda job: f"employee_summary_{job.params['employee_id']}.pdf",
+        build=_performance_employee_summary_pdf,
+    ),
+    "performance_reviews_xlsx": ReportSpec(
+        title="تقييمات الأداء",
+        content_type=XLSX,
+        extension="xlsx",
+        filename=lambda job: "performance_reviews.xlsx",
+        build=_performance_reviews_xlsx,
+    ),
+}
@@ -0,0 +1,30 @@
+# ============================================================
+# ⏰ Report Jobs Sweep (run_workers)
+# ============================================================
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from primey_hrm.db_connections import with_db_connection
+from primey_hrm.distributed_lock import single_instance_job
+
+from .services import process_pending_report_jobs
+
+
+@with_db_connection
+@single_instance_job("scheduler:reports:pending_jobs", 30 * 60)
+def process_pending_report_jobs_job():
+    process_pending_report_jobs()
+
+
+def start_scheduler():
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(
+        process_pending_report_jobs_job,
+        trigger="interval",
+        seconds=30,
+        id="process_pending_report_jobs",
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.start()
+    return scheduler
@@ -0,0 +1,268 @@
+# ============================================================
+# 🧾 Reports Center — Job Runner + Stored Artifacts
+# Mham Cloud
+# ============================================================
+# ✔ request_report: ينشئ ReportJob ويرجع فورًا (لا توليد داخل الطلب)
+#   - نفس التقرير قيد التوليد → نفس الـ Job
+#   - نفس التقرير اكتمل حديثًا → إعادة استخدام الملف (بدون توليد)
+# ✔ run_report_job: claim ذري (pending → running) ثم التوليد
+# ✔ الملف: MEDIA_ROOT/reports/<type>/<sha256>.<ext> (نفس المحتوى = نفس الملف)
+# ✔ الإكمال: notify_report_generated للطالب
+# ✔ التنفيذ: DBThreadPoolExecutor بعد commit + Sweep في run_workers
+# ============================================================
+
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+
+from primey_hrm.db_connections import DBThreadPoolExecutor
+
+from .models import ReportJob
+from .registry import REPORTS
+
+logger = logging.getLogger(__name__)
+
+_executor = DBThreadPoolExecutor(
+    max_workers=max(int(getattr(settings, "REPORT_WORKERS", 2) or 1), 1),
+    thread_name_prefix="report-jobs",
+)
+
+
+def _params_hash(params):
+    raw = json.dumps(params or {}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _reuse_window():
+    return timedelta(seconds=int(getattr(settings, "REPORT_ARTIFACT_REUSE_SECONDS", 900) or 0))
+
+
+# ============================================================
+# 📥 Request
+# ============================================================
+def request_report(*, report_type, requested_by=None, company=None, params=None):
+    """
+    يرجع ReportJob (جديد / قيد التوليد / مكتمل بإعادة الاستخدام).
+    """
+    if report_type not in REPORTS:
+        raise ValueError(f"Unknown report type: {report_type}")
+
+    params = params or {}
+    params_hash = _params_hash(params)
+
+    same_report = ReportJob.objects.filter(
+        report_type=report_type,
+        company=company,
+        params_hash=params_hash,
+    )
+
+    # 🔁 نفس التقرير قيد التوليد لنفس المستخدم
+    in_flight = (
+        same_report
+        .filter(
+            requested_by=requested_by,
+            status__in=[ReportJob.STATUS_PENDING, ReportJob.STATUS_RUNNING],
+        )
+        .order_by("-id")
+        .first()
+    )
+    if in_flight:
+        return in_flight
+
+    # ♻️ ملف مطابق حديث → Job مكتمل مباشرة
+    window = _reuse_window()
+    recent = None
+    if window:
+        recent = (
+            same_report
+            .filter(
+                status=ReportJob.STATUS_COMPLETED,
+                finished_at__gte=timezone.now() - window,
+            )
+            .exclude(file="")
+            .order_by("-finished_at")
+            .first()
+        )
+
+    if recent and default_storage.exists(recent.file.name):
+        job = ReportJob.objects.create(
+            company=company,
+            requested_by=requested_by,
+            report_type=report_type,
+            params=params,
+            params_hash=params_hash,
+            status=ReportJob.STATUS_COMPLETED,
+            file=recent.file.name,
+            file_name=recent.file_name,
+            content_type=recent.content_type,
+            content_hash=recent.content_hash,
+            size_bytes=recent.size_bytes,
+            reused=True,
+            started_at=timezone.now(),
+            finished_at=timezone.now(),
+        )
+        transaction.on_commit(lambda: _notify_completed(job))
+        return job
+
+    job = ReportJob.objects.create(
+        company=company,
+        requested_by=requested_by,
+        report_type=report_type,
+        params=params,
+        params_hash=params_hash,
+    )
+    transaction.on_commit(lambda: submit_report_job(job.id))
+    return job
+
+
+def submit_report_job(job_id):
+    try:
+        _executor.submit(run_report_job, job_id)
+    except Exception:
+        # يبقى pending → يلتقطه الـ Sweep في run_workers
+        logger.exception("❌ Failed to submit report job | job=%s", job_id)
+
+
+# ============================================================
+# ⚙️ Runner
+# ============================================================
+def _store_artifact(job, spec, content):
+    content_hash = hashlib.sha256(content).hexdigest()
+    path = f"reports/{job.report_type}/{content_hash}.{spec.extension}"
+
+    # نفس المحتوى موجود مسبقًا → لا نكتب نسخة جديدة
+    if not default_storage.exists(path):
+        path = default_storage.save(path, ContentFile(content))
+
+    return path, content_hash
+
+
+def run_report_job(job_id):
+    """
+    توليد تقرير واحد. آمن للاستدعاء من أكثر من عملية (claim ذري).
+    """
+    claimed = ReportJob.objects.filter(id=job_id, status=ReportJob.STATUS_PENDING).update(
+        status=ReportJob.STATUS_RUNNING,
+        started_at=timezone.now(),
+    )
+    if not claimed:
+        return None
+
+    job = ReportJob.objects.select_related("company", "requested_by").get(id=job_id)
+    spec = REPORTS.get(job.report_type)
+
+    try:
+        if spec is None:
+            raise ValueError(f"Unknown report type: {job.report_type}")
+
+        content = spec.build(job)
+        path, content_hash = _store_artifact(job, spec, content)
+
+        job.file.name = path
+        job.file_name = spec.filename(job)
+        job.content_type = spec.content_type
+        job.content_hash = content_hash
+        job.size_bytes = len(content)
+        job.status = ReportJob.STATUS_COMPLETED
+        job.finished_at = timezone.now()
+        job.save(update_fields=[
+            "file",
+            "file_name",
+            "content_type",
+            "content_hash",
+            "size_bytes",
+            "status",
+            "finished_at",
+        ])
+
+    except Exception as exc:
+        logger.exception("❌ Report job failed | job=%s type=%s", job.id, job.report_type)
+        job.status = ReportJob.STATUS_FAILED
+        job.error_message = str(exc)[:2000]
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error_message", "finished_at"])
+        return job
+
+    _notify_completed(job)
+    return job
+
+
+def _notify_completed(job):
+    if not job.requested_by_id:
+        return
+
+    try:
+        from notification_center.services import notify_report_generated
+
+        notify_report_generated(
+            recipient=job.requested_by,
+            report_title=REPORTS[job.report_type].title,
+            link=reverse("reports_center:report_job_download", args=[job.id]),
+        )
+    except Exception:
+        logger.exception("⚠️ Report notification failed | job=%s", job.id)
+
+
+# ============================================================
+# 🧹 Sweep (run_workers)
+# ============================================================
+def process_pending_report_jobs(limit=20):
+    """
+    - Jobs عالقة في running (عملية ماتت) → failed
+    - Jobs pending (لم تُرسل للـ executor) → تُولّد هنا
+    """
+    stale_after = int(getattr(settings, "REPORT_JOB_TIMEOUT_SECONDS", 1800) or 1800)
+
+    ReportJob.objects.filter(
+        status=ReportJob.STATUS_RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=stale_after),
+    ).update(
+        status=ReportJob.STATUS_FAILED,
+        error_message="Report job timed out",
+        finished_at=timezone.now(),
+    )
+
+    pending_ids = list(
+        ReportJob.objects
+        .filter(status=ReportJob.STATUS_PENDING)
+        .order_by("created_at")
+        .values_list("id", flat=True)[:limit]
+    )
+
+    for job_id in pending_ids:
+        run_report_job(job_id)
+
+    return len(pending_ids)
+
+
+# ============================================================
+# 🌐 Response Helper (للـ Views التي كانت تولّد داخل الطلب)
+# ============================================================
+def serialize_report_job(job):
+    completed = job.status == ReportJob.STATUS_COMPLETED
+
+    return {
+        "job_id": job.id,
+        "report_type": job.report_type,
+        "status": job.status,
+        "reused": job.reused,
+        "file_name": job.file_name,
+        "size_bytes": job.size_bytes,
+        "error_message": job.error_message,
+        "status_url": reverse("reports_center:report_job_status", args=[job.id]),
+        "download_url": reverse("reports_center:report_job_download", args=[job.id]) if completed else None,
+    }
+
+
+def report_job_response(job):
+    status = 200 if job.status == ReportJob.STATUS_COMPLETED else 202
+    return JsonResponse(serialize_report_job(job), status=status)
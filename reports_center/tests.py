@@ -0,0 +1,166 @@
+import io
+import shutil
+import tempfile
+from datetime import date, time
+from unittest.mock import patch
+
+import openpyxl
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from attendance_center.models import AttendancePolicy, AttendanceRecord
+from company_manager.models import Company
+from employee_center.models import Employee
+from reports_center import services
+from reports_center.models import ReportJob
+from reports_center.registry import PDF, ReportSpec
+from system_log.models import SystemLog
+
+
+FAKE_REPORTS = {
+    "fake_pdf": ReportSpec(
+        title="تقرير تجريبي",
+        content_type=PDF,
+        extension="pdf",
+        filename=lambda job: "fake.pdf",
+        build=lambda job: b"%PDF-fake",
+    ),
+}
+
+
+# ============================================================
+# 📊 Report Jobs — Background Render + Artifact Reuse
+# ============================================================
+class ReportJobTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        registry = patch.dict(services.REPORTS, FAKE_REPORTS)
+        registry.start()
+        self.addCleanup(registry.stop)
+
+        self.user = get_user_model().objects.create_user(username="reporter", password="x")
+
+    def test_job_renders_in_background_and_stores_hashed_artifact(self):
+        with patch.object(services, "submit_report_job") as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                job = services.request_report(report_type="fake_pdf", requested_by=self.user)
+
+        self.assertEqual(job.status, ReportJob.STATUS_PENDING)
+        submit.assert_called_once_with(job.id)
+
+        with patch("notification_center.services.notify_report_generated") as notify:
+            services.run_report_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.STATUS_COMPLETED)
+        self.assertTrue(job.file.name.endswith(f"{job.content_hash}.pdf"))
+        self.assertEqual(job.file.read(), b"%PDF-fake")
+        notify.assert_called_once()
+
+    def test_identical_recent_report_reuses_artifact(self):
+        with patch.object(services, "submit_report_job"):
+            first = services.request_report(report_type="fake_pdf", requested_by=self.user)
+
+        with patch("notification_center.services.notify_report_generated"):
+            services.run_report_job(first.id)
+
+        with patch.object(services, "submit_report_job") as submit:
+            with patch("notification_center.services.notify_report_generated") as notify:
+                with self.captureOnCommitCallbacks(execute=True):
+                    second = services.request_report(report_type="fake_pdf", requested_by=self.user)
+
+        first.refresh_from_db()
+        self.assertTrue(second.reused)
+        self.assertEqual(second.status, ReportJob.STATUS_COMPLETED)
+        self.assertEqual(second.file.name, first.file.name)
+        submit.assert_not_called()
+        notify.assert_called_once()
+
+
+# ============================================================
+# 🧾 Real Renderers — Registry → Job → Stored File
+# ============================================================
+class RegisteredRenderersTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = get_user_model().objects.create_user(username="renderer", password="x")
+        self.company = Company.objects.create(name="Reports Co", is_active=False)
+
+        employee = Employee.objects.create(
+            company=self.company,
+            user=get_user_model().objects.create_user(username="report-emp"),
+            full_name="موظف التقارير",
+            national_id="1000000009",
+        )
+        AttendanceRecord.objects.create(
+            employee=employee,
+            date=date(2026, 10, 18),
+            check_in=time(8, 5),
+            check_out=time(16, 0),
+        )
+        AttendancePolicy.objects.create(
+            company=self.company,
+            work_start=time(8, 0),
+            work_end=time(16, 0),
+        )
+        SystemLog.objects.create(
+            company=self.company,
+            user=self.user,
+            module="reports_center",
+            action="export",
+            message="تصدير تجريبي",
+        )
+
+    def _render(self, report_type, params=None):
+        with patch.object(services, "submit_report_job"):
+            job = services.request_report(
+                report_type=report_type,
+                requested_by=self.user,
+                company=self.company,
+                params=params,
+            )
+
+        with patch("notification_center.services.notify_report_generated"):
+            services.run_report_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.STATUS_COMPLETED, job.error_message)
+        return job.file.read()
+
+    def _sheet_rows(self, content):
+        sheet = openpyxl.load_workbook(io.BytesIO(content), read_only=True).active
+        return list(sheet.iter_rows(values_only=True))
+
+    def test_attendance_range_pdf(self):
+        content = self._render(
+            "attendance_range_pdf",
+            {"start": "2026-10-01", "end": "2026-10-31"},
+        )
+        self.assertTrue(content.startswith(b"%PDF"))
+
+    def test_attendance_policies_xlsx(self):
+        rows = self._sheet_rows(self._render("attendance_policies_xlsx"))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1], "fri - sat")
+        self.assertEqual(rows[1][2], 0)
+
+    def test_system_logs_exports(self):
+        rows = self._sheet_rows(self._render("system_logs_xlsx"))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][:2], ("reports_center", "export"))
+        self.assertTrue(self._render("system_logs_pdf").startswith(b"%PDF"))
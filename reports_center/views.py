@@ -0,0 +1,40 @@
+# ============================================================
+# 📊 Reports Center — Job Status + Download
+# ============================================================
+
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+
+from .models import ReportJob
+from .services import serialize_report_job
+
+
+def _get_owned_job(request, job_id):
+    job = get_object_or_404(ReportJob, id=job_id)
+
+    if not request.user.is_superuser and job.requested_by_id != request.user.id:
+        raise Http404("Report not found")
+
+    return job
+
+
+@login_required
+def report_job_status(request, job_id):
+    job = _get_owned_job(request, job_id)
+    return JsonResponse(serialize_report_job(job))
+
+
+@login_required
+def report_job_download(request, job_id):
+    job = _get_owned_job(request, job_id)
+
+    if job.status != ReportJob.STATUS_COMPLETED or not job.file:
+        return JsonResponse(serialize_report_job(job), status=409)
+
+    return FileResponse(
+        job.file.open("rb"),
+        as_attachment=True,
+        filename=job.file_name,
+        content_type=job.content_type,
+    )
@@ -3,7 +3,9 @@
 # ⚙️ Version: V8 Ultra Pro — Unified Singleton Backend
 # ============================================================
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from django.contrib.auth.models import User
 from company_manager.models import Company
@@ -222,3 +224,14 @@ class NationalAddressStreet(models.Model):
 
     def __str__(self):
         return self.name
+
+
+# ============================================================
+# 🔄 System Flags Invalidation (Cross-Process)
+# ============================================================
+@receiver(post_save, sender=SettingsGeneral)
+@receiver(post_save, sender=SettingsSecurity)
+def invalidate_system_flags(sender, instance, **kwargs):
+    from .system_flags import clear_system_flags_cache
+
+    transaction.on_commit(clear_system_flags_cache)
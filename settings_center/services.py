@@ -4,8 +4,6 @@
 # 🔒 Compatible with Settings Center (No SystemSetting Model)
 # ============================================================
 
-from functools import lru_cache
-
 from django.core.mail import EmailMessage
 
 # ============================================================
@@ -144,50 +142,16 @@ def add_audit_log(company, user, section, field, old, new, ip):
 # 🔒 7) System Governance — Derived From Settings
 # ============================================================
 
-@lru_cache(maxsize=1)
-def get_system_flags():
-    """
-    🔒 Cached System Flags
-    - Derived from SettingsGeneral + SettingsSecurity
-    """
-    general = get_general_settings()
-    security = get_security_settings()
-
-    return {
-        "platform_active": general.platform_active,
-        "maintenance_mode": general.maintenance_mode,
-        "readonly_mode": security.readonly_mode,
-        "billing_enabled": general.billing_enabled,
-        "enforce_subscription": general.enforce_subscription,
-    }
-
-
-def clear_system_flags_cache():
-    get_system_flags.cache_clear()
-
-
-# ============================================================
-# 🧠 Flags Helpers
-# ============================================================
-
-def is_platform_active() -> bool:
-    return get_system_flags()["platform_active"]
-
-
-def is_maintenance_mode() -> bool:
-    return get_system_flags()["maintenance_mode"]
-
-
-def is_readonly_mode() -> bool:
-    return get_system_flags()["readonly_mode"]
-
-
-def is_billing_enabled() -> bool:
-    return get_system_flags()["billing_enabled"]
-
-
-def is_subscription_enforced() -> bool:
-    return get_system_flags()["enforce_subscription"]
+# النسخة المحلية + Version مشترك عبر العمليات (system_flags.py)
+from .system_flags import (  # noqa: E402
+    get_system_flags,
+    clear_system_flags_cache,
+    is_platform_active,
+    is_maintenance_mode,
+    is_readonly_mode,
+    is_billing_enabled,
+    is_subscription_enforced,
+)
 
 
 # ============================================================
@@ -1,3 +1,12 @@
 # Export services
 from .system_settings import update_system_setting
 from .national_address_cache import cache_address
+from settings_center.system_flags import (
+    get_system_flags,
+    clear_system_flags_cache,
+    is_platform_active,
+    is_maintenance_mode,
+    is_readonly_mode,
+    is_billing_enabled,
+    is_subscription_enforced,
+)
@@ -0,0 +1,128 @@
+# ============================================================
+# 🔒 System Flags — Versioned Cross-Process Cache
+# Mham Cloud
+# ============================================================
+# ✔ نسخة محلية من الـ Flags لكل عملية (صفر استعلامات في المسار الساخن)
+# ✔ Version واحد في الـ cache المشترك (Redis) لكل العمليات
+# ✔ فحص الـ Version مرة كل SYSTEM_FLAGS_CHECK_SECONDS فقط
+# ✔ أي حفظ لـ SettingsGeneral / SettingsSecurity يرفع الـ Version
+# ============================================================
+
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import SettingsGeneral, SettingsSecurity
+
+
+VERSION_CACHE_KEY = "settings:system_flags:version"
+
+_MISSING = object()
+
+_STATE = {
+    "flags": None,
+    "version": _MISSING,
+    "checked_at": 0.0,
+}
+_STATE_LOCK = threading.Lock()
+
+
+def _version_check_seconds() -> float:
+    return float(getattr(settings, "SYSTEM_FLAGS_CHECK_SECONDS", 1) or 0)
+
+
+def _read_version():
+    try:
+        return cache.get(VERSION_CACHE_KEY)
+    except Exception:
+        return None
+
+
+def _load_flags():
+    """
+    🔒 Derived From SettingsGeneral + SettingsSecurity
+    """
+    general = SettingsGeneral.get_settings()
+    security = SettingsSecurity.get_settings()
+
+    return {
+        "platform_active": general.platform_active,
+        "maintenance_mode": general.maintenance_mode,
+        "readonly_mode": security.readonly_mode,
+        "billing_enabled": general.billing_enabled,
+        "enforce_subscription": general.enforce_subscription,
+    }
+
+
+# ============================================================
+# 🚀 Public API
+# ============================================================
+
+def get_system_flags():
+    now = time.monotonic()
+
+    with _STATE_LOCK:
+        flags = _STATE["flags"]
+        cached_version = _STATE["version"]
+        checked_at = _STATE["checked_at"]
+
+    if flags is not None and now - checked_at < _version_check_seconds():
+        return flags
+
+    version = _read_version()
+
+    if flags is not None and cached_version == version:
+        with _STATE_LOCK:
+            _STATE["checked_at"] = now
+        return flags
+
+    flags = _load_flags()
+
+    with _STATE_LOCK:
+        _STATE["flags"] = flags
+        _STATE["version"] = version
+        _STATE["checked_at"] = now
+
+    return flags
+
+
+def clear_system_flags_cache():
+    """
+    إسقاط النسخة المحلية + رفع الـ Version لباقي العمليات.
+    """
+
+    with _STATE_LOCK:
+        _STATE["flags"] = None
+        _STATE["version"] = _MISSING
+
+    try:
+        cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    except Exception:
+        pass
+
+
+# ============================================================
+# 🧠 Flags Helpers
+# ============================================================
+
+def is_platform_active() -> bool:
+    return get_system_flags()["platform_active"]
+
+
+def is_maintenance_mode() -> bool:
+    return get_system_flags()["maintenance_mode"]
+
+
+def is_readonly_mode() -> bool:
+    return get_system_flags()["readonly_mode"]
+
+
+def is_billing_enabled() -> bool:
+    return get_system_flags()["billing_enabled"]
+
+
+def is_subscription_enforced() -> bool:
+    return get_system_flags()["enforce_subscription"]
@@ -1,3 +1,30 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from settings_center import system_flags
+
+
+# ============================================================
+# 🔒 System Flags — Versioned Cache
+# ============================================================
+@override_settings(SYSTEM_FLAGS_CHECK_SECONDS=0)
+class SystemFlagsCacheTests(TestCase):
+    def setUp(self):
+        cache.delete(system_flags.VERSION_CACHE_KEY)
+        system_flags.clear_system_flags_cache()
+
+    def test_local_copy_reused_until_version_changes(self):
+        loaded = [{"readonly_mode": False}, {"readonly_mode": True}]
+
+        with patch.object(system_flags, "_load_flags", side_effect=loaded) as load:
+            self.assertFalse(system_flags.is_readonly_mode())
+            self.assertFalse(system_flags.is_readonly_mode())
+            self.assertEqual(load.call_count, 1)
+
+            # عملية أخرى رفعت الـ Version
+            cache.set(system_flags.VERSION_CACHE_KEY, "other-worker", None)
+
+            self.assertTrue(system_flags.is_readonly_mode())
+            self.assertEqual(load.call_count, 2)
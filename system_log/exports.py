@@ -0,0 +1,71 @@
+# ================================================================
+# 📤 System Log Exports — Bytes Renderers (ReportJob)
+# ================================================================
+# ✔ تُستدعى من reports_center في الخلفية
+# ✔ openpyxl write_only + iterator بدل pandas DataFrame كامل في الذاكرة
+# ================================================================
+
+import io
+
+import openpyxl
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Trim
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from .models import SystemLog
+
+
+def _logs(company):
+    return SystemLog.objects.filter(company=company).order_by("-created_at")
+
+
+def render_logs_xlsx(company):
+    rows = _logs(company).annotate(
+        user_full_name=Trim(Concat(F("user__first_name"), Value(" "), F("user__last_name"))),
+    ).values_list("module", "action", "user_id", "user_full_name", "severity", "message", "created_at")
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("System Logs")
+    ws.append(["الوحدة", "الإجراء", "المستخدم", "الخطورة", "الرسالة", "التاريخ"])
+
+    for module, action, user_id, user_full_name, severity, message, created_at in rows.iterator(chunk_size=2000):
+        ws.append([
+            module,
+            action,
+            (user_full_name or "") if user_id else "—",
+            severity,
+            message,
+            created_at.strftime("%Y-%m-%d %H:%M"),
+        ])
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def render_logs_pdf(company):
+    rows = _logs(company).values_list("created_at", "module", "action", "severity")
+
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    y = 800
+
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(50, y, f"System Logs — Company #{company.id}")
+    y -= 40
+
+    p.setFont("Helvetica", 10)
+
+    for created_at, module, action, severity in rows.iterator(chunk_size=2000):
+        p.drawString(50, y, f"{created_at}: {module} — {action} — {severity}")
+        y -= 20
+
+        if y < 50:
+            p.showPage()
+            p.setFont("Helvetica", 10)
+            y = 800
+
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
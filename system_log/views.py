@@ -136,69 +136,22 @@ def api_filter_logs(request, company_id):
     })
 
 # ================================================================
-# 📤 V3 — Export Excel
+# 📤 V3 — Export Excel / PDF (ReportJob في الخلفية)
 # ================================================================
-import pandas as pd
-from django.http import HttpResponse
+from reports_center.services import report_job_response, request_report
 
 @login_required
 def export_logs_excel(request, company_id):
     company = get_object_or_404(Company, id=company_id)
-    logs = SystemLog.objects.filter(company=company).order_by("-created_at")
-
-    data = []
-    for log in logs:
-        data.append({
-            "الوحدة": log.module,
-            "الإجراء": log.action,
-            "المستخدم": log.user.get_full_name() if log.user else "—",
-            "الخطورة": log.severity,
-            "الرسالة": log.message,
-            "التاريخ": log.created_at.strftime("%Y-%m-%d %H:%M"),
-        })
-
-    df = pd.DataFrame(data)
-    response = HttpResponse(content_type="application/vnd.ms-excel")
-    response["Content-Disposition"] = f'attachment; filename="system_logs_{company.id}.xlsx"'
-    df.to_excel(response, index=False)
+    job = request_report(report_type="system_logs_xlsx", requested_by=request.user, company=company)
+    return report_job_response(job)
 
-    return response
-
-
-# ================================================================
-# 📄 V3 — Export PDF (ReportLab)
-# ================================================================
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
 
 @login_required
 def export_logs_pdf(request, company_id):
     company = get_object_or_404(Company, id=company_id)
-    logs = SystemLog.objects.filter(company=company).order_by("-created_at")
-
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="system_logs_{company.id}.pdf"'
-
-    p = canvas.Canvas(response, pagesize=A4)
-    y = 800
-
-    p.setFont("Helvetica-Bold", 14)
-    p.drawString(50, y, f"System Logs — Company #{company.id}")
-    y -= 40
-
-    p.setFont("Helvetica", 10)
-
-    for log in logs:
-        p.drawString(50, y, f"{log.created_at}: {log.module} — {log.action} — {log.severity}")
-        y -= 20
-
-        if y < 50:
-            p.showPage()
-            y = 800
-
-    p.showPage()
-    p.save()
-    return response
+    job = request_report(report_type="system_logs_pdf", requested_by=request.user, company=company)
+    return report_job_response(job)
 
 
 # ================================================================
@@ -42,7 +42,7 @@ class WhatsAppTemplateAdmin(admin.ModelAdmin):
 @admin.register(WhatsAppMessageLog)
 class WhatsAppMessageLogAdmin(admin.ModelAdmin):
     list_display = ("id", "scope_type", "company", "event_code", "recipient_phone", "message_type", "delivery_status", "created_at")
-    list_filter = ("scope_type", "message_type", "delivery_status", "trigger_source")
+    list_filter = ("scope_type", "message_type", "delivery_status", "failure_category", "trigger_source")
     search_fields = ("recipient_phone", "recipient_name", "external_message_id", "event_code")
     readonly_fields = ("created_at", "updated_at", "sent_at", "delivered_at", "read_at", "failed_at")
 
@@ -2,7 +2,7 @@
 # 📂 whatsapp_center/apps.py
 # Mham Cloud - WhatsApp Center App Config
 # ============================================================
-# ✅ تشغيل تلقائي لـ WhatsApp Session Gateway
+# ✅ تشغيل تلقائي لـ WhatsApp Session Gateway (من run_workers فقط)
 # ✅ آمن مع Django runserver + StatReloader
 # ✅ لا يعيد التشغيل إذا كان الجت واي شغال
 # ✅ يدعم Windows بشكل صحيح
@@ -33,12 +33,12 @@ class WhatsappCenterConfig(AppConfig):
     verbose_name = "WhatsApp Center"
 
     # --------------------------------------------------------
-    # 🚀 App Ready
+    # 🚀 Gateway Autostart (run_workers فقط)
     # --------------------------------------------------------
-    def ready(self):
+    def start_gateway(self):
         """
-        تشغيل الجت واي تلقائيًا عند إقلاع Django
-        بدون تكرار مع autoreloader.
+        تشغيل الجت واي من عملية الـ Workers (python manage.py run_workers)
+        وليس من ready() — عمليات الويب لا تشغل أي خيوط خلفية.
         """
         if not self._should_autostart_gateway():
             return
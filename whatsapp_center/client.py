@@ -10,17 +10,86 @@
 #   * Create Pairing Code
 #   * Get Session Status
 #   * Disconnect Session
+# - Pooled Keep-Alive Transport مشترك بين كل العملاء
+# - send_many: إرسال متوازٍ محدود لكل Session
+# - send_batch: دفعة واحدة إلى /messages/send-batch/
 # ============================================================
 
 from __future__ import annotations
 
-import json
 import os
-from dataclasses import dataclass
-from typing import Optional, Any
-from urllib.error import HTTPError, URLError
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Any, Iterable
 from urllib.parse import urljoin
-from urllib.request import Request, urlopen
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# ============================================================
+# 🔌 Shared Gateway Transport
+# ============================================================
+# Session واحدة لكل العملية (Keep-Alive) بدل اتصال TCP جديد لكل رسالة.
+
+_GATEWAY_HTTP_SESSION: Optional[requests.Session] = None
+_GATEWAY_HTTP_SESSION_LOCK = threading.Lock()
+
+# Semaphore لكل session_name لتحديد عدد الرسائل المتزامنة نحو نفس الجلسة
+# الحد يؤخذ مرة واحدة من WHATSAPP_SESSION_GATEWAY_MAX_IN_FLIGHT عند الإنشاء
+_SESSION_SEMAPHORES: dict[str, threading.BoundedSemaphore] = {}
+_SESSION_SEMAPHORES_LOCK = threading.Lock()
+
+DEFAULT_GATEWAY_MAX_IN_FLIGHT = 4
+DEFAULT_GATEWAY_BATCH_SIZE = 100
+
+
+def _env_positive_int(key: str, default: int) -> int:
+    try:
+        value = int(os.getenv(key, str(default)))
+        return value if value > 0 else default
+    except Exception:
+        return default
+
+
+def get_gateway_http_session() -> requests.Session:
+    global _GATEWAY_HTTP_SESSION
+
+    if _GATEWAY_HTTP_SESSION is not None:
+        return _GATEWAY_HTTP_SESSION
+
+    with _GATEWAY_HTTP_SESSION_LOCK:
+        if _GATEWAY_HTTP_SESSION is None:
+            pool_size = _env_positive_int("WHATSAPP_SESSION_GATEWAY_POOL_SIZE", 20)
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=2,
+                pool_maxsize=pool_size,
+                # لا نعيد الإرسال تلقائيًا حتى لا تتكرر الرسائل
+                max_retries=0,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _GATEWAY_HTTP_SESSION = session
+
+    return _GATEWAY_HTTP_SESSION
+
+
+def _gateway_max_in_flight() -> int:
+    return _env_positive_int(
+        "WHATSAPP_SESSION_GATEWAY_MAX_IN_FLIGHT",
+        DEFAULT_GATEWAY_MAX_IN_FLIGHT,
+    )
+
+
+def _get_session_semaphore(session_name: str) -> threading.BoundedSemaphore:
+    with _SESSION_SEMAPHORES_LOCK:
+        semaphore = _SESSION_SEMAPHORES.get(session_name)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(_gateway_max_in_flight())
+            _SESSION_SEMAPHORES[session_name] = semaphore
+        return semaphore
 
 
 # ============================================================
@@ -52,6 +121,14 @@ class WhatsAppSessionResult:
     error_message: str = ""
 
 
+@dataclass
+class WhatsAppBatchResult:
+    # نتيجة لكل رسالة بنفس ترتيب الإرسال
+    results: list[WhatsAppSendResult] = field(default_factory=list)
+    # حالة الجلسة من آخر رد للـ Gateway (None للمزودات غير المربوطة)
+    session: Optional[WhatsAppSessionResult] = None
+
+
 # ============================================================
 # 💬 WhatsApp Client
 # ============================================================
@@ -123,7 +200,13 @@ class WhatsAppClient:
     # --------------------------------------------------------
     # 🌐 Gateway Core Request
     # --------------------------------------------------------
-    def _gateway_post(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+    def _gateway_post(
+        self,
+        path: str,
+        payload: dict[str, Any],
+        *,
+        timeout: Optional[int] = None,
+    ) -> dict[str, Any]:
         """
         استدعاء موحد للـ Session Gateway الخارجي.
         """
@@ -135,62 +218,67 @@ class WhatsAppClient:
 
         target_url = urljoin(f"{self.gateway_base_url}/", path.lstrip("/"))
 
-        req = Request(
-            target_url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers=self._gateway_headers(),
-            method="POST",
-        )
-
         try:
-            with urlopen(req, timeout=self.gateway_timeout) as response:
-                raw = response.read().decode("utf-8") or "{}"
-
-                try:
-                    data = json.loads(raw)
-                except json.JSONDecodeError:
-                    return {
-                        "success": False,
-                        "message": "Invalid JSON response from gateway",
-                        "raw_response": raw,
-                    }
-
-                if "success" not in data:
-                    data["success"] = True
-
-                if "status_code" not in data:
-                    data["status_code"] = getattr(response, "status", 200)
-
-                return data
+            response = get_gateway_http_session().post(
+                target_url,
+                json=payload,
+                headers=self._gateway_headers(),
+                timeout=timeout or self.gateway_timeout,
+            )
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            return {
+                "success": False,
+                "message": f"Gateway connection failed: {exc}",
+                "status_code": 503,
+            }
+        except Exception as exc:
+            return {
+                "success": False,
+                "message": f"Unexpected gateway error: {str(exc)}",
+                "status_code": 500,
+            }
 
-        except HTTPError as exc:
+        if response.status_code >= 400:
             try:
-                raw = exc.read().decode("utf-8") or "{}"
-                parsed = json.loads(raw)
+                parsed = response.json()
+                if not isinstance(parsed, dict):
+                    parsed = {}
             except Exception:
                 parsed = {}
 
             return {
                 "success": False,
-                "message": parsed.get("message") or f"Gateway HTTPError {exc.code}",
+                "message": parsed.get("message") or f"Gateway HTTPError {response.status_code}",
                 "details": parsed,
-                "status_code": exc.code,
+                "status_code": response.status_code,
             }
 
-        except URLError as exc:
+        raw = response.text or "{}"
+
+        try:
+            data = response.json() if response.text else {}
+        except ValueError:
             return {
                 "success": False,
-                "message": f"Gateway connection failed: {exc.reason}",
-                "status_code": 503,
+                "message": "Invalid JSON response from gateway",
+                "raw_response": raw,
             }
 
-        except Exception as exc:
+        if not isinstance(data, dict):
             return {
                 "success": False,
-                "message": f"Unexpected gateway error: {str(exc)}",
-                "status_code": 500,
+                "message": "Invalid JSON response from gateway",
+                "raw_response": raw,
             }
 
+        if "success" not in data:
+            data["success"] = True
+
+        if "status_code" not in data:
+            data["status_code"] = response.status_code
+
+        return data
+
     # --------------------------------------------------------
     # 🧩 Session Result Mapper
     # --------------------------------------------------------
@@ -444,4 +532,160 @@ class WhatsAppClient:
                 "caption": caption,
                 "filename": filename,
             },
-        )
\ No newline at end of file
+        )
+    # --------------------------------------------------------
+    # 🚀 Send Many (Pipelined)
+    # --------------------------------------------------------
+    @property
+    def gateway_max_in_flight(self) -> int:
+        return _gateway_max_in_flight()
+
+    def _send_one(self, message: dict[str, Any]) -> WhatsAppSendResult:
+        if message.get("document_url"):
+            return self.send_document_message(
+                to_phone=message.get("to_phone", ""),
+                document_url=message.get("document_url", ""),
+                caption=message.get("caption", "") or message.get("body", ""),
+                filename=message.get("filename", ""),
+            )
+
+        return self.send_text_message(
+            to_phone=message.get("to_phone", ""),
+            body=message.get("body", ""),
+        )
+
+    def send_many(
+        self,
+        messages: Iterable[dict[str, Any]],
+        *,
+        max_in_flight: Optional[int] = None,
+    ) -> list[WhatsAppSendResult]:
+        """
+        إرسال عدة رسائل عبر نفس الـ Session بشكل متوازٍ ومحدود.
+
+        كل عنصر: {"to_phone", "body"} أو {"to_phone", "document_url", "caption", "filename"}.
+        النتائج ترجع بنفس ترتيب الرسائل.
+        الحد الأقصى للرسائل المتزامنة مشترك لكل session_name عبر كل العملاء.
+        """
+        messages = list(messages or [])
+        if not messages:
+            return []
+
+        limit = max_in_flight or self.gateway_max_in_flight
+
+        # المزودات غير المربوطة لا تحتاج توازي
+        if not self._is_web_session_provider() or limit <= 1 or len(messages) == 1:
+            return [self._send_one(message) for message in messages]
+
+        # max_in_flight يحدد عمّال هذا الاستدعاء فقط، والسقف المشترك للجلسة من الإعداد
+        semaphore = _get_session_semaphore(self.session_name)
+
+        def _guarded_send(message: dict[str, Any]) -> WhatsAppSendResult:
+            with semaphore:
+                return self._send_one(message)
+
+        with ThreadPoolExecutor(
+            max_workers=min(limit, len(messages)),
+            thread_name_prefix="whatsapp-send",
+        ) as executor:
+            return list(executor.map(_guarded_send, messages))
+
+    # --------------------------------------------------------
+    # 📦 Send Batch (Gateway Queue)
+    # --------------------------------------------------------
+    @property
+    def gateway_batch_size(self) -> int:
+        return _env_positive_int(
+            "WHATSAPP_SESSION_GATEWAY_BATCH_SIZE",
+            DEFAULT_GATEWAY_BATCH_SIZE,
+        )
+
+    @staticmethod
+    def _batch_item_result(item: dict[str, Any]) -> WhatsAppSendResult:
+        success = bool(item.get("success"))
+        return WhatsAppSendResult(
+            success=success,
+            status_code=int(item.get("status_code", 200 if success else 400)),
+            provider_status=str(
+                item.get("provider_status") or ("accepted" if success else "gateway_failed")
+            ),
+            external_message_id=str(
+                item.get("external_message_id", "") or item.get("message_id", "")
+            ),
+            response_data=item,
+            error_message="" if success else str(item.get("message") or "Session gateway failed"),
+        )
+
+    def send_batch(
+        self,
+        messages: Iterable[dict[str, Any]],
+        *,
+        pacing_ms: Optional[int] = None,
+    ) -> WhatsAppBatchResult:
+        """
+        إرسال دفعة رسائل في طلب واحد إلى الـ Gateway.
+
+        الـ Gateway يضع الرسائل في طابور الجلسة ويرسلها بفاصل pacing_ms،
+        ثم يرجع نتيجة لكل رسالة. النتائج بنفس ترتيب الرسائل،
+        وحالة الجلسة (session_status …) من مستوى الرد وليس من عناصره.
+        """
+        messages = list(messages or [])
+        if not messages:
+            return WhatsAppBatchResult()
+
+        if not self._is_web_session_provider():
+            return WhatsAppBatchResult(results=[self._send_one(message) for message in messages])
+
+        results: list[WhatsAppSendResult] = []
+        session: Optional[WhatsAppSessionResult] = None
+        batch_size = self.gateway_batch_size
+        pacing_seconds = (pacing_ms if pacing_ms is not None else 350) / 1000.0
+
+        for offset in range(0, len(messages), batch_size):
+            chunk = messages[offset:offset + batch_size]
+
+            payload: dict[str, Any] = {
+                "session_name": self.session_name,
+                "messages": [
+                    {
+                        "client_ref": offset + index,
+                        "to_phone": message.get("to_phone", ""),
+                        "body": message.get("body", ""),
+                        "document_url": message.get("document_url", ""),
+                        "caption": message.get("caption", ""),
+                        "filename": message.get("filename", ""),
+                        "mime_type": message.get("mime_type", ""),
+                    }
+                    for index, message in enumerate(chunk)
+                ],
+            }
+            if pacing_ms is not None:
+                payload["pacing_ms"] = pacing_ms
+
+            data = self._gateway_post(
+                "/messages/send-batch/",
+                payload,
+                timeout=int(self.gateway_timeout + len(chunk) * (pacing_seconds + 1)),
+            )
+
+            if data.get("session_status"):
+                session = self._build_session_result(data)
+
+            items = data.get("results") if data.get("success") else None
+
+            if not isinstance(items, list) or len(items) != len(chunk):
+                failure = {
+                    "success": False,
+                    "status_code": data.get("status_code", 502),
+                    "provider_status": data.get("provider_status") or "gateway_failed",
+                    "message": data.get("message") or "Invalid batch response from gateway",
+                }
+                if data.get("session_status"):
+                    failure["session_status"] = data["session_status"]
+                results.extend(self._batch_item_result(failure) for _ in chunk)
+                continue
+
+            items = sorted(items, key=lambda item: int(item.get("index", 0)))
+            results.extend(self._batch_item_result(item) for item in items)
+
+        return WhatsAppBatchResult(results=results, session=session)
@@ -0,0 +1,281 @@
+# ============================================================
+# 📂 whatsapp_center/inbox_queue.py
+# Mham Cloud - WhatsApp Webhook Queue (Fast-Ack Ingestion)
+# ============================================================
+# ✔ الـ endpoint يحفظ الحدث الخام في WhatsAppWebhookEvent ويرد 200 فورًا
+# ✔ المعالج في الخلفية يسحب الأحداث غير المعالجة على دفعات (الأقدم أولًا)
+# ✔ الرسائل الواردة: dedupe_key فريد (استعلام واحد + القيد عند السباق)
+# ✔ تحديثات الحالة: مجمعة لكل external_message_id → bulk_update
+# ✔ معالج واحد في نفس الوقت (DistributedLock) + Sweep دوري من run_workers
+# ✔ فشل دفعة الحالات → processing_attempts++ والتفريغ يكمل بعدها؛
+#   بعد WHATSAPP_WEBHOOK_MAX_ATTEMPTS يُعزل الحدث مع الخطأ
+# ============================================================
+
+from __future__ import annotations
+
+import logging
+import threading
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from primey_hrm.db_connections import DBThreadPoolExecutor, with_db_connection
+from primey_hrm.distributed_lock import DistributedLock
+
+from .models import WhatsAppWebhookEvent
+from .webhook_service import (
+    apply_status_updates_batch,
+    collect_status_updates,
+    create_or_update_inbox_from_webhook,
+    merge_status_update,
+    store_webhook_event,
+)
+
+logger = logging.getLogger(__name__)
+
+QUEUE_LOCK_KEY = "whatsapp:webhook_queue"
+QUEUE_LOCK_TTL = 5 * 60
+
+_executor = DBThreadPoolExecutor(max_workers=1, thread_name_prefix="whatsapp-inbox")
+_kick_pending = threading.Event()
+
+
+def _batch_size() -> int:
+    return max(int(getattr(settings, "WHATSAPP_WEBHOOK_BATCH_SIZE", 200) or 200), 1)
+
+
+def _max_attempts() -> int:
+    return max(int(getattr(settings, "WHATSAPP_WEBHOOK_MAX_ATTEMPTS", 5) or 5), 1)
+
+
+# ============================================================
+# 📥 Enqueue (Webhook Endpoint)
+# ============================================================
+
+def enqueue_webhook_event(
+    *,
+    payload: dict,
+    event_type: str,
+    provider: str,
+    scope_type: str = "SYSTEM",
+    company=None,
+) -> WhatsAppWebhookEvent:
+    """
+    حفظ الحدث الخام (is_processed=False) + تشغيل المعالج بعد commit.
+    """
+    event = store_webhook_event(
+        payload=payload,
+        event_type=event_type,
+        external_message_id="",
+        scope_type=scope_type,
+        company=company,
+        provider=provider,
+    )
+
+    transaction.on_commit(kick_webhook_queue)
+    return event
+
+
+def kick_webhook_queue() -> None:
+    """
+    تشغيل المعالج في الخلفية داخل العملية الحالية (مهمة واحدة معلقة كحد أقصى).
+    """
+    if _kick_pending.is_set():
+        return
+
+    _kick_pending.set()
+    try:
+        _executor.submit(_run_kicked)
+    except Exception:
+        _kick_pending.clear()
+        logger.exception("❌ Failed to submit WhatsApp webhook queue processing")
+
+
+def _run_kicked():
+    _kick_pending.clear()
+    try:
+        process_webhook_queue()
+    except Exception:
+        logger.exception("❌ WhatsApp webhook queue processing failed")
+
+
+# ============================================================
+# ⚙️ Processor
+# ============================================================
+
+def _process_batch(events: list[WhatsAppWebhookEvent]) -> dict[str, int]:
+    inbound_created = 0
+    status_updates: dict[str, str] = {}
+    status_event_ids: set[int] = set()
+    errors: dict[int, str] = {}
+
+    for event in events:
+        payload = event.payload_json if isinstance(event.payload_json, dict) else {}
+
+        if payload.get("messages"):
+            try:
+                result = create_or_update_inbox_from_webhook(
+                    payload=payload,
+                    scope_type=event.scope_type,
+                    company=event.company,
+                )
+                inbound_created += result.get("created_count", 0)
+            except Exception as exc:
+                logger.exception("❌ WhatsApp inbound intake failed | event=%s", event.id)
+                errors[event.id] = str(exc)[:2000]
+
+        for item in collect_status_updates(payload):
+            status_event_ids.add(event.id)
+            merge_status_update(
+                status_updates,
+                external_message_id=item["external_message_id"],
+                new_status=item["new_status"],
+            )
+
+    applied_status_updates = 0
+    retry_ids: set[int] = set()
+    quarantined: set[int] = set()
+    if status_updates:
+        try:
+            applied_status_updates = apply_status_updates_batch(status_updates)
+        except Exception as exc:
+            # فشل عابر (DB) → الأحداث التي تحمل حالات تبقى غير معالجة ليعيدها الـ sweep
+            logger.exception("❌ WhatsApp status batch failed")
+            quarantined = _record_failed_attempt(events, status_event_ids, str(exc)[:2000])
+            retry_ids = status_event_ids - quarantined
+
+    now = timezone.now()
+    processed_ids = [
+        event.id for event in events
+        if event.id not in errors
+        and event.id not in retry_ids
+        and event.id not in quarantined
+    ]
+
+    if processed_ids:
+        WhatsAppWebhookEvent.objects.filter(id__in=processed_ids).update(
+            is_processed=True,
+            processed_at=now,
+            # خطأ محاولة سابقة لم يعد قائمًا
+            processing_error="",
+        )
+
+    # ⚠ رسائل واردة فاشلة: تُعلّم معالجة مع الخطأ (لا نعيد حدثًا مسمومًا للأبد)
+    for event_id, error in errors.items():
+        if event_id in retry_ids or event_id in quarantined:
+            continue
+        WhatsAppWebhookEvent.objects.filter(id=event_id).update(
+            is_processed=True,
+            processed_at=now,
+            processing_error=error,
+        )
+
+    return {
+        "events": len(events),
+        "inbound_created": inbound_created,
+        "status_updates": len(status_updates),
+        "applied_status_updates": applied_status_updates,
+        "errors": len(errors),
+        "retried": len(retry_ids),
+        "quarantined": len(quarantined),
+    }
+
+
+def _record_failed_attempt(events, event_ids, error) -> set[int]:
+    """
+    محاولة فاشلة لأحداث الحالة؛ ما تجاوز الحد يُعلّم معالجًا مع الخطأ (عزل).
+    يرجع ids الأحداث المعزولة.
+    """
+    WhatsAppWebhookEvent.objects.filter(id__in=event_ids).update(
+        processing_attempts=F("processing_attempts") + 1,
+        processing_error=error,
+    )
+
+    limit = _max_attempts()
+    exhausted = {
+        event.id for event in events
+        if event.id in event_ids and event.processing_attempts + 1 >= limit
+    }
+    if exhausted:
+        logger.error("🚫 WhatsApp status events quarantined after %s attempts | ids=%s", limit, sorted(exhausted))
+        WhatsAppWebhookEvent.objects.filter(id__in=exhausted).update(
+            is_processed=True,
+            processed_at=timezone.now(),
+        )
+
+    return exhausted
+
+
+def process_webhook_queue(*, max_batches: int | None = None) -> dict[str, int]:
+    """
+    تفريغ طابور الـ webhook حتى ينتهي (أو max_batches).
+    """
+    summary = {
+        "batches": 0,
+        "events": 0,
+        "inbound_created": 0,
+        "status_updates": 0,
+        "applied_status_updates": 0,
+        "errors": 0,
+        "retried": 0,
+        "quarantined": 0,
+    }
+
+    with DistributedLock(QUEUE_LOCK_KEY, ttl=QUEUE_LOCK_TTL) as lock:
+        if not lock.acquired:
+            return summary
+
+        batch_size = _batch_size()
+        # مؤشر تقدم: الأحداث المعادة لا تُسحب مرة أخرى في نفس التفريغ
+        last_id = 0
+
+        while max_batches is None or summary["batches"] < max_batches:
+            events = list(
+                WhatsAppWebhookEvent.objects
+                .select_related("company")
+                .filter(is_processed=False, id__gt=last_id)
+                .order_by("id")[:batch_size]
+            )
+            if not events:
+                break
+
+            last_id = events[-1].id
+
+            result = _process_batch(events)
+
+            summary["batches"] += 1
+            for key, value in result.items():
+                summary[key] += value
+
+            lock.renew()
+
+    if summary["events"]:
+        logger.info("📥 WhatsApp webhook queue processed | %s", summary)
+
+    return summary
+
+
+# ============================================================
+# ⏰ Sweep Scheduler (run_workers)
+# ============================================================
+
+@with_db_connection
+def process_webhook_queue_job():
+    process_webhook_queue()
+
+
+def start_scheduler():
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(
+        process_webhook_queue_job,
+        trigger="interval",
+        seconds=max(int(getattr(settings, "WHATSAPP_WEBHOOK_SWEEP_SECONDS", 5) or 5), 1),
+        id="whatsapp_webhook_queue_job",
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.start()
+    return scheduler
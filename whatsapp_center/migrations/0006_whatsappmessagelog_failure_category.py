@@ -0,0 +1,48 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:04
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+# نفس علامات _is_session_not_connected_failure القديمة
+SESSION_MARKERS = (
+    "whatsapp session is not connected",
+    "session is not connected",
+    "not connected",
+    "gateway_failed",
+)
+
+
+def backfill_failure_category(apps, schema_editor):
+    WhatsAppMessageLog = apps.get_model("whatsapp_center", "WhatsAppMessageLog")
+
+    failed = WhatsAppMessageLog.objects.filter(delivery_status="FAILED", failure_category="")
+
+    session_filter = Q()
+    for marker in SESSION_MARKERS:
+        session_filter |= Q(failure_reason__icontains=marker) | Q(provider_status__icontains=marker)
+
+    failed.filter(session_filter).update(failure_category="session_not_connected")
+    failed.filter(failure_reason__icontains="config found").update(failure_category="config_missing")
+    failed.filter(failure_reason__icontains="recipient phone").update(failure_category="invalid_recipient")
+    failed.update(failure_category="provider_error")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('whatsapp_center', '0005_systemwhatsappconfig_whatsapp_ce_is_enab_0c0c78_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='whatsappmessagelog',
+            name='failure_category',
+            field=models.CharField(blank=True, choices=[('session_not_connected', 'Session Not Connected'), ('config_missing', 'Config Missing'), ('invalid_recipient', 'Invalid Recipient'), ('provider_error', 'Provider Error'), ('delivery_failed', 'Delivery Failed')], default='', max_length=30),
+        ),
+        migrations.AddIndex(
+            model_name='whatsappmessagelog',
+            index=models.Index(fields=['scope_type', 'company', 'delivery_status', 'failure_category', 'created_at'], name='wa_msg_log_retry_queue_idx'),
+        ),
+        migrations.RunPython(backfill_failure_category, migrations.RunPython.noop),
+    ]
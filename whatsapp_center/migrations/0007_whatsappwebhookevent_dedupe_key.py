@@ -0,0 +1,63 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:40
+
+from django.db import migrations, models
+
+
+def mark_existing_events_processed(apps, schema_editor):
+    # الأحداث الخام القديمة عولجت بشكل متزامن قبل الطابور → لا نعيد معالجتها
+    WhatsAppWebhookEvent = apps.get_model("whatsapp_center", "WhatsAppWebhookEvent")
+    WhatsAppWebhookEvent.objects.filter(is_processed=False).update(is_processed=True)
+
+
+def backfill_inbound_dedupe_keys(apps, schema_editor):
+    # نفس صيغة webhook_service.inbound_dedupe_key (منسوخة لتبقى الـ migration ثابتة)
+    # حتى لا تُنشأ من جديد رسائل واردة مخزنة قبل الطابور
+    WhatsAppWebhookEvent = apps.get_model("whatsapp_center", "WhatsAppWebhookEvent")
+
+    events = (
+        WhatsAppWebhookEvent.objects
+        .filter(event_type="inbound_message", dedupe_key__isnull=True)
+        .exclude(external_message_id="")
+        .only("id", "scope_type", "company_id", "external_message_id")
+        .order_by("id")
+    )
+
+    seen = set()
+    pending = []
+
+    for event in events.iterator(chunk_size=2000):
+        scope_type = "COMPANY" if (event.scope_type or "").strip().upper() == "COMPANY" else "SYSTEM"
+        external_message_id = (event.external_message_id or "").strip()
+        key = f"inbound:{scope_type}:{event.company_id or 0}:{external_message_id}"[:255]
+
+        # تكرارات قديمة → المفتاح لأقدم حدث فقط (القيد فريد)
+        if not external_message_id or key in seen:
+            continue
+
+        seen.add(key)
+        event.dedupe_key = key
+        pending.append(event)
+
+        if len(pending) >= 1000:
+            WhatsAppWebhookEvent.objects.bulk_update(pending, ["dedupe_key"])
+            pending = []
+
+    if pending:
+        WhatsAppWebhookEvent.objects.bulk_update(pending, ["dedupe_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('whatsapp_center', '0006_whatsappmessagelog_failure_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='whatsappwebhookevent',
+            name='dedupe_key',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+        migrations.RunPython(mark_existing_events_processed, migrations.RunPython.noop),
+        migrations.RunPython(backfill_inbound_dedupe_keys, migrations.RunPython.noop),
+    ]
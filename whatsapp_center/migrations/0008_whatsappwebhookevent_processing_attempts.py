@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('whatsapp_center', '0007_whatsappwebhookevent_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='whatsappwebhookevent',
+            name='processing_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -71,6 +71,14 @@ class DeliveryStatus(models.TextChoices):
     CANCELLED = "CANCELLED", "Cancelled"
 
 
+class FailureCategory(models.TextChoices):
+    SESSION_NOT_CONNECTED = "session_not_connected", "Session Not Connected"
+    CONFIG_MISSING = "config_missing", "Config Missing"
+    INVALID_RECIPIENT = "invalid_recipient", "Invalid Recipient"
+    PROVIDER_ERROR = "provider_error", "Provider Error"
+    DELIVERY_FAILED = "delivery_failed", "Delivery Failed"
+
+
 class TriggerSource(models.TextChoices):
     SYSTEM = "system", "System"
     BILLING = "billing", "Billing"
@@ -506,6 +514,13 @@ class WhatsAppMessageLog(models.Model):
 
     failure_reason = models.TextField(blank=True)
     failure_code = models.CharField(max_length=100, blank=True)
+    # 🔁 تصنيف الفشل وقت حدوثه (طابور إعادة الإرسال يعتمد عليه)
+    failure_category = models.CharField(
+        max_length=30,
+        choices=FailureCategory.choices,
+        blank=True,
+        default="",
+    )
 
     related_model = models.CharField(max_length=100, blank=True)
     related_object_id = models.CharField(max_length=100, blank=True)
@@ -532,6 +547,10 @@ class WhatsAppMessageLog(models.Model):
             models.Index(fields=["delivery_status"]),
             models.Index(fields=["recipient_phone"]),
             models.Index(fields=["external_message_id"]),
+            models.Index(
+                fields=["scope_type", "company", "delivery_status", "failure_category", "created_at"],
+                name="wa_msg_log_retry_queue_idx",
+            ),
         ]
 
     def __str__(self) -> str:
@@ -610,12 +629,17 @@ class WhatsAppWebhookEvent(models.Model):
     )
     event_type = models.CharField(max_length=100, blank=True)
     external_message_id = models.CharField(max_length=255, blank=True)
+    # 🔁 منع تكرار الرسائل الواردة على مستوى قاعدة البيانات
+    # (NULL للأحداث الخام → لا يتعارض)
+    dedupe_key = models.CharField(max_length=255, null=True, blank=True, unique=True)
 
     payload_json = models.JSONField(default=dict, blank=True)
 
     is_processed = models.BooleanField(default=False)
     processed_at = models.DateTimeField(null=True, blank=True)
     processing_error = models.TextField(blank=True)
+    # 🔁 محاولات فاشلة (دفعة الحالات) → العزل بعد WHATSAPP_WEBHOOK_MAX_ATTEMPTS
+    processing_attempts = models.PositiveIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
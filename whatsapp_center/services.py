@@ -5,15 +5,23 @@
 
 from __future__ import annotations
 import logging
+import threading
+import time
 from dataclasses import asdict
 from typing import Any
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
+from primey_hrm.db_connections import DBThreadPoolExecutor
+
 from .client import WhatsAppClient, WhatsAppSessionResult
 from .models import (
     DeliveryStatus,
+    FailureCategory,
     MessageType,
     ScopeType,
     TemplateApprovalStatus,
@@ -333,32 +341,39 @@ def _session_result_to_payload(result: WhatsAppSessionResult) -> dict[str, Any]:
     return asdict(result)
 
 
-def _is_session_not_connected_failure(log: WhatsAppMessageLog) -> bool:
+SESSION_NOT_CONNECTED_MARKERS = (
+    "whatsapp session is not connected",
+    "session is not connected",
+    "not connected",
+    "gateway_failed",
+)
+
+
+def _classify_send_failure(
+    *,
+    error_message: str = "",
+    provider_status: str = "",
+    response_json: dict | None = None,
+) -> str:
     """
-    التحقق هل فشل الرسالة كان بسبب أن الجلسة غير متصلة.
+    تصنيف فشل الإرسال وقت حدوثه (يُحفظ في failure_category).
+    فقط session_not_connected يدخل طابور إعادة الإرسال بعد رجوع الجلسة.
     """
-    failure_reason = safe_text(getattr(log, "failure_reason", ""))
-    response_json = getattr(log, "response_json", {}) or {}
-    payload_json = getattr(log, "payload_json", {}) or {}
+    response_json = response_json if isinstance(response_json, dict) else {}
 
     candidates = [
-        failure_reason,
-        safe_text(getattr(log, "provider_status", "")),
+        safe_text(error_message),
+        safe_text(provider_status),
         safe_text(response_json.get("message")),
         safe_text(response_json.get("error")),
-        safe_text(payload_json.get("message")),
     ]
 
     normalized_text = " | ".join([item.lower() for item in candidates if item]).strip()
 
-    session_markers = [
-        "whatsapp session is not connected",
-        "session is not connected",
-        "not connected",
-        "gateway_failed",
-    ]
+    if any(marker in normalized_text for marker in SESSION_NOT_CONNECTED_MARKERS):
+        return FailureCategory.SESSION_NOT_CONNECTED
 
-    return any(marker in normalized_text for marker in session_markers)
+    return FailureCategory.PROVIDER_ERROR
 
 
 def _retry_existing_whatsapp_log(log: WhatsAppMessageLog):
@@ -377,12 +392,14 @@ def _retry_existing_whatsapp_log(log: WhatsAppMessageLog):
         log.delivery_status = DeliveryStatus.FAILED
         log.provider_status = "gateway_failed"
         log.failure_reason = "No active WhatsApp config found during retry"
+        log.failure_category = FailureCategory.CONFIG_MISSING
         log.failed_at = timezone.now()
         log.save(
             update_fields=[
                 "delivery_status",
                 "provider_status",
                 "failure_reason",
+                "failure_category",
                 "failed_at",
                 "updated_at",
             ]
@@ -394,12 +411,14 @@ def _retry_existing_whatsapp_log(log: WhatsAppMessageLog):
         log.delivery_status = DeliveryStatus.FAILED
         log.provider_status = "validation_failed"
         log.failure_reason = "Invalid or missing recipient phone number during retry"
+        log.failure_category = FailureCategory.INVALID_RECIPIENT
         log.failed_at = timezone.now()
         log.save(
             update_fields=[
                 "delivery_status",
                 "provider_status",
                 "failure_reason",
+                "failure_category",
                 "failed_at",
                 "updated_at",
             ]
@@ -419,11 +438,13 @@ def _retry_existing_whatsapp_log(log: WhatsAppMessageLog):
 
     log.delivery_status = DeliveryStatus.QUEUED
     log.failure_reason = ""
+    log.failure_category = ""
     log.provider_status = ""
     log.save(
         update_fields=[
             "delivery_status",
             "failure_reason",
+            "failure_category",
             "provider_status",
             "updated_at",
         ]
@@ -529,6 +550,11 @@ def _retry_existing_whatsapp_log(log: WhatsAppMessageLog):
         log.delivery_status = DeliveryStatus.FAILED
         log.provider_status = result.provider_status
         log.failure_reason = result.error_message
+        log.failure_category = _classify_send_failure(
+            error_message=result.error_message,
+            provider_status=result.provider_status,
+            response_json=result.response_data,
+        )
         log.response_json = result.response_data or {}
         log.failed_at = timezone.now()
         log.save(
@@ -536,6 +562,7 @@ def _retry_existing_whatsapp_log(log: WhatsAppMessageLog):
                 "delivery_status",
                 "provider_status",
                 "failure_reason",
+                "failure_category",
                 "response_json",
                 "failed_at",
                 "updated_at",
@@ -545,61 +572,188 @@ def _retry_existing_whatsapp_log(log: WhatsAppMessageLog):
     return log
 
 
-@transaction.atomic
+# ============================================================
+# 🔁 Retry Queue (Session Reconnect)
+# ============================================================
+# ✔ الطابور = FAILED + failure_category=session_not_connected
+#   → wa_msg_log_retry_queue_idx (بدون فلترة نصية في Python)
+# ✔ إعادة الإرسال في الخلفية: دفعات + حد معدل + قفل لكل نطاق
+# ✔ endpoint حالة الجلسة لا ينتظر الإرسال
+# ============================================================
+
+RETRY_DRAIN_LOCK_KEY = "whatsapp:retry_drain:{scope_type}:{company_id}"
+
+_retry_executor = None
+_retry_executor_lock = threading.Lock()
+
+
+def _get_retry_executor() -> DBThreadPoolExecutor:
+    global _retry_executor
+
+    with _retry_executor_lock:
+        if _retry_executor is None:
+            _retry_executor = DBThreadPoolExecutor(
+                max_workers=max(int(getattr(settings, "WHATSAPP_RETRY_WORKERS", 2) or 1), 1),
+                thread_name_prefix="whatsapp-retry",
+            )
+        return _retry_executor
+
+
+def _retry_drain_lock_key(scope_type: str, company_id=None) -> str:
+    return RETRY_DRAIN_LOCK_KEY.format(scope_type=scope_type, company_id=company_id or "system")
+
+
+def _retry_queue_qs(*, scope_type: str, company_id=None):
+    logs_qs = WhatsAppMessageLog.objects.filter(
+        scope_type=scope_type,
+        delivery_status=DeliveryStatus.FAILED,
+        failure_category=FailureCategory.SESSION_NOT_CONNECTED,
+    )
+
+    if scope_type == ScopeType.COMPANY:
+        return logs_qs.filter(company_id=company_id)
+
+    return logs_qs.filter(company__isnull=True)
+
+
 def retry_failed_whatsapp_messages_for_scope(
     *,
     scope_type: str,
     company=None,
-    limit: int = 100,
+    limit: int | None = None,
 ) -> dict[str, Any]:
     """
-    إعادة إرسال الرسائل الفاشلة تلقائيًا عند رجوع الجلسة.
-    يعيد فقط الرسائل التي فشلت بسبب انقطاع الجلسة.
+    إعادة إرسال الرسائل التي فشلت بسبب انقطاع الجلسة (الأقدم أولًا).
+    - دفعات WHATSAPP_RETRY_BATCH_SIZE
+    - حد معدل WHATSAPP_RETRY_RATE_PER_SECOND
+    - يتوقف فورًا إذا انقطعت الجلسة مرة أخرى
     """
-    logs_qs = (
-        WhatsAppMessageLog.objects
+    company_id = getattr(company, "id", None) if company else None
+    limit = limit or int(getattr(settings, "WHATSAPP_RETRY_MAX_PER_DRAIN", 500) or 500)
+    batch_size = max(int(getattr(settings, "WHATSAPP_RETRY_BATCH_SIZE", 20) or 20), 1)
+    rate = float(getattr(settings, "WHATSAPP_RETRY_RATE_PER_SECOND", 5) or 0)
+    min_interval = 1.0 / rate if rate > 0 else 0.0
+
+    queue_qs = (
+        _retry_queue_qs(scope_type=scope_type, company_id=company_id)
         .select_related("template", "company")
-        .filter(
-            scope_type=scope_type,
-            delivery_status=DeliveryStatus.FAILED,
-        )
-        .order_by("created_at")
+        .order_by("created_at", "id")
     )
 
-    if scope_type == ScopeType.COMPANY:
-        logs_qs = logs_qs.filter(company=company)
-    else:
-        logs_qs = logs_qs.filter(company__isnull=True)
-
     retried = 0
     sent = 0
     failed_again = 0
-    skipped = 0
+    session_lost = False
+    cursor = None
+    last_sent_at = 0.0
+
+    while retried < limit and not session_lost:
+        batch_qs = queue_qs
+        if cursor is not None:
+            # Keyset على (created_at, id) → الفاشل مجددًا لا يُعاد في نفس الجولة
+            batch_qs = batch_qs.filter(
+                Q(created_at__gt=cursor[0]) | Q(created_at=cursor[0], id__gt=cursor[1])
+            )
 
-    for log in logs_qs[:limit]:
-        if not _is_session_not_connected_failure(log):
-            skipped += 1
-            continue
+        batch = list(batch_qs[: min(batch_size, limit - retried)])
+        if not batch:
+            break
 
-        retried += 1
-        updated_log = _retry_existing_whatsapp_log(log)
+        for log in batch:
+            cursor = (log.created_at, log.id)
+
+            wait = min_interval - (time.monotonic() - last_sent_at)
+            if wait > 0:
+                time.sleep(wait)
+            last_sent_at = time.monotonic()
+
+            retried += 1
+            updated_log = _retry_existing_whatsapp_log(log)
+
+            if updated_log and getattr(updated_log, "delivery_status", "") == DeliveryStatus.SENT:
+                sent += 1
+                continue
 
-        if updated_log and getattr(updated_log, "delivery_status", "") == DeliveryStatus.SENT:
-            sent += 1
-        else:
             failed_again += 1
+            if getattr(updated_log, "failure_category", "") == FailureCategory.SESSION_NOT_CONNECTED:
+                session_lost = True
+                break
 
     return {
         "success": True,
         "retried": retried,
         "sent": sent,
         "failed_again": failed_again,
-        "skipped": skipped,
+        "session_lost": session_lost,
         "scope_type": scope_type,
-        "company_id": getattr(company, "id", None) if company else None,
+        "company_id": company_id,
     }
 
 
+def _drain_retry_queue(*, scope_type: str, company_id=None) -> dict[str, Any]:
+    lock_key = _retry_drain_lock_key(scope_type, company_id)
+
+    try:
+        company = None
+        if company_id:
+            company = (
+                WhatsAppMessageLog._meta.get_field("company").related_model.objects
+                .filter(pk=company_id)
+                .first()
+            )
+
+        result = retry_failed_whatsapp_messages_for_scope(
+            scope_type=scope_type,
+            company=company,
+        )
+        logger.info("🔁 WhatsApp retry drain finished | %s", result)
+        return result
+
+    except Exception:
+        logger.exception(
+            "❌ WhatsApp retry drain failed | scope=%s company=%s",
+            scope_type,
+            company_id,
+        )
+        raise
+
+    finally:
+        cache.delete(lock_key)
+
+
+def schedule_failed_messages_retry(*, scope_type: str, company=None) -> dict[str, Any]:
+    """
+    جدولة تفريغ طابور إعادة الإرسال في الخلفية (بعد commit).
+    تفريغ واحد فقط لكل نطاق في نفس الوقت (قفل في الـ cache المشترك).
+    """
+    company_id = getattr(company, "id", None) if company else None
+
+    pending = _retry_queue_qs(scope_type=scope_type, company_id=company_id).count()
+    if not pending:
+        return {"auto_retry_triggered": False, "pending": 0}
+
+    lock_key = _retry_drain_lock_key(scope_type, company_id)
+    lock_ttl = int(getattr(settings, "WHATSAPP_RETRY_LOCK_SECONDS", 600) or 600)
+
+    if not cache.add(lock_key, timezone.now().isoformat(), lock_ttl):
+        return {"auto_retry_triggered": False, "already_running": True, "pending": pending}
+
+    def _submit():
+        try:
+            _get_retry_executor().submit(
+                _drain_retry_queue,
+                scope_type=scope_type,
+                company_id=company_id,
+            )
+        except Exception:
+            cache.delete(lock_key)
+            logger.exception("❌ Failed to submit WhatsApp retry drain")
+
+    transaction.on_commit(_submit)
+
+    return {"auto_retry_triggered": True, "pending": pending}
+
+
 def _auto_retry_failed_messages_after_reconnect(
     *,
     scope_type: str,
@@ -607,24 +761,25 @@ def _auto_retry_failed_messages_after_reconnect(
     connected: bool,
 ) -> dict[str, Any]:
     """
-    إذا أصبحت الجلسة متصلة يتم تشغيل إعادة الإرسال التلقائي.
+    إذا أصبحت الجلسة متصلة يتم تفريغ طابور إعادة الإرسال في الخلفية.
     """
     if not connected:
         return {
             "success": True,
-            "retried": 0,
-            "sent": 0,
-            "failed_again": 0,
-            "skipped": 0,
+            "pending": 0,
             "auto_retry_triggered": False,
         }
 
-    retry_result = retry_failed_whatsapp_messages_for_scope(
-        scope_type=scope_type,
-        company=company,
-        limit=100,
-    )
-    retry_result["auto_retry_triggered"] = True
+    try:
+        retry_result = schedule_failed_messages_retry(
+            scope_type=scope_type,
+            company=company,
+        )
+    except Exception:
+        logger.exception("⚠️ WhatsApp auto retry scheduling failed")
+        retry_result = {"auto_retry_triggered": False}
+
+    retry_result["success"] = True
     return retry_result
 
 
@@ -3110,7 +3265,7 @@ def disconnect_whatsapp_session(
 # ============================================================
 
 @transaction.atomic
-def send_event_whatsapp_message(
+def _create_event_whatsapp_log(
     *,
     scope_type: str,
     event_code: str,
@@ -3126,9 +3281,12 @@ def send_event_whatsapp_message(
     attachment_url: str = "",
     attachment_name: str = "",
     mime_type: str = "",
+    config=None,
+    resolve_config: bool = True,
 ):
     """
-    خدمة عامة لإرسال رسالة واتساب مبنية على event/template.
+    تجهيز سجل الرسالة + المحاولة الأولى بدون إرسال.
+    يرجع (log, config, attempt). إذا تعذر الإرسال يرجع log فاشل و attempt=None.
     """
     context = context or {}
     normalized_phone = normalize_phone_number(recipient_phone)
@@ -3147,13 +3305,15 @@ def send_event_whatsapp_message(
             message_body="",
             delivery_status=DeliveryStatus.FAILED,
             failure_reason="Invalid or missing recipient phone number",
+            failure_category=FailureCategory.INVALID_RECIPIENT,
             related_model=related_model,
             related_object_id=str(related_object_id or ""),
             payload_json=context,
         )
-        return log
+        return log, None, None
 
-    config = _get_scope_config(scope_type=scope_type, company=company)
+    if resolve_config:
+        config = _get_scope_config(scope_type=scope_type, company=company)
 
     if not config:
         log = WhatsAppMessageLog.objects.create(
@@ -3169,11 +3329,12 @@ def send_event_whatsapp_message(
             message_body="",
             delivery_status=DeliveryStatus.FAILED,
             failure_reason="No active WhatsApp config found",
+            failure_category=FailureCategory.CONFIG_MISSING,
             related_model=related_model,
             related_object_id=str(related_object_id or ""),
             payload_json=context,
         )
-        return log
+        return log, None, None
 
     template = get_whatsapp_template(
         scope_type=scope_type,
@@ -3216,8 +3377,6 @@ def send_event_whatsapp_message(
         payload_json=context,
     )
 
-    client = _build_client_from_config(config)
-
     attempt = WhatsAppMessageAttempt.objects.create(
         message_log=log,
         attempt_number=1,
@@ -3231,19 +3390,33 @@ def send_event_whatsapp_message(
         },
     )
 
-    if attachment_url:
-        result = client.send_document_message(
-            to_phone=normalized_phone,
-            document_url=attachment_url,
-            caption=log.message_body,
-            filename=attachment_name,
-        )
-    else:
-        result = client.send_text_message(
-            to_phone=normalized_phone,
-            body=log.message_body,
-        )
+    return log, config, attempt
+
 
+def _build_log_send_message(log: WhatsAppMessageLog) -> dict[str, Any]:
+    if log.attachment_url:
+        return {
+            "to_phone": log.recipient_phone,
+            "document_url": log.attachment_url,
+            "caption": log.message_body,
+            "filename": log.attachment_name,
+            "mime_type": log.mime_type,
+        }
+
+    return {
+        "to_phone": log.recipient_phone,
+        "body": log.message_body,
+    }
+
+
+def _apply_event_send_result(
+    *,
+    log: WhatsAppMessageLog,
+    attempt: WhatsAppMessageAttempt,
+    config,
+    result,
+    sync_session: bool = True,
+) -> WhatsAppMessageLog:
     attempt.response_payload = result.response_data or {}
     attempt.status_code = result.status_code
     attempt.provider_status = result.provider_status
@@ -3262,7 +3435,7 @@ def send_event_whatsapp_message(
     )
 
     response_data = result.response_data or {}
-    if isinstance(response_data, dict) and any(
+    if sync_session and isinstance(response_data, dict) and any(
         key in response_data
         for key in [
             "session_status",
@@ -3310,6 +3483,11 @@ def send_event_whatsapp_message(
         log.delivery_status = DeliveryStatus.FAILED
         log.provider_status = result.provider_status
         log.failure_reason = result.error_message
+        log.failure_category = _classify_send_failure(
+            error_message=result.error_message,
+            provider_status=result.provider_status,
+            response_json=result.response_data,
+        )
         log.response_json = result.response_data or {}
         log.failed_at = timezone.now()
         log.save(
@@ -3317,6 +3495,7 @@ def send_event_whatsapp_message(
                 "delivery_status",
                 "provider_status",
                 "failure_reason",
+                "failure_category",
                 "response_json",
                 "failed_at",
                 "updated_at",
@@ -3326,6 +3505,145 @@ def send_event_whatsapp_message(
     return log
 
 
+def send_event_whatsapp_message(
+    *,
+    scope_type: str,
+    event_code: str,
+    recipient_phone: str,
+    recipient_name: str = "",
+    recipient_role: str = "",
+    trigger_source: str = TriggerSource.SYSTEM,
+    company=None,
+    language_code: str = "ar",
+    context: dict | None = None,
+    related_model: str = "",
+    related_object_id: str = "",
+    attachment_url: str = "",
+    attachment_name: str = "",
+    mime_type: str = "",
+):
+    """
+    خدمة عامة لإرسال رسالة واتساب مبنية على event/template.
+    """
+    log, config, attempt = _create_event_whatsapp_log(
+        scope_type=scope_type,
+        event_code=event_code,
+        recipient_phone=recipient_phone,
+        recipient_name=recipient_name,
+        recipient_role=recipient_role,
+        trigger_source=trigger_source,
+        company=company,
+        language_code=language_code,
+        context=context,
+        related_model=related_model,
+        related_object_id=related_object_id,
+        attachment_url=attachment_url,
+        attachment_name=attachment_name,
+        mime_type=mime_type,
+    )
+
+    if attempt is None:
+        return log
+
+    client = _build_client_from_config(config)
+
+    if attachment_url:
+        result = client.send_document_message(
+            to_phone=log.recipient_phone,
+            document_url=attachment_url,
+            caption=log.message_body,
+            filename=attachment_name,
+        )
+    else:
+        result = client.send_text_message(
+            to_phone=log.recipient_phone,
+            body=log.message_body,
+        )
+
+    return _apply_event_send_result(
+        log=log,
+        attempt=attempt,
+        config=config,
+        result=result,
+    )
+
+
+def send_event_whatsapp_messages_batch(
+    *,
+    scope_type: str,
+    event_code: str,
+    recipients: list[dict[str, Any]],
+    trigger_source: str = TriggerSource.SYSTEM,
+    company=None,
+    language_code: str = "ar",
+    context: dict | None = None,
+    related_model: str = "",
+    related_object_id: str = "",
+    attachment_url: str = "",
+    attachment_name: str = "",
+    mime_type: str = "",
+    pacing_ms: int | None = None,
+) -> list[WhatsAppMessageLog]:
+    """
+    نسخة جماعية من send_event_whatsapp_message لدفعة بث كاملة.
+
+    كل recipient: {"phone", "name", "role", "language_code", "context"}
+    (الحقول اختيارية ما عدا phone). يتم تجهيز السجلات أولاً ثم إرسالها
+    في طلب واحد عبر WhatsAppClient.send_batch. النتائج بنفس ترتيب المستلمين.
+    """
+    config = _get_scope_config(scope_type=scope_type, company=company)
+
+    logs: list[WhatsAppMessageLog] = []
+    pending: list[tuple[WhatsAppMessageLog, WhatsAppMessageAttempt]] = []
+
+    for recipient in recipients or []:
+        log, _config, attempt = _create_event_whatsapp_log(
+            scope_type=scope_type,
+            event_code=event_code,
+            recipient_phone=recipient.get("phone", ""),
+            recipient_name=recipient.get("name", ""),
+            recipient_role=recipient.get("role", ""),
+            trigger_source=trigger_source,
+            company=company,
+            language_code=recipient.get("language_code") or language_code,
+            context=recipient.get("context", context),
+            related_model=related_model,
+            related_object_id=related_object_id,
+            attachment_url=attachment_url,
+            attachment_name=attachment_name,
+            mime_type=mime_type,
+            config=config,
+            resolve_config=False,
+        )
+        logs.append(log)
+        if attempt is not None:
+            pending.append((log, attempt))
+
+    if not pending:
+        return logs
+
+    client = _build_client_from_config(config)
+    batch = client.send_batch(
+        [_build_log_send_message(log) for log, _attempt in pending],
+        pacing_ms=pacing_ms,
+    )
+
+    for (log, attempt), result in zip(pending, batch.results):
+        _apply_event_send_result(
+            log=log,
+            attempt=attempt,
+            config=config,
+            result=result,
+            sync_session=False,
+        )
+
+    # حالة الجلسة تُزامن مرة واحدة فقط للدفعة (من مستوى رد الـ Gateway)
+    if batch.session is not None:
+        _sync_config_session_fields_from_result(config, batch.session)
+
+    return logs
+
+
 # ============================================================
 # 🔗 Notification Center Bridge — WhatsApp Channel
 # ============================================================
@@ -60,6 +60,19 @@ const BACKEND_WEBHOOK_TIMEOUT_MS = Number(
   10000
 )
 
+// ============================================================
+// 📦 Batch Send / Per-Session Queue Config
+// ============================================================
+// كل جلسة لها طابور إرسال تسلسلي مع فاصل زمني بين الرسائل
+// حتى لا نتجاوز حدود WhatsApp عند البث الجماعي.
+//
+// WHATSAPP_SEND_PACING_MS=350
+// WHATSAPP_BATCH_MAX_MESSAGES=200
+// ============================================================
+
+const SEND_PACING_MS = Math.max(0, Number(process.env.WHATSAPP_SEND_PACING_MS || 350))
+const BATCH_MAX_MESSAGES = Math.max(1, Number(process.env.WHATSAPP_BATCH_MAX_MESSAGES || 200))
+
 const logger = pino({
   level: LOG_LEVEL,
 })
@@ -74,6 +87,7 @@ app.use(
 )
 
 const sessions = new Map()
+const sessionSendQueues = new Map()
 
 function safeSessionName(value) {
   const raw = String(value || "primey-system-session").trim()
@@ -222,6 +236,98 @@ function authMiddleware(req, res, next) {
   next()
 }
 
+function sleep(ms) {
+  return new Promise((resolve) => setTimeout(resolve, ms))
+}
+
+function enqueueSessionSend(sessionName, task, pacingMs = SEND_PACING_MS) {
+  const key = safeSessionName(sessionName)
+  const previous = sessionSendQueues.get(key) || Promise.resolve()
+
+  // المرسل يستلم النتيجة فور انتهاء الإرسال
+  const run = previous.then(() => task())
+
+  // الفاصل الزمني على ذيل الطابور فقط (والطابور يستمر حتى لو فشلت رسالة)
+  const tail = run
+    .catch(() => undefined)
+    .then(() => (pacingMs > 0 ? sleep(pacingMs) : undefined))
+  sessionSendQueues.set(key, tail)
+  tail.then(() => {
+    if (sessionSendQueues.get(key) === tail) {
+      sessionSendQueues.delete(key)
+    }
+  })
+
+  return run
+}
+
+function buildOutgoingContent(item) {
+  const documentUrl = String(item?.document_url || "").trim()
+
+  if (documentUrl) {
+    return {
+      document: { url: documentUrl },
+      mimetype: String(item?.mime_type || "application/octet-stream").trim(),
+      fileName: String(item?.filename || "document").trim(),
+      caption: String(item?.caption || item?.body || "").trim(),
+    }
+  }
+
+  return { text: String(item?.body || "").trim() }
+}
+
+async function sendQueuedMessage(state, item, pacingMs) {
+  const toPhone = digitsOnly(item?.to_phone)
+  const content = buildOutgoingContent(item)
+  const base = {
+    client_ref: item?.client_ref ?? null,
+    to_phone: toPhone,
+  }
+
+  if (!toPhone || (!content.text && !content.document)) {
+    return {
+      ...base,
+      success: false,
+      status_code: 400,
+      provider_status: "validation_failed",
+      message: "Missing to_phone or body/document_url",
+    }
+  }
+
+  return enqueueSessionSend(state.sessionName, async () => {
+    if (!state.sock || !state.connected) {
+      return {
+        ...base,
+        success: false,
+        status_code: 409,
+        provider_status: "session_not_connected",
+        message: "WhatsApp session is not connected",
+      }
+    }
+
+    try {
+      const response = await state.sock.sendMessage(toWhatsAppJid(toPhone), content)
+
+      return {
+        ...base,
+        success: true,
+        status_code: 200,
+        provider_status: "accepted",
+        message: "Message sent successfully",
+        external_message_id: response?.key?.id || "",
+      }
+    } catch (error) {
+      return {
+        ...base,
+        success: false,
+        status_code: 500,
+        provider_status: "send_failed",
+        message: String(error?.message || error),
+      }
+    }
+  }, pacingMs)
+}
+
 async function waitFor(predicate, timeoutMs = 15000, intervalMs = 300) {
   const started = Date.now()
 
@@ -1226,7 +1332,9 @@ app.post("/messages/send-text/", authMiddleware, async (req, res) => {
 
   try {
     const jid = toWhatsAppJid(toPhone)
-    const response = await state.sock.sendMessage(jid, { text: body })
+    const response = await enqueueSessionSend(sessionName, () =>
+      state.sock.sendMessage(jid, { text: body })
+    )
 
     return res.json({
       success: true,
@@ -1293,12 +1401,14 @@ app.post("/messages/send-document/", authMiddleware, async (req, res) => {
 
   try {
     const jid = toWhatsAppJid(toPhone)
-    const response = await state.sock.sendMessage(jid, {
-      document: { url: documentUrl },
-      mimetype: mimeType,
-      fileName: filename,
-      caption,
-    })
+    const response = await enqueueSessionSend(sessionName, () =>
+      state.sock.sendMessage(jid, {
+        document: { url: documentUrl },
+        mimetype: mimeType,
+        fileName: filename,
+        caption,
+      })
+    )
 
     return res.json({
       success: true,
@@ -1323,6 +1433,80 @@ app.post("/messages/send-document/", authMiddleware, async (req, res) => {
   }
 })
 
+app.post("/messages/send-batch/", authMiddleware, async (req, res) => {
+  const sessionName = safeSessionName(req.body?.session_name)
+  const messages = Array.isArray(req.body?.messages) ? req.body.messages : []
+  const pacingMs = req.body?.pacing_ms === undefined || req.body?.pacing_ms === null
+    ? SEND_PACING_MS
+    : Math.max(0, Number(req.body.pacing_ms) || 0)
+
+  if (!messages.length) {
+    return res.status(400).json({
+      success: false,
+      status_code: 400,
+      provider_status: "validation_failed",
+      message: "Missing messages",
+    })
+  }
+
+  if (messages.length > BATCH_MAX_MESSAGES) {
+    return res.status(413).json({
+      success: false,
+      status_code: 413,
+      provider_status: "validation_failed",
+      message: `Batch too large (max ${BATCH_MAX_MESSAGES} messages)`,
+    })
+  }
+
+  const state = getOrCreateState(sessionName)
+
+  if (!state.connected && hasStoredSessionFiles(state.sessionDir)) {
+    try {
+      await restoreSessionIfExists(sessionName, { mode: "qr" })
+    } catch (error) {
+      logger.warn(
+        { err: error, session: sessionName },
+        "Failed to restore session before sending batch"
+      )
+    }
+  }
+
+  if (!state.sock || !state.connected) {
+    return res.status(409).json({
+      success: false,
+      status_code: 409,
+      provider_status: "session_not_connected",
+      message: "WhatsApp session is not connected",
+      session_status: state.status || "disconnected",
+    })
+  }
+
+  // كل الرسائل تدخل طابور الجلسة فورًا، والإرسال الفعلي تسلسلي مع الفاصل الزمني
+  const results = await Promise.all(
+    messages.map((item, index) =>
+      sendQueuedMessage(state, item, pacingMs).then((result) => ({ index, ...result }))
+    )
+  )
+
+  const sentCount = results.filter((item) => item.success).length
+
+  return res.json({
+    success: true,
+    status_code: 200,
+    provider_status: "batch_processed",
+    message: "Batch processed",
+    total: results.length,
+    sent_count: sentCount,
+    failed_count: results.length - sentCount,
+    results,
+    session_status: state.status,
+    connected: state.connected,
+    connected_phone: state.connectedPhone,
+    device_label: state.deviceLabel,
+    last_connected_at: state.lastConnectedAt,
+  })
+})
+
 app.use((error, _req, res, _next) => {
   logger.error({ err: error }, "Unhandled gateway error")
 
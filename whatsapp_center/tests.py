@@ -3,8 +3,25 @@
 # Mham Cloud - WhatsApp Center Tests
 # ============================================================
 
-from django.test import TestCase
+import json
+from unittest.mock import MagicMock, patch
 
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from . import services
+from .client import WhatsAppClient, _get_session_semaphore, get_gateway_http_session
+from .inbox_queue import process_webhook_queue
+from .models import (
+    DeliveryStatus,
+    FailureCategory,
+    ScopeType,
+    WhatsAppConversationMessage,
+    WhatsAppMessageLog,
+    WhatsAppWebhookEvent,
+)
+from .webhook_service import store_webhook_event
 from .utils import is_valid_phone_number, normalize_phone_number
 
 
@@ -19,4 +36,267 @@ class WhatsAppUtilsTests(TestCase):
         self.assertTrue(is_valid_phone_number("+966555555555"))
         self.assertTrue(is_valid_phone_number("966555555555"))
         self.assertFalse(is_valid_phone_number("055555"))
-        self.assertFalse(is_valid_phone_number(""))
\ No newline at end of file
+        self.assertFalse(is_valid_phone_number(""))
+
+
+class WhatsAppClientTransportTests(TestCase):
+    def _response(self, status_code, data):
+        response = MagicMock(status_code=status_code, text="{}")
+        response.json.return_value = data
+        return response
+
+    @patch.dict("os.environ", {"WHATSAPP_SESSION_GATEWAY_URL": "http://gateway.test"})
+    def test_send_many_uses_shared_session_and_keeps_order(self):
+        client = WhatsAppClient(provider="whatsapp_web_session", session_name="tests")
+        messages = [{"to_phone": f"+96655000000{i}", "body": "hi"} for i in range(6)]
+
+        def _post(url, json=None, **kwargs):
+            return self._response(200, {"message_id": json["to_phone"]})
+
+        with patch.object(get_gateway_http_session(), "post", side_effect=_post) as mock_post:
+            results = client.send_many(messages, max_in_flight=3)
+
+        self.assertEqual(mock_post.call_count, 6)
+        self.assertEqual(
+            [result.external_message_id for result in results],
+            [message["to_phone"] for message in messages],
+        )
+
+    @patch.dict("os.environ", {"WHATSAPP_SESSION_GATEWAY_MAX_IN_FLIGHT": "2"})
+    def test_session_semaphore_is_shared_per_session_name(self):
+        semaphore = _get_session_semaphore("semaphore-tests")
+
+        self.assertEqual(semaphore._initial_value, 2)
+        self.assertIs(_get_session_semaphore("semaphore-tests"), semaphore)
+        self.assertIsNot(_get_session_semaphore("semaphore-tests-2"), semaphore)
+
+    @patch.dict("os.environ", {"WHATSAPP_SESSION_GATEWAY_URL": "http://gateway.test"})
+    def test_gateway_http_error_is_mapped_to_failed_result(self):
+        client = WhatsAppClient(provider="whatsapp_web_session", session_name="tests")
+
+        with patch.object(
+            get_gateway_http_session(),
+            "post",
+            return_value=self._response(409, {"message": "Session not connected"}),
+        ):
+            result = client.send_text_message(to_phone="+966550000000", body="hi")
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.status_code, 409)
+        self.assertEqual(result.error_message, "Session not connected")
+
+    @patch.dict(
+        "os.environ",
+        {
+            "WHATSAPP_SESSION_GATEWAY_URL": "http://gateway.test",
+            "WHATSAPP_SESSION_GATEWAY_BATCH_SIZE": "2",
+        },
+    )
+    def test_send_batch_chunks_messages_and_maps_results_by_index(self):
+        client = WhatsAppClient(provider="whatsapp_web_session", session_name="tests")
+        messages = [{"to_phone": f"+96655000000{i}", "body": "hi"} for i in range(3)]
+
+        def _post(url, json=None, **kwargs):
+            self.assertTrue(url.endswith("/messages/send-batch/"))
+            items = [
+                {
+                    "index": index,
+                    "success": index == 0,
+                    "external_message_id": item["to_phone"],
+                    "message": "" if index == 0 else "send failed",
+                }
+                for index, item in enumerate(json["messages"])
+            ]
+            return self._response(
+                200,
+                {"success": True, "results": items[::-1], "session_status": "connected", "connected": True},
+            )
+
+        with patch.object(get_gateway_http_session(), "post", side_effect=_post) as mock_post:
+            batch = client.send_batch(messages)
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual([result.success for result in batch.results], [True, False, True])
+        self.assertEqual(batch.results[1].error_message, "send failed")
+        self.assertEqual(batch.session.session_status, "connected")
+        self.assertTrue(batch.session.connected)
+
+
+@override_settings(WHATSAPP_RETRY_RATE_PER_SECOND=0, WHATSAPP_RETRY_BATCH_SIZE=2)
+class WhatsAppRetryQueueTests(TestCase):
+    def _failed_log(self, category, phone="+966550000001"):
+        return WhatsAppMessageLog.objects.create(
+            scope_type=ScopeType.SYSTEM,
+            recipient_phone=phone,
+            message_body="hi",
+            delivery_status=DeliveryStatus.FAILED,
+            failure_category=category,
+        )
+
+    def test_failure_is_classified_at_failure_time(self):
+        self.assertEqual(
+            services._classify_send_failure(error_message="WhatsApp session is not connected"),
+            FailureCategory.SESSION_NOT_CONNECTED,
+        )
+        self.assertEqual(
+            services._classify_send_failure(error_message="Number is not on WhatsApp"),
+            FailureCategory.PROVIDER_ERROR,
+        )
+
+    def test_drain_retries_only_session_failures_in_batches(self):
+        retryable = [self._failed_log(FailureCategory.SESSION_NOT_CONNECTED) for _ in range(3)]
+        self._failed_log(FailureCategory.PROVIDER_ERROR)
+
+        def _retry(log):
+            log.delivery_status = DeliveryStatus.SENT
+            log.save(update_fields=["delivery_status"])
+            return log
+
+        with patch.object(services, "_retry_existing_whatsapp_log", side_effect=_retry) as retry:
+            result = services.retry_failed_whatsapp_messages_for_scope(scope_type=ScopeType.SYSTEM)
+
+        self.assertEqual(result["retried"], 3)
+        self.assertEqual(result["sent"], 3)
+        self.assertEqual([call.args[0].id for call in retry.call_args_list], [log.id for log in retryable])
+
+    def test_drain_stops_when_session_is_lost_again(self):
+        self._failed_log(FailureCategory.SESSION_NOT_CONNECTED)
+        self._failed_log(FailureCategory.SESSION_NOT_CONNECTED)
+
+        with patch.object(services, "_retry_existing_whatsapp_log", side_effect=lambda log: log) as retry:
+            result = services.retry_failed_whatsapp_messages_for_scope(scope_type=ScopeType.SYSTEM)
+
+        self.assertEqual(retry.call_count, 1)
+        self.assertTrue(result["session_lost"])
+
+    def test_reconnect_schedules_single_background_drain(self):
+        self._failed_log(FailureCategory.SESSION_NOT_CONNECTED)
+        cache.delete(services._retry_drain_lock_key(ScopeType.SYSTEM))
+
+        executor = MagicMock()
+        with patch.object(services, "_get_retry_executor", return_value=executor):
+            with self.captureOnCommitCallbacks(execute=True):
+                first = services._auto_retry_failed_messages_after_reconnect(
+                    scope_type=ScopeType.SYSTEM,
+                    connected=True,
+                )
+                second = services._auto_retry_failed_messages_after_reconnect(
+                    scope_type=ScopeType.SYSTEM,
+                    connected=True,
+                )
+
+        self.assertTrue(first["auto_retry_triggered"])
+        self.assertTrue(second["already_running"])
+        executor.submit.assert_called_once()
+        cache.delete(services._retry_drain_lock_key(ScopeType.SYSTEM))
+
+
+class WhatsAppWebhookQueueTests(TestCase):
+    def _inbound(self, message_id):
+        return {
+            "provider": "whatsapp_web_session",
+            "event": "messages.upsert",
+            "messages": [
+                {"message_id": message_id, "sender_phone": "966550000009", "text": "hello"},
+            ],
+        }
+
+    def _enqueue(self, payload):
+        return store_webhook_event(
+            payload=payload,
+            event_type=payload.get("event", ""),
+            provider="whatsapp_web_session",
+        )
+
+    def test_queue_dedupes_inbound_messages_across_events(self):
+        self._enqueue(self._inbound("wamid-1"))
+        self._enqueue(self._inbound("wamid-1"))
+
+        summary = process_webhook_queue()
+
+        self.assertEqual(summary["inbound_created"], 1)
+        self.assertEqual(WhatsAppConversationMessage.objects.filter(external_message_id="wamid-1").count(), 1)
+        self.assertFalse(WhatsAppWebhookEvent.objects.filter(is_processed=False).exists())
+
+    def test_status_updates_are_grouped_and_never_downgraded(self):
+        log = WhatsAppMessageLog.objects.create(
+            recipient_phone="+966550000009",
+            delivery_status=DeliveryStatus.SENT,
+            external_message_id="wamid-out",
+        )
+        self._enqueue({"statuses": [{"id": "wamid-out", "status": "read"}]})
+        self._enqueue({"statuses": [{"id": "wamid-out", "status": "delivered"}]})
+
+        summary = process_webhook_queue()
+
+        log.refresh_from_db()
+        self.assertEqual(summary["status_updates"], 1)
+        self.assertEqual(log.delivery_status, DeliveryStatus.READ)
+        self.assertIsNotNone(log.read_at)
+
+    def test_provider_delivery_overrides_local_failure(self):
+        log = WhatsAppMessageLog.objects.create(
+            recipient_phone="+966550000009",
+            delivery_status=DeliveryStatus.FAILED,
+            failure_category=FailureCategory.SESSION_NOT_CONNECTED,
+            external_message_id="wamid-failed",
+        )
+        self._enqueue({"statuses": [{"id": "wamid-failed", "status": "delivered"}]})
+        self._enqueue({"statuses": [{"id": "wamid-failed", "status": "failed"}]})
+
+        process_webhook_queue()
+
+        log.refresh_from_db()
+        self.assertEqual(log.delivery_status, DeliveryStatus.DELIVERED)
+        self.assertEqual(log.failure_category, "")
+
+    def test_status_batch_failure_leaves_events_for_sweep(self):
+        status_event = self._enqueue({"statuses": [{"id": "wamid-out", "status": "read"}]})
+        inbound_event = self._enqueue(self._inbound("wamid-3"))
+
+        with patch("whatsapp_center.inbox_queue.apply_status_updates_batch", side_effect=RuntimeError("db down")):
+            summary = process_webhook_queue()
+
+        self.assertEqual(summary["retried"], 1)
+        status_event.refresh_from_db()
+        inbound_event.refresh_from_db()
+        self.assertFalse(status_event.is_processed)
+        self.assertEqual(status_event.processing_attempts, 1)
+        self.assertTrue(inbound_event.is_processed)
+
+        self.assertEqual(process_webhook_queue()["events"], 1)
+        status_event.refresh_from_db()
+        self.assertTrue(status_event.is_processed)
+        self.assertEqual(status_event.processing_error, "")
+
+    @override_settings(WHATSAPP_WEBHOOK_MAX_ATTEMPTS=2)
+    def test_failing_status_events_are_quarantined_without_blocking_queue(self):
+        status_event = self._enqueue({"statuses": [{"id": "wamid-out", "status": "read"}]})
+
+        with patch("whatsapp_center.inbox_queue.apply_status_updates_batch", side_effect=RuntimeError("db down")):
+            self.assertEqual(process_webhook_queue()["retried"], 1)
+
+            inbound_event = self._enqueue(self._inbound("wamid-4"))
+            summary = process_webhook_queue()
+
+        self.assertEqual((summary["quarantined"], summary["inbound_created"]), (1, 1))
+        status_event.refresh_from_db()
+        inbound_event.refresh_from_db()
+        self.assertTrue(status_event.is_processed)
+        self.assertEqual(status_event.processing_error, "db down")
+        self.assertTrue(inbound_event.is_processed)
+
+    def test_receive_endpoint_acks_without_processing(self):
+        with patch("whatsapp_center.inbox_queue.kick_webhook_queue") as kick:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse("api:system_whatsapp_webhook_receive"),
+                    data=json.dumps(self._inbound("wamid-2")),
+                    content_type="application/json",
+                )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["ok"])
+        kick.assert_called_once()
+        self.assertTrue(WhatsAppWebhookEvent.objects.filter(is_processed=False).exists())
+        self.assertFalse(WhatsAppConversationMessage.objects.exists())
@@ -6,8 +6,8 @@
 # - Raw webhook audit storage
 # - Safe provider normalization
 # - Safe status normalization
-# - Idempotent inbound event detection
-# - Message log status update
+# - Idempotent inbound event detection (dedupe_key فريد)
+# - Message log status update (فردي + دفعات مجمعة بدون رجوع للخلف)
 # - Inbox Runtime Engine
 #   * Contact create/update
 #   * Conversation create/update
@@ -25,6 +25,7 @@ from django.utils import timezone
 from .models import (
     ConversationDirection,
     DeliveryStatus,
+    FailureCategory,
     MessageType,
     ScopeType,
     WhatsAppContact,
@@ -181,55 +182,6 @@ def store_webhook_event(
     )
 
 
-def inbound_event_exists(
-    *,
-    external_message_id: str,
-    scope_type: str = "SYSTEM",
-    company=None,
-    event_type: str = "inbound_message",
-) -> bool:
-    """
-    تحقق idempotent: هل تم تخزين نفس الرسالة الواردة مسبقًا؟
-    """
-    external_message_id = _safe_str(external_message_id)
-    if not external_message_id:
-        return False
-
-    queryset = WhatsAppWebhookEvent.objects.filter(
-        scope_type=scope_type,
-        external_message_id=external_message_id,
-        event_type=event_type,
-    )
-
-    if company is None:
-        queryset = queryset.filter(company__isnull=True)
-    else:
-        queryset = queryset.filter(company=company)
-
-    return queryset.exists()
-
-
-def store_inbound_message_event(
-    *,
-    payload: dict,
-    external_message_id: str,
-    scope_type: str = "SYSTEM",
-    company=None,
-    provider: str = "whatsapp_web_session",
-):
-    """
-    تخزين رسالة واردة كـ event مستقل.
-    """
-    return store_webhook_event(
-        payload=payload,
-        event_type="inbound_message",
-        external_message_id=external_message_id,
-        scope_type=scope_type,
-        company=company,
-        provider=provider,
-    )
-
-
 # ============================================================
 # 🧾 Message Log Resolvers
 # ============================================================
@@ -264,27 +216,42 @@ def get_conversation_message_by_external_message_id(*, external_message_id: str)
 # 🔄 Status Update Engine
 # ============================================================
 
-def apply_status_update_to_message(*, external_message_id: str, new_status: str):
+# delivered / read مؤكدة من المزود → تتقدم على failed (فشل محلي أو متأخر)
+STATUS_RANK = {
+    "sent": 1,
+    "failed": 2,
+    "delivered": 3,
+    "read": 4,
+}
+
+DELIVERY_STATUS_RANK = {
+    DeliveryStatus.QUEUED: 0,
+    DeliveryStatus.SENT: 1,
+    DeliveryStatus.FAILED: 2,
+    DeliveryStatus.DELIVERED: 3,
+    DeliveryStatus.READ: 4,
+}
+
+
+def _is_status_downgrade(current_status: str, status: str) -> bool:
     """
-    تطبيق حالة الرسالة على آخر سجل مطابق في WhatsAppMessageLog.
+    تحديثات الحالة قد تصل بغير ترتيبها (دفعات / gateway) → لا نرجع للخلف.
+    FAILED محلي لا يمنع delivered / read المؤكدة من المزود.
     """
-    external_message_id = _safe_str(external_message_id)
-    if not external_message_id:
-        return None
-
-    log = get_message_log_by_external_message_id(
-        external_message_id=external_message_id,
-    )
-    if not log:
-        return None
+    return DELIVERY_STATUS_RANK.get(current_status, 0) > STATUS_RANK.get(status, 0)
 
-    status = normalize_status_value(new_status)
-    if not status:
-        return log
 
-    now = timezone.now()
+def _apply_status_to_log(log: WhatsAppMessageLog, *, status: str, raw_status: str, now) -> list[str]:
     changed_fields: list[str] = []
 
+    if _is_status_downgrade(log.delivery_status, status):
+        return changed_fields
+
+    # تسليم مؤكد بعد فشل → يخرج من طابور إعادة الإرسال
+    if status in ("delivered", "read") and log.failure_category:
+        log.failure_category = ""
+        changed_fields.append("failure_category")
+
     if status == "sent":
         if log.delivery_status != DeliveryStatus.SENT:
             log.delivery_status = DeliveryStatus.SENT
@@ -329,45 +296,36 @@ def apply_status_update_to_message(*, external_message_id: str, new_status: str)
             log.delivery_status = DeliveryStatus.FAILED
             changed_fields.append("delivery_status")
 
+        # فشل تسليم من المزود بعد الإرسال → لا يدخل طابور إعادة الإرسال
+        if not log.failure_category:
+            log.failure_category = FailureCategory.DELIVERY_FAILED
+            changed_fields.append("failure_category")
+
         if not log.failed_at:
             log.failed_at = now
             changed_fields.append("failed_at")
 
-    if log.provider_status != _safe_str(new_status):
-        log.provider_status = _safe_str(new_status)
+    if log.provider_status != raw_status:
+        log.provider_status = raw_status
         changed_fields.append("provider_status")
 
-    if changed_fields:
-        if "updated_at" not in changed_fields:
-            changed_fields.append("updated_at")
-        log.save(update_fields=changed_fields)
+    return changed_fields
 
-    return log
 
-
-def apply_status_update_to_conversation_message(*, external_message_id: str, new_status: str):
-    """
-    تطبيق الحالة على طبقة Runtime للشات.
-    """
-    external_message_id = _safe_str(external_message_id)
-    if not external_message_id:
-        return None
-
-    message = get_conversation_message_by_external_message_id(
-        external_message_id=external_message_id,
-    )
-    if not message:
-        return None
-
-    status = normalize_status_value(new_status)
-    if not status:
-        return message
-
-    now = timezone.now()
+def _apply_status_to_conversation_message(
+    message: WhatsAppConversationMessage,
+    *,
+    status: str,
+    raw_status: str,
+    now,
+) -> list[str]:
     changed_fields: list[str] = []
 
-    if message.provider_status != _safe_str(new_status):
-        message.provider_status = _safe_str(new_status)
+    if _is_status_downgrade(message.delivery_status, status):
+        return changed_fields
+
+    if message.provider_status != raw_status:
+        message.provider_status = raw_status
         changed_fields.append("provider_status")
 
     if status == "sent":
@@ -414,14 +372,120 @@ def apply_status_update_to_conversation_message(*, external_message_id: str, new
             message.failed_at = now
             changed_fields.append("failed_at")
 
+    return changed_fields
+
+
+def apply_status_update_to_message(*, external_message_id: str, new_status: str):
+    """
+    تطبيق حالة الرسالة على آخر سجل مطابق في WhatsAppMessageLog.
+    """
+    external_message_id = _safe_str(external_message_id)
+    if not external_message_id:
+        return None
+
+    log = get_message_log_by_external_message_id(
+        external_message_id=external_message_id,
+    )
+    if not log:
+        return None
+
+    status = normalize_status_value(new_status)
+    if not status:
+        return log
+
+    changed_fields = _apply_status_to_log(
+        log,
+        status=status,
+        raw_status=_safe_str(new_status),
+        now=timezone.now(),
+    )
+
     if changed_fields:
-        if "updated_at" not in changed_fields:
-            changed_fields.append("updated_at")
+        changed_fields.append("updated_at")
+        log.save(update_fields=changed_fields)
+
+    return log
+
+
+def apply_status_update_to_conversation_message(*, external_message_id: str, new_status: str):
+    """
+    تطبيق الحالة على طبقة Runtime للشات.
+    """
+    external_message_id = _safe_str(external_message_id)
+    if not external_message_id:
+        return None
+
+    message = get_conversation_message_by_external_message_id(
+        external_message_id=external_message_id,
+    )
+    if not message:
+        return None
+
+    status = normalize_status_value(new_status)
+    if not status:
+        return message
+
+    changed_fields = _apply_status_to_conversation_message(
+        message,
+        status=status,
+        raw_status=_safe_str(new_status),
+        now=timezone.now(),
+    )
+
+    if changed_fields:
+        changed_fields.append("updated_at")
         message.save(update_fields=changed_fields)
 
     return message
 
 
+def _latest_by_external_id(queryset, external_message_ids) -> dict[str, Any]:
+    latest: dict[str, Any] = {}
+    for obj in queryset.filter(external_message_id__in=external_message_ids).order_by("-id"):
+        latest.setdefault(obj.external_message_id, obj)
+    return latest
+
+
+@transaction.atomic
+def apply_status_updates_batch(updates: dict[str, str]) -> int:
+    """
+    تطبيق تحديثات حالة مجمعة {external_message_id: status}
+    باستعلام واحد + bulk_update واحد لكل جدول.
+    """
+    if not updates:
+        return 0
+
+    now = timezone.now()
+    external_message_ids = list(updates)
+    applied_count = 0
+
+    for queryset, apply_status in (
+        (WhatsAppMessageLog.objects.all(), _apply_status_to_log),
+        (WhatsAppConversationMessage.objects.all(), _apply_status_to_conversation_message),
+    ):
+        changed_objects = []
+        changed_fields: set[str] = set()
+
+        for external_message_id, obj in _latest_by_external_id(queryset, external_message_ids).items():
+            applied_count += 1
+            status = updates[external_message_id]
+            fields = apply_status(obj, status=status, raw_status=status, now=now)
+            if fields:
+                # bulk_update لا يمر على auto_now
+                obj.updated_at = now
+                changed_objects.append(obj)
+                changed_fields.update(fields)
+
+        if changed_objects:
+            queryset.model.objects.bulk_update(
+                changed_objects,
+                sorted(changed_fields | {"updated_at"}),
+                batch_size=500,
+            )
+
+    return applied_count
+
+
 # ============================================================
 # 📦 Payload Helpers
 # ============================================================
@@ -483,6 +547,99 @@ def build_inbound_event_payload(
     }
 
 
+def _extract_legacy_statuses(payload: dict[str, Any]) -> list[dict[str, str]]:
+    """
+    دعم الشكل القديم:
+    {
+        "statuses": [{"id": "...", "status": "delivered"}]
+    }
+    """
+    normalized: list[dict[str, str]] = []
+
+    for item in payload.get("statuses", []) or []:
+        if not isinstance(item, dict):
+            continue
+
+        external_message_id = _safe_str(item.get("id"))
+        new_status = normalize_status_value(item.get("status"))
+
+        if external_message_id and new_status:
+            normalized.append(
+                {
+                    "external_message_id": external_message_id,
+                    "new_status": new_status,
+                }
+            )
+
+    return normalized
+
+
+def _extract_gateway_message_updates(payload: dict[str, Any]) -> list[dict[str, str]]:
+    """
+    دعم الشكل الجديد القادم من Gateway:
+    {
+        "event": "messages.update",
+        "message_updates": [
+            {
+                "message_id": "...",
+                "update": {
+                    "status": "read"
+                }
+            }
+        ]
+    }
+    """
+    normalized: list[dict[str, str]] = []
+
+    for item in payload.get("message_updates", []) or []:
+        if not isinstance(item, dict):
+            continue
+
+        external_message_id = _safe_str(
+            item.get("message_id")
+            or item.get("external_message_id")
+            or item.get("id")
+        )
+
+        update = item.get("update", {}) or {}
+
+        candidate_status = (
+            update.get("status")
+            or update.get("delivery_status")
+            or update.get("ack")
+            or update.get("messageStatus")
+        )
+
+        new_status = normalize_status_value(candidate_status)
+
+        if external_message_id and new_status:
+            normalized.append(
+                {
+                    "external_message_id": external_message_id,
+                    "new_status": new_status,
+                }
+            )
+
+    return normalized
+
+
+def collect_status_updates(payload: dict[str, Any]) -> list[dict[str, str]]:
+    payload = _safe_dict(payload)
+    updates: list[dict[str, str]] = []
+    updates.extend(_extract_legacy_statuses(payload))
+    updates.extend(_extract_gateway_message_updates(payload))
+    return updates
+
+
+def merge_status_update(updates: dict[str, str], *, external_message_id: str, new_status: str) -> None:
+    """
+    تجميع التحديثات لكل رسالة: نحتفظ بالحالة الأكثر تقدمًا فقط.
+    """
+    current = updates.get(external_message_id)
+    if current is None or STATUS_RANK.get(new_status, 0) >= STATUS_RANK.get(current, 0):
+        updates[external_message_id] = new_status
+
+
 # ============================================================
 # 💬 Inbox Runtime Helpers
 # ============================================================
@@ -739,6 +896,11 @@ def create_inbound_conversation_message(
 # 🚀 Inbox Engine
 # ============================================================
 
+def inbound_dedupe_key(*, external_message_id: str, scope_type: str, company=None) -> str:
+    company_id = getattr(company, "id", None) or 0
+    return f"inbound:{_resolve_scope_type(scope_type)}:{company_id}:{_safe_str(external_message_id)}"[:255]
+
+
 def create_or_update_inbox_from_webhook(
     *,
     payload: dict,
@@ -747,6 +909,7 @@ def create_or_update_inbox_from_webhook(
 ) -> dict[str, int]:
     """
     إنشاء / تحديث Inbox Runtime من payload يحتوي على messages.
+    التكرار يُكتشف باستعلام واحد على dedupe_key + القيد الفريد عند السباق.
 
     الناتج:
     {
@@ -760,9 +923,9 @@ def create_or_update_inbox_from_webhook(
     created_count = 0
     skipped_count = 0
 
-    messages = payload.get("messages", []) or []
+    candidates = []
 
-    for item in messages:
+    for item in payload.get("messages", []) or []:
         if not isinstance(item, dict):
             skipped_count += 1
             continue
@@ -785,35 +948,52 @@ def create_or_update_inbox_from_webhook(
             skipped_count += 1
             continue
 
-        normalized_phone = resolve_normalized_phone(message_item=item)
-        if not normalized_phone:
+        if not resolve_normalized_phone(message_item=item):
             skipped_count += 1
             continue
 
-        if inbound_event_exists(
-            external_message_id=external_message_id,
-            scope_type=scope_type,
-            company=company,
-            event_type="inbound_message",
-        ):
+        candidates.append(
+            (
+                inbound_dedupe_key(
+                    external_message_id=external_message_id,
+                    scope_type=scope_type,
+                    company=company,
+                ),
+                external_message_id,
+                item,
+            )
+        )
+
+    existing_keys = set(
+        WhatsAppWebhookEvent.objects
+        .filter(dedupe_key__in=[candidate[0] for candidate in candidates])
+        .values_list("dedupe_key", flat=True)
+    )
+
+    provider = _normalize_provider(payload.get("provider") or "whatsapp_web_session")
+
+    for dedupe_key, external_message_id, item in candidates:
+        if dedupe_key in existing_keys:
             skipped_count += 1
             continue
 
-        inbound_payload = build_inbound_event_payload(
-            root_payload=payload,
-            message_item=item,
-        )
+        existing_keys.add(dedupe_key)
 
         try:
             with transaction.atomic():
-                inbound_event = store_inbound_message_event(
-                    payload=inbound_payload,
-                    external_message_id=external_message_id,
+                inbound_event = WhatsAppWebhookEvent.objects.create(
                     scope_type=scope_type,
                     company=company,
-                    provider=_normalize_provider(
-                        payload.get("provider") or "whatsapp_web_session"
+                    provider=provider,
+                    event_type="inbound_message",
+                    external_message_id=external_message_id,
+                    dedupe_key=dedupe_key,
+                    payload_json=build_inbound_event_payload(
+                        root_payload=payload,
+                        message_item=item,
                     ),
+                    is_processed=True,
+                    processed_at=timezone.now(),
                 )
 
                 contact = resolve_or_create_contact(
@@ -847,10 +1027,11 @@ def create_or_update_inbox_from_webhook(
                 created_count += 1
 
         except Exception:
+            # IntegrityError على dedupe_key = نفس الرسالة عولجت في مكان آخر
             skipped_count += 1
             continue
 
     return {
         "created_count": created_count,
         "skipped_count": skipped_count,
-    }
\ No newline at end of file
+    }